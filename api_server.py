@@ -0,0 +1,534 @@
+"""
+재고조사 HTTP API 서버 (브라우저 없이 다른 시스템에서 파일을 보내 결과/보고서 받기)
+
+스캐너 앱, ERP 내보내기 작업 등이 Streamlit 화면 대신 사용하는 로컬 서비스입니다.
+요청 본문은 파일 내용 그대로 보내고(filename 파라미터의 확장자로 형식 판별), 결과는 JSON으로 받습니다.
+
+    POST /upload?filename=PART.xlsx                          PART 분석 → {"session": ..., ...}
+    POST /validate?session=<ID>&filename=count.xlsx          실재고 검사/계산
+    POST /apply?session=<ID>&filename=adj.xlsx[&start=&end=] 재고조정 적용 (기간 생략 시 최근 6개월)
+    POST /report?session=<ID>   (본문: 점포 정보 JSON)        엑셀 보고서 (xlsx)
+                                 part_export_time(ISO)을 주거나 PART 파일명에 일시가 있으면
+                                 조사일 기준 전산재고를 재구성한 시점재고비교 시트 포함
+                                 review_metric(amount/quantity/ratio), review_size(기본 100, 0이면 생략)로
+                                 검토대상 시트의 순위 기준/개수 지정
+    DELETE /session?session=<ID>                             세션 삭제
+    GET  /health, GET /stats
+
+PART 분석, 실재고 계산, 보고서 생성은 앱과 같은 HeavyTaskScheduler(동시 실행 수/메모리 한도)에서 실행하며
+대기열이 가득 차면 503(Retry-After)을 반환합니다.
+
+사용법:
+    python api_server.py --port 8600
+    python api_server.py --host 0.0.0.0 --port 8600 --workers 4 --memory-mb 2048
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import argparse
+import calendar
+import tempfile
+import threading
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, parse_qs
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils import enable_copy_on_write  # noqa: E402
+from utils.data_processor import PartDataProcessor  # noqa: E402
+from utils.adjustment_processor import AdjustmentProcessor  # noqa: E402
+from utils.report_generator import ReportGenerator  # noqa: E402
+from utils.xlsx_parts import SheetPartCache  # noqa: E402
+from utils.book_stock import book_stock_as_of, export_time_from_filename  # noqa: E402
+from utils.review_queue import ReviewQueue, REVIEW_METRICS  # noqa: E402
+from utils.file_reader import FORMATS, read_count_sheet  # noqa: E402
+from utils.data_validator import validate_count_sheet  # noqa: E402
+from utils.count_stream import InventoryTotals  # noqa: E402
+from utils.inventory_template import part_fingerprint, align_to_template, ROW_KEY_COLUMN  # noqa: E402
+from utils.task_scheduler import (  # noqa: E402
+    HeavyTaskScheduler, SchedulerBusy, estimate_file_memory, estimate_report_memory
+)
+
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+# 보고서 응답을 나눠 쓰는 크기
+RESPONSE_CHUNK_BYTES = 256 * 1024
+# 응답에 포함하는 데이터 품질 검사 문제 행 수
+MAX_ISSUES = 100
+# 보고서 검토대상 시트 기본 품목 수
+DEFAULT_REVIEW_SIZE = 100
+
+
+class ApiError(Exception):
+    """HTTP 오류 응답 (상태 코드 + 메시지)"""
+
+    def __init__(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class ApiSession:
+    """API 세션 하나의 처리 상태 (세션마다 프로세서를 따로 두고 요청은 하나씩 처리)"""
+
+    def __init__(self, sheet_cache: Optional[SheetPartCache] = None):
+        self.session_id = uuid.uuid4().hex
+        self.part_processor = PartDataProcessor()
+        self.adjustment_processor = AdjustmentProcessor()
+        self.report_generator = ReportGenerator(sheet_cache)
+        self.part_data: Optional[pd.DataFrame] = None
+        self.inventory_data: Optional[pd.DataFrame] = None
+        self.final_data: Optional[pd.DataFrame] = None
+        self.adjustment_summary: Optional[Dict] = None
+        # PART 파일명의 내보내기 일시 (조사 시점 전산재고 재구성 기본값)
+        self.part_export_time: Optional[pd.Timestamp] = None
+        # 검토 대기열 (보고서를 다시 만들 때 바뀐 행만 갱신)
+        self.review_queue: Optional[ReviewQueue] = None
+        self.lock = threading.Lock()
+        self.last_used = time.time()
+
+
+class ApiSessionStore:
+    """API 세션 목록 (마지막 사용 후 ttl초가 지나면 삭제)"""
+
+    def __init__(self, ttl: float = 3600, max_sessions: int = 64):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self._sessions: Dict[str, ApiSession] = {}
+        self._lock = threading.Lock()
+        # 보고서 시트 캐시 (같은 PART/실재고로 여러 세션이 보고서를 만들면 시트 재사용)
+        self.sheet_cache = SheetPartCache()
+
+    def create(self) -> ApiSession:
+        self._cleanup()
+        session = ApiSession(self.sheet_cache)
+        with self._lock:
+            if len(self._sessions) >= self.max_sessions:
+                raise ApiError(503, f"세션 수가 한도({self.max_sessions}개)에 도달했습니다. 사용이 끝난 세션을 삭제해주세요.",
+                               {'Retry-After': '30'})
+            self._sessions[session.session_id] = session
+        return session
+
+    def get(self, session_id: Optional[str]) -> ApiSession:
+        with self._lock:
+            session = self._sessions.get(session_id or '')
+        if session is None:
+            raise ApiError(404, "세션을 찾을 수 없습니다. /upload로 PART 파일을 먼저 보내주세요.")
+        session.last_used = time.time()
+        return session
+
+    def drop(self, session_id: Optional[str]) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id or '', None) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def _cleanup(self):
+        now = time.time()
+        with self._lock:
+            expired = [
+                session_id for session_id, session in self._sessions.items()
+                if now - session.last_used > self.ttl and not session.lock.locked()
+            ]
+            for session_id in expired:
+                del self._sessions[session_id]
+
+
+def _json_default(value: Any):
+    """numpy/pandas/날짜 값 JSON 변환"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _validation_summary(validation: Optional[Dict]) -> Optional[Dict]:
+    """데이터 품질 검사 결과 → JSON (문제 행은 앞에서 MAX_ISSUES개)"""
+    if validation is None:
+        return None
+    issues = validation['issues']
+    return {
+        'counts': validation['counts'],
+        'error_rows': validation['error_rows'],
+        'warning_rows': validation['warning_rows'],
+        'total_rows': validation['total_rows'],
+        'issues': issues.head(MAX_ISSUES).to_dict('records'),
+        'issues_truncated': len(issues) > MAX_ISSUES,
+    }
+
+
+def _parse_date(value: Optional[str], default: date) -> date:
+    if not value:
+        return default
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"날짜 형식이 올바르지 않습니다 (YYYY-MM-DD): {value}")
+
+
+def _six_months_ago(today: date) -> date:
+    """앱 재고조정 탭의 기본 시작일과 같은 계산 (6개월 전, 그 달에 없는 날이면 말일)"""
+    year, month = (today.year, today.month - 6) if today.month > 6 else (today.year - 1, today.month + 6)
+    return date(year, month, min(today.day, calendar.monthrange(year, month)[1]))
+
+
+class InventoryApiHandler(BaseHTTPRequestHandler):
+    """요청 처리 (서버 객체의 sessions/scheduler/max_upload_bytes 사용)"""
+
+    server_version = 'InventoryAPI/1.0'
+    protocol_version = 'HTTP/1.1'
+    # 헤더와 본문을 따로 보내므로 Nagle 알고리즘 끄기 (keep-alive 연결에서 요청마다 ~40ms 지연 방지)
+    disable_nagle_algorithm = True
+
+    # ---- 라우팅 ----
+
+    def do_GET(self):
+        self._dispatch({'/health': self._health, '/stats': self._stats})
+
+    def do_POST(self):
+        self._dispatch({
+            '/upload': self._upload,
+            '/validate': self._validate,
+            '/apply': self._apply,
+            '/report': self._report,
+        })
+
+    def do_DELETE(self):
+        self._dispatch({'/session': self._delete_session})
+
+    def _dispatch(self, routes):
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        handler = routes.get(url.path.rstrip('/') or '/')
+        self._body_read = False
+        try:
+            if handler is None:
+                raise ApiError(404, f"알 수 없는 경로입니다: {url.path}")
+            handler()
+        except ApiError as e:
+            self._send_json(e.status, {'error': str(e)}, e.headers)
+        except SchedulerBusy as e:
+            self._send_json(503, {'error': str(e)}, {'Retry-After': '5'})
+        except Exception as e:
+            self._send_json(500, {'error': f"처리 오류: {e}"})
+
+    # ---- 엔드포인트 ----
+
+    def _health(self):
+        self._send_json(200, {'status': 'ok'})
+
+    def _stats(self):
+        self._send_json(200, {
+            'sessions': len(self.server.sessions),
+            'scheduler': self.server.scheduler.stats(),
+            'sheet_cache': self.server.sessions.sheet_cache.stats(),
+        })
+
+    def _upload(self):
+        """PART 분석 후 새 세션 생성"""
+        with self._uploaded_file() as path:
+            session = self.server.sessions.create()
+            try:
+                with session.lock:
+                    with self._heavy(session, 'load_part_file', estimate_file_memory(path)):
+                        success, message, part_data = session.part_processor.load_part_file(path)
+                    if not success:
+                        raise ApiError(422, message)
+                    session.part_data = part_data
+                    session.part_export_time = export_time_from_filename(self.query.get('filename') or '')
+            except BaseException:
+                self.server.sessions.drop(session.session_id)
+                raise
+        self._send_json(200, {
+            'session': session.session_id,
+            'message': message,
+            'rows': len(part_data),
+            'validation': _validation_summary(session.part_processor.validation),
+        })
+
+    def _validate(self):
+        """실재고 파일 검사/계산 (앱에서 만든 템플릿이면 행 키로 PART 순서에 맞춤)"""
+        session = self.server.sessions.get(self.query.get('session'))
+        with self._uploaded_file() as path, session.lock:
+            with self._heavy(session, 'validate_inventory_data', estimate_file_memory(path)):
+                inventory_df, template_meta, sheets = read_count_sheet(path)
+                # 템플릿 정렬 전 업로드한 시트 기준으로 검사 (시트별 행 번호)
+                validation = None
+                if '제작사 품번' in inventory_df.columns:
+                    validation = validate_count_sheet(inventory_df, session.part_data, sheets=sheets)
+                alignment = None
+                if template_meta and ROW_KEY_COLUMN in inventory_df.columns \
+                        and template_meta.get('part_fingerprint') == part_fingerprint(session.part_data):
+                    row_keys = session.part_processor.create_inventory_template(session.part_data)[ROW_KEY_COLUMN]
+                    inventory_df, alignment = align_to_template(inventory_df, session.part_data, row_keys.to_numpy())
+                inventory_df = inventory_df.drop(columns=[ROW_KEY_COLUMN], errors='ignore')
+                success, message, processed_data = session.part_processor.validate_inventory_data(inventory_df)
+            if not success:
+                raise ApiError(422, message)
+            session.inventory_data = processed_data
+            # 이전 재고조정 결과는 새 실재고 기준으로 다시 적용해야 함
+            session.final_data = None
+            session.adjustment_summary = None
+        totals = InventoryTotals().add(processed_data)
+        self._send_json(200, {
+            'message': message,
+            'rows': len(processed_data),
+            'alignment': alignment,
+            'totals': {
+                'increased_rows': totals.increased_rows,
+                'decreased_rows': totals.decreased_rows,
+                'positive_amount': totals.positive_amount,
+                'negative_amount': totals.negative_amount,
+            },
+            'validation': _validation_summary(validation),
+        })
+
+    def _apply(self):
+        """재고조정 파일 기간 필터 후 실재고에 반영"""
+        session = self.server.sessions.get(self.query.get('session'))
+        today = date.today()
+        start_date = _parse_date(self.query.get('start'), _six_months_ago(today))
+        end_date = _parse_date(self.query.get('end'), today)
+        with self._uploaded_file() as path, session.lock:
+            if session.inventory_data is None:
+                raise ApiError(409, "먼저 /validate로 실재고 파일을 보내주세요.")
+            processor = session.adjustment_processor
+            success, message, _ = processor.load_adjustment_file(path)
+            if success:
+                success, message, _ = processor.filter_by_date_range(start_date, end_date)
+            if not success:
+                raise ApiError(422, message)
+            success, message, final_data, summary = processor.apply_adjustments_to_inventory(
+                session.inventory_data, session.part_data
+            )
+            if not success:
+                raise ApiError(422, message)
+            session.final_data = final_data
+            session.adjustment_summary = summary
+        self._send_json(200, {'message': message, 'summary': summary})
+
+    def _report(self):
+        """엑셀 보고서 생성 후 나눠서 전송"""
+        session = self.server.sessions.get(self.query.get('session'))
+        body = self._read_body()
+        try:
+            store_info = json.loads(body.decode('utf-8')) if body else {}
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ApiError(400, "점포 정보는 JSON으로 보내주세요.")
+        if not isinstance(store_info, dict):
+            raise ApiError(400, "점포 정보는 JSON 객체로 보내주세요.")
+        survey_date = str(store_info.get('survey_date') or date.today().isoformat())
+        try:
+            # 앱 보고서와 같은 표기로 변환 (YYYY-MM-DD가 아니면 그대로 사용)
+            survey_day = date.fromisoformat(survey_date)
+            survey_date = survey_day.strftime('%Y년 %m월 %d일')
+        except ValueError:
+            survey_day = None
+        try:
+            export_time = pd.Timestamp(store_info['part_export_time']) if store_info.get('part_export_time') else None
+        except ValueError:
+            raise ApiError(400, "part_export_time은 ISO 형식(YYYY-MM-DD 또는 YYYY-MM-DDTHH:MM)으로 보내주세요.")
+        review_metric = str(store_info.get('review_metric') or 'amount')
+        if review_metric not in REVIEW_METRICS:
+            raise ApiError(400, f"review_metric은 {', '.join(REVIEW_METRICS)} 중 하나로 보내주세요.")
+        try:
+            review_size = int(store_info.get('review_size', DEFAULT_REVIEW_SIZE))
+        except (TypeError, ValueError):
+            raise ApiError(400, "review_size는 정수로 보내주세요.")
+        if not 0 <= review_size <= 10_000:
+            raise ApiError(400, "review_size는 0~10000 사이로 보내주세요.")
+        store_info = {
+            'store_name': str(store_info.get('store_name', '')),
+            'survey_date': survey_date,
+            'survey_method': str(store_info.get('survey_method', '전수조사')),
+            'survey_staff': str(store_info.get('survey_staff', '')),
+        }
+
+        with session.lock:
+            if session.inventory_data is None:
+                raise ApiError(409, "먼저 /validate로 실재고 파일을 보내주세요.")
+            generator = session.report_generator
+            if session.adjustment_processor.filtered_data is not None:
+                generator.set_adjustment_data(session.adjustment_processor.filtered_data)
+            # PART 내보내기 ~ 조사일 사이 재고조정을 반영한 조사 시점 전산재고
+            export_time = export_time if export_time is not None else session.part_export_time
+            ledger = session.adjustment_processor.get_ledger()
+            book_stock = None
+            if export_time is not None and survey_day is not None and ledger is not None:
+                book_stock = book_stock_as_of(session.inventory_data, ledger, export_time, survey_day)
+            generator.set_book_stock(book_stock)
+            # 차이가 큰 품목 검토대상 (재고조정 반영 결과 기준)
+            review_list = None
+            if review_size > 0:
+                source = session.final_data if session.final_data is not None else session.inventory_data
+                if session.review_queue is None:
+                    session.review_queue = ReviewQueue(source, review_metric, capacity=max(review_size, 500))
+                else:
+                    session.review_queue.refresh(source)
+                    session.review_queue.set_metric(review_metric)
+                review_list = session.review_queue.top(review_size)
+            generator.set_review_list(review_list if review_list is not None and not review_list.empty else None)
+            generator.generate_report_data(
+                inventory_data=session.inventory_data,
+                store_info=store_info,
+                part_data=session.part_data,
+                final_data=session.final_data,
+                adjustment_summary=session.adjustment_summary
+            )
+            frames = [session.part_data, session.inventory_data, session.final_data]
+            with self._heavy(session, 'create_excel_report', estimate_report_memory(frames)):
+                excel_data = generator.create_excel_report()
+        if not excel_data:
+            raise ApiError(500, "보고서 데이터가 비어있습니다.")
+
+        filename = f"inventory_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        self.send_response(200)
+        self.send_header('Content-Type', XLSX_MIME)
+        self.send_header('Content-Length', str(len(excel_data)))
+        self.send_header('Content-Disposition', f'attachment; filename="{filename}"')
+        self.end_headers()
+        # 응답 버퍼에 한 번에 복사하지 않고 나눠서 전송
+        view = memoryview(excel_data)
+        for start in range(0, len(view), RESPONSE_CHUNK_BYTES):
+            self.wfile.write(view[start:start + RESPONSE_CHUNK_BYTES])
+
+    def _delete_session(self):
+        if not self.server.sessions.drop(self.query.get('session')):
+            raise ApiError(404, "세션을 찾을 수 없습니다.")
+        self._send_json(200, {'deleted': True})
+
+    # ---- 보조 ----
+
+    def _heavy(self, session: ApiSession, name: str, cost: int):
+        """무거운 처리 실행 구간 (스케줄러 차례가 될 때까지 대기)"""
+        return self.server.scheduler.slot(session.session_id, name, cost)
+
+    def _read_body(self) -> bytes:
+        length = self.headers.get('Content-Length')
+        if length is None:
+            raise ApiError(411, "Content-Length 헤더가 필요합니다.")
+        try:
+            length = int(length)
+        except ValueError:
+            raise ApiError(400, "Content-Length 값이 올바르지 않습니다.")
+        if length > self.server.max_upload_bytes:
+            raise ApiError(413, f"파일이 너무 큽니다 (최대 {self.server.max_upload_bytes // 1024 // 1024}MB).")
+        body = self.rfile.read(length)
+        self._body_read = True
+        return body
+
+    def _uploaded_file(self):
+        """요청 본문을 임시 파일로 저장 (filename 파라미터의 확장자로 형식 판별)"""
+        filename = self.query.get('filename') or ''
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in FORMATS:
+            raise ApiError(400, f"filename 파라미터에 지원하는 확장자가 필요합니다: {', '.join(sorted(FORMATS))}")
+        body = self._read_body()
+        if not body:
+            raise ApiError(400, "파일 내용이 비어있습니다.")
+        return _TempUpload(body, extension)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload, ensure_ascii=False, default=_json_default).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        if not self._body_read and int(self.headers.get('Content-Length') or 0) > 0:
+            # 읽지 않은 본문이 다음 요청과 섞이지 않도록 응답 후 연결 종료
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _TempUpload:
+    """업로드 본문 임시 파일 (with 블록이 끝나면 삭제)"""
+
+    def __init__(self, body: bytes, extension: str):
+        self.body = body
+        self.extension = extension
+        self.path = None
+
+    def __enter__(self) -> str:
+        fd, self.path = tempfile.mkstemp(prefix='api_upload_', suffix=self.extension)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.body)
+        self.body = None
+        return self.path
+
+    def __exit__(self, *exc):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+        return False
+
+
+def make_server(host: str = '127.0.0.1', port: int = 8600, scheduler: Optional[HeavyTaskScheduler] = None,
+                sessions: Optional[ApiSessionStore] = None, max_upload_bytes: int = 200 * 1024 * 1024,
+                quiet: bool = False) -> ThreadingHTTPServer:
+    """
+    API 서버 생성 (serve_forever()로 실행)
+
+    Args:
+        scheduler: 무거운 작업 스케줄러 (None이면 기본 설정)
+        sessions: 세션 저장소 (None이면 기본 설정)
+        max_upload_bytes: 요청 본문 최대 크기
+        quiet: 요청 로그 출력 안 함
+    """
+    server = ThreadingHTTPServer((host, port), InventoryApiHandler)
+    server.daemon_threads = True
+    server.scheduler = scheduler or HeavyTaskScheduler()
+    server.sessions = sessions or ApiSessionStore()
+    server.max_upload_bytes = max_upload_bytes
+    server.quiet = quiet
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='재고조사 HTTP API 서버')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소 (기본: 로컬만)')
+    parser.add_argument('--port', type=int, default=int(os.getenv('INVENTORY_API_PORT', '8600')))
+    parser.add_argument('--workers', type=int, default=int(os.getenv('HEAVY_TASK_WORKERS', '2')),
+                        help='무거운 작업 동시 실행 수')
+    parser.add_argument('--memory-mb', type=int, default=int(os.getenv('HEAVY_TASK_MEMORY_MB', '1024')),
+                        help='무거운 작업 예상 메모리 한도(MB)')
+    parser.add_argument('--max-queue', type=int, default=int(os.getenv('HEAVY_TASK_MAX_QUEUE', '32')),
+                        help='최대 대기 작업 수 (넘으면 503)')
+    parser.add_argument('--max-upload-mb', type=int, default=200, help='요청 본문 최대 크기(MB)')
+    parser.add_argument('--session-ttl', type=float, default=3600, help='세션 보관 시간(초)')
+    parser.add_argument('--quiet', action='store_true', help='요청 로그 출력 안 함')
+    args = parser.parse_args(argv)
+    enable_copy_on_write()
+
+    server = make_server(
+        args.host, args.port,
+        scheduler=HeavyTaskScheduler(args.workers, args.memory_mb * 1024 * 1024, args.max_queue),
+        sessions=ApiSessionStore(ttl=args.session_ttl),
+        max_upload_bytes=args.max_upload_mb * 1024 * 1024,
+        quiet=args.quiet
+    )
+    print(f"재고조사 API 서버: http://{args.host}:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
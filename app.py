@@ -1,28 +1,80 @@
 import streamlit as st
-import pandas as pd
 import os
+import sys
+import time
+import uuid
+import shutil
+import tempfile
+import calendar
+import functools
+from contextlib import contextmanager
 from datetime import datetime, date
 
-# utils 모듈 import
-try:
+
+def _import_dependencies():
+    """pandas와 utils 모듈 import (아래 함수들이 쓰는 모듈 전역 이름으로 바인딩)"""
+    global pd, PartDataProcessor, AdjustmentProcessor, ExcelFileConverter, ReportGenerator, SheetPartCache, PagedTable
+    global perf_monitor, ReportJobManager, validate_count_sheet, SurveyStore, SurveyHistory
+    global SessionDataManager, SharedDiskCache, content_key, UPLOAD_TYPES, read_count_sheet
+    global stream_count_sheet, TemplateCache, part_fingerprint, align_to_template, ROW_KEY_COLUMN
+    global SPLIT_BALANCES, MAX_SPLIT_PARTS
+    global HeavyTaskScheduler, SchedulerBusy, estimate_file_memory, estimate_nbytes
+    global book_stock_as_of, export_time_from_filename, parse_survey_date
+    global ReviewQueue, REVIEW_METRICS
+    import pandas as pd
+    from utils import enable_copy_on_write
+    enable_copy_on_write()
     from utils.data_processor import PartDataProcessor
     from utils.adjustment_processor import AdjustmentProcessor
     from utils.file_converter import ExcelFileConverter
     from utils.report_generator import ReportGenerator
-except ImportError as e:
-    st.error(f"모듈 import 오류: {e}")
-    # 대안으로 직접 import 시도
-    try:
-        import sys
-        import os
-        sys.path.append(os.path.dirname(__file__))
-        from utils.data_processor import PartDataProcessor
-        from utils.adjustment_processor import AdjustmentProcessor
-        from utils.file_converter import ExcelFileConverter
-        from utils.report_generator import ReportGenerator
-    except Exception as fallback_error:
-        st.error(f"모듈 로드 실패: {fallback_error}")
-        st.stop()
+    from utils.xlsx_parts import SheetPartCache
+    from utils.data_grid import PagedTable
+    from utils.perf_monitor import perf_monitor
+    from utils.report_jobs import ReportJobManager
+    from utils.data_validator import validate_count_sheet
+    from utils.survey_store import SurveyStore
+    from utils.survey_history import SurveyHistory
+    from utils.session_data import SessionDataManager
+    from utils.shared_cache import SharedDiskCache, content_key
+    from utils.file_reader import UPLOAD_TYPES, read_count_sheet
+    from utils.count_stream import stream_count_sheet
+    from utils.inventory_template import (
+        TemplateCache, part_fingerprint, align_to_template, ROW_KEY_COLUMN, SPLIT_BALANCES, MAX_SPLIT_PARTS
+    )
+    from utils.task_scheduler import HeavyTaskScheduler, SchedulerBusy, estimate_file_memory
+    from utils.session_data import estimate_nbytes
+    from utils.book_stock import book_stock_as_of, export_time_from_filename
+    from utils.survey_history import parse_survey_date
+    from utils.review_queue import ReviewQueue, REVIEW_METRICS
+
+
+_dependencies_loaded = False
+
+
+def load_dependencies():
+    """
+    pandas와 utils 모듈 로드 (main()에서 제목을 그린 뒤 호출)
+    
+    콜드 스타트 시 무거운 모듈을 읽는 동안에도 첫 화면이 먼저 표시되도록 모듈 import 시점이 아니라
+    첫 실행 때 로드합니다. 두 번째 실행부터는 바로 반환합니다.
+    """
+    global _dependencies_loaded
+    if _dependencies_loaded:
+        return
+    with st.spinner("앱을 준비하는 중입니다..."):
+        try:
+            _import_dependencies()
+        except ImportError as e:
+            st.error(f"모듈 import 오류: {e}")
+            # 대안으로 직접 import 시도
+            try:
+                sys.path.append(os.path.dirname(__file__))
+                _import_dependencies()
+            except Exception as fallback_error:
+                st.error(f"모듈 로드 실패: {fallback_error}")
+                st.stop()
+    _dependencies_loaded = True
 
 # 페이지 설정 (배포 최적화)
 st.set_page_config(
@@ -45,8 +97,8 @@ def get_processors(version="v2.1_error_fix"):
     try:
         return {
             'part_processor': PartDataProcessor(),
-            'adjustment_processor': AdjustmentProcessor(),
-            'report_generator': ReportGenerator()
+            # 보고서 시트 캐시만 공유 (보고서 입력은 세션마다 만드는 ReportGenerator에 설정)
+            'sheet_cache': SheetPartCache()
         }
     except Exception as e:
         st.error(f"프로세서 초기화 오류: {str(e)}")
@@ -54,6 +106,188 @@ def get_processors(version="v2.1_error_fix"):
         st.stop()
         return None
 
+# 프로세스 간 공유 디스크 캐시 (같은 서버의 여러 앱 프로세스가 파일 분석/템플릿/보고서 결과 공유)
+@st.cache_resource
+def get_shared_cache():
+    """공유 캐시 (SHARED_CACHE_MAX_MB 환경변수로 크기 제한, 기본 1024MB, 폴더를 만들 수 없으면 None)"""
+    try:
+        return SharedDiskCache(max_bytes=int(os.getenv('SHARED_CACHE_MAX_MB', '1024')) * 1024 * 1024)
+    except OSError:
+        return None
+
+# 무거운 처리(PART 분석, 실재고 계산, 엑셀 보고서 생성) 동시 실행 제한 (전체 세션 공용)
+@st.cache_resource
+def get_task_scheduler():
+    """
+    무거운 작업 스케줄러
+    
+    HEAVY_TASK_WORKERS(동시 실행 수, 기본 2), HEAVY_TASK_MEMORY_MB(예상 메모리 합계 한도, 기본 1024MB),
+    HEAVY_TASK_MAX_QUEUE(최대 대기 작업 수, 기본 32) 환경변수로 설정
+    """
+    return HeavyTaskScheduler(
+        max_concurrent=int(os.getenv('HEAVY_TASK_WORKERS', '2')),
+        memory_budget=int(os.getenv('HEAVY_TASK_MEMORY_MB', '1024')) * 1024 * 1024,
+        max_queued=int(os.getenv('HEAVY_TASK_MAX_QUEUE', '32'))
+    )
+
+def task_session_id():
+    """스케줄러 대기열에서 이 세션을 구분하는 ID"""
+    if 'task_session_id' not in st.session_state:
+        st.session_state.task_session_id = uuid.uuid4().hex
+    return st.session_state.task_session_id
+
+@contextmanager
+def heavy_task(name, cost):
+    """
+    무거운 처리 실행 구간 (스케줄러 차례가 될 때까지 대기 순번 표시)
+    
+    대기열이 가득 차면 안내 후 이번 실행을 멈춥니다. (다시 시도하면 처리)
+    
+    Args:
+        name: 작업 이름
+        cost: 예상 메모리 사용량 (바이트)
+    """
+    waiting = st.empty()
+    
+    def show_position(position):
+        waiting.info(f"⏳ 다른 사용자의 작업이 끝나기를 기다리는 중입니다... (대기 {position}번째)")
+    
+    try:
+        with get_task_scheduler().slot(task_session_id(), name, cost, on_wait=show_position):
+            waiting.empty()
+            yield
+    except SchedulerBusy as e:
+        waiting.empty()
+        st.warning(f"⚠️ {e}")
+        st.stop()
+
+# 백그라운드 보고서 생성 작업 관리자 (전체 세션 공용, 작업 결과는 세션별 작업 ID로 조회)
+@st.cache_resource
+def get_report_job_manager():
+    """엑셀 보고서 백그라운드 작업 관리자 (시작 순서는 무거운 작업 스케줄러가 결정)"""
+    return ReportJobManager(max_workers=2, cache=get_shared_cache(), scheduler=get_task_scheduler())
+
+# PART 파일별 템플릿 엑셀 캐시 (같은 PART 파일을 쓰는 세션끼리 공유)
+@st.cache_resource
+def get_template_cache():
+    """실재고 입력 템플릿 캐시"""
+    return TemplateCache(max_entries=32, max_bytes=256 * 1024 * 1024, backend=get_shared_cache())
+
+def load_uploaded_file(namespace, uploaded_file, load, extra=None):
+    """
+    업로드 파일 분석 (같은 내용의 파일은 공유 캐시의 분석 결과 재사용)
+    
+    Args:
+        namespace: 캐시 구분 ('part_file', 'adjustment_file')
+        uploaded_file: 업로드된 파일
+        load: 분석 함수 () → (성공여부, 메시지, 데이터프레임)
+        extra: 분석 후 함께 저장할 부가 정보 함수 (예: 품질 검사 결과)
+    
+    Returns:
+        (성공여부, 메시지, 데이터프레임, 부가 정보)
+    """
+    failures = []
+    
+    def compute():
+        success, message, data = load()
+        if not success:
+            failures.append(message)
+            return None
+        return {'message': message, 'data': data, 'extra': extra() if extra else None}
+    
+    cache = get_shared_cache()
+    entry = None
+    if cache is not None:
+        try:
+            entry = cache.get_or_compute(namespace, content_key(namespace, uploaded_file.getvalue()), compute)
+        except OSError:
+            entry = None
+    if entry is None and not failures:
+        entry = compute()
+    if entry is None:
+        return False, failures[0], None, None
+    return True, entry['message'], entry['data'], entry['extra']
+
+# 조사별 처리 결과 디스크 저장소 (새로고침/서버 재시작 후 이어하기)
+@st.cache_resource
+def get_survey_store():
+    """조사 저장소 (저장 폴더를 만들 수 없는 환경이면 None)"""
+    try:
+        return SurveyStore()
+    except OSError:
+        return None
+
+# 완료된 조사의 품목별 결과 이력 (기간별 재고차이 비교)
+@st.cache_resource
+def get_survey_history():
+    """조사 이력 저장소 (저장 폴더를 만들 수 없는 환경이면 None)"""
+    try:
+        return SurveyHistory()
+    except OSError:
+        return None
+
+# 세션별 대용량 데이터 관리자 (메모리 한도를 넘으면 오래 쓰지 않은 세션부터 디스크로 내림)
+@st.cache_resource
+def get_session_data_manager():
+    """세션 데이터 관리자 (SESSION_MEMORY_LIMIT_MB 환경변수로 메모리 한도 설정, 기본 512MB)"""
+    return SessionDataManager(
+        max_resident_bytes=int(os.getenv('SESSION_MEMORY_LIMIT_MB', '512')) * 1024 * 1024,
+        spill_dir=os.getenv('SESSION_SPILL_DIR')
+    )
+
+def session_data():
+    """
+    현재 세션 상태 (st.session_state 래퍼)
+    
+    PART/실재고/재고조정/최종 데이터와 엑셀 바이트는 관리자에 저장되어
+    다른 세션이 메모리를 차지하면 디스크로 내려갔다가 접근할 때 다시 올라옵니다.
+    """
+    manager = get_session_data_manager()
+    token = st.session_state.get('session_data_token')
+    if token is None:
+        token = manager.register()
+        st.session_state.session_data_token = token
+    return manager.view(token, st.session_state)
+
+# 주기적으로 다시 그리는 부분 화면 (fragment 미지원 버전은 None)
+_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None)
+
+# 탭별 부분 재실행 (INVENTORY_TAB_FRAGMENTS=0이면 사용 안 함, 재실행 시간 비교용)
+TAB_FRAGMENTS = _fragment is not None and os.getenv('INVENTORY_TAB_FRAGMENTS', '1') != '0'
+
+# 이 크기 이상인 실재고 파일은 행 묶음 단위로 나눠 처리 (COUNT_STREAM_MIN_MB, 기본 20MB)
+COUNT_STREAM_MIN_BYTES = int(os.getenv('COUNT_STREAM_MIN_MB', '20')) * 1024 * 1024
+
+def mark_data_changed():
+    """다른 탭/사이드바가 사용하는 데이터(진행 단계, PART/실재고/재고조정 데이터)가 바뀌었음을 표시"""
+    st.session_state.data_version = st.session_state.get('data_version', 0) + 1
+
+def tab_fragment(name):
+    """
+    탭 화면 데코레이터
+    
+    탭 안의 위젯을 조작하면 그 탭만 다시 실행합니다.
+    탭이 다른 탭의 입력 데이터를 바꾸면(mark_data_changed) 전체 화면을 다시 실행해 다른 탭과 사이드바에 반영합니다.
+    """
+    def decorator(render):
+        @functools.wraps(render)
+        def run_tab(*args, **kwargs):
+            version = st.session_state.get('data_version', 0)
+            # 측정 기록은 이 세션에만 표시
+            with perf_monitor.session_scope(task_session_id()), perf_monitor.stage(f'tab_{name}'):
+                render(*args, **kwargs)
+            if TAB_FRAGMENTS and st.session_state.get('data_version', 0) != version:
+                st.rerun()
+        if not TAB_FRAGMENTS:
+            return run_tab
+        try:
+            # 이름으로 다시 실행할 수 있도록 키 지정 (st.rerun(scope='tab_report') 등)
+            return _fragment(run_tab, key=f'tab_{name}')
+        except TypeError:
+            # 키를 지원하지 않는 Streamlit 버전
+            return _fragment(run_tab)
+    return decorator
+
 # UI 컴포넌트 함수들 (UIComponents 대체)
 def show_progress_sidebar():
     """사이드바에 진행 단계 표시"""
@@ -78,6 +312,69 @@ def show_progress_sidebar():
             else:
                 st.write(step_name)
 
+def show_performance_sidebar():
+    """
+    사이드바에 단계별 성능 측정 결과 표시
+    
+    측정은 프로세스 전체 설정이므로 화면에서 켜고 끄지 않고
+    서버 시작 시 환경변수(STOCK_APP_PERF=1, STOCK_APP_PERF_MEMORY=1)로만 켭니다.
+    측정 기록은 이 세션에서 실행한 단계만 표시합니다.
+    """
+    with st.sidebar:
+        with st.expander("⏱️ 성능", expanded=perf_monitor.enabled):
+            if not perf_monitor.enabled:
+                st.caption("단계별 측정이 꺼져 있습니다. (서버를 STOCK_APP_PERF=1로 시작하면 측정)")
+            
+            session_id = task_session_id()
+            records = perf_monitor.get_records(limit=20, session=session_id)
+            if records:
+                records_df = pd.DataFrame(records)
+                columns = [col for col in ['stage', 'wall_time_ms', 'rows', 'peak_memory_mb', 'status', 'timestamp']
+                           if col in records_df.columns]
+                st.dataframe(records_df[columns], use_container_width=True, hide_index=True)
+                if st.button("🗑️ 기록 지우기", key="perf_clear"):
+                    perf_monitor.clear(session=session_id)
+                    st.rerun()
+            elif perf_monitor.enabled:
+                st.caption("측정된 단계가 없습니다.")
+            
+            # 세션 데이터 메모리/디스크 사용 현황
+            session_stats = get_session_data_manager().stats()
+            st.caption(
+                f"세션 데이터: 메모리 {session_stats['resident_bytes'] / 1024 / 1024:,.1f}MB"
+                f" / 한도 {session_stats['max_resident_bytes'] / 1024 / 1024:,.0f}MB, "
+                f"디스크 {session_stats['spilled_bytes'] / 1024 / 1024:,.1f}MB "
+                f"(세션 {session_stats['sessions']}개, 내린 뒤 남은 데이터 {session_stats['spilled_alive']}개)"
+            )
+            
+            # 무거운 작업 실행/대기 현황
+            task_stats = get_task_scheduler().stats()
+            st.caption(
+                f"무거운 작업: 실행 {task_stats['running']}/{task_stats['max_concurrent']}개, "
+                f"대기 {task_stats['queued']}개, 예상 메모리 {task_stats['reserved_mb']:,.1f}MB"
+                f" / 한도 {task_stats['budget_mb']:,.0f}MB "
+                f"(평균 대기 {task_stats['avg_wait_s']:.1f}초, 거절 {task_stats['rejected']}회)"
+            )
+            
+            # 보고서 시트 캐시 현황 (다시 만들 때 바뀌지 않은 시트 재사용)
+            sheet_stats = get_processors()['sheet_cache'].stats()
+            st.caption(
+                f"보고서 시트 캐시: {sheet_stats['entries']}개 시트, "
+                f"{sheet_stats['total_bytes'] / 1024 / 1024:,.1f}MB "
+                f"(적중 {sheet_stats['hits']}회, 미적중 {sheet_stats['misses']}회)"
+            )
+            
+            # 프로세스 간 공유 캐시 현황 (폴더 전체를 훑으므로 측정 중일 때만)
+            shared_cache = get_shared_cache()
+            if perf_monitor.enabled and shared_cache is not None:
+                cache_stats = shared_cache.stats()
+                st.caption(
+                    f"공유 캐시: {cache_stats['entries']}개 항목, "
+                    f"{cache_stats['total_bytes'] / 1024 / 1024:,.1f}MB"
+                    f" / 한도 {cache_stats['max_bytes'] / 1024 / 1024:,.0f}MB "
+                    f"(이 프로세스 적중 {cache_stats['hits']}회, 미적중 {cache_stats['misses']}회)"
+                )
+
 def render_store_info_form():
     """점포 정보 입력 폼"""
     with st.form("store_info_form"):
@@ -86,6 +383,13 @@ def render_store_info_form():
         with col1:
             store_name = st.text_input("점포명", value="고양점", placeholder="예: 고양점")
             survey_method = st.selectbox("조사방식", ["전수조사", "표본조사"], index=0)
+            # PART 파일명에 내보내기 일시가 있으면 기본값으로 사용
+            part_export_time = st.session_state.get('part_export_time')
+            part_export_date = st.date_input(
+                "PART 내보내기 일자",
+                value=pd.Timestamp(part_export_time).date() if part_export_time else None,
+                help="입력하면 내보내기 이후 조사일까지의 재고조정으로 조사 시점 전산재고를 재구성합니다."
+            )
         
         with col2:
             from datetime import date
@@ -95,11 +399,18 @@ def render_store_info_form():
         generate_report = st.form_submit_button("📋 보고서 생성", type="primary")
         
         if generate_report:
+            # 파일명 일시와 같은 날이면 시각까지 사용, 직접 고른 날짜는 그날 전체 기준
+            if part_export_date is not None and part_export_time \
+                    and pd.Timestamp(part_export_time).date() == part_export_date:
+                export_time = part_export_time
+            else:
+                export_time = part_export_date.isoformat() if part_export_date is not None else ''
             return {
                 'store_name': store_name,
                 'survey_date': survey_date.strftime('%Y년 %m월 %d일'),
                 'survey_method': survey_method,
-                'survey_staff': survey_staff
+                'survey_staff': survey_staff,
+                'part_export_time': export_time
             }
         return None
 
@@ -346,6 +657,381 @@ def render_report_cards(report_data):
         st.write("디버그 정보:")
         st.write(f"report_data 키들: {list(report_data.keys()) if isinstance(report_data, dict) else 'report_data가 딕셔너리가 아님'}")
 
+def uploaded_file_signature(uploaded_file):
+    """업로드 파일 식별자 (같은 파일의 재처리 방지용)"""
+    file_id = getattr(uploaded_file, 'file_id', None)
+    if file_id:
+        return file_id
+    return f"{uploaded_file.name}:{uploaded_file.size}"
+
+def render_paged_table(df, key, positions=None, page_size=50, source=None):
+    """
+    대용량 표 페이지 조회 (서버 측 정렬/필터/페이지 분할)
+    - 브라우저로는 현재 페이지 행만 전송
+    - 정렬 순서는 데이터가 바뀔 때까지 세션에 캐시
+    - positions: 표시할 행 위치 배열을 만드는 함수 (데이터가 바뀔 때만 호출)
+    - source: df가 세션 관리 값이면 그 키 (표 캐시를 관리자에 두어 디스크로 내릴 때 함께 버림)
+    """
+    cache_key = f"_paged_table_{key}"
+    build = lambda: PagedTable(df, positions(df) if positions is not None else None)
+    if source is not None:
+        table = session_data().cached(cache_key, (source,), build)
+    else:
+        cached = st.session_state.get(cache_key)
+        if cached is None or cached[0] is not df:
+            cached = (df, build())
+            st.session_state[cache_key] = cached
+        table = cached[1]
+    
+    if len(table) == 0:
+        st.info("표시할 데이터가 없습니다.")
+        return
+    
+    columns = table.columns
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    with col1:
+        filter_text = st.text_input("🔍 검색", value="", key=f"{key}_filter", placeholder="검색어 입력")
+    with col2:
+        filter_column = st.selectbox("검색 컬럼", ["(전체)"] + columns, key=f"{key}_filter_col")
+    with col3:
+        sort_column = st.selectbox("정렬 기준", ["(기본 순서)"] + columns, key=f"{key}_sort")
+    with col4:
+        ascending = st.radio("정렬", ["오름차순", "내림차순"], key=f"{key}_order") == "오름차순"
+    
+    sort_column = None if sort_column == "(기본 순서)" else sort_column
+    filter_column = None if filter_column == "(전체)" else filter_column
+    
+    # 조건에 맞는 전체 행 수로 페이지 범위 계산
+    total_rows = len(table.view_positions(sort_column, ascending, filter_text, filter_column))
+    total_pages = max(1, -(-total_rows // page_size))
+    
+    # 검색 결과가 줄어든 경우 현재 페이지를 범위 안으로 보정
+    if st.session_state.get(f"{key}_page", 1) > total_pages:
+        st.session_state[f"{key}_page"] = total_pages
+    
+    page = st.number_input(
+        f"페이지 (전체 {total_pages:,}페이지)",
+        min_value=1,
+        max_value=total_pages,
+        step=1,
+        key=f"{key}_page"
+    )
+    
+    page_df, total_rows, total_pages = table.get_page(
+        page, page_size, sort_column, ascending, filter_text, filter_column
+    )
+    st.caption(f"총 {total_rows:,}행 중 {(page - 1) * page_size + 1:,}~{(page - 1) * page_size + len(page_df):,}행 표시")
+    
+    # 숫자/문자 혼합 컬럼(예: 제작사 품번)은 표시용 문자열로 변환 (현재 페이지 행만)
+    mixed_columns = [col for col in page_df.columns if page_df[col].dtype == object]
+    if mixed_columns:
+        page_df = page_df.astype({col: str for col in mixed_columns}).replace({'nan': '', 'None': ''})
+    st.dataframe(page_df, use_container_width=True)
+
+def render_validation_result(validation, key):
+    """데이터 품질 검사 결과 표시 (규칙별 건수 + 문제 행 목록)"""
+    if not validation:
+        return
+    
+    if not validation['counts']:
+        st.success(f"🔍 데이터 검사: {validation['total_rows']:,}개 행 모두 문제 없음")
+        return
+    
+    error_rows = validation['error_rows']
+    warning_rows = validation['warning_rows']
+    with st.expander(f"🔍 데이터 검사: 오류 {error_rows:,}개 행 / 경고 {warning_rows:,}개 행", expanded=error_rows > 0):
+        counts_df = pd.DataFrame(list(validation['counts'].items()), columns=['검사항목', '건수'])
+        st.dataframe(counts_df, use_container_width=True, hide_index=True)
+        render_paged_table(validation['issues'], key, page_size=20)
+
+def get_part_fingerprint():
+    """세션 PART 데이터 지문 (PART 데이터가 바뀔 때만 다시 계산)"""
+    return session_data().cached('part_fingerprint', ('part_data',), lambda: part_fingerprint(session_data().part_data))
+
+def get_adjustment_processor():
+    """
+    세션 재고조정 처리기
+    
+    공용 인스턴스에 세션의 재고조정 데이터가 남지 않도록 실행마다 세션 데이터(원본/기간 필터 결과)로 새로 만듭니다.
+    """
+    adjustment_processor = AdjustmentProcessor()
+    adjustment_processor.data = session_data().adjustment_data
+    adjustment_processor.filtered_data = session_data().adjustment_filtered
+    return adjustment_processor
+
+def set_survey_query_param(survey_id):
+    """현재 조사 ID를 주소창 파라미터에 반영 (새로고침해도 같은 조사로 복원)"""
+    if hasattr(st, 'query_params'):
+        if survey_id:
+            st.query_params['survey'] = survey_id
+        elif 'survey' in st.query_params:
+            del st.query_params['survey']
+
+def start_survey(name):
+    """새 조사 시작 (PART 파일을 새로 분석할 때)"""
+    store = get_survey_store()
+    st.session_state.survey_id = store.create(name) if store is not None else None
+    st.session_state.pop('history_surveys', None)
+    set_survey_query_param(st.session_state.survey_id)
+
+def persist_survey(frames=None, blobs=None, **meta):
+    """현재 조사에 단계 결과 저장 (저장 실패해도 작업은 계속)"""
+    store = get_survey_store()
+    survey_id = st.session_state.get('survey_id')
+    if store is None or not survey_id:
+        return
+    try:
+        store.save(survey_id, frames=frames, blobs=blobs, **meta)
+    except Exception as e:
+        st.warning(f"⚠️ 조사 저장 실패 (작업은 계속할 수 있습니다): {str(e)}")
+
+def resume_survey(survey_id, processors):
+    """
+    저장된 조사를 세션으로 불러오기
+    
+    Returns:
+        불러왔으면 True
+    """
+    store = get_survey_store()
+    saved = store.load(survey_id) if store is not None else None
+    if saved is None:
+        return False
+    
+    frames, blobs, meta = saved['frames'], saved['blobs'], saved['meta']
+    st.session_state.survey_id = survey_id
+    st.session_state.step = meta.get('step', 1)
+    session_data().part_data = frames.get('part_data')
+    st.session_state.part_validation = None
+    session_data().inventory_data = frames.get('inventory_data')
+    st.session_state.inventory_upload_signature = None
+    session_data().adjustment_data = frames.get('adjustment_data')
+    st.session_state.adjustment_upload_signature = None
+    session_data().adjustment_filtered = frames.get('adjustment_filtered')
+    session_data().final_data = frames.get('final_data')
+    st.session_state.adjustment_summary = meta.get('adjustment_summary')
+    st.session_state.store_info = meta.get('store_info')
+    st.session_state.part_export_time = meta.get('part_export_time')
+    session_data().excel_report_data = blobs.get('excel_report_data')
+    st.session_state.excel_generation_time = meta.get('excel_generation_time')
+    st.session_state.excel_report_job_id = None
+    st.session_state.excel_report_error = None
+    st.session_state.pop('history_surveys', None)
+    set_survey_query_param(survey_id)
+    return True
+
+def update_history_comparison(record=False):
+    """
+    이전 조사 대비 품목별 재고차이 비교를 세션에 저장
+    
+    Args:
+        record: True면 현재 실재고 조사 결과를 이력에 먼저 기록 (점포 정보 입력 시)
+    """
+    st.session_state.history_comparison = None
+    st.session_state.history_surveys = []
+    history = get_survey_history()
+    if history is None:
+        return
+    
+    # 저장소를 쓸 수 없는 환경에서도 세션 안에서는 같은 조사 ID로 기록
+    st.session_state.history_survey_id = (
+        st.session_state.get('survey_id') or st.session_state.get('history_survey_id') or uuid.uuid4().hex
+    )
+    
+    try:
+        if record:
+            history.record(
+                st.session_state.history_survey_id, st.session_state.store_info, session_data().inventory_data
+            )
+        comparison, surveys = history.comparison(st.session_state.history_survey_id)
+        st.session_state.history_comparison = comparison
+        st.session_state.history_surveys = surveys
+    except Exception as e:
+        st.warning(f"⚠️ 조사 이력 처리 실패: {str(e)}")
+
+def compute_book_stock():
+    """조사 시점 전산재고 재구성 (PART 내보내기 일시, 재고조정 파일, 조사일이 모두 있을 때만, 없으면 None)"""
+    store_info = st.session_state.store_info or {}
+    export_time = store_info.get('part_export_time')
+    survey_date = parse_survey_date(store_info.get('survey_date', ''))
+    if not export_time or survey_date is None or session_data().adjustment_data is None:
+        return None
+    ledger = session_data().cached(
+        'adjustment_ledger', ('adjustment_data',), lambda: get_adjustment_processor().get_ledger()
+    )
+    if ledger is None:
+        return None
+    return book_stock_as_of(session_data().inventory_data, ledger, export_time, survey_date)
+
+def render_book_stock(book_stock):
+    """PART 내보내기 이후 재고조정을 반영한 조사 시점 전산재고 대비 실재고"""
+    st.markdown("### 🕒 조사 시점 전산재고")
+    if book_stock is None:
+        st.info("💡 재고조정 파일을 올리고 점포 정보에 PART 내보내기 일자를 입력하면 "
+                "내보내기 이후 조사일까지의 재고조정으로 조사 시점 전산재고를 재구성해 비교합니다.")
+        return
+    
+    changed = book_stock['조정수량'] != 0
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("내보내기 이후 조정 품목", f"{int(changed.sum()):,}개")
+    with col2:
+        st.metric("PART 기준 전산재고액", f"{book_stock['재고액'].sum():,.0f}원")
+    with col3:
+        book_value = book_stock['시점재고액'].sum()
+        st.metric("조사 시점 전산재고액", f"{book_value:,.0f}원",
+                  delta=f"{book_value - book_stock['재고액'].sum():,.0f}원")
+    with col4:
+        st.metric("조사 시점 기준 차액", f"{book_stock['시점차액'].sum():,.0f}원")
+    
+    if changed.any():
+        render_paged_table(book_stock[changed], "book_stock_grid")
+
+def get_review_queue():
+    """검토 대기열 (재고조정 반영 결과 기준, 세션에 두고 바뀐 행만 갱신, 원본을 디스크로 내리면 다시 만듦)"""
+    source = session_data().final_data
+    if source is None:
+        source = session_data().inventory_data
+    # 빈 대기열로 만든 뒤 refresh()에서 처음 한 번 전체 계산
+    queue = session_data().cached('review_queue', ('final_data', 'inventory_data'), ReviewQueue, keep_on_put=True)
+    queue.refresh(source)
+    return queue
+
+def render_review_queue():
+    """차이가 큰 품목부터 검토 목록 표시 (기준값/개수는 힙 안에서만 다시 거름), 표시한 목록 반환"""
+    st.markdown("### 🔎 검토 대기열")
+    queue = get_review_queue()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metric = st.selectbox("순위 기준", list(REVIEW_METRICS), format_func=REVIEW_METRICS.get, key="review_metric")
+    queue.set_metric(metric)
+    unit = {'amount': '원', 'quantity': '개', 'ratio': '%'}[metric]
+    with col2:
+        threshold = st.number_input(f"최소 기준 ({unit})", min_value=0.0, value=0.0,
+                                    step=10000.0 if metric == 'amount' else 1.0, key=f"review_threshold_{metric}")
+    with col3:
+        size = st.slider("표시 개수", min_value=10, max_value=queue.capacity, value=50, step=10, key="review_size")
+    
+    min_score = threshold / 100 if metric == 'ratio' else threshold
+    review_list = queue.top(size, min_score)
+    st.caption(f"기준 이상 {queue.count(min_score):,}개 중 상위 {len(review_list):,}개 (재고조정 반영 결과 기준)")
+    if not review_list.empty:
+        render_paged_table(review_list, "review_grid")
+    return review_list
+
+def render_history_comparison():
+    """이전 조사 대비 품목별 재고차이 (상습 부족 품목)"""
+    st.markdown("### 📈 기간별 재고차이 비교")
+    comparison = st.session_state.get('history_comparison')
+    surveys = st.session_state.get('history_surveys') or []
+    if comparison is None:
+        st.info("💡 같은 점포의 이전 조사 기록이 없습니다. 다음 조사부터 이번 조사와 비교합니다.")
+        return
+    
+    chronic = comparison['상습부족'] == 'Y'
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("비교 조사 수", f"{len(surveys)}회", help=f"{surveys[0]['survey_date']} ~ {surveys[-1]['survey_date']}")
+    with col2:
+        st.metric("상습 부족 품목", f"{int(chronic.sum()):,}개")
+    with col3:
+        st.metric("상습 부족 누적 차액", f"{int(comparison.loc[chronic, '누적차액'].sum()):,.0f}원")
+    render_paged_table(comparison, "history_grid")
+
+def show_survey_sidebar(processors):
+    """사이드바에 저장된 조사 목록 (이어하기/새 조사)"""
+    store = get_survey_store()
+    if store is None:
+        return
+    
+    with st.sidebar:
+        with st.expander("💾 저장된 조사"):
+            current_id = st.session_state.get('survey_id')
+            surveys = store.list_surveys()
+            if not surveys:
+                st.caption("PART 파일을 분석하면 조사가 자동으로 저장됩니다.")
+                return
+            
+            labels = {
+                survey['survey_id']: (
+                    f"{survey['name'] or '(이름 없음)'} · {survey['step']}단계 · "
+                    f"{datetime.fromtimestamp(survey['updated_at']).strftime('%m-%d %H:%M')}"
+                )
+                for survey in surveys
+            }
+            survey_ids = list(labels)
+            selected = st.selectbox(
+                "조사 선택",
+                survey_ids,
+                index=survey_ids.index(current_id) if current_id in labels else 0,
+                format_func=labels.get,
+                key="survey_select"
+            )
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button("📂 불러오기", key="survey_resume", disabled=selected == current_id):
+                    if resume_survey(selected, processors):
+                        st.rerun()
+                    st.error("❌ 조사를 불러오지 못했습니다.")
+            with col2:
+                if st.button("🆕 새 조사", key="survey_new"):
+                    for key in list(st.session_state.keys()):
+                        del st.session_state[key]
+                    set_survey_query_param(None)
+                    st.rerun()
+
+def poll_excel_report_job():
+    """
+    백그라운드 엑셀 보고서 작업 상태 표시
+    
+    Returns:
+        작업이 끝나 결과(또는 오류)를 세션에 반영했으면 True
+    """
+    job_manager = get_report_job_manager()
+    job = job_manager.get(st.session_state.get('excel_report_job_id'))
+    
+    if job is None:
+        # 서버 재시작 등으로 작업 정보가 사라진 경우
+        st.session_state.excel_report_job_id = None
+        st.session_state.excel_report_error = "보고서 생성 작업 정보를 찾을 수 없습니다. 다시 생성해주세요."
+        return True
+    
+    if job.status == 'done':
+        session_data().excel_report_data = job.result
+        st.session_state.excel_generation_time = datetime.fromtimestamp(job.finished_at).strftime("%Y%m%d_%H%M%S")
+        st.session_state.excel_report_job_id = None
+        job_manager.discard(job.job_id)
+        persist_survey(
+            blobs={'excel_report_data': job.result},
+            excel_generation_time=st.session_state.excel_generation_time
+        )
+        return True
+    
+    if job.status == 'error':
+        st.session_state.excel_report_error = job.error
+        st.session_state.excel_report_job_id = None
+        job_manager.discard(job.job_id)
+        return True
+    
+    if job.status == 'queued':
+        position_text = f" (대기 {job.queue_position}번째)" if job.queue_position else ""
+        st.progress(0.0, text=f"⏳ 보고서 생성 대기 중...{position_text}")
+    else:
+        task_text = f" ({job.current_task} 완료)" if job.current_task else ""
+        st.progress(job.progress, text=f"📊 엑셀 보고서 생성 중... {job.progress * 100:.0f}%{task_text}")
+    st.caption("생성 중에도 다른 탭을 계속 사용할 수 있습니다.")
+    return False
+
+def excel_report_job_panel():
+    """진행 중인 엑셀 보고서 작업 패널 (작업이 끝나면 전체 화면 갱신)"""
+    if poll_excel_report_job():
+        st.rerun()
+
+# fragment 지원 버전은 패널만 1초마다 다시 그림 (미지원 버전은 main() 끝에서 전체 화면 갱신)
+if _fragment is not None:
+    excel_report_job_panel = _fragment(run_every=1)(excel_report_job_panel)
+
 def create_processed_inventory_excel(processed_data):
     """처리된 실재고 데이터를 엑셀 파일로 변환"""
     try:
@@ -356,6 +1042,9 @@ def create_processed_inventory_excel(processed_data):
         
         with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
             # 처리된 데이터를 엑셀로 저장
+            # 내부용 숨김 컬럼(_로 시작)은 제외
+            visible_columns = [col for col in processed_data.columns if not str(col).startswith('_')]
+            processed_data = processed_data[visible_columns]
             processed_data.to_excel(writer, sheet_name='완성된실재고데이터', index=False)
             
             # 워크시트 스타일링
@@ -442,572 +1131,864 @@ def create_processed_inventory_excel(processed_data):
         st.error(f"엑셀 파일 생성 오류: {str(e)}")
         return None
 
-# 메인 함수
-def main():
-    st.title("📦 재고조사 앱")
-    st.markdown("---")
-    
-    # 사이드바 진행 단계 표시
-    show_progress_sidebar()
-    
-    # 캐시된 프로세서 가져오기
-    processors = get_processors()
-    
-    # 프로세서 초기화 확인
-    if processors is None:
-        st.error("⚠️ 시스템 초기화 실패. 페이지를 새로고침해주세요.")
-        st.stop()
-        return
+@tab_fragment('part')
+def render_part_tab(processors):
+    """PART 파일 업로드/분석 탭"""
+    st.header("📁 PART 파일 업로드")
+    st.write("PART로 시작하는 엑셀 파일을 업로드해주세요. (CSV, Parquet, Feather 형식도 지원)")
     
-    # 세션 상태 초기화
-    if 'step' not in st.session_state:
-        st.session_state.step = 1
-    if 'part_data' not in st.session_state:
-        st.session_state.part_data = None
-    if 'inventory_data' not in st.session_state:
-        st.session_state.inventory_data = None
-    if 'adjustment_data' not in st.session_state:
-        st.session_state.adjustment_data = None
-    if 'final_data' not in st.session_state:
-        st.session_state.final_data = None
-    if 'adjustment_summary' not in st.session_state:
-        st.session_state.adjustment_summary = None
-    # 엑셀 보고서 관련 세션 상태
-    if 'excel_report_data' not in st.session_state:
-        st.session_state.excel_report_data = None
-    if 'excel_generation_time' not in st.session_state:
-        st.session_state.excel_generation_time = None
-    # 점포 정보 세션 상태
-    if 'store_info' not in st.session_state:
-        st.session_state.store_info = None
+    uploaded_file = st.file_uploader(
+        "PART 파일 선택",
+        type=UPLOAD_TYPES,
+        key="part_file"
+    )
     
-    # 탭 생성
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "1️⃣ PART 파일", 
-        "2️⃣ 실재고 템플릿", 
-        "3️⃣ 실재고 입력", 
-        "4️⃣ 재고조정", 
-        "5️⃣ 결과보고서"
-    ])
-    
-    with tab1:
-        st.header("📁 PART 파일 업로드")
-        st.write("PART로 시작하는 엑셀 파일을 업로드해주세요.")
-        
-        uploaded_file = st.file_uploader(
-            "PART 파일 선택",
-            type=['xlsx', 'xls'],
-            key="part_file"
-        )
-        
-        if uploaded_file is not None:
-            try:
-                # 파일 자동 변환 처리
-                converted_file_path = ExcelFileConverter.process_uploaded_file(uploaded_file)
-                
-                if converted_file_path:
-                    st.success(f"✅ 파일 업로드 완료: {uploaded_file.name}")
-                    
-                    # 데이터 분석 버튼
-                    if st.button("📊 데이터 분석하기", type="primary"):
+    if uploaded_file is not None:
+        try:
+            st.success(f"✅ 파일 업로드 완료: {uploaded_file.name}")
+            
+            # 데이터 분석 버튼
+            if st.button("📊 데이터 분석하기", type="primary"):
+                # 임시 파일은 분석할 때만 만들고 끝나면 삭제 (재실행마다 업로드 사본이 쌓이지 않도록)
+                with ExcelFileConverter.temp_upload(uploaded_file) as converted_file_path:
+                    if converted_file_path is None:
+                        st.error("❌ 파일 처리 실패")
+                    else:
                         with st.spinner("📊 PART 파일을 분석 중입니다..."):
-                            success, message, data = processors['part_processor'].load_part_file(converted_file_path)
+                            # 이번 분석 전용 (공용 인스턴스에 세션의 PART 데이터/검사 결과가 남지 않도록)
+                            part_processor = PartDataProcessor()
+                            
+                            def load_part():
+                                # 공유 캐시에 없을 때만 스케줄러 차례를 기다려 분석
+                                with heavy_task('load_part_file', estimate_file_memory(converted_file_path)):
+                                    return part_processor.load_part_file(converted_file_path)
+                            
+                            success, message, data, validation = load_uploaded_file(
+                                'part_file', uploaded_file, load_part,
+                                lambda: part_processor.validation
+                            )
                             
                             if success:
-                                st.session_state.part_data = data
+                                session_data().part_data = data
+                                st.session_state.part_validation = validation
                                 st.session_state.step = 2
-                                st.success(message)
                                 
-                                # 임시 파일 정리
-                                ExcelFileConverter.cleanup_temp_file(converted_file_path)
+                                # 파일명의 내보내기 일시 (조사 시점 전산재고 재구성 기본값)
+                                export_time = export_time_from_filename(uploaded_file.name)
+                                st.session_state.part_export_time = export_time.isoformat() if export_time else None
+                                
+                                # 새 조사로 저장
+                                start_survey(uploaded_file.name)
+                                persist_survey(
+                                    frames={'part_data': data}, step=2,
+                                    part_export_time=st.session_state.part_export_time
+                                )
+                                mark_data_changed()
+                                st.success(message)
                                 st.rerun()
                             else:
                                 st.error(message)
-                                # 임시 파일 정리
-                                ExcelFileConverter.cleanup_temp_file(converted_file_path)
-                else:
-                    st.error("❌ 파일 처리 실패")
-                            
-            except Exception as e:
-                st.error(f"❌ 파일 업로드 오류: {str(e)}")
         
-        # 분석 결과 표시
-        if st.session_state.part_data is not None:
-            st.markdown("### 📊 분석 결과")
+        except Exception as e:
+            st.error(f"❌ 파일 업로드 오류: {str(e)}")
+    
+    # 분석 결과 표시
+    if session_data().part_data is not None:
+        st.markdown("### 📊 분석 결과")
+        
+        # 요약 통계 (안전한 접근, 세션 간 공유 프로세서가 아닌 이 세션의 PART 데이터 기준)
+        try:
+            stats = processors['part_processor'].get_summary_stats(session_data().part_data)
             
-            # 요약 통계 (안전한 접근)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("총 품목 수", f"{stats.get('total_items', 0):,}개")
+                st.metric("재고 없는 품목", f"{stats.get('zero_stock_items', 0):,}개")
+            with col2:
+                st.metric("총 재고량", f"{stats.get('total_stock', 0):,.0f}")
+                st.metric("평균 단가", f"{stats.get('avg_unit_price', 0):,.0f}원")
+            with col3:
+                st.metric("총 재고액", f"{stats.get('total_stock_value', 0):,.0f}원")
+                st.metric("재고액 없는 품목", f"{stats.get('zero_value_items', 0):,}개")
+        except Exception as e:
+            st.error(f"통계 계산 오류: {str(e)}")
+            # 기본값으로 표시
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("총 품목 수", "0개")
+                st.metric("재고 없는 품목", "0개")
+            with col2:
+                st.metric("총 재고량", "0")
+                st.metric("평균 단가", "0원")
+            with col3:
+                st.metric("총 재고액", "0원")
+                st.metric("재고액 없는 품목", "0개")
+        
+        # 원본 데이터 품질 검사 결과 (품번 없는 행은 분석에서 제외됨)
+        render_validation_result(st.session_state.get('part_validation'), "part_issue_grid")
+        
+        # 전체 데이터 조회 (페이지 단위)
+        st.markdown("### 📋 데이터 조회")
+        render_paged_table(session_data().part_data, "part_grid", source='part_data')
+
+@tab_fragment('template')
+def render_template_tab(processors):
+    """실재고 입력 템플릿 탭"""
+    st.header("📋 실재고 입력 템플릿")
+    if st.session_state.step >= 2 and session_data().part_data is not None:
+        st.write("PART 파일 분석이 완료되었습니다. 실재고 입력용 템플릿을 다운로드하세요.")
+        
+        # 조별 분할 (부품명 순 연속 구간을 조마다 시트 하나씩, 품목 수 또는 재고액 균등)
+        col1, col2 = st.columns(2)
+        with col1:
+            parts = st.number_input("조사 조 수", min_value=1, max_value=MAX_SPLIT_PARTS, value=1, step=1,
+                                    key="template_parts", help="2 이상이면 조별 시트로 나눈 템플릿을 만듭니다.")
+        with col2:
+            balance = st.radio("나누는 기준", list(SPLIT_BALANCES), format_func=SPLIT_BALANCES.get,
+                               horizontal=True, key="template_balance", disabled=parts < 2)
+        
+        # 템플릿 생성 (같은 PART 데이터의 템플릿은 캐시된 엑셀 바이트 재사용)
+        if st.button("📥 템플릿 생성", type="primary"):
             try:
-                stats = processors['part_processor'].get_summary_stats()
+                get_template_cache().get_or_create(
+                    get_part_fingerprint(),
+                    session_data().part_data,
+                    processors['part_processor'],
+                    parts, balance
+                )
+                st.session_state.template_fingerprint = get_part_fingerprint()
+                st.session_state.template_options = (parts, balance)
+                if st.session_state.step != 3:
+                    st.session_state.step = 3
+                    mark_data_changed()
+            except Exception as e:
+                st.error(f"❌ 템플릿 생성 오류: {str(e)}")
+        
+        # 생성된 템플릿 다운로드 (탭을 다시 실행해도 유지, 조 수/기준은 버튼을 눌렀을 때 값 사용)
+        if st.session_state.get('template_fingerprint') == get_part_fingerprint():
+            try:
+                built_parts, built_balance = st.session_state.get('template_options', (1, 'lines'))
+                template_entry = get_template_cache().get_or_create(
+                    get_part_fingerprint(),
+                    session_data().part_data,
+                    processors['part_processor'],
+                    built_parts, built_balance
+                )
+                split = template_entry.get('split')
                 
-                col1, col2, col3 = st.columns(3)
+                st.success("✅ 템플릿이 생성되었습니다!")
+                if (parts, balance) != (built_parts, built_balance) and (parts > 1 or built_parts > 1):
+                    st.info("💡 조 수/나누는 기준이 바뀌었습니다. 바꾼 설정으로 받으려면 '📥 템플릿 생성'을 다시 눌러주세요.")
+                
+                # 파일 다운로드 버튼
+                st.download_button(
+                    label="📥 템플릿 다운로드",
+                    data=template_entry['excel'],
+                    file_name=f"실재고입력템플릿_{len(split)}조.xlsx" if split is not None else "실재고입력템플릿.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+                
+                # 조별 담당 구간
+                if split is not None:
+                    st.markdown("### 👥 조별 담당 구간")
+                    st.dataframe(split, use_container_width=True, hide_index=True)
+                
+                # 템플릿 미리보기
+                st.markdown("### 📋 템플릿 미리보기")
+                st.dataframe(template_entry['preview'], use_container_width=True)
+                
+                # 템플릿 정보 표시
+                col1, col2 = st.columns(2)
                 with col1:
-                    st.metric("총 품목 수", f"{stats.get('total_items', 0):,}개")
-                    st.metric("재고 없는 품목", f"{stats.get('zero_stock_items', 0):,}개")
+                    st.metric("템플릿 품목 수", f"{template_entry['item_count']:,}개")
                 with col2:
-                    st.metric("총 재고량", f"{stats.get('total_stock', 0):,.0f}")
-                    st.metric("평균 단가", f"{stats.get('avg_unit_price', 0):,.0f}원")
-                with col3:
-                    st.metric("총 재고액", f"{stats.get('total_stock_value', 0):,.0f}원")
-                    st.metric("재고액 없는 품목", f"{stats.get('zero_value_items', 0):,}개")
+                    excluded_count = len(session_data().part_data) - template_entry['item_count']
+                    st.metric("제외된 품목 수", f"{excluded_count:,}개 (재고 없음)")
+                
+                # 사용 안내
+                st.markdown("### 📝 사용 안내")
+                st.info("""
+                **실재고 입력 방법:**
+                - **실재고** 컬럼에 실제 재고량을 입력하거나
+                - **차이** 컬럼에 차이값을 입력하세요 (예: -5, +10)
+                - 둘 다 입력된 경우 **차이값이 우선**됩니다
+                - 입력하지 않은 품목은 기존 재고로 유지됩니다
+                - **재고가 없는 품목은 템플릿에서 제외**되었습니다
+                - 조별로 나눈 템플릿은 각 조가 자기 시트에 입력한 뒤 **시트를 합치지 말고 그대로** 업로드하세요
+                """)
+                
             except Exception as e:
-                st.error(f"통계 계산 오류: {str(e)}")
-                # 기본값으로 표시
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("총 품목 수", "0개")
-                    st.metric("재고 없는 품목", "0개")
-                with col2:
-                    st.metric("총 재고량", "0")
-                    st.metric("평균 단가", "0원")
-                with col3:
-                    st.metric("총 재고액", "0원")
-                    st.metric("재고액 없는 품목", "0개")
-            
-            # 데이터 미리보기
-            st.markdown("### 📋 데이터 미리보기")
-            st.dataframe(
-                st.session_state.part_data.head(10),
-                use_container_width=True
-            )
+                st.error(f"❌ 템플릿 생성 오류: {str(e)}")
+    else:
+        st.warning("⚠️ 먼저 PART 파일을 업로드하고 분석해주세요.")
+
+def align_count_sheet(inventory_df, template_meta, processors):
+    """
+    앱에서 만든 템플릿이면 숨김 행 키로 PART 데이터에 맞춰 정렬
     
-    with tab2:
-        st.header("📋 실재고 입력 템플릿")
-        if st.session_state.step >= 2 and st.session_state.part_data is not None:
-            st.write("PART 파일 분석이 완료되었습니다. 실재고 입력용 템플릿을 다운로드하세요.")
-            
-            # 템플릿 생성 및 다운로드
-            if st.button("📥 템플릿 생성", type="primary"):
-                try:
-                    template = processors['part_processor'].create_inventory_template()
-                    
-                    # 메모리에서 엑셀 파일 생성 (웹 배포 호환)
-                    from io import BytesIO
-                    buffer = BytesIO()
-                    template.to_excel(buffer, index=False, engine='openpyxl')
-                    buffer.seek(0)
-                    
-                    st.success("✅ 템플릿이 생성되었습니다!")
-                    
-                    # 파일 다운로드 버튼
-                    st.download_button(
-                        label="📥 템플릿 다운로드",
-                        data=buffer.getvalue(),
-                        file_name="실재고입력템플릿.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                    )
-                    
-                    # 템플릿 미리보기
-                    st.markdown("### 📋 템플릿 미리보기")
-                    st.dataframe(template.head(10), use_container_width=True)
-                    
-                    # 템플릿 정보 표시
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.metric("템플릿 품목 수", f"{len(template):,}개")
-                    with col2:
-                        excluded_count = len(st.session_state.part_data) - len(template)
-                        st.metric("제외된 품목 수", f"{excluded_count:,}개 (재고 없음)")
-                    
-                    # 사용 안내
-                    st.markdown("### 📝 사용 안내")
-                    st.info("""
-                    **실재고 입력 방법:**
-                    - **실재고** 컬럼에 실제 재고량을 입력하거나
-                    - **차이** 컬럼에 차이값을 입력하세요 (예: -5, +10)
-                    - 둘 다 입력된 경우 **차이값이 우선**됩니다
-                    - 입력하지 않은 품목은 기존 재고로 유지됩니다
-                    - **재고가 없는 품목은 템플릿에서 제외**되었습니다
-                    """)
-                    
-                    st.session_state.step = 3
-                    
-                except Exception as e:
-                    st.error(f"❌ 템플릿 생성 오류: {str(e)}")
+    Returns:
+        (정렬된 데이터 (행 키 컬럼 제외), 정렬 결과 또는 None)
+    """
+    alignment = None
+    part_data = session_data().part_data
+    if template_meta and ROW_KEY_COLUMN in inventory_df.columns and part_data is not None:
+        fingerprint = get_part_fingerprint()
+        if template_meta.get('part_fingerprint') == fingerprint:
+            with perf_monitor.stage('align_count_sheet', rows=len(inventory_df)):
+                row_keys = get_template_cache().get_row_keys(fingerprint, part_data, processors['part_processor'])
+                inventory_df, alignment = align_to_template(inventory_df, part_data, row_keys)
         else:
-            st.warning("⚠️ 먼저 PART 파일을 업로드하고 분석해주세요.")
+            st.warning("⚠️ 현재 PART 파일이 아닌 다른 PART 파일로 만든 템플릿입니다. 업로드된 값을 그대로 사용합니다.")
+    return inventory_df.drop(columns=[ROW_KEY_COLUMN], errors='ignore'), alignment
+
+def load_count_upload(file_path, processors):
+    """
+    실재고 파일을 한 번에 읽어 검사/정렬/계산
     
-    with tab3:
-        st.header("📝 실재고 데이터 입력")
-        if st.session_state.step >= 3:
-            st.write("작성된 실재고 데이터를 업로드해주세요.")
-            
-            uploaded_inventory = st.file_uploader(
-                "실재고 파일 선택",
-                type=['xlsx', 'xls'],
-                key="inventory_file"
-            )
+    Returns:
+        (성공여부, 메시지, 계산된 데이터, 템플릿 정렬 결과, 데이터 품질 검사 결과)
+    """
+    with perf_monitor.stage('read_count_sheet') as record:
+        inventory_df, template_meta, sheets = read_count_sheet(file_path)
+        record['rows'] = len(inventory_df)
+    
+    # 숫자 변환 전 원본 값으로 데이터 품질 검사 (템플릿 정렬 전, 업로드한 시트의 행 번호 기준)
+    validation = None
+    if '제작사 품번' in inventory_df.columns:
+        validation = validate_count_sheet(inventory_df, session_data().part_data, sheets=sheets)
+    
+    inventory_df, alignment = align_count_sheet(inventory_df, template_meta, processors)
+    
+    # 데이터 검증 및 계산
+    success, message, processed_data = processors['part_processor'].validate_inventory_data(inventory_df)
+    return success, message, processed_data, alignment, validation
+
+def stream_count_upload(file_path, processors):
+    """
+    대용량 실재고 파일을 행 묶음 단위로 검사/계산 (메모리 사용량이 행 묶음 크기에 비례)
+    
+    읽는 동안 처리한 행 수와 증가/감소 금액 누적 합계를 표시합니다.
+    
+    Returns:
+        (성공여부, 메시지, 계산된 데이터, 템플릿 정렬 결과, 데이터 품질 검사 결과)
+    """
+    part_data = session_data().part_data
+    progress_bar = st.progress(0.0, text="실재고 파일 읽는 중...")
+    totals_text = st.empty()
+    
+    def show_progress(rows, total_rows, totals):
+        if total_rows:
+            progress_bar.progress(min(rows / total_rows, 1.0), text=f"실재고 파일 읽는 중... {rows:,} / 약 {total_rows:,}행")
+        else:
+            progress_bar.progress(0.0, text=f"실재고 파일 읽는 중... {rows:,}행")
+        totals_text.caption(
+            f"증가 {totals.increased_rows:,}개 품목 (+{totals.positive_amount:,}원) · "
+            f"감소 {totals.decreased_rows:,}개 품목 (-{totals.negative_amount:,}원) · "
+            f"차액 {totals.positive_amount - totals.negative_amount:,}원"
+        )
+    
+    # 행 묶음 결과는 임시 폴더에 Arrow 파일로 저장했다가 합침
+    out_dir = tempfile.mkdtemp(prefix='count_stream_')
+    try:
+        success, message, processed_data, info = stream_count_sheet(
+            file_path, processors['part_processor'], out_dir,
+            part_data=part_data,
+            part_fingerprint=get_part_fingerprint() if part_data is not None else None,
+            progress_callback=show_progress
+        )
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    progress_bar.empty()
+    if not success:
+        return False, message, None, None, None
+    
+    alignment = None
+    if info['needs_alignment']:
+        # 템플릿 순서/PART 값 복구 후 다시 계산
+        processed_data, alignment = align_count_sheet(processed_data, info['template_meta'], processors)
+        success, message, processed_data = processors['part_processor'].validate_inventory_data(processed_data)
+    elif info['template_meta'] and part_data is not None:
+        st.warning("⚠️ 현재 PART 파일이 아닌 다른 PART 파일로 만든 템플릿입니다. 업로드된 값을 그대로 사용합니다.")
+    return success, message, processed_data, alignment, info['validation']
+
+@tab_fragment('count')
+def render_count_tab(processors):
+    """실재고 입력 탭"""
+    st.header("📝 실재고 데이터 입력")
+    if st.session_state.step >= 3:
+        st.write("작성된 실재고 데이터를 업로드해주세요.")
+        
+        uploaded_inventory = st.file_uploader(
+            "실재고 파일 선택",
+            type=UPLOAD_TYPES,
+            key="inventory_file"
+        )
+        
+        if uploaded_inventory is not None:
+            upload_signature = uploaded_file_signature(uploaded_inventory)
             
-            if uploaded_inventory is not None:
+            # 새 파일이 업로드된 경우에만 읽기/계산 수행 (페이지 이동 등 재실행 시 재처리 방지)
+            if st.session_state.get('inventory_upload_signature') != upload_signature:
                 try:
-                    # 파일 자동 변환 처리
-                    converted_file_path = ExcelFileConverter.process_uploaded_file(uploaded_inventory)
-                    
-                    if converted_file_path:
-                        # 파일 읽기
-                        inventory_df = pd.read_excel(converted_file_path, engine='openpyxl')
-                        
-                        # 데이터 검증 및 계산
-                        success, message, processed_data = processors['part_processor'].validate_inventory_data(inventory_df)
-                        
-                        if success:
-                            st.session_state.inventory_data = processed_data
-                            st.session_state.step = 4
-                            st.success(message)
-                            
-                            # 처리 결과 미리보기
-                            st.markdown("### 📊 처리 결과")
-                            
-                            # 요약 통계
-                            total_items = len(processed_data)
-                            changed_items = len(processed_data[processed_data['차이'] != 0])
-                            
-                            # 품목 개수 기준으로 계산
-                            increased_items = len(processed_data[processed_data['차이'] > 0])
-                            decreased_items = len(processed_data[processed_data['차이'] < 0])
-                            
-                            total_diff_value = processed_data['차액'].sum()
-                            
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("총 품목 수", f"{total_items:,}개")
-                                st.metric("변경된 품목", f"{changed_items:,}개")
-                            with col2:
-                                st.metric("증가 품목", f"{increased_items:,}개")
-                                st.metric("감소 품목", f"{decreased_items:,}개")
-                            with col3:
-                                st.metric("총 차액", f"{total_diff_value:,.0f}원")
-                            
-                            # 데이터 미리보기
-                            st.markdown("### 📋 데이터 미리보기")
-                            st.dataframe(processed_data.head(10), use_container_width=True)
-                            
-                            # 처리된 데이터 다운로드 기능 추가
-                            st.markdown("### 📥 완성된 실재고 파일 다운로드")
-                            st.write("계산이 완료된 실재고 데이터를 엑셀 파일로 다운로드할 수 있습니다.")
-                            
-                            # 엑셀 파일 생성
-                            excel_data = create_processed_inventory_excel(processed_data)
-                            if excel_data:
-                                st.download_button(
-                                    label="📊 완성된 실재고 파일 다운로드",
-                                    data=excel_data,
-                                    file_name=f"완성된_실재고데이터_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
-                                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                    type="primary",
-                                    help="처리가 완료된 실재고 데이터를 엑셀 파일로 다운로드합니다."
-                                )
-                                st.success("✅ 엑셀 파일이 준비되었습니다. 위 버튼을 클릭하여 다운로드하세요.")
+                    # 파일 자동 변환 처리 (임시 파일은 with 블록이 끝나면 삭제)
+                    with ExcelFileConverter.temp_upload(uploaded_inventory) as converted_file_path:
+                        if converted_file_path:
+                            if uploaded_inventory.size >= COUNT_STREAM_MIN_BYTES:
+                                # 대용량 파일은 행 묶음 단위로 검사/계산 (진행 중 누적 합계 표시)
+                                # 메모리는 행 묶음 크기와 합친 결과 데이터프레임(PART 크기 정도)에 비례
+                                with heavy_task('stream_count_sheet', estimate_nbytes(session_data().part_data) * 3):
+                                    success, message, processed_data, alignment, validation = stream_count_upload(
+                                        converted_file_path, processors
+                                    )
                             else:
-                                st.error("❌ 엑셀 파일 생성에 실패했습니다.")
+                                with heavy_task('validate_inventory_data', estimate_file_memory(converted_file_path)):
+                                    success, message, processed_data, alignment, validation = load_count_upload(
+                                        converted_file_path, processors
+                                    )
                             
+                            if success:
+                                session_data().inventory_data = processed_data
+                                st.session_state.inventory_upload_signature = upload_signature
+                                session_data().processed_inventory_excel = None
+                                st.session_state.inventory_alignment = alignment
+                                st.session_state.inventory_validation = validation
+                                st.session_state.step = 4
+                                st.session_state.inventory_load_message = message
+                                persist_survey(frames={'inventory_data': processed_data}, step=4)
+                                mark_data_changed()
+                            else:
+                                st.error(message)
                         else:
-                            st.error(message)
-                        
-                        # 임시 파일 정리
-                        ExcelFileConverter.cleanup_temp_file(converted_file_path)
-                    else:
-                        st.error("❌ 파일 처리 실패")
+                            st.error("❌ 파일 처리 실패")
                         
                 except Exception as e:
                     st.error(f"❌ 파일 처리 오류: {str(e)}")
-        else:
-            st.warning("⚠️ 먼저 이전 단계를 완료해주세요.")
+            
+            processed_data = session_data().inventory_data
+            if processed_data is not None and st.session_state.get('inventory_upload_signature') == upload_signature:
+                if st.session_state.get('inventory_load_message'):
+                    st.success(st.session_state.inventory_load_message)
+                
+                # 템플릿 행 키 정렬 결과
+                alignment = st.session_state.get('inventory_alignment')
+                if alignment:
+                    notes = []
+                    if alignment['reordered']:
+                        notes.append("행 순서 변경 → 템플릿 순서로 복원")
+                    if alignment['repaired_rows']:
+                        notes.append(f"품번/부품명/재고 등 수정된 {alignment['repaired_rows']:,}개 행 → PART 원본 값으로 복구")
+                    if alignment['restored_rows']:
+                        notes.append(f"삭제된 {alignment['restored_rows']:,}개 행 → 기존 재고로 복원")
+                    if alignment['rematched_rows']:
+                        notes.append(f"행 키가 없는 {alignment['rematched_rows']:,}개 행 → 품번으로 매칭")
+                    if alignment['extra_rows']:
+                        notes.append(f"템플릿에 없는 {alignment['extra_rows']:,}개 행 → 업로드 값 그대로 사용")
+                    if notes:
+                        st.warning("🔑 템플릿 검사 결과\n" + "\n".join(f"- {note}" for note in notes))
+                    else:
+                        st.info(f"🔑 템플릿 행 키로 {alignment['matched_rows']:,}개 행을 확인했습니다. (수정된 PART 정보 없음)")
+                
+                # 데이터 품질 검사 결과
+                render_validation_result(st.session_state.get('inventory_validation'), "inventory_issue_grid")
+                
+                # 처리 결과 미리보기
+                st.markdown("### 📊 처리 결과")
+                
+                # 요약 통계
+                total_items = len(processed_data)
+                changed_items = len(processed_data[processed_data['차이'] != 0])
+                
+                # 품목 개수 기준으로 계산
+                increased_items = len(processed_data[processed_data['차이'] > 0])
+                decreased_items = len(processed_data[processed_data['차이'] < 0])
+                
+                total_diff_value = processed_data['차액'].sum()
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("총 품목 수", f"{total_items:,}개")
+                    st.metric("변경된 품목", f"{changed_items:,}개")
+                with col2:
+                    st.metric("증가 품목", f"{increased_items:,}개")
+                    st.metric("감소 품목", f"{decreased_items:,}개")
+                with col3:
+                    st.metric("총 차액", f"{total_diff_value:,.0f}원")
+                
+                # 전체 데이터 조회 (페이지 단위)
+                st.markdown("### 📋 데이터 조회")
+                list_type = st.radio(
+                    "조회 목록",
+                    ["전체재고리스트", "재고차이리스트(-)", "재고차이리스트(+)"],
+                    horizontal=True,
+                    key="inventory_list_type"
+                )
+                if list_type == "재고차이리스트(-)":
+                    render_paged_table(processed_data, "inventory_negative_grid", source='inventory_data',
+                                       positions=lambda df: (df['차이'] < 0).to_numpy().nonzero()[0])
+                elif list_type == "재고차이리스트(+)":
+                    render_paged_table(processed_data, "inventory_positive_grid", source='inventory_data',
+                                       positions=lambda df: (df['차이'] > 0).to_numpy().nonzero()[0])
+                else:
+                    render_paged_table(processed_data, "inventory_grid", source='inventory_data')
+                
+                # 처리된 데이터 다운로드 기능 추가
+                st.markdown("### 📥 완성된 실재고 파일 다운로드")
+                st.write("계산이 완료된 실재고 데이터를 엑셀 파일로 다운로드할 수 있습니다.")
+                
+                # 엑셀 파일 생성 (업로드 파일당 1회)
+                if session_data().get('processed_inventory_excel') is None:
+                    session_data().processed_inventory_excel = create_processed_inventory_excel(processed_data)
+                excel_data = session_data().processed_inventory_excel
+                if excel_data:
+                    st.download_button(
+                        label="📊 완성된 실재고 파일 다운로드",
+                        data=excel_data,
+                        file_name=f"완성된_실재고데이터_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx",
+                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                        type="primary",
+                        help="처리가 완료된 실재고 데이터를 엑셀 파일로 다운로드합니다."
+                    )
+                    st.success("✅ 엑셀 파일이 준비되었습니다. 위 버튼을 클릭하여 다운로드하세요.")
+                else:
+                    st.error("❌ 엑셀 파일 생성에 실패했습니다.")
+    else:
+        st.warning("⚠️ 먼저 이전 단계를 완료해주세요.")
+
+@tab_fragment('adjustment')
+def render_adjustment_tab(processors):
+    """재고조정 탭"""
+    st.header("⚖️ 재고조정 적용")
+    adjustment_processor = get_adjustment_processor()
+    st.write("재고조정 파일을 업로드하고 기간을 설정하여 적용할 수 있습니다. (선택사항)")
     
-    with tab4:
-        st.header("⚖️ 재고조정 적용")
-        st.write("재고조정 파일을 업로드하고 기간을 설정하여 적용할 수 있습니다. (선택사항)")
-        
-        # 재고조정 파일 업로드
-        uploaded_adjustment = st.file_uploader(
-            "재고조정 파일 선택",
-            type=['xlsx', 'xls'],
-            key="adjustment_file"
-        )
-        
-        if uploaded_adjustment is not None:
-            try:
-                # 파일 자동 변환 처리
-                converted_file_path = ExcelFileConverter.process_uploaded_file(uploaded_adjustment)
+    # 재고조정 파일 업로드
+    uploaded_adjustment = st.file_uploader(
+        "재고조정 파일 선택",
+        type=UPLOAD_TYPES,
+        key="adjustment_file"
+    )
+    
+    if uploaded_adjustment is not None:
+        try:
+            upload_signature = uploaded_file_signature(uploaded_adjustment)
+            reuse_loaded = (
+                st.session_state.get('adjustment_upload_signature') == upload_signature
+                and session_data().adjustment_data is not None
+            )
+            
+            # 재고조정 파일 로드 (같은 파일은 이전 로드 결과 재사용, 임시 파일은 읽는 동안만 두고 삭제)
+            loaded = reuse_loaded
+            if reuse_loaded:
+                adj_data = session_data().adjustment_data
+                success, message = True, st.session_state.adjustment_load_message
+                adjustment_processor.data = adj_data
+            else:
+                with ExcelFileConverter.temp_upload(uploaded_adjustment) as converted_file_path:
+                    loaded = converted_file_path is not None
+                    if loaded:
+                        success, message, adj_data, _ = load_uploaded_file(
+                            'adjustment_file', uploaded_adjustment,
+                            lambda: adjustment_processor.load_adjustment_file(converted_file_path)
+                        )
+                        if success:
+                            adjustment_processor.data = adj_data
+            
+            if loaded:
+                st.success(f"✅ 파일 업로드 완료: {uploaded_adjustment.name}")
                 
-                if converted_file_path:
-                    st.success(f"✅ 파일 업로드 완료: {uploaded_adjustment.name}")
+                if success:
+                    session_data().adjustment_data = adj_data
+                    st.session_state.adjustment_upload_signature = upload_signature
+                    st.session_state.adjustment_load_message = message
+                    if not reuse_loaded:
+                        persist_survey(frames={'adjustment_data': adj_data})
+                        mark_data_changed()
+                    st.success(message)
+                    
+                    # 전체 데이터 조회 (페이지 단위)
+                    st.markdown("### 📋 재고조정 데이터 조회")
+                    render_paged_table(adj_data, "adjustment_grid", source='adjustment_data')
                     
-                    # 재고조정 파일 로드
-                    success, message, adj_data = processors['adjustment_processor'].load_adjustment_file(converted_file_path)
+                    # 날짜 범위 설정
+                    st.markdown("### 📅 적용 기간 설정")
                     
-                    if success:
-                        st.session_state.adjustment_data = adj_data
-                        st.success(message)
+                    # 기본값 설정 - 실용적인 기본값
+                    today = date.today()
+                    # 6개월 전 계산 (그 달에 없는 날이면 말일, 예: 8월 31일 → 2월 28일)
+                    if today.month > 6:
+                        start_year, start_month = today.year, today.month - 6
+                    else:
+                        start_year, start_month = today.year - 1, today.month + 6
+                    default_start_date = date(
+                        start_year, start_month, min(today.day, calendar.monthrange(start_year, start_month)[1])
+                    )
+                    
+                    # 폼으로 모든 날짜 입력과 적용 버튼을 함께 처리
+                    with st.form("adjustment_form"):
+                        st.markdown("**📌 기간 설정 가이드:** 기본적으로 최근 6개월 기간이 설정됩니다. 필요에 따라 조정하세요.")
                         
-                        # 데이터 미리보기
-                        st.markdown("### 📋 재고조정 데이터 미리보기")
-                        st.dataframe(adj_data.head(10), use_container_width=True)
+                        col1, col2 = st.columns(2)
                         
-                        # 날짜 범위 설정
-                        st.markdown("### 📅 적용 기간 설정")
+                        with col1:
+                            start_date = st.date_input(
+                                "📅 시작일",
+                                value=default_start_date,
+                                min_value=date(2010, 1, 1),
+                                max_value=date(2030, 12, 31),
+                                key="adjustment_start_date_form"
+                            )
                         
-                        # 기본값 설정 - 실용적인 기본값
-                        today = date.today()
-                        # 6개월 전 계산
-                        if today.month > 6:
-                            default_start_date = date(today.year, today.month - 6, today.day)
-                        else:
-                            default_start_date = date(today.year - 1, today.month + 6, today.day)
+                        with col2:
+                            end_date = st.date_input(
+                                "🗓️ 종료일",
+                                value=today,
+                                min_value=date(2010, 1, 1),
+                                max_value=date(2030, 12, 31),
+                                key="adjustment_end_date_form"
+                            )
                         
-                        # 폼으로 모든 날짜 입력과 적용 버튼을 함께 처리
-                        with st.form("adjustment_form"):
-                            st.markdown("**📌 기간 설정 가이드:** 기본적으로 최근 6개월 기간이 설정됩니다. 필요에 따라 조정하세요.")
-                            
-                            col1, col2 = st.columns(2)
-                            
-                            with col1:
-                                start_date = st.date_input(
-                                    "📅 시작일",
-                                    value=default_start_date,
-                                    min_value=date(2010, 1, 1),
-                                    max_value=date(2030, 12, 31),
-                                    key="adjustment_start_date_form"
-                                )
-                            
-                            with col2:
-                                end_date = st.date_input(
-                                    "🗓️ 종료일",
-                                    value=today,
-                                    min_value=date(2010, 1, 1),
-                                    max_value=date(2030, 12, 31),
-                                    key="adjustment_end_date_form"
-                                )
-                            
-                            # 선택된 기간 표시
-                            if start_date <= end_date:
-                                days_diff = (end_date - start_date).days + 1
-                                st.info(f"📊 **선택된 기간:** {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')} ({days_diff:,}일)")
-                            else:
-                                st.error("⚠️ 시작일이 종료일보다 늦을 수 없습니다.")
-                            
-                            # 재고조정 적용 버튼
-                            apply_adjustment = st.form_submit_button("⚖️ 재고조정 적용", type="primary")
+                        # 선택된 기간 표시
+                        if start_date <= end_date:
+                            days_diff = (end_date - start_date).days + 1
+                            st.info(f"📊 **선택된 기간:** {start_date.strftime('%Y-%m-%d')} ~ {end_date.strftime('%Y-%m-%d')} ({days_diff:,}일)")
+                        else:
+                            st.error("⚠️ 시작일이 종료일보다 늦을 수 없습니다.")
                         
-                        if apply_adjustment:
-                            if start_date <= end_date:
-                                with st.spinner("⚖️ 재고조정을 적용 중입니다..."):
-                                    # 날짜 범위로 필터링
-                                    filter_success, filter_message, filtered_data = processors['adjustment_processor'].filter_by_date_range(start_date, end_date)
+                        # 재고조정 적용 버튼
+                        apply_adjustment = st.form_submit_button("⚖️ 재고조정 적용", type="primary")
+                    
+                    if apply_adjustment:
+                        if start_date <= end_date:
+                            with st.spinner("⚖️ 재고조정을 적용 중입니다..."):
+                                # 날짜 범위로 필터링
+                                filter_success, filter_message, filtered_data = adjustment_processor.filter_by_date_range(start_date, end_date)
+                                
+                                if filter_success:
+                                    session_data().adjustment_filtered = filtered_data
+                                
+                                if filter_success and session_data().inventory_data is not None:
+                                    # 실재고 데이터에 재고조정 적용
+                                    apply_success, apply_message, final_data, adj_summary = adjustment_processor.apply_adjustments_to_inventory(
+                                        session_data().inventory_data, session_data().part_data
+                                    )
                                     
-                                    if filter_success and st.session_state.inventory_data is not None:
-                                        # 실재고 데이터에 재고조정 적용
-                                        apply_success, apply_message, final_data, adj_summary = processors['adjustment_processor'].apply_adjustments_to_inventory(
-                                            st.session_state.inventory_data, st.session_state.part_data
+                                    if apply_success:
+                                        session_data().final_data = final_data
+                                        st.session_state.adjustment_summary = adj_summary
+                                        st.session_state.step = max(st.session_state.step, 4)
+                                        persist_survey(
+                                            frames={'final_data': final_data, 'adjustment_filtered': filtered_data},
+                                            adjustment_summary=adj_summary,
+                                            step=st.session_state.step
                                         )
+                                        mark_data_changed()
+                                        st.success(apply_message)
+                                        
+                                        # 적용 결과 표시
+                                        st.markdown("### 📊 재고조정 적용 결과")
+                                        
+                                        col1, col2, col3, col4 = st.columns(4)
+                                        with col1:
+                                            st.metric("필터된 조정 건수", f"{len(filtered_data):,}건")
+                                        with col2:
+                                            st.metric("매칭된 조정 건수", f"{adj_summary.get('total_adjustments', 0):,}건")
+                                        with col3:
+                                            positive_amt = adj_summary.get('positive_amount', 0)
+                                            st.metric("(+) 조정액", f"{positive_amt:,.0f}원")
+                                        with col4:
+                                            negative_amt = abs(adj_summary.get('negative_amount', 0))
+                                            st.metric("(-) 조정액", f"{negative_amt:,.0f}원")
                                         
-                                        if apply_success:
-                                            st.session_state.final_data = final_data
-                                            st.session_state.adjustment_summary = adj_summary
-                                            st.session_state.step = max(st.session_state.step, 4)
-                                            st.success(apply_message)
-                                            
-                                            # 적용 결과 표시
-                                            st.markdown("### 📊 재고조정 적용 결과")
-                                            
-                                            col1, col2, col3, col4 = st.columns(4)
-                                            with col1:
-                                                st.metric("필터된 조정 건수", f"{len(filtered_data):,}건")
-                                            with col2:
-                                                st.metric("매칭된 조정 건수", f"{adj_summary.get('total_adjustments', 0):,}건")
-                                            with col3:
-                                                positive_amt = adj_summary.get('positive_amount', 0)
-                                                st.metric("(+) 조정액", f"{positive_amt:,.0f}원")
-                                            with col4:
-                                                negative_amt = abs(adj_summary.get('negative_amount', 0))
-                                                st.metric("(-) 조정액", f"{negative_amt:,.0f}원")
-                                            
-                                            # 미매칭 품목이 있으면 경고 표시
-                                            unmatched_items = adj_summary.get('unmatched_items', [])
-                                            if unmatched_items:
-                                                st.warning(f"⚠️ {len(unmatched_items)}개 품목이 실재고 데이터와 매칭되지 않았습니다.")
-                                                
-                                                # 미매칭 품목 상세 정보 (접기/펼치기)
-                                                with st.expander("미매칭 품목 상세"):
-                                                    unmatched_df = pd.DataFrame(unmatched_items)
-                                                    st.dataframe(unmatched_df, use_container_width=True)
-                                            
-                                            st.rerun()
-                                        else:
-                                            st.error(apply_message)
-                                    elif not filter_success:
-                                        st.error(filter_message)
+                                        st.rerun()
                                     else:
-                                        st.warning("⚠️ 먼저 실재고 데이터를 입력해주세요.")
-                            else:
-                                st.error("❌ 시작일이 종료일보다 늦을 수 없습니다.")
-                    else:
-                        st.error(message)
-                    
-                    # 임시 파일 정리
-                    ExcelFileConverter.cleanup_temp_file(converted_file_path)
+                                        st.error(apply_message)
+                                elif not filter_success:
+                                    st.error(filter_message)
+                                else:
+                                    st.warning("⚠️ 먼저 실재고 데이터를 입력해주세요.")
+                        else:
+                            st.error("❌ 시작일이 종료일보다 늦을 수 없습니다.")
                 else:
-                    st.error("❌ 파일 처리 실패")
-                    
-            except Exception as e:
-                st.error(f"❌ 파일 처리 오류: {str(e)}")
+                    st.error(message)
+            else:
+                st.error("❌ 파일 처리 실패")
+                
+        except Exception as e:
+            st.error(f"❌ 파일 처리 오류: {str(e)}")
+    
+    # 재고조정 요약 정보 표시 (적용된 경우에만)
+    if st.session_state.adjustment_summary is not None:
+        st.markdown("### 📋 재고조정 요약")
+        summary = adjustment_processor.get_adjustment_summary()
         
-        # 재고조정 요약 정보 표시 (적용된 경우에만)
-        if st.session_state.adjustment_summary is not None:
-            st.markdown("### 📋 재고조정 요약")
-            summary = processors['adjustment_processor'].get_adjustment_summary()
+        if summary:
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("(+) 조정 건수", f"{summary.get('positive_records', 0):,}건")
+                st.metric("(+) 조정 수량", f"{summary.get('positive_quantity', 0):,.0f}")
+            with col2:
+                st.metric("(-) 조정 건수", f"{summary.get('negative_records', 0):,}건")
+                st.metric("(-) 조정 수량", f"{abs(summary.get('negative_quantity', 0)):,.0f}")
+        
+        # 미매칭 품목이 있으면 경고 표시 (유사 품번 후보 포함)
+        unmatched_items = st.session_state.adjustment_summary.get('unmatched_items', [])
+        if unmatched_items:
+            st.warning(f"⚠️ {len(unmatched_items)}개 품목이 실재고 데이터와 매칭되지 않았습니다.")
             
-            if summary:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.metric("(+) 조정 건수", f"{summary.get('positive_records', 0):,}건")
-                    st.metric("(+) 조정 수량", f"{summary.get('positive_quantity', 0):,.0f}")
-                with col2:
-                    st.metric("(-) 조정 건수", f"{summary.get('negative_records', 0):,}건")
-                    st.metric("(-) 조정 수량", f"{abs(summary.get('negative_quantity', 0)):,.0f}")
+            # 미매칭 품목 상세 정보 (접기/펼치기)
+            with st.expander("미매칭 품목 상세"):
+                unmatched_df = pd.DataFrame(unmatched_items).rename(columns={
+                    'part_code': '제작사품번', 'quantity': '수량', 'type': '구분', 'candidates': '유사 품번 후보'
+                })
+                unmatched_df['제작사품번'] = unmatched_df['제작사품번'].astype(str)
+                st.dataframe(unmatched_df, use_container_width=True, hide_index=True)
+
+@tab_fragment('report')
+def render_report_tab(processors):
+    """결과보고서 탭"""
+    st.header("📊 결과보고서")
     
-    with tab5:
-        st.header("📊 결과보고서")
+    # 조건 확인 (step >= 3이고 inventory_data가 있으면 OK)
+    if st.session_state.step >= 3 and session_data().inventory_data is not None:
+        # 점포 정보 입력 및 세션 저장
+        store_info = render_store_info_form()
+        
+        # 점포 정보가 입력되면 세션에 저장
+        if store_info:
+            st.session_state.store_info = store_info
+            persist_survey(store_info=store_info)
+            update_history_comparison(record=True)
         
-        # 조건 확인 (step >= 3이고 inventory_data가 있으면 OK)
-        if st.session_state.step >= 3 and st.session_state.inventory_data is not None:
-            # 점포 정보 입력 및 세션 저장
-            store_info = render_store_info_form()
+        # 세션에 저장된 점포 정보 사용 (폼 제출과 무관하게 유지)
+        if hasattr(st.session_state, 'store_info') and st.session_state.store_info:
+            # 세션별 보고서 생성기 (여러 세션이 같은 인스턴스의 입력을 덮어쓰지 않도록 실행마다 새로 만들고 시트 캐시만 공유)
+            report_generator = ReportGenerator(processors['sheet_cache'])
+            
+            # 재고조정 데이터 설정
+            filtered_adj_data = session_data().adjustment_filtered
+            if filtered_adj_data is not None:
+                report_generator.set_adjustment_data(filtered_adj_data)
+            elif session_data().adjustment_data is not None:
+                report_generator.set_adjustment_data(session_data().adjustment_data)
+            
+            # 이전 조사 대비 비교 (이어하기 등으로 세션에 없으면 이력에서 다시 계산)
+            if 'history_surveys' not in st.session_state:
+                update_history_comparison()
+            report_generator.set_history_comparison(st.session_state.history_comparison)
             
-            # 점포 정보가 입력되면 세션에 저장
-            if store_info:
-                st.session_state.store_info = store_info
+            # PART 내보내기 이후 재고조정을 반영한 조사 시점 전산재고
+            book_stock = compute_book_stock()
+            report_generator.set_book_stock(book_stock)
             
-            # 세션에 저장된 점포 정보 사용 (폼 제출과 무관하게 유지)
-            if hasattr(st.session_state, 'store_info') and st.session_state.store_info:
-                # 재고조정 데이터 설정
-                filtered_adj_data = getattr(processors['adjustment_processor'], 'filtered_data', None)
-                if filtered_adj_data is not None:
-                    processors['report_generator'].set_adjustment_data(filtered_adj_data)
-                elif st.session_state.adjustment_data is not None:
-                    processors['report_generator'].set_adjustment_data(st.session_state.adjustment_data)
+            # 보고서 데이터 생성 (항상 원본 inventory_data 사용)
+            # ✅ 수정: inventory_data는 항상 원본 실재고 조사 결과만 전달
+            # ✅ final_data는 계산용으로만 사용하여 재고조정 중복 반영 방지
+            report_data = report_generator.generate_report_data(
+                inventory_data=session_data().inventory_data,  # 항상 원본 실재고 데이터
+                store_info=st.session_state.store_info,
+                part_data=session_data().part_data,
+                final_data=session_data().final_data,  # 계산용으로만 사용
+                adjustment_summary=st.session_state.adjustment_summary
+            )
+            
+            if report_data:
+                # 보고서 카드 표시
+                render_report_cards(report_data)
                 
-                # 보고서 데이터 생성 (항상 원본 inventory_data 사용)
-                # ✅ 수정: inventory_data는 항상 원본 실재고 조사 결과만 전달
-                # ✅ final_data는 계산용으로만 사용하여 재고조정 중복 반영 방지
-                report_data = processors['report_generator'].generate_report_data(
-                    inventory_data=st.session_state.inventory_data,  # 항상 원본 실재고 데이터
-                    store_info=st.session_state.store_info,
-                    part_data=st.session_state.part_data,
-                    final_data=st.session_state.final_data,  # 계산용으로만 사용
-                    adjustment_summary=st.session_state.adjustment_summary
-                )
+                # 기간별 재고차이 비교
+                render_history_comparison()
                 
-                if report_data:
-                    # 보고서 카드 표시
-                    render_report_cards(report_data)
-                    
-                    # 요약 통계
-                    stats = processors['report_generator'].get_summary_stats()
+                # 조사 시점 전산재고 대비 실재고
+                render_book_stock(book_stock)
+                
+                # 차이가 큰 품목 검토 대기열 (표시한 목록은 보고서 검토대상 시트로)
+                review_list = render_review_queue()
+                report_generator.set_review_list(review_list if not review_list.empty else None)
+                
+                # 요약 통계
+                stats = report_generator.get_summary_stats()
+                
+                # 엑셀 보고서 다운로드
+                st.markdown("### 📥 보고서 다운로드")
+                
+                # 엑셀 보고서 생성 (세션 상태 기반)
+                col1, col2 = st.columns([1, 3])
+                with col1:
+                    # 보고서 생성 오류 (백그라운드 작업 실패)
+                    if st.session_state.excel_report_error:
+                        st.error(f"❌ 보고서 생성 오류: {st.session_state.excel_report_error}")
+                        st.error("점포 정보를 다시 입력하고 보고서를 먼저 생성해주세요.")
                     
-                    # 엑셀 보고서 다운로드
-                    st.markdown("### 📥 보고서 다운로드")
+                    # 생성 중인 작업이 있으면 진행률 표시
+                    if st.session_state.excel_report_job_id is not None:
+                        excel_report_job_panel()
                     
-                    # 엑셀 보고서 생성 (세션 상태 기반)
-                    col1, col2 = st.columns([1, 3])
-                    with col1:
-                        # 엑셀 생성 버튼 (완전 단순화)
-                        if st.button("📊 엑셀 보고서 생성", type="primary", key="generate_excel"):
-                            try:
-                                with st.spinner("📊 엑셀 보고서를 생성 중입니다..."):
-                                    # 현재 화면에 표시된 report_data 사용 (재생성 안함)
-                                    report_generator = processors['report_generator']
-                                    
-                                    # 엑셀 보고서 생성 (별도 검증 없이 바로 시도)
-                                    excel_data = report_generator.create_excel_report()
-                                    
-                                    if excel_data and len(excel_data) > 0:
-                                        # 세션에 저장
-                                        st.session_state.excel_report_data = excel_data
-                                        st.session_state.excel_generation_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-                                        st.success("✅ 엑셀 보고서가 성공적으로 생성되었습니다!")
-                                        
-                                        # 즉시 다운로드 버튼 표시
-                                        filename = f"재고조사보고서_{st.session_state.excel_generation_time}.xlsx"
-                                        
-                                        st.download_button(
-                                            label="📥 보고서 다운로드",
-                                            data=st.session_state.excel_report_data,
-                                            file_name=filename,
-                                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                            key="download_excel_immediate"
-                                        )
-                                        
-                                        # 파일 크기 정보
-                                        file_size = len(st.session_state.excel_report_data) / 1024  # KB
-                                        st.info(f"📄 파일 크기: {file_size:.1f}KB")
-                                    else:
-                                        st.error("❌ 엑셀 보고서 생성 실패: 데이터가 비어있습니다.")
-                                        
-                            except Exception as e:
-                                st.error(f"❌ 보고서 생성 오류: {str(e)}")
-                                st.error("점포 정보를 다시 입력하고 보고서를 먼저 생성해주세요.")
-                        
-                        # 기존 다운로드 버튼 (엑셀 데이터가 있을 때만 표시)
-                        elif st.session_state.excel_report_data is not None:
-                            filename = f"재고조사보고서_{st.session_state.excel_generation_time}.xlsx"
-                            
-                            st.download_button(
-                                label="📥 보고서 다운로드 (기존)",
-                                data=st.session_state.excel_report_data,
-                                file_name=filename,
-                                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                                key="download_excel_persistent"
+                    # 엑셀 생성 버튼 (백그라운드 작업으로 등록, 화면은 계속 응답)
+                    elif st.button("📊 엑셀 보고서 생성", type="primary", key="generate_excel"):
+                        try:
+                            # 현재 화면에 표시된 report_data 사용 (재생성 안함)
+                            st.session_state.excel_report_job_id = get_report_job_manager().submit(
+                                report_generator, session_id=task_session_id()
                             )
-                            
-                            # 파일 크기 정보
-                            file_size = len(st.session_state.excel_report_data) / 1024  # KB
-                            st.info(f"📄 파일 크기: {file_size:.1f}KB")
-                            
-                            # 새 보고서 생성 버튼
-                            if st.button("🔄 새 보고서 생성", key="reset_excel"):
-                                st.session_state.excel_report_data = None
-                                st.session_state.excel_generation_time = None
+                            session_data().excel_report_data = None
+                            st.session_state.excel_report_error = None
+                            excel_report_job_panel()
+                        except SchedulerBusy as e:
+                            st.warning(f"⚠️ {e}")
+                        except Exception as e:
+                            st.error(f"❌ 보고서 생성 오류: {str(e)}")
+                            st.error("점포 정보를 다시 입력하고 보고서를 먼저 생성해주세요.")
                     
-                    with col2:
-                        st.info("📋 **보고서 구성**: 요약보고서, 재고차이리스트, 재고조정리스트, PART원본데이터, 전체재고리스트 (7개 시트)")
+                    # 기존 다운로드 버튼 (엑셀 데이터가 있을 때만 표시)
+                    elif session_data().excel_report_data is not None:
+                        filename = f"재고조사보고서_{st.session_state.excel_generation_time}.xlsx"
                         
-                        # 현재 상태 표시
-                        if st.session_state.excel_report_data is not None:
-                            st.success(f"✅ 엑셀 파일 준비 완료 ({st.session_state.excel_generation_time})")
-                        else:
-                            st.info("💡 먼저 '엑셀 보고서 생성' 버튼을 클릭하세요")
+                        st.download_button(
+                            label="📥 보고서 다운로드",
+                            data=session_data().excel_report_data,
+                            file_name=filename,
+                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                            key="download_excel_persistent"
+                        )
                         
-                        # 엑셀 보고서 설명
-                        with st.expander("📝 엑셀 보고서 상세 내용"):
-                            st.write("""
-                            **포함 시트:**
-                            - 📊 재고조사요약: 전체 결과 요약
-                            - 📉 재고차이리스트(-): 부족 재고 상세
-                            - 📈 재고차이리스트(+): 과잉 재고 상세
-                            - ⚖️ 재고조정리스트(+): 증가 조정 내역
-                            - ⚖️ 재고조정리스트(-): 감소 조정 내역
-                            - 📋 PART원본데이터: 원본 PART 파일 전체 데이터
-                            - 📊 전체재고리스트: 재고조사 후 계산값 적용된 전체 재고
-                            """)
-                else:
-                    st.error("❌ 보고서 데이터 생성 실패")
+                        # 파일 크기 정보
+                        file_size = len(session_data().excel_report_data) / 1024  # KB
+                        st.info(f"📄 파일 크기: {file_size:.1f}KB")
+                        
+                        # 새 보고서 생성 버튼
+                        if st.button("🔄 새 보고서 생성", key="reset_excel"):
+                            session_data().excel_report_data = None
+                            st.session_state.excel_generation_time = None
+                            persist_survey(blobs={'excel_report_data': None}, excel_generation_time=None)
+                
+                with col2:
+                    st.info("📋 **보고서 구성**: 요약보고서, 재고차이리스트, 재고조정리스트, PART원본데이터, 전체재고리스트 (7개 시트, 이전 조사가 있으면 기간비교 시트 추가)")
+                    
+                    # 현재 상태 표시
+                    if session_data().excel_report_data is not None:
+                        st.success(f"✅ 엑셀 파일 준비 완료 ({st.session_state.excel_generation_time})")
+                    elif st.session_state.excel_report_job_id is not None:
+                        st.info("⏳ 엑셀 보고서를 생성하고 있습니다. 완료되면 다운로드 버튼이 표시됩니다.")
+                    else:
+                        st.info("💡 먼저 '엑셀 보고서 생성' 버튼을 클릭하세요")
+                    
+                    # 엑셀 보고서 설명
+                    with st.expander("📝 엑셀 보고서 상세 내용"):
+                        st.write("""
+                        **포함 시트:**
+                        - 📊 재고조사요약: 전체 결과 요약
+                        - 📉 재고차이리스트(-): 부족 재고 상세
+                        - 📈 재고차이리스트(+): 과잉 재고 상세
+                        - ⚖️ 재고조정리스트(+): 증가 조정 내역
+                        - ⚖️ 재고조정리스트(-): 감소 조정 내역
+                        - 📋 PART원본데이터: 원본 PART 파일 전체 데이터
+                        - 📊 전체재고리스트: 재고조사 후 계산값 적용된 전체 재고
+                        - 📈 기간비교(재고차이): 이전 조사 대비 품목별 재고차이, 상습 부족 품목 (이전 조사가 있을 때)
+                        """)
             else:
-                st.info("💡 위의 점포 정보를 입력하고 '📋 보고서 생성' 버튼을 클릭해주세요.")
+                st.error("❌ 보고서 데이터 생성 실패")
         else:
-            st.warning("⚠️ 먼저 이전 단계를 완료해주세요.")
+            st.info("💡 위의 점포 정보를 입력하고 '📋 보고서 생성' 버튼을 클릭해주세요.")
+    else:
+        st.warning("⚠️ 먼저 이전 단계를 완료해주세요.")
+        
+        # 디버깅 정보 (개발용)
+        if st.checkbox("🔧 디버깅 정보 표시"):
+            st.write(f"현재 단계: {st.session_state.step}")
+            st.write(f"PART 데이터: {'있음' if session_data().part_data is not None else '없음'}")
+            st.write(f"실재고 데이터: {'있음' if session_data().inventory_data is not None else '없음'}")
+            st.write(f"최종 데이터: {'있음' if session_data().final_data is not None else '없음'}")
             
-            # 디버깅 정보 (개발용)
-            if st.checkbox("🔧 디버깅 정보 표시"):
-                st.write(f"현재 단계: {st.session_state.step}")
-                st.write(f"PART 데이터: {'있음' if st.session_state.part_data is not None else '없음'}")
-                st.write(f"실재고 데이터: {'있음' if st.session_state.inventory_data is not None else '없음'}")
-                st.write(f"최종 데이터: {'있음' if st.session_state.final_data is not None else '없음'}")
-                
-                # 강제 보고서 생성 (개발/테스트용)
-                if st.session_state.inventory_data is not None:
-                    if st.button("🔧 강제 보고서 생성 (테스트용)"):
-                        st.session_state.step = 5
-                        st.rerun()
+            # 강제 보고서 생성 (개발/테스트용)
+            if session_data().inventory_data is not None:
+                if st.button("🔧 강제 보고서 생성 (테스트용)"):
+                    st.session_state.step = 5
+                    st.rerun()
+
+# 메인 함수
+def main():
+    st.title("📦 재고조사 앱")
+    st.markdown("---")
+    
+    # 첫 화면을 그린 뒤 pandas/utils 로드
+    load_dependencies()
+    
+    # 캐시된 프로세서 가져오기
+    processors = get_processors()
+    
+    # 프로세서 초기화 확인
+    if processors is None:
+        st.error("⚠️ 시스템 초기화 실패. 페이지를 새로고침해주세요.")
+        st.stop()
+        return
+    
+    # 세션 상태 초기화
+    if 'step' not in st.session_state:
+        st.session_state.step = 1
+    if 'part_data' not in session_data():
+        session_data().part_data = None
+    if 'inventory_data' not in session_data():
+        session_data().inventory_data = None
+    if 'adjustment_data' not in session_data():
+        session_data().adjustment_data = None
+    if 'adjustment_filtered' not in session_data():
+        session_data().adjustment_filtered = None
+    if 'final_data' not in session_data():
+        session_data().final_data = None
+    if 'adjustment_summary' not in st.session_state:
+        st.session_state.adjustment_summary = None
+    # 엑셀 보고서 관련 세션 상태
+    if 'excel_report_data' not in session_data():
+        session_data().excel_report_data = None
+    if 'excel_generation_time' not in st.session_state:
+        st.session_state.excel_generation_time = None
+    if 'excel_report_job_id' not in st.session_state:
+        st.session_state.excel_report_job_id = None
+    if 'excel_report_error' not in st.session_state:
+        st.session_state.excel_report_error = None
+    # 점포 정보 세션 상태
+    if 'store_info' not in st.session_state:
+        st.session_state.store_info = None
+    # 조사 ID (주소창의 survey 파라미터가 있으면 저장된 조사 이어하기)
+    if 'survey_id' not in st.session_state:
+        st.session_state.survey_id = None
+        requested_id = st.query_params.get('survey') if hasattr(st, 'query_params') else None
+        if requested_id and not resume_survey(requested_id, processors):
+            set_survey_query_param(None)
+    
+    # 사이드바 진행 단계 표시
+    show_progress_sidebar()
+    show_survey_sidebar(processors)
+    show_performance_sidebar()
+    
+    # 탭 생성
+    tab1, tab2, tab3, tab4, tab5 = st.tabs([
+        "1️⃣ PART 파일", 
+        "2️⃣ 실재고 템플릿", 
+        "3️⃣ 실재고 입력", 
+        "4️⃣ 재고조정", 
+        "5️⃣ 결과보고서"
+    ])
+    
+    with tab1:
+        render_part_tab(processors)
+    
+    with tab2:
+        render_template_tab(processors)
+    
+    with tab3:
+        render_count_tab(processors)
+    
+    with tab4:
+        render_adjustment_tab(processors)
+    
+    with tab5:
+        render_report_tab(processors)
+    
+    # fragment 미지원 버전: 엑셀 보고서 작업이 끝날 때까지 1초마다 전체 화면 갱신
+    if _fragment is None and st.session_state.excel_report_job_id is not None:
+        time.sleep(1)
+        st.rerun()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
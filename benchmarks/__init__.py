@@ -0,0 +1 @@
+# 벤치마크/부하 테스트 도구
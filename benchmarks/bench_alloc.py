@@ -0,0 +1,160 @@
+"""
+재고조사 파이프라인 단계별 메모리 할당량 측정
+
+PART 로드부터 보고서 시트 데이터 생성까지 데이터프레임 처리 단계를 tracemalloc 할당 추적 상태로 실행하고
+단계별 최대 사용량(시작 시점 대비)과 누적 할당량을 출력합니다.
+이전 결과 JSON을 --compare로 넘기면 단계별 변화를 함께 보여줍니다.
+
+- PART는 Parquet 파일로 읽고, 실재고 엑셀은 추적 전에 미리 읽어 둠 (openpyxl 셀 객체 할당 제외)
+- 보고서는 엑셀 파일 작성 없이 시트별 데이터프레임 생성(sheet_*)만 측정
+- 누적 할당량은 함수 호출마다 사용량 증가분을 더한 값이라 실제보다 작게 나올 수 있음(하한값)
+- 할당 추적 중에는 느리므로 소요시간은 bench_pipeline으로 측정
+
+사용법:
+    python -m benchmarks.bench_alloc --json alloc_before.json
+    python -m benchmarks.bench_alloc --compare alloc_before.json
+    python -m benchmarks.bench_alloc --sizes 10000,100000
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import date
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import enable_copy_on_write  # noqa: E402
+from utils.data_processor import PartDataProcessor  # noqa: E402
+from utils.adjustment_processor import AdjustmentProcessor  # noqa: E402
+from utils.report_generator import ReportGenerator  # noqa: E402
+from utils.perf_monitor import perf_monitor, logger as perf_logger  # noqa: E402
+from benchmarks.bench_pipeline import DEFAULT_DATA_DIR, STORE_INFO  # noqa: E402
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+
+DEFAULT_SIZES = [100_000]
+
+# 보고서 시트 데이터 생성 함수 (엑셀 작성 전 단계)
+SHEET_BUILDERS = {
+    'sheet_part_data': '_create_part_data_sheet',
+    'sheet_full_inventory': '_create_full_inventory_list_sheet',
+    'sheet_negative_diff': '_create_negative_diff_sheet',
+    'sheet_positive_diff': '_create_positive_diff_sheet',
+    'sheet_negative_adjustment': '_create_negative_adjustment_sheet',
+    'sheet_positive_adjustment': '_create_positive_adjustment_sheet',
+}
+
+
+def run_frames(paths: Dict[str, str], count_df: pd.DataFrame):
+    """데이터프레임 처리 단계 1회 실행 (단계 기록은 perf_monitor에 남음)"""
+    part_processor = PartDataProcessor()
+    adjustment_processor = AdjustmentProcessor()
+    report_generator = ReportGenerator()
+
+    success, message, part_data = part_processor.load_part_file(paths['part_parquet'])
+    if not success:
+        raise RuntimeError(message)
+    part_processor.create_inventory_template()
+
+    success, message, inventory_data = part_processor.validate_inventory_data(count_df)
+    if not success:
+        raise RuntimeError(message)
+
+    success, message, _ = adjustment_processor.load_adjustment_file(paths['adjustment'])
+    if not success:
+        raise RuntimeError(message)
+    success, message, _ = adjustment_processor.filter_by_date_range(date(2024, 12, 27), date(2025, 6, 27))
+    if not success:
+        raise RuntimeError(message)
+    success, message, final_data, adj_summary = adjustment_processor.apply_adjustments_to_inventory(
+        inventory_data, part_data
+    )
+    if not success:
+        raise RuntimeError(message)
+
+    report_generator.set_adjustment_data(adjustment_processor.filtered_data)
+    report_generator.generate_report_data(
+        inventory_data=inventory_data,
+        store_info=STORE_INFO,
+        part_data=part_data,
+        final_data=final_data,
+        adjustment_summary=adj_summary
+    )
+    for stage, method in SHEET_BUILDERS.items():
+        with perf_monitor.stage(stage) as record:
+            record['rows'] = len(getattr(report_generator, method)())
+
+
+def measure_allocations(paths: Dict[str, str]) -> Dict[str, Dict[str, float]]:
+    """단계별 {'peak_mb', 'allocated_mb'} (같은 단계가 여러 번이면 최대/합계)"""
+    count_df = pd.read_excel(paths['count'], engine='openpyxl')
+
+    perf_monitor.clear()
+    perf_monitor.enable(trace_allocations=True)
+    try:
+        run_frames(paths, count_df)
+        records = list(reversed(perf_monitor.get_records()))
+    finally:
+        perf_monitor.disable()
+
+    stages: Dict[str, Dict[str, float]] = {}
+    for record in records:
+        stage = stages.setdefault(record['stage'], {'peak_mb': 0.0, 'allocated_mb': 0.0})
+        stage['peak_mb'] = max(stage['peak_mb'], record.get('peak_memory_mb', 0.0))
+        stage['allocated_mb'] = round(stage['allocated_mb'] + record.get('allocated_mb', 0.0), 2)
+    return stages
+
+
+def measure(sizes: List[int], data_dir: str) -> Dict[str, Dict]:
+    results = {}
+    for size in sizes:
+        print(f"▶ {size:,} SKU 데이터 준비 중...", flush=True)
+        paths = build_dataset(size, data_dir)
+        results[str(size)] = measure_allocations(paths)
+    return results
+
+
+def print_table(current: Dict, previous: Dict):
+    for size, stages in current.items():
+        print(f"\n[{int(size):,} SKU] 단계별 메모리 (MB)")
+        print(f"  {'단계':<32}{'최대':>10}{'할당':>10}{'이전 최대':>12}{'이전 할당':>12}")
+        for stage, values in stages.items():
+            before = previous.get(size, {}).get(stage)
+            before_peak = f"{before['peak_mb']:.1f}" if before else '-'
+            before_allocated = f"{before['allocated_mb']:.1f}" if before else '-'
+            print(f"  {stage:<32}{values['peak_mb']:>10.1f}{values['allocated_mb']:>10.1f}"
+                  f"{before_peak:>12}{before_allocated:>12}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='재고조사 파이프라인 메모리 할당량 측정')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='측정할 SKU 규모 (쉼표 구분)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--json', dest='json_path', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 경로')
+    args = parser.parse_args(argv)
+    enable_copy_on_write()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    perf_logger.setLevel(logging.WARNING)
+
+    current = measure(sizes, args.data_dir)
+
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+    print_table(current, previous)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""
+HTTP API 서버 처리량 측정 (같은 장비에서 동시 클라이언트)
+
+api_server.py를 새 프로세스로 띄우고, 클라이언트 스레드 N개가 각자 연결을 유지하며
+엔드포인트를 --duration초 동안 반복 호출해 초당 요청 수(RPS)와 응답시간 p50/p95를 출력합니다.
+validate/apply/report는 클라이언트마다 /upload로 세션을 먼저 만든 뒤 측정합니다.
+
+사용법:
+    python -m benchmarks.bench_api --skus 2000 --clients 1,4,8
+    python -m benchmarks.bench_api --endpoints health,report --duration 20 --workers 4
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import threading
+import subprocess
+import http.client
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+from benchmarks.load_test import DEFAULT_DATA_DIR  # noqa: E402
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = ['health', 'upload', 'validate', 'apply', 'report']
+STORE_INFO = {'store_name': '벤치마크점', 'survey_date': '2025-06-27', 'survey_method': '전수조사', 'survey_staff': ''}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int, memory_mb: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT_DIR, 'api_server.py'), '--port', str(port), '--quiet',
+         '--workers', str(workers), '--memory-mb', str(memory_mb), '--max-queue', '256'],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"API 서버 시작 실패:\n{server.stderr.read().decode('utf-8', 'replace')[-2000:]}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/health')
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("API 서버 시작 시간 초과")
+
+
+class Client:
+    """연결을 유지하는 API 클라이언트 (서버가 연결을 닫으면 다시 연결)"""
+
+    def __init__(self, port: int, timeout: float):
+        self.port = port
+        self.timeout = timeout
+        self.connection = None
+
+    def request(self, method: str, path: str, body: bytes = b'') -> Tuple[int, bytes]:
+        for attempt in range(2):
+            if self.connection is None:
+                self.connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=self.timeout)
+            try:
+                self.connection.request(method, path, body=body)
+                response = self.connection.getresponse()
+                data = response.read()
+                if response.will_close:
+                    self.close()
+                return response.status, data
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+        raise RuntimeError('unreachable')
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+def endpoint_request(endpoint: str, files: Dict[str, bytes], session: Optional[str]) -> Tuple[str, str, bytes]:
+    if endpoint == 'health':
+        return 'GET', '/health', b''
+    if endpoint == 'upload':
+        return 'POST', '/upload?filename=PART.xlsx', files['part']
+    if endpoint == 'validate':
+        return 'POST', f'/validate?session={session}&filename=count.xlsx', files['count']
+    if endpoint == 'apply':
+        return 'POST', f'/apply?session={session}&filename=adjustment.xlsx&start=2024-12-27&end=2025-06-27', \
+            files['adjustment']
+    return 'POST', f'/report?session={session}', json.dumps(STORE_INFO).encode('utf-8')
+
+
+def prepare_session(client: Client, files: Dict[str, bytes], endpoint: str) -> Optional[str]:
+    """측정 엔드포인트 앞 단계까지 진행한 세션"""
+    if endpoint in ('health', 'upload'):
+        return None
+    status, data = client.request(*endpoint_request('upload', files, None))
+    if status != 200:
+        raise RuntimeError(f"upload 실패 ({status}): {data[:200]!r}")
+    session = json.loads(data)['session']
+    for step in ENDPOINTS[2:ENDPOINTS.index(endpoint)]:
+        status, data = client.request(*endpoint_request(step, files, session))
+        if status != 200:
+            raise RuntimeError(f"{step} 실패 ({status}): {data[:200]!r}")
+    return session
+
+
+def run_endpoint(port: int, endpoint: str, clients: int, duration: float, files: Dict[str, bytes],
+                 timeout: float) -> Dict:
+    """클라이언트 N개가 duration초 동안 같은 엔드포인트를 반복 호출"""
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    deadline = [0.0]
+    # 모든 클라이언트가 준비되면 측정 시작 (종료 시각은 대기가 풀리기 전에 설정)
+    ready = threading.Barrier(clients + 1, action=lambda: deadline.__setitem__(0, time.perf_counter() + duration))
+
+    def worker():
+        client = Client(port, timeout)
+        try:
+            session = prepare_session(client, files, endpoint)
+        finally:
+            ready.wait()
+        sessions = [session] if session else []
+        try:
+            while time.perf_counter() < deadline[0]:
+                method, path, body = endpoint_request(endpoint, files, session)
+                start = time.perf_counter()
+                status, data = client.request(method, path, body)
+                elapsed = time.perf_counter() - start
+                with lock:
+                    if status == 200:
+                        latencies.append(elapsed)
+                    else:
+                        errors[str(status)] = errors.get(str(status), 0) + 1
+                if endpoint == 'upload' and status == 200:
+                    sessions.append(json.loads(data)['session'])
+        finally:
+            for created in sessions:
+                client.request('DELETE', f'/session?session={created}')
+            client.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = deadline[0] - duration
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    values = np.array(latencies) if latencies else np.zeros(1)
+    return {
+        'endpoint': endpoint,
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 2),
+        'p50_ms': round(float(np.percentile(values, 50)) * 1000, 1),
+        'p95_ms': round(float(np.percentile(values, 95)) * 1000, 1),
+    }
+
+
+def print_table(results: List[Dict], skus: int, workers: int):
+    print(f"\n[API 처리량, {skus:,} SKU, 무거운 작업 동시 실행 {workers}개]")
+    print(f"  {'엔드포인트':<12}{'클라이언트':>10}{'요청':>8}{'RPS':>10}{'p50(ms)':>10}{'p95(ms)':>10}  오류")
+    for result in results:
+        errors = ', '.join(f"{status}×{count}" for status, count in result['errors'].items()) or '-'
+        print(f"  {result['endpoint']:<12}{result['clients']:>10}{result['requests']:>8}{result['rps']:>10.2f}"
+              f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}  {errors}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='HTTP API 서버 처리량 측정')
+    parser.add_argument('--skus', type=int, default=2_000, help='합성 PART 품목 수')
+    parser.add_argument('--clients', default='1,4,8', help='동시 클라이언트 수 (쉼표 구분)')
+    parser.add_argument('--endpoints', default=','.join(ENDPOINTS), help='측정할 엔드포인트 (쉼표 구분)')
+    parser.add_argument('--duration', type=float, default=10, help='측정 시간(초)')
+    parser.add_argument('--workers', type=int, default=2, help='서버 무거운 작업 동시 실행 수')
+    parser.add_argument('--memory-mb', type=int, default=1024, help='서버 무거운 작업 예상 메모리 한도(MB)')
+    parser.add_argument('--timeout', type=float, default=300, help='요청 제한시간(초)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--json', dest='json_path', help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    paths = build_dataset(args.skus, args.data_dir)
+    files = {}
+    for kind in ('part', 'count', 'adjustment'):
+        with open(paths[kind], 'rb') as f:
+            files[kind] = f.read()
+
+    port = free_port()
+    server = start_server(port, args.workers, args.memory_mb)
+    results = []
+    try:
+        for endpoint in [name.strip() for name in args.endpoints.split(',') if name.strip()]:
+            for clients in [int(value) for value in args.clients.split(',') if value.strip()]:
+                print(f"▶ {endpoint} × {clients} 클라이언트 측정 중...", flush=True)
+                results.append(run_endpoint(port, endpoint, clients, args.duration, files, args.timeout))
+    finally:
+        server.terminate()
+        server.wait()
+    print_table(results, args.skus, args.workers)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if any(result['errors'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
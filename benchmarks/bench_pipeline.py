@@ -0,0 +1,331 @@
+"""
+재고조사 파이프라인 단계별 벤치마크
+
+합성 데이터(PART/실재고/재고조정 xlsx)로 전체 파이프라인을 실행하고
+단계별 소요시간을 JSON 기준값(baseline)과 비교합니다.
+
+사용법:
+    python -m benchmarks.bench_pipeline                       # 10k/100k/500k 측정 후 기준값과 비교
+    python -m benchmarks.bench_pipeline --sizes 10000         # 특정 규모만 측정
+    python -m benchmarks.bench_pipeline --update-baseline     # 측정 결과를 기준값으로 저장
+    python -m benchmarks.bench_pipeline --threshold 0.5       # 50% 이상 느려진 단계만 실패 처리
+    python -m benchmarks.bench_pipeline --repeat 5 --warmup 2 # 워밍업 2회 버리고 5회 측정
+
+규모별로 워밍업 실행을 버린 뒤 repeat회 측정한 단계별 중앙값을 기준값과 비교하고,
+threshold 이상 느려진 단계가 있으면 종료 코드 1을 반환합니다.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import tempfile
+import argparse
+import platform
+import statistics
+from datetime import datetime, date
+from typing import Dict, List
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import enable_copy_on_write  # noqa: E402
+from utils.data_processor import PartDataProcessor  # noqa: E402
+from utils.adjustment_processor import AdjustmentProcessor  # noqa: E402
+from utils.report_generator import ReportGenerator  # noqa: E402
+from utils.inventory_template import write_template_xlsx, template_split  # noqa: E402
+from utils.file_reader import read_table  # noqa: E402
+from utils.part_key import part_keys  # noqa: E402
+from utils.count_stream import stream_count_sheet  # noqa: E402
+from utils.book_stock import book_stock_as_of  # noqa: E402
+from utils.review_queue import ReviewQueue  # noqa: E402
+from utils.survey_store import SurveyStore  # noqa: E402
+from utils.survey_history import SurveyHistory, compare_surveys  # noqa: E402
+from utils.perf_monitor import perf_monitor, logger as perf_logger  # noqa: E402
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_DATA_DIR = os.path.join(BENCHMARK_DIR, '.data')
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+
+STORE_INFO = {
+    'store_name': '벤치마크점',
+    'survey_date': '2025년 06월 27일',
+    'survey_method': '전수조사',
+    'survey_staff': '벤치마크'
+}
+
+
+def run_pipeline(paths: Dict[str, str]) -> Dict[str, float]:
+    """파이프라인 1회 실행 후 단계별 소요시간(초) 반환"""
+    perf_monitor.clear()
+
+    part_processor = PartDataProcessor()
+    adjustment_processor = AdjustmentProcessor()
+    report_generator = ReportGenerator()
+
+    success, message, part_data = part_processor.load_part_file(paths['part'])
+    if not success:
+        raise RuntimeError(message)
+
+    # 빠른 형식 PART 읽기 (필요한 컬럼만)
+    for fmt in ('csv', 'parquet', 'feather'):
+        with perf_monitor.stage(f'read_part_{fmt}') as record:
+            record['rows'] = len(read_table(paths[f'part_{fmt}'], columns=part_processor.required_columns))
+
+    # 숫자 품번 CSV: 앞자리 0이 유지되어 PART와 재고조정 품번이 같은 키로 매칭되어야 함
+    with perf_monitor.stage('read_digit_code_csv') as record:
+        digit_part = read_table(paths['part_digits_csv'], columns=part_processor.required_columns)
+        digit_processor = AdjustmentProcessor()
+        success, message, digit_adjustments = digit_processor.load_adjustment_file(paths['adjustment_digits_csv'])
+        if not success:
+            raise RuntimeError(message)
+        record['rows'] = len(digit_part) + len(digit_adjustments)
+    unmatched = ~part_keys(digit_adjustments, '제작사품번').isin(set(part_keys(digit_part, '제작사 품번')))
+    if unmatched.any() or not digit_part['제작사 품번'].astype(str).str.startswith('00').all():
+        raise RuntimeError(f"CSV 숫자 품번의 앞자리 0이 사라졌습니다 (미매칭 {int(unmatched.sum()):,}건)")
+
+    template = part_processor.create_inventory_template()
+    with perf_monitor.stage('template_to_excel', rows=len(template)):
+        write_template_xlsx(template)
+    # 6개 조로 재고액 균등 분할 (누적 합 경계 탐색 + 시트별 기록)
+    with perf_monitor.stage('template_to_excel_split', rows=len(template)):
+        write_template_xlsx(template, bounds=template_split(template, 6, 'value'))
+
+    with perf_monitor.stage('read_count_sheet') as record:
+        count_df = pd.read_excel(paths['count'], engine='openpyxl')
+        record['rows'] = len(count_df)
+
+    success, message, inventory_data = part_processor.validate_inventory_data(count_df)
+    if not success:
+        raise RuntimeError(message)
+
+    success, message, _ = adjustment_processor.load_adjustment_file(paths['adjustment'])
+    if not success:
+        raise RuntimeError(message)
+
+    # 앱 기본값과 같은 최근 6개월
+    success, message, _ = adjustment_processor.filter_by_date_range(date(2024, 12, 27), date(2025, 6, 27))
+    if not success:
+        raise RuntimeError(message)
+
+    success, message, final_data, adj_summary = adjustment_processor.apply_adjustments_to_inventory(
+        inventory_data, part_data
+    )
+    if not success:
+        raise RuntimeError(message)
+
+    # 조정 기록 누적 합 → 조사 시점 전산재고 재구성 (PART 내보내기 6개월 전 가정)
+    with perf_monitor.stage('build_adjustment_ledger') as record:
+        ledger = adjustment_processor.get_ledger()
+        record['rows'] = len(adjustment_processor.data)
+    book_stock_as_of(inventory_data, ledger, date(2024, 12, 27), date(2025, 6, 27))
+
+    # 검토 대기열: 상위 500개 선정 → 기준값만 바꿔 조회 (전체 재정렬 없음)
+    with perf_monitor.stage('review_queue_top', rows=len(final_data)):
+        review_queue = ReviewQueue(final_data)
+        review_queue.top(100)
+        review_list = review_queue.top(100, min_score=10_000)
+
+    report_generator.set_adjustment_data(adjustment_processor.filtered_data)
+    report_generator.set_review_list(review_list)
+    report_generator.generate_report_data(
+        inventory_data=inventory_data,
+        store_info=STORE_INFO,
+        part_data=part_data,
+        final_data=final_data,
+        adjustment_summary=adj_summary
+    )
+    excel_report = report_generator.create_excel_report()
+
+    # 조사 저장 → 이어하기 (엑셀을 다시 읽지 않고 저장된 단계 결과 로드)
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = SurveyStore(store_dir)
+        survey_id = store.create('benchmark')
+        store.save(
+            survey_id,
+            frames={
+                'part_data': part_data,
+                'inventory_data': inventory_data,
+                'adjustment_data': adjustment_processor.data,
+                'adjustment_filtered': adjustment_processor.filtered_data,
+                'final_data': final_data,
+            },
+            blobs={'excel_report_data': excel_report},
+            adjustment_summary=adj_summary,
+            store_info=STORE_INFO,
+            step=5
+        )
+        store.load(survey_id)
+
+        # 조사 이력 기록 → 8회 조사 비교 (같은 결과를 분기별 조사로 가정)
+        history = SurveyHistory(os.path.join(store_dir, 'history'))
+        entry = history.record(survey_id, STORE_INFO, inventory_data)
+        results = history.load(survey_id)
+        compare_surveys([({**entry, 'survey_date': f"2025-Q{quarter}"}, results) for quarter in range(1, 9)])
+
+    timings = {}
+    for record in reversed(perf_monitor.get_records()):
+        timings[record['stage']] = timings.get(record['stage'], 0.0) + record['wall_time_ms'] / 1000
+
+    # 대용량 실재고 행 묶음 처리 (행 묶음별 검사/계산 기록이 위 단계 합계에 섞이지 않도록 따로 측정)
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        success, message, _, _ = stream_count_sheet(paths['count'], part_processor, out_dir, part_data=part_data)
+        timings['stream_count_sheet'] = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(message)
+
+    # 조정 기간만 바꿔 보고서 다시 생성 (PART/실재고 시트는 캐시된 시트 재사용)
+    success, message, _ = adjustment_processor.filter_by_date_range(date(2025, 3, 27), date(2025, 6, 27))
+    if not success:
+        raise RuntimeError(message)
+    success, message, final_data, adj_summary = adjustment_processor.apply_adjustments_to_inventory(
+        inventory_data, part_data
+    )
+    if not success:
+        raise RuntimeError(message)
+    # 조정이 바뀐 행만 검토 대기열에 반영
+    start = time.perf_counter()
+    review_queue.refresh(final_data)
+    report_generator.set_review_list(review_queue.top(100))
+    timings['review_queue_refresh'] = time.perf_counter() - start
+    report_generator.set_adjustment_data(adjustment_processor.filtered_data)
+    report_generator.generate_report_data(
+        inventory_data=inventory_data,
+        store_info=STORE_INFO,
+        part_data=part_data,
+        final_data=final_data,
+        adjustment_summary=adj_summary
+    )
+    start = time.perf_counter()
+    report_generator.create_excel_report()
+    timings['create_excel_report_rebuild'] = time.perf_counter() - start
+    return timings
+
+
+def measure(sizes: List[int], repeat: int, data_dir: str, warmup: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+    규모별 측정 (warmup회 실행은 버리고 repeat회 측정의 단계별 중앙값 사용)
+
+    첫 실행은 파일 캐시/지연 import/메모리 할당 영향으로 느리고 1회 측정은 잡음이 커서
+    한 번 느린 실행으로 성능 저하가 잘못 감지되지 않도록 합니다.
+    """
+    results = {}
+    for size in sizes:
+        print(f"▶ {size:,} SKU 데이터 준비 중...", flush=True)
+        paths = build_dataset(size, data_dir)
+
+        for run in range(warmup):
+            timings = run_pipeline(paths)
+            print(f"  워밍업 {run + 1}/{warmup}회 완료 (합계 {sum(timings.values()):.2f}초, 제외)", flush=True)
+
+        samples: Dict[str, List[float]] = {}
+        for run in range(repeat):
+            timings = run_pipeline(paths)
+            for stage, seconds in timings.items():
+                samples.setdefault(stage, []).append(seconds)
+            print(f"  {run + 1}/{repeat}회 완료 (합계 {sum(timings.values()):.2f}초)", flush=True)
+
+        results[str(size)] = {stage: round(statistics.median(values), 4) for stage, values in samples.items()}
+    return results
+
+
+def compare(current: Dict, baseline: Dict, threshold: float, min_delta: float) -> List[str]:
+    """기준값 대비 threshold 이상 느려진 단계 목록"""
+    regressions = []
+    for size, stages in current.items():
+        base_stages = baseline.get(size, {})
+        for stage, seconds in stages.items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            if seconds > base * (1 + threshold) and seconds - base > min_delta:
+                regressions.append(
+                    f"{int(size):,} SKU / {stage}: {base:.3f}초 → {seconds:.3f}초 (+{(seconds / base - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(current: Dict, baseline: Dict):
+    for size, stages in current.items():
+        print(f"\n[{int(size):,} SKU]")
+        print(f"  {'단계':<32}{'현재(초)':>10}{'기준(초)':>10}{'변화':>9}")
+        for stage, seconds in stages.items():
+            base = baseline.get(size, {}).get(stage)
+            change = f"{(seconds / base - 1) * 100:+.0f}%" if base else '-'
+            base_text = f"{base:.3f}" if base is not None else '-'
+            print(f"  {stage:<32}{seconds:>10.3f}{base_text:>10}{change:>9}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='재고조사 파이프라인 벤치마크')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='측정할 SKU 규모 (쉼표 구분)')
+    parser.add_argument('--repeat', type=int, default=3, help='규모별 측정 횟수 (중앙값 사용)')
+    parser.add_argument('--warmup', type=int, default=1, help='측정 전에 버리는 실행 횟수')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='기준값 JSON 경로')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--threshold', type=float,
+                        default=float(os.getenv('BENCH_REGRESSION_THRESHOLD', '0.25')),
+                        help='허용 성능 저하 비율 (0.25 = 25%%)')
+    parser.add_argument('--min-delta', type=float, default=0.05,
+                        help='측정 오차로 보고 무시할 최소 차이(초)')
+    parser.add_argument('--update-baseline', action='store_true', help='측정 결과를 기준값으로 저장')
+    args = parser.parse_args(argv)
+    enable_copy_on_write()
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    if args.repeat < 1:
+        parser.error('--repeat는 1 이상이어야 합니다.')
+
+    # 벤치마크 중에는 단계별 JSON 로그 출력 생략
+    perf_logger.setLevel(logging.WARNING)
+    perf_monitor.enable(trace_memory=False)
+
+    current = measure(sizes, args.repeat, args.data_dir, warmup=args.warmup)
+
+    baseline_doc = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline_doc = json.load(f)
+    baseline = baseline_doc.get('results', {})
+
+    print_table(current, baseline)
+
+    if args.update_baseline:
+        baseline_doc = {
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'method': {'repeat': args.repeat, 'warmup': args.warmup, 'statistic': 'median'},
+            'environment': {
+                'python': platform.python_version(),
+                'pandas': pd.__version__,
+                'machine': platform.machine(),
+                'processor': platform.processor() or platform.machine(),
+            },
+            'results': {**baseline, **current},
+        }
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline_doc, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 기준값 저장: {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("\n⚠️ 기준값이 없습니다. --update-baseline 으로 먼저 저장하세요.")
+        return 0
+
+    regressions = compare(current, baseline, args.threshold, args.min_delta)
+    if regressions:
+        print(f"\n❌ 성능 저하 감지 (허용 {args.threshold * 100:.0f}%):")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+
+    print(f"\n✅ 성능 저하 없음 (허용 {args.threshold * 100:.0f}%)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+위젯 조작 시 화면 재실행 시간 측정 (전체 재실행 vs 탭별 부분 재실행)
+
+Streamlit AppTest로 app.py를 실행해 보고서 단계까지 진행한 뒤,
+각 탭의 표 조회 위젯(페이지 이동, 목록 전환)을 반복 조작하며 재실행 1회 시간을 측정합니다.
+
+- full: INVENTORY_TAB_FRAGMENTS=0 (위젯을 조작할 때마다 5개 탭과 사이드바 전체를 다시 실행)
+- fragment: INVENTORY_TAB_FRAGMENTS=1 (조작한 탭만 다시 실행)
+
+AppTest는 위젯 조작을 항상 전체 재실행으로 처리하므로, fragment 모드에서는
+브라우저가 보내는 것과 같은 부분 재실행 요청(해당 탭의 fragment ID)으로 실행합니다.
+
+사용법:
+    python -m benchmarks.bench_rerun --skus 50000
+    python -m benchmarks.bench_rerun --skus 10000 --repeat 10 --json rerun_result.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import functools
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+from benchmarks.load_test import APP_PATH, DEFAULT_DATA_DIR, XLSX_MIME, _click, _check  # noqa: E402
+
+MODES = ['full', 'fragment']
+
+# (측정 이름, 위젯 종류, 위젯 키, 번갈아 설정할 두 값, 위젯이 있는 탭 fragment 키)
+INTERACTIONS = [
+    ('part_page', 'number_input', 'part_grid_page', (2, 1), 'tab_part'),
+    ('inventory_list', 'radio', 'inventory_list_type', ('재고차이리스트(-)', '전체재고리스트'), 'tab_count'),
+    ('inventory_page', 'number_input', 'inventory_grid_page', (2, 1), 'tab_count'),
+    ('adjustment_page', 'number_input', 'adjustment_grid_page', (2, 1), 'tab_adjustment'),
+]
+
+
+@contextmanager
+def fragment_rerun(at, fragment_key: Optional[str]):
+    """
+    at.run()을 해당 fragment의 부분 재실행 요청으로 실행 (fragment_key가 None이면 전체 재실행)
+
+    AppTest의 LocalScriptRunner가 만드는 재실행 요청(RerunData)에 fragment ID를 지정합니다.
+    """
+    if fragment_key is None:
+        yield
+        return
+    from streamlit.testing.v1 import local_script_runner
+
+    fragment_ids = at._fragment_storage.resolve_target(fragment_key)
+    original = local_script_runner.RerunData
+    local_script_runner.RerunData = functools.partial(
+        original, fragment_id_queue=fragment_ids, is_fragment_scoped_rerun=True
+    )
+    try:
+        yield
+    finally:
+        local_script_runner.RerunData = original
+
+
+def prepare_session(files: Dict[str, bytes], timeout: float):
+    """PART 업로드부터 점포 정보 입력(보고서 단계)까지 진행한 세션"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    at.run()
+    at.file_uploader(key='part_file').set_value(('PART_bench.xlsx', files['part'], XLSX_MIME))
+    at.run()
+    _click(at, '📊 데이터 분석하기').run()
+    _check(at, 'upload_part')
+    _click(at, '📥 템플릿 생성').run()
+    _check(at, 'template')
+    at.file_uploader(key='inventory_file').set_value(('실재고_bench.xlsx', files['count'], XLSX_MIME))
+    at.run()
+    _check(at, 'count_upload')
+    at.file_uploader(key='adjustment_file').set_value(('재고조정_bench.xlsx', files['adjustment'], XLSX_MIME))
+    at.run()
+    at.date_input(key='adjustment_start_date_form').set_value(date(2024, 12, 27))
+    at.date_input(key='adjustment_end_date_form').set_value(date(2025, 6, 27))
+    _click(at, '⚖️ 재고조정 적용').run()
+    _check(at, 'adjustment')
+    _click(at, '📋 보고서 생성').run()
+    _check(at, 'report')
+    return at
+
+
+def measure_mode(mode: str, files: Dict[str, bytes], repeat: int, timeout: float) -> Dict[str, List[float]]:
+    """모드별 위젯 조작 → 재실행 소요시간(초) 목록"""
+    os.environ['INVENTORY_TAB_FRAGMENTS'] = '1' if mode == 'fragment' else '0'
+    at = prepare_session(files, timeout)
+
+    timings: Dict[str, List[float]] = {}
+    for name, widget_type, key, values, fragment_key in INTERACTIONS:
+        timings[name] = []
+        for i in range(repeat):
+            getattr(at, widget_type)(key=key).set_value(values[i % 2])
+            start = time.perf_counter()
+            with fragment_rerun(at, fragment_key if mode == 'fragment' else None):
+                at.run()
+            timings[name].append(time.perf_counter() - start)
+            _check(at, name)
+            # 부분 재실행 결과에는 해당 탭 요소만 있으므로 다음 측정 전에 전체 화면 갱신
+            if mode == 'fragment':
+                at.run()
+        # 다음 조작이 기본 화면에서 시작하도록 원래 값으로 복원
+        getattr(at, widget_type)(key=key).set_value(values[1])
+        at.run()
+    return timings
+
+
+def run_benchmark(skus: int, repeat: int, timeout: float, data_dir: str) -> Dict:
+    paths = build_dataset(skus, data_dir)
+    files = {}
+    for kind in ('part', 'count', 'adjustment'):
+        with open(paths[kind], 'rb') as f:
+            files[kind] = f.read()
+
+    results = {}
+    for mode in MODES:
+        timings = measure_mode(mode, files, repeat, timeout)
+        results[mode] = {
+            name: {
+                'p50': round(float(np.percentile(values, 50)), 4),
+                'max': round(float(max(values)), 4),
+            }
+            for name, values in timings.items()
+        }
+    return {'skus': skus, 'repeat': repeat, 'modes': results}
+
+
+def print_report(report: Dict):
+    print(f"\n[{report['skus']:,} SKU, 조작당 {report['repeat']}회] 위젯 조작 → 재실행 시간 p50 (초)")
+    print(f"  {'조작':<18}{'full':>10}{'fragment':>10}{'배율':>8}")
+    full, fragment = report['modes']['full'], report['modes']['fragment']
+    for name in full:
+        ratio = full[name]['p50'] / fragment[name]['p50'] if fragment[name]['p50'] else float('inf')
+        print(f"  {name:<18}{full[name]['p50']:>10.3f}{fragment[name]['p50']:>10.3f}{ratio:>7.1f}x")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='탭별 부분 재실행 효과 측정')
+    parser.add_argument('--skus', type=int, default=50_000, help='합성 PART 품목 수')
+    parser.add_argument('--repeat', type=int, default=6, help='조작별 반복 횟수')
+    parser.add_argument('--timeout', type=float, default=600, help='스크립트 1회 실행 제한시간(초)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--json', dest='json_path', help='결과 JSON 저장 경로')
+    args = parser.parse_args(argv)
+
+    from streamlit.testing.v1 import AppTest
+    if not hasattr(AppTest, 'file_uploader'):
+        print("❌ 설치된 Streamlit의 AppTest가 파일 업로드를 지원하지 않습니다. Streamlit을 업그레이드해주세요.")
+        return 2
+
+    os.environ.setdefault('INVENTORY_SURVEY_DIR', tempfile.mkdtemp(prefix='bench_rerun_surveys_'))
+    os.environ.setdefault('INVENTORY_SHARED_CACHE_DIR', tempfile.mkdtemp(prefix='bench_rerun_cache_'))
+
+    report = run_benchmark(args.skus, args.repeat, args.timeout, args.data_dir)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
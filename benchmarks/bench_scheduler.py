@@ -0,0 +1,170 @@
+"""
+무거운 작업 스케줄러 동시 부하 측정
+
+N개의 세션(스레드)이 동시에 PART 분석 → 실재고 계산 → 엑셀 보고서 생성을 실행할 때
+제한 없음(unlimited)과 스케줄러 적용(scheduled)의 최대 RSS, 처리량, 세션별 완료시간을 비교합니다.
+모드마다 새 프로세스에서 실행하므로 RSS는 서로 영향을 주지 않습니다.
+
+사용법:
+    python -m benchmarks.bench_scheduler --sessions 8 --skus 10000
+    python -m benchmarks.bench_scheduler --sessions 8 --workers 1 --memory-mb 256
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import enable_copy_on_write  # noqa: E402
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+from benchmarks.load_test import DEFAULT_DATA_DIR, RssSampler, current_rss_mb  # noqa: E402
+
+MODES = ['unlimited', 'scheduled']
+
+
+def run_session(index: int, paths: Dict[str, str], scheduler):
+    """세션 하나의 무거운 단계 실행 (단계마다 스케줄러 차례를 기다림)"""
+    import pandas as pd
+    from utils.data_processor import PartDataProcessor
+    from utils.report_generator import ReportGenerator
+    from utils.task_scheduler import estimate_file_memory, estimate_report_memory
+    from benchmarks.bench_pipeline import STORE_INFO
+
+    session_id = f"session-{index}"
+    part_processor = PartDataProcessor()
+    report_generator = ReportGenerator()
+
+    with scheduler.slot(session_id, 'load_part_file', estimate_file_memory(paths['part']), poll_interval=0.05):
+        success, message, part_data = part_processor.load_part_file(paths['part'])
+        if not success:
+            raise RuntimeError(message)
+
+    with scheduler.slot(session_id, 'validate_inventory_data', estimate_file_memory(paths['count']),
+                        poll_interval=0.05):
+        count_df = pd.read_excel(paths['count'], engine='openpyxl')
+        success, message, inventory_data = part_processor.validate_inventory_data(count_df)
+        if not success:
+            raise RuntimeError(message)
+        del count_df
+
+    report_generator.generate_report_data(
+        inventory_data=inventory_data, store_info=STORE_INFO, part_data=part_data, final_data=inventory_data
+    )
+    with scheduler.slot(session_id, 'create_excel_report', estimate_report_memory([part_data, inventory_data]),
+                        poll_interval=0.05):
+        report_generator.create_excel_report()
+
+
+def run_mode(mode: str, sessions: int, workers: int, memory_mb: int, paths: Dict[str, str]) -> Dict:
+    """한 모드 측정 (이 프로세스에서 실행)"""
+    from utils.task_scheduler import HeavyTaskScheduler
+
+    if mode == 'unlimited':
+        scheduler = HeavyTaskScheduler(max_concurrent=sessions, memory_budget=1 << 62, max_queued=sessions * 3)
+    else:
+        scheduler = HeavyTaskScheduler(max_concurrent=workers, memory_budget=memory_mb * 1024 * 1024,
+                                       max_queued=sessions * 3)
+
+    durations: List[float] = []
+    failures: List[str] = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        start = time.perf_counter()
+        try:
+            run_session(index, paths, scheduler)
+            with lock:
+                durations.append(time.perf_counter() - start)
+        except Exception as e:
+            with lock:
+                failures.append(f"세션 {index + 1}: {e}")
+
+    sampler = RssSampler(interval=0.05)
+    rss_before = current_rss_mb()
+    sampler.start()
+    wall_start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - wall_start
+    sampler.stop()
+
+    values = np.array(durations) if durations else np.zeros(1)
+    stats = scheduler.stats()
+    return {
+        'mode': mode,
+        'completed': len(durations),
+        'failures': failures,
+        'wall_time_s': round(wall_time, 2),
+        'sessions_per_min': round(len(durations) / wall_time * 60, 2),
+        'session_p50_s': round(float(np.percentile(values, 50)), 2),
+        'session_p95_s': round(float(np.percentile(values, 95)), 2),
+        'avg_wait_s': stats['avg_wait_s'],
+        'rss_growth_mb': round(max(sampler.samples) - rss_before, 1) if sampler.samples and rss_before else None,
+    }
+
+
+def print_table(results: List[Dict], sessions: int, skus: int):
+    print(f"\n[세션 {sessions}개 × {skus:,} SKU 동시 실행]")
+    print(f"  {'모드':<12}{'완료':>6}{'총(초)':>9}{'세션/분':>9}{'p50(초)':>9}{'p95(초)':>9}"
+          f"{'평균대기':>9}{'RSS증가(MB)':>13}")
+    for result in results:
+        print(f"  {result['mode']:<12}{result['completed']:>6}{result['wall_time_s']:>9.2f}"
+              f"{result['sessions_per_min']:>9.2f}{result['session_p50_s']:>9.2f}{result['session_p95_s']:>9.2f}"
+              f"{result['avg_wait_s']:>9.2f}{result['rss_growth_mb'] or 0:>13.1f}")
+        for failure in result['failures']:
+            print(f"  ❌ {failure}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='무거운 작업 스케줄러 동시 부하 측정')
+    parser.add_argument('--sessions', type=int, default=8, help='동시 세션 수')
+    parser.add_argument('--skus', type=int, default=10_000, help='합성 PART 품목 수')
+    parser.add_argument('--workers', type=int, default=2, help='scheduled 모드 동시 실행 수')
+    parser.add_argument('--memory-mb', type=int, default=1024, help='scheduled 모드 예상 메모리 한도(MB)')
+    parser.add_argument('--modes', default=','.join(MODES), help='측정할 모드 (쉼표 구분)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--json', dest='json_path', help='결과 JSON 저장 경로')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    enable_copy_on_write()
+
+    paths = build_dataset(args.skus, args.data_dir)
+    if args.child:
+        # 새 프로세스에서 한 모드만 측정하고 결과를 JSON으로 출력
+        result = run_mode(args.child, args.sessions, args.workers, args.memory_mb, paths)
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    results = []
+    for mode in [mode.strip() for mode in args.modes.split(',') if mode.strip()]:
+        print(f"▶ {mode} 측정 중...", flush=True)
+        child = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_scheduler', '--child', mode,
+             '--sessions', str(args.sessions), '--skus', str(args.skus), '--workers', str(args.workers),
+             '--memory-mb', str(args.memory_mb), '--data-dir', args.data_dir],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        if child.returncode != 0:
+            print(child.stderr[-2000:])
+            return 1
+        results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+    print_table(results, args.sessions, args.skus)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 1 if any(result['failures'] for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+"""
+콜드 스타트 import 시간 측정 (python -X importtime)
+
+새 파이썬 프로세스에서 app.py를 Streamlit 없이(bare mode) 실행해 import 시간을 구간별로 합산하고
+예산(startup_budget.json)과 비교합니다.
+
+- before_first_paint: streamlit import 이후 ~ 첫 화면(제목) 표시 전까지 import한 모듈
+- first_paint_to_ready: 제목 표시 후 ~ 탭을 그리기 직전까지 import한 모듈 (pandas/utils 등)
+- utils_package: `import utils` (패키지만, 하위 모듈은 처음 사용할 때 import)
+
+Streamlit 서버는 스크립트 실행 전에 streamlit을 이미 import하므로 streamlit import 시간은 제외합니다.
+첫 화면 전에 무거운 모듈(pandas, numpy, pyarrow, openpyxl)을 import하거나 예산을 넘으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python -m benchmarks.bench_startup                     # 측정 후 예산과 비교
+    python -m benchmarks.bench_startup --repeat 10
+    python -m benchmarks.bench_startup --update-budget     # 측정값 × (1 + 여유율)로 예산 갱신
+"""
+import os
+import sys
+import json
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCHMARK_DIR)
+APP_PATH = os.path.join(ROOT_DIR, 'app.py')
+DEFAULT_BUDGET = os.path.join(BENCHMARK_DIR, 'startup_budget.json')
+
+MARK_PREFIX = '# startup-mark '
+DEFAULT_FORBIDDEN = ['pandas', 'numpy', 'pyarrow', 'openpyxl']
+
+# app.py 실행: st.title 호출 시점을 첫 화면, st.tabs 호출 시점을 준비 완료로 기록하고 종료
+APP_PROBE = f'''
+import sys, runpy
+sys.path.insert(0, {ROOT_DIR!r})
+import streamlit as st
+
+def mark(name):
+    sys.stderr.flush()
+    sys.stderr.write({MARK_PREFIX!r} + name + "\\n")
+    sys.stderr.flush()
+
+_title = st.title
+def title(*args, **kwargs):
+    mark('first_paint')
+    st.title = _title
+    return _title(*args, **kwargs)
+
+def tabs(*args, **kwargs):
+    mark('ready')
+    raise SystemExit(0)
+
+st.title = title
+st.tabs = tabs
+mark('start')
+runpy.run_path({APP_PATH!r}, run_name='__main__')
+'''
+
+UTILS_PROBE = f'''
+import sys
+sys.path.insert(0, {ROOT_DIR!r})
+sys.stderr.write({MARK_PREFIX!r} + "start\\n")
+sys.stderr.flush()
+import utils
+sys.stderr.write({MARK_PREFIX!r} + "ready\\n")
+'''
+
+
+def parse_importtime(stderr: str) -> Dict[str, List[Tuple[str, int]]]:
+    """-X importtime 출력 → 구간별 [(최상위 모듈, 누적 import 시간 us)] (구간은 마크 사이)"""
+    segments: Dict[str, List[Tuple[str, int]]] = {}
+    current = None
+    for line in stderr.splitlines():
+        if line.startswith(MARK_PREFIX):
+            current = line[len(MARK_PREFIX):].strip()
+            segments[current] = []
+            continue
+        if current is None or not line.startswith('import time:'):
+            continue
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2][1:]
+        # 들여쓰기가 없는 줄만 합산 (하위 import는 누적 시간에 포함)
+        if name and not name.startswith(' '):
+            segments[current].append((name.strip(), int(parts[1])))
+    return segments
+
+
+def run_probe(code: str) -> Dict[str, List[Tuple[str, int]]]:
+    env = dict(os.environ)
+    env['STOCK_APP_PERF'] = '0'
+    # 사이드바가 만드는 조사 저장소/공유 캐시는 임시 폴더에
+    with tempfile.TemporaryDirectory(prefix='bench_startup_') as scratch:
+        env.setdefault('INVENTORY_SURVEY_DIR', os.path.join(scratch, 'surveys'))
+        env.setdefault('INVENTORY_SHARED_CACHE_DIR', os.path.join(scratch, 'cache'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code],
+            capture_output=True, text=True, cwd=ROOT_DIR, env=env
+        )
+    segments = parse_importtime(result.stderr)
+    if 'ready' not in segments:
+        raise RuntimeError(f"시작 측정 실패 (종료 코드 {result.returncode}):\n{result.stderr[-2000:]}")
+    return segments
+
+
+def measure(repeat: int) -> Tuple[Dict[str, float], Dict[str, List[str]]]:
+    """구간별 import 시간(ms, repeat회 중 최솟값)과 첫 화면 전에 import한 최상위 모듈 목록"""
+    best: Dict[str, float] = {}
+    modules: Dict[str, List[str]] = {}
+    for _ in range(repeat):
+        app = run_probe(APP_PROBE)
+        utils = run_probe(UTILS_PROBE)
+        values = {
+            'app_before_first_paint': sum(us for _, us in app['start']) / 1000,
+            'app_first_paint_to_ready': sum(us for _, us in app['first_paint']) / 1000,
+            'utils_package': sum(us for _, us in utils['start']) / 1000,
+        }
+        for name, ms in values.items():
+            best[name] = round(min(best.get(name, ms), ms), 1)
+        modules = {
+            'before_first_paint': [name for name, _ in app['start']],
+            'first_paint_to_ready': [
+                name for name, _ in sorted(app['first_paint'], key=lambda item: -item[1])
+            ],
+        }
+    return best, modules
+
+
+def check(current: Dict[str, float], modules: Dict[str, List[str]], budget_doc: Dict) -> List[str]:
+    """예산 초과/금지 모듈 목록"""
+    failures = []
+    forbidden = budget_doc.get('forbidden_before_first_paint', DEFAULT_FORBIDDEN)
+    early = [name for name in modules['before_first_paint'] if name.split('.')[0] in forbidden]
+    if early:
+        failures.append(f"첫 화면 전에 import: {', '.join(early)}")
+    for name, limit in budget_doc.get('budget_ms', {}).items():
+        if name in current and current[name] > limit:
+            failures.append(f"{name}: {current[name]:.1f}ms > 예산 {limit:.1f}ms")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='콜드 스타트 import 시간 측정')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--budget', default=DEFAULT_BUDGET, help='예산 JSON 경로')
+    parser.add_argument('--update-budget', action='store_true', help='측정값으로 예산 갱신')
+    parser.add_argument('--headroom', type=float, default=1.0, help='예산 갱신 시 여유율 (1.0 = 100%%)')
+    args = parser.parse_args(argv)
+
+    current, modules = measure(args.repeat)
+
+    budget_doc = {}
+    if os.path.exists(args.budget):
+        with open(args.budget, encoding='utf-8') as f:
+            budget_doc = json.load(f)
+    budget = budget_doc.get('budget_ms', {})
+
+    print(f"\n[콜드 스타트 import 시간, {args.repeat}회 중 최솟값]")
+    print(f"  {'구간':<28}{'현재(ms)':>10}{'예산(ms)':>10}")
+    for name, ms in current.items():
+        limit = f"{budget[name]:.1f}" if name in budget else '-'
+        print(f"  {name:<28}{ms:>10.1f}{limit:>10}")
+    print(f"  첫 화면 전 최상위 import: {', '.join(modules['before_first_paint']) or '-'}")
+    print(f"  첫 화면 후 최상위 import: {', '.join(modules['first_paint_to_ready'][:8]) or '-'}")
+
+    if args.update_budget:
+        budget_doc = {
+            'updated_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': {
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+            },
+            'budget_ms': {name: round(ms * (1 + args.headroom), 1) for name, ms in current.items()},
+            'forbidden_before_first_paint': budget_doc.get('forbidden_before_first_paint', DEFAULT_FORBIDDEN),
+        }
+        with open(args.budget, 'w', encoding='utf-8') as f:
+            json.dump(budget_doc, f, ensure_ascii=False, indent=2)
+        print(f"\n✅ 예산 저장: {args.budget}")
+        return 0
+
+    failures = check(current, modules, budget_doc)
+    if failures:
+        print("\n❌ 시작 시간 예산 초과:")
+        for line in failures:
+            print(f"  - {line}")
+        return 1
+    print("\n✅ 시작 시간 예산 이내")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
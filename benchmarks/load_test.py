@@ -0,0 +1,315 @@
+"""
+Streamlit 앱 동시 접속 부하 테스트
+
+Streamlit AppTest로 app.py를 프로세스 안에서 직접 실행하여
+N개의 세션이 동시에 아래 흐름을 진행하도록 합니다. (외부 서버/브라우저 불필요)
+AppTest는 스크립트 실행 간 전역 상태를 공유하므로 각 스크립트 실행은 순서대로 처리되고,
+세션별 응답시간에는 다른 세션의 실행을 기다린 대기시간이 포함됩니다.
+(GIL 때문에 CPU 위주의 pandas 처리가 사실상 직렬로 진행되는 단일 서버 프로세스와 같은 조건)
+
+    PART 업로드·분석 → 템플릿 생성 → 실재고 업로드 → 재고조정 적용 → 보고서 생성 → 새 세션에서 이어하기
+
+단계별 응답시간 백분위수(p50/p90/p95/max)와 프로세스 RSS를 출력합니다.
+모든 세션을 유지한 채로 디스크로 내린 세션 데이터가 메모리에서 실제로 수거됐는지도 확인합니다.
+(--memory-limit-mb로 한도를 작게 주면 세션 데이터가 디스크로 내려감)
+
+사용법:
+    python -m benchmarks.load_test --sessions 10 --skus 10000
+    python -m benchmarks.load_test --sessions 5 --ramp 0.5 --json load_result.json
+    python -m benchmarks.load_test --sessions 3 --skus 2000 --memory-limit-mb 1
+"""
+import gc
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from datetime import date
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic_data import build_dataset  # noqa: E402
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data')
+XLSX_MIME = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+STEPS = ['upload_part', 'template', 'count_upload', 'adjustment', 'report', 'resume']
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 프로세스 RSS(MB) (psutil이 없으면 /proc 사용)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError):
+        return None
+
+
+class RssSampler(threading.Thread):
+    """부하 테스트 중 RSS를 주기적으로 기록"""
+
+    def __init__(self, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples: List[float] = []
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = current_rss_mb()
+            if rss is not None:
+                self.samples.append(rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+# AppTest는 실행마다 전역 상태(Runtime 싱글턴, 설정 값)를 바꾸므로 스크립트 실행 자체는 한 번에 하나씩 진행
+# (세션 상태는 세션별로 유지되고, 응답시간에는 다른 세션 실행을 기다린 대기시간이 포함됨)
+_RUN_LOCK = threading.Lock()
+
+
+def _run(at):
+    with _RUN_LOCK:
+        return at.run()
+
+
+def _click(at, label: str):
+    """라벨로 버튼(폼 제출 버튼 포함)을 찾아 클릭"""
+    for button in at.button:
+        if button.label == label:
+            return button.click()
+    messages = [element.value for element in at.error] + [e.message for e in at.exception]
+    raise LookupError(f"버튼을 찾을 수 없습니다: {label} {messages}")
+
+
+def _check(at, step: str):
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    errors = [element.value for element in at.error]
+    if errors:
+        raise RuntimeError(f"{step}: {errors[0]}")
+
+
+def spilled_frames_alive() -> Dict[str, int]:
+    """디스크로 내린 세션 데이터프레임 중 메모리에 남은 수 (앱의 세션 데이터 관리자 기준)"""
+    from utils.session_data import SessionDataManager
+
+    gc.collect()
+    managers = [obj for obj in gc.get_objects() if isinstance(obj, SessionDataManager)]
+    stats = [manager.stats() for manager in managers]
+    return {
+        'spill_count': sum(stat['spill_count'] for stat in stats),
+        'spilled_alive': sum(stat['spilled_alive'] for stat in stats),
+    }
+
+
+def run_session(files: Dict[str, bytes], timeout: float, apps: Optional[List] = None) -> Dict[str, float]:
+    """
+    세션 1개로 전체 흐름 실행 후 단계별 소요시간(초) 반환
+
+    apps: 실행한 AppTest를 담을 목록 (세션을 끝까지 유지해야 할 때)
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    if apps is not None:
+        apps.append(at)
+    _run(at)
+    timings = {}
+
+    # 1. PART 업로드 → 분석
+    start = time.perf_counter()
+    at.file_uploader(key='part_file').set_value(('PART_bench.xlsx', files['part'], XLSX_MIME))
+    _run(at)
+    _run(_click(at, '📊 데이터 분석하기'))
+    _check(at, 'upload_part')
+    timings['upload_part'] = time.perf_counter() - start
+
+    # 2. 템플릿 생성
+    start = time.perf_counter()
+    _run(_click(at, '📥 템플릿 생성'))
+    _check(at, 'template')
+    timings['template'] = time.perf_counter() - start
+
+    # 3. 실재고 파일 업로드
+    start = time.perf_counter()
+    at.file_uploader(key='inventory_file').set_value(('실재고_bench.xlsx', files['count'], XLSX_MIME))
+    _run(at)
+    _check(at, 'count_upload')
+    timings['count_upload'] = time.perf_counter() - start
+
+    # 4. 재고조정 파일 업로드 → 기간 설정 → 적용
+    start = time.perf_counter()
+    at.file_uploader(key='adjustment_file').set_value(('재고조정_bench.xlsx', files['adjustment'], XLSX_MIME))
+    _run(at)
+    at.date_input(key='adjustment_start_date_form').set_value(date(2024, 12, 27))
+    at.date_input(key='adjustment_end_date_form').set_value(date(2025, 6, 27))
+    _run(_click(at, '⚖️ 재고조정 적용'))
+    _check(at, 'adjustment')
+    timings['adjustment'] = time.perf_counter() - start
+
+    # 5. 점포 정보 입력 → 엑셀 보고서 생성
+    start = time.perf_counter()
+    _run(_click(at, '📋 보고서 생성'))
+    _run(_click(at, '📊 엑셀 보고서 생성'))
+    # 보고서는 백그라운드 작업으로 생성되므로 완료될 때까지 화면 갱신 반복
+    deadline = time.monotonic() + timeout
+    # (보고서 바이트는 세션 데이터 관리자에 있으므로 함께 설정되는 생성 시각으로 확인)
+    while at.session_state['excel_generation_time'] is None:
+        _check(at, 'report')
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"report: {timeout}초 안에 엑셀 보고서가 생성되지 않았습니다.")
+        time.sleep(0.2)
+        _run(at)
+    _check(at, 'report')
+    timings['report'] = time.perf_counter() - start
+
+    # 6. 새 세션에서 주소창의 조사 ID로 이어하기 (새로고침/재접속)
+    start = time.perf_counter()
+    resumed = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    if apps is not None:
+        apps.append(resumed)
+    resumed.query_params['survey'] = at.session_state['survey_id']
+    _run(resumed)
+    _check(resumed, 'resume')
+    if resumed.session_state['excel_generation_time'] is None:
+        raise RuntimeError("resume: 저장된 조사를 불러오지 못했습니다.")
+    timings['resume'] = time.perf_counter() - start
+
+    return timings
+
+
+def run_load_test(sessions: int, skus: int, ramp: float, timeout: float, data_dir: str) -> Dict:
+    paths = build_dataset(skus, data_dir)
+    files = {}
+    for kind, path in paths.items():
+        with open(path, 'rb') as f:
+            files[kind] = f.read()
+
+    results: List[Dict[str, float]] = []
+    failures: List[str] = []
+    apps: List = []
+    lock = threading.Lock()
+
+    def worker(index: int):
+        time.sleep(index * ramp)
+        try:
+            timings = run_session(files, timeout, apps)
+            with lock:
+                results.append(timings)
+        except Exception as e:
+            with lock:
+                failures.append(f"세션 {index + 1}: {e}")
+
+    sampler = RssSampler()
+    rss_before = current_rss_mb()
+    sampler.start()
+    wall_start = time.perf_counter()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    wall_time = time.perf_counter() - wall_start
+    sampler.stop()
+
+    # 세션이 모두 살아 있는 상태에서 디스크로 내린 데이터프레임이 수거됐는지 확인 후 세션 종료
+    spill = spilled_frames_alive()
+    if spill['spilled_alive']:
+        failures.append(f"디스크로 내린 데이터프레임 {spill['spilled_alive']}개가 메모리에 남아 있습니다.")
+    apps.clear()
+
+    step_stats = {}
+    for step in STEPS:
+        values = np.array([timings[step] for timings in results if step in timings])
+        if len(values) == 0:
+            continue
+        step_stats[step] = {
+            'p50': round(float(np.percentile(values, 50)), 3),
+            'p90': round(float(np.percentile(values, 90)), 3),
+            'p95': round(float(np.percentile(values, 95)), 3),
+            'max': round(float(values.max()), 3),
+        }
+
+    return {
+        'sessions': sessions,
+        'skus': skus,
+        'completed': len(results),
+        'failures': failures,
+        'wall_time_s': round(wall_time, 2),
+        'steps': step_stats,
+        'spill': spill,
+        'rss_mb': {
+            'before': round(rss_before, 1) if rss_before else None,
+            'peak': round(max(sampler.samples), 1) if sampler.samples else None,
+            'after': round(current_rss_mb() or 0, 1),
+        },
+    }
+
+
+def print_report(report: Dict):
+    print(f"\n[세션 {report['sessions']}개 × {report['skus']:,} SKU] "
+          f"완료 {report['completed']}/{report['sessions']}, 총 {report['wall_time_s']}초")
+    print(f"  {'단계':<16}{'p50':>9}{'p90':>9}{'p95':>9}{'max':>9}  (초)")
+    for step, stats in report['steps'].items():
+        print(f"  {step:<16}{stats['p50']:>9.3f}{stats['p90']:>9.3f}{stats['p95']:>9.3f}{stats['max']:>9.3f}")
+    rss = report['rss_mb']
+    print(f"  RSS: 시작 {rss['before']}MB / 최대 {rss['peak']}MB / 종료 {rss['after']}MB")
+    spill = report['spill']
+    print(f"  디스크로 내린 세션 데이터: {spill['spill_count']}회, 메모리에 남은 데이터프레임 {spill['spilled_alive']}개")
+    for failure in report['failures']:
+        print(f"  ❌ {failure}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='재고조사 앱 동시 세션 부하 테스트')
+    parser.add_argument('--sessions', type=int, default=5, help='동시 세션 수')
+    parser.add_argument('--skus', type=int, default=10_000, help='합성 PART 품목 수')
+    parser.add_argument('--ramp', type=float, default=0.0, help='세션 시작 간격(초)')
+    parser.add_argument('--timeout', type=float, default=600, help='스크립트 1회 실행 제한시간(초)')
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR, help='합성 데이터 저장 폴더')
+    parser.add_argument('--json', dest='json_path', help='결과 JSON 저장 경로')
+    parser.add_argument('--memory-limit-mb', type=int,
+                        help='세션 데이터 메모리 한도(MB), 넘으면 오래 쓰지 않은 세션 데이터를 디스크로 내림')
+    args = parser.parse_args(argv)
+
+    from streamlit.testing.v1 import AppTest
+    if not hasattr(AppTest, 'file_uploader'):
+        print("❌ 설치된 Streamlit의 AppTest가 파일 업로드를 지원하지 않습니다. Streamlit을 업그레이드해주세요.")
+        return 2
+
+    if args.memory_limit_mb is not None:
+        os.environ['SESSION_MEMORY_LIMIT_MB'] = str(args.memory_limit_mb)
+
+    # 부하 테스트 세션이 만드는 조사는 임시 폴더에 저장
+    os.environ.setdefault('INVENTORY_SURVEY_DIR', tempfile.mkdtemp(prefix='load_test_surveys_'))
+    # 이전 실행의 공유 캐시 결과를 재사용하지 않도록 공유 캐시도 임시 폴더 사용
+    os.environ.setdefault('INVENTORY_SHARED_CACHE_DIR', tempfile.mkdtemp(prefix='load_test_cache_'))
+
+    report = run_load_test(args.sessions, args.skus, args.ramp, args.timeout, args.data_dir)
+    print_report(report)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return 1 if report['failures'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
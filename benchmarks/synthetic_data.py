@@ -0,0 +1,295 @@
+"""
+재고조사 파이프라인 벤치마크용 합성 데이터 생성기
+
+실제 파일과 같은 컬럼 구성을 사용합니다.
+- PART 파일: ERP 부품 내보내기 27개 컬럼 (제작사 품번, 부품명, 재고, 재고액 등)
+- 실재고 파일: 실재고입력템플릿 9개 컬럼 (실재고/차이 일부 입력, 나머지는 '' 셀)
+- 재고조정 파일: 일자, 구분, 제작사품번, 부품명, 수량 5개 컬럼
+"""
+import os
+from datetime import datetime
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PART_COLUMNS = [
+    '상위카테고리명', '카테고리명', '부품코드', '제작사 품번', '부품명', '제작사', '판매단가', '공임액',
+    '합계', '단위', '재고', '재고액', '적정재고', '안전재고', '위치', '적립', '작업범위적용', '관리상태',
+    '부품상태', '메모', '판매가1', '판매가2', '판매가3', '지점판매가', '지점공임가', '연관부품', '최소발주량'
+]
+COUNT_SHEET_COLUMNS = ['제작사 품번', '부품명', '재고', '재고액', '단가', '실재고', '실재고액', '차이', '차액']
+ADJUSTMENT_COLUMNS = ['일자', '구분', '제작사품번', '부품명', '수량']
+
+_TOP_CATEGORIES = ['부품', '물류', '용품', '오일', '공구']
+_CATEGORIES = ['패드', '타이밍벨트', '라이닝', '라디에터/써모스탯/워터호스', '쇼바', '브레이크',
+               '조향장치', '내장/외장', '도어장치', '타이어/휠', '엔진오일']
+_ITEMS = ['팽창밸브', '배기온도센서', '터보차져스터드', '흡기가스켓', '오일쿨러', '허브베어링', '로워암볼트',
+          '브레이크패드', '타이밍벨트', '워터펌프', '에어컨가스', '엔진오일', '와이퍼', '점화플러그', '필터']
+_BRANDS = ['순정', '한국', '금호', '불스원', '후성', '모비스', '보쉬']
+_MODELS = ['포터2', '봉고3', '그랜드스타렉스', 'YF/K5', '싼타페', '아이오닉', 'G80', 'EQ900', 'K8', '쏘렌토']
+_ADJUSTMENT_TYPES = np.array(['수량변경(+)', '수량변경(-)', '누실', '파손'])
+
+
+def generate_part_codes(n: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    제작사 품번 생성 (object 배열, 중복 없음)
+
+    - 영숫자 혼합 (예: 976264E000, 소문자/앞뒤 공백 일부 포함)
+    - 엑셀 숫자 셀로 저장된 정수 품번 (예: 8801324221476)
+    - 0으로 시작하는 숫자 문자열 (예: 0510000191)
+    - 일부 빈 값(None)과 '' 셀
+    """
+    serial = rng.permutation(n) + 100000
+    kind = rng.choice(4, size=n, p=[0.55, 0.25, 0.15, 0.05])
+    letters = np.array(list('ABCDEFGHJKLMNPRSTUVWXYZ'))[rng.integers(0, 23, size=n)]
+    suffix = rng.integers(0, 1000, size=n)
+
+    codes = np.empty(n, dtype=object)
+    for i in range(n):
+        k = kind[i]
+        if k == 0:
+            codes[i] = f"{serial[i]:06d}{letters[i]}{suffix[i]:03d}"
+        elif k == 1:
+            codes[i] = int(8800000000000 + serial[i] * 7)
+        elif k == 2:
+            codes[i] = f"0{serial[i]:09d}"
+        else:
+            codes[i] = f" {serial[i]:06d}{letters[i].lower()}{suffix[i]:03d} "
+
+    # 빈 품번 (PART 로드 시 제외되는 행)
+    blank = rng.random(n) < 0.005
+    codes[blank & (rng.random(n) < 0.5)] = None
+    codes[blank & (codes != None)] = ''  # noqa: E711 (object 배열 비교)
+    return codes
+
+
+def generate_part_frame(n_skus: int, seed: int = 0) -> pd.DataFrame:
+    """PART 파일 데이터프레임 생성 (ERP 내보내기와 같은 27개 컬럼)"""
+    rng = np.random.default_rng(seed)
+    n = n_skus
+
+    names = np.char.add(
+        np.char.add(np.array(_ITEMS)[rng.integers(0, len(_ITEMS), n)], '_'),
+        np.char.add(
+            np.char.add(np.array(_BRANDS)[rng.integers(0, len(_BRANDS), n)], '_'),
+            np.array(_MODELS)[rng.integers(0, len(_MODELS), n)]
+        )
+    ).astype(object)
+    names = np.char.add(names.astype(str), np.char.mod('(%d)', rng.integers(1, 100, n))).astype(object)
+
+    sale_price = (rng.lognormal(9.5, 1.2, n).round(-2)).astype(np.int64)
+    labor = np.where(rng.random(n) < 0.6, 0, (rng.lognormal(9.5, 0.8, n).round(-3))).astype(np.int64)
+
+    stock = rng.integers(1, 60, n).astype(float)
+    stock[rng.random(n) < 0.3] = 0.0
+    stock[rng.random(n) < 0.002] = -1.0  # 음수 재고 (로드 시 0으로 보정)
+    # 이동평균 원가 (판매단가의 60~95%)
+    stock_value = (stock * sale_price * rng.uniform(0.6, 0.95, n)).round(0)
+    stock_value = np.where(stock > 0, stock_value, 0.0)
+
+    df = pd.DataFrame({
+        '상위카테고리명': np.array(_TOP_CATEGORIES)[rng.integers(0, len(_TOP_CATEGORIES), n)],
+        '카테고리명': np.array(_CATEGORIES)[rng.integers(0, len(_CATEGORIES), n)],
+        '부품코드': (100110000100000 + np.arange(n)).astype(str),
+        '제작사 품번': generate_part_codes(n, rng),
+        '부품명': names,
+        '제작사': None,
+        '판매단가': sale_price,
+        '공임액': labor,
+        '합계': sale_price + labor,
+        '단위': None,
+        '재고': stock,
+        '재고액': stock_value.astype(object),
+        '적정재고': np.nan,
+        '안전재고': 0.0,
+        '위치': None,
+        '적립': 4,
+        '작업범위적용': 0,
+        '관리상태': 0,
+        '부품상태': 'A',
+        '메모': None,
+        '판매가1': sale_price,
+        '판매가2': sale_price.astype(float),
+        '판매가3': 0.0,
+        '지점판매가': sale_price.astype(float),
+        '지점공임가': np.where(labor > 0, labor, np.nan),
+        '연관부품': None,
+        '최소발주량': np.nan,
+    }, columns=PART_COLUMNS)
+
+    # 재고액 일부를 '' 셀로 (숫자 변환 시 0 처리 대상)
+    df.loc[rng.random(n) < 0.002, '재고액'] = ''
+    return df
+
+
+def generate_count_sheet(part_df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """
+    작성 완료된 실재고 파일 생성 (템플릿과 같은 9개 컬럼, 재고 있는 품목만, 부품명 순)
+
+    - 70%: 실재고 = 재고 입력
+    - 10%: 실재고를 다른 값으로 입력
+    - 10%: 차이만 입력 (예: -2, +3)
+    - 10%: 미입력 ('' 셀)
+    """
+    rng = np.random.default_rng(seed + 1)
+    codes = part_df['제작사 품번']
+    stock = pd.to_numeric(part_df['재고'], errors='coerce').fillna(0)
+    value = pd.to_numeric(part_df['재고액'], errors='coerce').fillna(0)
+    rows = part_df[(stock > 0) & codes.notna() & (codes.astype(str) != '')]
+    rows = rows.sort_values('부품명', kind='stable')
+
+    n = len(rows)
+    stock = stock.loc[rows.index].to_numpy()
+    value = value.loc[rows.index].to_numpy()
+    unit_price = np.round(np.where(stock > 0, value / np.where(stock > 0, stock, 1), 0), 2)
+
+    case = rng.choice(4, size=n, p=[0.7, 0.1, 0.1, 0.1])
+    delta = rng.integers(-3, 4, n)
+    delta[delta == 0] = -1
+
+    counted = np.full(n, '', dtype=object)
+    counted[case == 0] = stock[case == 0].astype(np.int64)
+    counted[case == 1] = np.maximum(stock[case == 1] + delta[case == 1], 0).astype(np.int64)
+    diff = np.full(n, '', dtype=object)
+    diff[case == 2] = delta[case == 2]
+
+    return pd.DataFrame({
+        '제작사 품번': rows['제작사 품번'].to_numpy(),
+        '부품명': rows['부품명'].to_numpy(),
+        '재고': stock.astype(np.int64),
+        '재고액': value.astype(np.int64),
+        '단가': unit_price,
+        '실재고': counted,
+        '실재고액': '',
+        '차이': diff,
+        '차액': '',
+    }, columns=COUNT_SHEET_COLUMNS)
+
+
+def generate_adjustment_log(part_df: pd.DataFrame, n_rows: Optional[int] = None, seed: int = 0,
+                            end_date: datetime = datetime(2025, 6, 27)) -> pd.DataFrame:
+    """
+    재고조정 파일 생성 (최근 18개월, 5개 컬럼)
+
+    - 품번 표기 차이: 숫자/문자열 혼용, 앞뒤 공백, 대소문자
+    - 5%는 PART에 없는 품번
+    - 누실/파손 등 +/- 구분이 없는 행, 수량 0 행 포함
+    """
+    rng = np.random.default_rng(seed + 2)
+    codes = part_df['제작사 품번'].dropna()
+    codes = codes[codes.astype(str).str.strip() != ''].to_numpy()
+    n = n_rows if n_rows is not None else max(len(part_df) // 20, 100)
+
+    picked = codes[rng.integers(0, len(codes), n)].astype(object)
+    as_text = rng.random(n) < 0.3
+    picked[as_text] = [str(code).strip().upper() for code in picked[as_text]]
+    missing = rng.random(n) < 0.05
+    picked[missing] = [f"X{i:08d}" for i in rng.integers(0, 10 ** 8, int(missing.sum()))]
+
+    days = rng.integers(0, 548, n)
+    dates = pd.to_datetime(end_date) - pd.to_timedelta(days, unit='D')
+    quantity = np.maximum(rng.geometric(0.45, n), 1)
+    quantity[rng.random(n) < 0.01] = 0
+
+    name_lookup = dict(zip(part_df['제작사 품번'].astype(str), part_df['부품명']))
+    names = [name_lookup.get(str(code), '미등록부품') for code in picked]
+
+    return pd.DataFrame({
+        '일자': dates,
+        '구분': _ADJUSTMENT_TYPES[rng.choice(4, size=n, p=[0.4, 0.5, 0.08, 0.02])],
+        '제작사품번': picked,
+        '부품명': names,
+        '수량': quantity,
+    }, columns=ADJUSTMENT_COLUMNS).sort_values('일자', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def generate_digit_code_frames(part_df: pd.DataFrame, seed: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    품번이 모두 0으로 시작하는 숫자 문자열인 PART/재고조정 데이터 (CSV 타입 추론 검사용)
+
+    컬럼 전체가 숫자뿐이라 CSV 리더가 타입을 추론하면 정수가 되어 앞자리 0이 사라지는 경우
+    """
+    codes = np.array([f"00{i:08d}" for i in range(len(part_df))], dtype=object)
+    digit_part = part_df.assign(**{'제작사 품번': codes})
+    adjustments = generate_adjustment_log(digit_part, seed=seed)
+    # PART에 없는 품번(X...)과 대소문자 변형 없이 숫자 품번만
+    adjustments = adjustments[adjustments['제작사품번'].astype(str).str.isdigit()].reset_index(drop=True)
+    return digit_part, adjustments
+
+
+def write_xlsx(df: pd.DataFrame, path: str, sheet_name: str = 'Sheet1') -> str:
+    """openpyxl write-only 모드로 빠르게 xlsx 저장 (None/NaN은 빈 셀, ''는 문자열 셀)"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    worksheet.append(list(df.columns))
+
+    # datetime64 컬럼은 Timestamp(datetime 하위 클래스)로 변환되어 날짜 셀로 저장
+    columns = [df[col].to_numpy(dtype=object) for col in df.columns]
+
+    for row in zip(*columns):
+        worksheet.append([
+            None if value is None or (isinstance(value, float) and np.isnan(value)) else
+            (value.item() if isinstance(value, np.generic) else value)
+            for value in row
+        ])
+
+    workbook.save(path)
+    return path
+
+
+def write_parquet(df: pd.DataFrame, path: str) -> str:
+    """Parquet 저장 (섞인 타입 품번은 columnar_io 형식으로 보존)"""
+    import pyarrow.parquet as pq
+    from utils.columnar_io import frame_to_table
+
+    pq.write_table(frame_to_table(df), path)
+    return path
+
+
+def build_dataset(n_skus: int, directory: str, seed: int = 0) -> dict:
+    """
+    PART/실재고/재고조정 xlsx 파일 세트 + PART CSV/Parquet/Feather 생성 (이미 있는 파일은 재사용)
+
+    숫자 품번 CSV(part_digits_csv/adjustment_digits_csv)는 품번이 모두 0으로 시작하는 숫자인 PART/재고조정 CSV입니다.
+
+    Returns:
+        {'part': 경로, 'count': 경로, 'adjustment': 경로, 'part_csv': 경로, 'part_parquet': 경로, 'part_feather': 경로,
+         'part_digits_csv': 경로, 'adjustment_digits_csv': 경로}
+    """
+    from utils.columnar_io import write_frame
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {
+        'part': os.path.join(directory, f"PART_{n_skus}_{seed}.xlsx"),
+        'count': os.path.join(directory, f"count_{n_skus}_{seed}.xlsx"),
+        'adjustment': os.path.join(directory, f"adjustment_{n_skus}_{seed}.xlsx"),
+        'part_csv': os.path.join(directory, f"PART_{n_skus}_{seed}.csv"),
+        'part_parquet': os.path.join(directory, f"PART_{n_skus}_{seed}.parquet"),
+        'part_feather': os.path.join(directory, f"PART_{n_skus}_{seed}.feather"),
+        'part_digits_csv': os.path.join(directory, f"PART_digits_{n_skus}_{seed}.csv"),
+        'adjustment_digits_csv': os.path.join(directory, f"adjustment_digits_{n_skus}_{seed}.csv"),
+    }
+    missing = [name for name, path in paths.items() if not os.path.exists(path)]
+    if not missing:
+        return paths
+
+    part_df = generate_part_frame(n_skus, seed)
+    writers = {
+        'part': lambda path: write_xlsx(part_df, path),
+        'count': lambda path: write_xlsx(generate_count_sheet(part_df, seed), path),
+        'adjustment': lambda path: write_xlsx(generate_adjustment_log(part_df, seed=seed), path),
+        # ERP 내보내기와 같은 CP949 CSV
+        'part_csv': lambda path: part_df.to_csv(path, index=False, encoding='cp949'),
+        'part_parquet': lambda path: write_parquet(part_df, path),
+        'part_feather': lambda path: write_frame(part_df, path),
+        'part_digits_csv': lambda path: generate_digit_code_frames(part_df, seed)[0].to_csv(
+            path, index=False, encoding='cp949'),
+        'adjustment_digits_csv': lambda path: generate_digit_code_frames(part_df, seed)[1].to_csv(
+            path, index=False, encoding='cp949'),
+    }
+    for name in missing:
+        writers[name](paths[name])
+    return paths
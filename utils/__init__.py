@@ -1,12 +1,64 @@
 # utils 패키지
-from .data_processor import PartDataProcessor
-from .adjustment_processor import AdjustmentProcessor
-from .file_converter import ExcelFileConverter
-from .report_generator import ReportGenerator
-
-__all__ = [
-    'PartDataProcessor',
-    'AdjustmentProcessor', 
-    'ExcelFileConverter',
-    'ReportGenerator'
-] 
\ No newline at end of file
+import importlib
+
+# 공개 이름 → 정의된 모듈 (처음 사용할 때 모듈을 import: 패키지 import 시 보고서/파일 읽기 모듈을 미리 읽지 않음)
+_EXPORTS = {
+    'PartDataProcessor': 'data_processor',
+    'AdjustmentProcessor': 'adjustment_processor',
+    'ExcelFileConverter': 'file_converter',
+    'ReportGenerator': 'report_generator',
+    'PagedTable': 'data_grid',
+    'ReportJobManager': 'report_jobs',
+    'TemplateCache': 'inventory_template',
+    'write_template_xlsx': 'inventory_template',
+    'part_fingerprint': 'inventory_template',
+    'template_split': 'inventory_template',
+    'validate_part_data': 'data_validator',
+    'validate_count_sheet': 'data_validator',
+    'PartKeyIndex': 'part_key',
+    'normalize_part_codes': 'part_key',
+    'SurveyStore': 'survey_store',
+    'SurveyHistory': 'survey_history',
+    'compare_surveys': 'survey_history',
+    'SessionDataManager': 'session_data',
+    'SharedDiskCache': 'shared_cache',
+    'content_key': 'shared_cache',
+    'read_table': 'file_reader',
+    'read_count_sheet': 'file_reader',
+    'stream_count_sheet': 'count_stream',
+    'InventoryTotals': 'count_stream',
+    'HeavyTaskScheduler': 'task_scheduler',
+    'SchedulerBusy': 'task_scheduler',
+    'SheetPartCache': 'xlsx_parts',
+    'AdjustmentLedger': 'book_stock',
+    'book_stock_as_of': 'book_stock',
+    'export_time_from_filename': 'book_stock',
+    'ReviewQueue': 'review_queue',
+}
+
+__all__ = list(_EXPORTS) + ['enable_copy_on_write']
+
+
+def enable_copy_on_write():
+    """
+    pandas copy-on-write 켜기 (앱/API 서버/벤치마크 진입점에서 호출, 패키지 import만으로는 바꾸지 않음)
+
+    컬럼 선택/필터/assign 결과가 원본과 데이터를 공유하다가 값을 바꿀 때만 복사되어 복사량이 줄어듭니다.
+    각 처리기는 입력 데이터프레임을 직접 바꾸지 않고 새 데이터프레임을 반환하므로 꺼져 있어도 결과는 같습니다.
+    """
+    import pandas as pd
+    pd.set_option('mode.copy_on_write', True)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # 다음 접근부터는 모듈 속성으로 바로 조회
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
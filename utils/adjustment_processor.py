@@ -1,7 +1,13 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime, date
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
+
+from .perf_monitor import track_stage
+from .money import to_won, to_scaled_price, amount_won
+from .part_key import PART_KEY_COLUMN, PartKeyIndex, normalize_part_codes, part_keys
+from .file_reader import read_table
+from .book_stock import AdjustmentLedger
 
 class AdjustmentProcessor:
     """재고조정 파일 처리 클래스"""
@@ -9,12 +15,16 @@ class AdjustmentProcessor:
     def __init__(self):
         self.data = None
         self.filtered_data = None
+        # 전체 재고조정 기록의 품번별 누적 합 (self.data가 바뀌면 다시 생성)
+        self._ledger = None
+        self._ledger_source = None
     
+    @track_stage('load_adjustment_file')
     def load_adjustment_file(self, file_path: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
-        """재고조정 엑셀 파일을 로드"""
+        """재고조정 파일(xlsx/xls/csv/parquet/feather)을 로드"""
         try:
-            # openpyxl 엔진만 사용 (자동 변환된 .xlsx 파일)
-            df = pd.read_excel(file_path, engine='openpyxl')
+            # 형식별 리더로 읽기 (xlsx/xls/csv/parquet/feather, 세 번째 컬럼은 머리글 이름과 무관하게 품번 문자열)
+            df = read_table(file_path, text_columns=[2])
             
             # 기본 검증
             if len(df) == 0:
@@ -49,26 +59,17 @@ class AdjustmentProcessor:
     
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """데이터 정리"""
-        # 복사본 생성하여 경고 방지
-        df = df.copy()
-        
-        # 필수 컬럼 결측값 제거
-        df = df.dropna(subset=['제작사품번']).copy()  # 추가적인 copy() 호출
-        
-        # 일자 변환
-        df.loc[:, '일자'] = pd.to_datetime(df['일자'], errors='coerce')
-        df = df.dropna(subset=['일자']).copy()  # 추가적인 copy() 호출
-        
-        # 수량 변환
-        df.loc[:, '수량'] = pd.to_numeric(df['수량'], errors='coerce').fillna(0)
+        # 일자/수량 변환, 조정구분 추출
+        일자 = pd.to_datetime(df['일자'], errors='coerce')
+        수량 = pd.to_numeric(df['수량'], errors='coerce').fillna(0)
+        조정구분 = df['수량변경'].astype(str).apply(self._extract_type)
         
-        # 조정구분 추출
-        df.loc[:, '조정구분'] = df['수량변경'].astype(str).apply(self._extract_type)
+        # 유효한 데이터만 유지 (품번/일자 결측, 수량 0, 구분 없음 제외 - 필터링할 때 한 번만 복사)
+        valid = df['제작사품번'].notna() & 일자.notna() & (수량 != 0) & (조정구분 != '')
+        df = df.assign(일자=일자, 수량=수량, 조정구분=조정구분)[valid].reset_index(drop=True)
         
-        # 유효한 데이터만 유지
-        df = df[(df['수량'] != 0) & (df['조정구분'] != '')].copy()  # 추가적인 copy() 호출
-        
-        return df.reset_index(drop=True)
+        # 정규화 품번 키 (실재고 매칭용)
+        return df.assign(**{PART_KEY_COLUMN: normalize_part_codes(df['제작사품번'])})
     
     def _extract_type(self, value: str) -> str:
         """+/- 구분 추출"""
@@ -78,13 +79,16 @@ class AdjustmentProcessor:
             return '-'
         return ''
     
+    @track_stage('filter_by_date_range')
     def filter_by_date_range(self, start_date: date, end_date: date) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """날짜 범위 필터링"""
         if self.data is None:
             return False, "먼저 재고조정 파일을 로드해주세요.", None
         
-        mask = (self.data['일자'].dt.date >= start_date) & (self.data['일자'].dt.date <= end_date)
-        filtered_df = self.data[mask].copy()
+        # 날짜 객체로 바꾸지 않고 종료일 다음 날 0시 전까지로 비교
+        일자 = self.data['일자']
+        mask = (일자 >= pd.Timestamp(start_date)) & (일자 < pd.Timestamp(end_date) + pd.Timedelta(days=1))
+        filtered_df = self.data[mask]
         
         if len(filtered_df) == 0:
             return False, f"선택한 기간에 해당하는 데이터가 없습니다.", None
@@ -92,68 +96,96 @@ class AdjustmentProcessor:
         self.filtered_data = filtered_df
         return True, f"✅ 기간 필터링 완료 ({len(filtered_df):,}건)", filtered_df
     
+    @track_stage('apply_adjustments_to_inventory')
     def apply_adjustments_to_inventory(self, inventory_df: pd.DataFrame, part_data: pd.DataFrame) -> Tuple[bool, str, pd.DataFrame, Dict]:
         """재고조정을 실재고 데이터에 반영"""
         if self.filtered_data is None:
             return False, "먼저 재고조정 기간을 설정해주세요.", inventory_df, {}
         
-        result_df = inventory_df.copy()
-        summary = {'total_adjustments': 0, 'positive_adjustments': 0, 'negative_adjustments': 0,
-                  'positive_amount': 0, 'negative_amount': 0, 'unmatched_items': []}
-        
-        # 제작사품번별 재고조정 집계
-        adj_grouped = self.filtered_data.groupby(['제작사품번', '조정구분'])['수량'].sum().reset_index()
-        
-        # 매칭된 품목 수와 매칭 실패 수 추적
-        matched_count = 0
-        unmatched_count = 0
+        # 정규화 품번 키별 재고조정 집계 (' 12345 ', 12345, '12345'는 같은 품번)
+        adjustments = self.filtered_data.assign(**{PART_KEY_COLUMN: part_keys(self.filtered_data, '제작사품번')})
+        adj_grouped = adjustments.groupby([PART_KEY_COLUMN, '조정구분'], sort=False).agg(
+            제작사품번=('제작사품번', 'first'), 수량=('수량', 'sum')
+        ).reset_index()
+        
+        # 실재고 데이터에서 해당 품목 찾기 (같은 품번이 여러 행이면 모두 반영)
+        inventory_keys = part_keys(inventory_df, '제작사 품번')
+        inventory_rows = pd.DataFrame({
+            PART_KEY_COLUMN: inventory_keys.to_numpy(dtype=object),
+            '_row': np.arange(len(inventory_df))
+        })
+        matches = adj_grouped[[PART_KEY_COLUMN]].reset_index().merge(inventory_rows, on=PART_KEY_COLUMN, how='inner')
+        matched = adj_grouped.index.isin(matches['index'])
+        
+        # 단가는 inventory_df에서 가져오기 (이미 계산되어 있음, 첫 번째 매칭 행 기준)
+        price_scaled = to_scaled_price(inventory_df['단가'])
+        first_rows = matches.groupby('index')['_row'].min()
+        group_amount = np.zeros(len(adj_grouped), dtype=np.int64)
+        group_amount[first_rows.index] = amount_won(
+            adj_grouped['수량'].to_numpy()[first_rows.index], price_scaled[first_rows.to_numpy()]
+        )
+        adj_types = adj_grouped['조정구분'].to_numpy()
+        sign = np.where(adj_types == '+', 1, np.where(adj_types == '-', -1, 0))
+        
+        # 행별 조정 수량/금액 누적
+        match_groups = matches['index'].to_numpy()
+        match_rows = matches['_row'].to_numpy()
+        quantity_delta = np.zeros(len(inventory_df), dtype=np.float64)
+        amount_delta = np.zeros(len(inventory_df), dtype=np.int64)
+        np.add.at(quantity_delta, match_rows, sign[match_groups] * adj_grouped['수량'].to_numpy(dtype=np.float64)[match_groups])
+        np.add.at(amount_delta, match_rows, sign[match_groups] * group_amount[match_groups])
+        
+        실재고 = pd.to_numeric(inventory_df['실재고'], errors='coerce').to_numpy(dtype=np.float64) + quantity_delta
+        실재고액 = to_won(inventory_df['실재고액']) + amount_delta
+        
+        # 차이와 차액 재계산 (조정된 행만)
+        touched = np.zeros(len(inventory_df), dtype=bool)
+        touched[match_rows] = True
+        재고 = pd.to_numeric(inventory_df['재고'], errors='coerce').to_numpy(dtype=np.float64)
+        차이 = np.where(touched, 실재고 - 재고, pd.to_numeric(inventory_df['차이'], errors='coerce'))
+        차액 = np.where(touched, 실재고액 - to_won(inventory_df['재고액']), to_won(inventory_df['차액']))
+        
+        # 수량은 소수점 둘째 자리 반올림, 금액은 원 단위 정수 (바뀐 컬럼만 새로 만들고 나머지는 공유)
+        result_df = inventory_df.assign(실재고=np.round(실재고, 2), 실재고액=실재고액, 차이=np.round(차이, 2), 차액=차액)
+        
+        positive = matched & (sign > 0)
+        negative = matched & (sign < 0)
+        summary = {
+            'total_adjustments': int(matched.sum()),
+            'positive_adjustments': int(positive.sum()),
+            'negative_adjustments': int(negative.sum()),
+            'positive_amount': int(group_amount[positive].sum()),
+            'negative_amount': -int(group_amount[negative].sum()),  # 음수로 저장
+            'unmatched_items': self._unmatched_items(adj_grouped[~matched], inventory_keys, result_df['제작사 품번'])
+        }
         
-        for _, adj_row in adj_grouped.iterrows():
-            part_code = adj_row['제작사품번']
-            adj_type = adj_row['조정구분']
-            quantity = adj_row['수량']
-            
-            # 실재고 데이터에서 해당 품목 찾기
-            mask = result_df['제작사 품번'] == part_code
-            
-            if mask.any():
-                # 단가는 inventory_df에서 가져오기 (이미 계산되어 있음)
-                unit_price = result_df.loc[mask, '단가'].iloc[0]
-                adjustment_amount = quantity * unit_price
-                
-                if adj_type == '+':
-                    result_df.loc[mask, '실재고'] = result_df.loc[mask, '실재고'].astype(float) + float(quantity)
-                    result_df.loc[mask, '실재고액'] = result_df.loc[mask, '실재고액'].astype(float) + float(adjustment_amount)
-                    summary['positive_adjustments'] += 1
-                    summary['positive_amount'] += adjustment_amount
-                elif adj_type == '-':
-                    result_df.loc[mask, '실재고'] = result_df.loc[mask, '실재고'].astype(float) - float(quantity)
-                    result_df.loc[mask, '실재고액'] = result_df.loc[mask, '실재고액'].astype(float) - float(adjustment_amount)
-                    summary['negative_adjustments'] += 1
-                    summary['negative_amount'] -= adjustment_amount  # 음수로 저장
-                
-                # 차이와 차액 재계산
-                result_df.loc[mask, '차이'] = result_df.loc[mask, '실재고'].astype(float) - result_df.loc[mask, '재고'].astype(float)
-                result_df.loc[mask, '차액'] = result_df.loc[mask, '실재고액'].astype(float) - result_df.loc[mask, '재고액'].astype(float)
-                
-                summary['total_adjustments'] += 1
-                matched_count += 1
-            else:
-                summary['unmatched_items'].append({
-                    'part_code': part_code, 'quantity': quantity, 'type': adj_type
-                })
-                unmatched_count += 1
+        # 매칭된 품목 수와 매칭 실패 수
+        matched_count = summary['total_adjustments']
+        unmatched_count = len(summary['unmatched_items'])
         
         # 처리 결과 메시지에 상세 정보 포함
         message = f"✅ 재고조정 반영 완료 (매칭: {matched_count}건, 미매칭: {unmatched_count}건)"
         
-        # 반올림
-        for col in ['실재고', '실재고액', '차이', '차액']:
-            if col in result_df.columns:
-                result_df.loc[:, col] = result_df[col].round(2)
-        
         return True, message, result_df, summary
     
+    def _unmatched_items(self, unmatched: pd.DataFrame, inventory_keys: pd.Series,
+                         inventory_codes: pd.Series) -> List[Dict]:
+        """미매칭 품목 목록 (실재고 데이터의 유사 품번 후보 포함)"""
+        if unmatched.empty:
+            return []
+        
+        key_index = PartKeyIndex(inventory_keys, inventory_codes)
+        items = []
+        for row in unmatched.to_dict('records'):
+            candidates = key_index.suggest(row[PART_KEY_COLUMN])
+            items.append({
+                'part_code': row['제작사품번'],
+                'quantity': row['수량'],
+                'type': row['조정구분'],
+                'candidates': ', '.join(f"{c['code']} ({c['score']:.0%})" for c in candidates)
+            })
+        return items
+    
     def get_adjustment_summary(self) -> Dict:
         """재고조정 요약 통계"""
         if self.filtered_data is None:
@@ -168,13 +200,22 @@ class AdjustmentProcessor:
             'negative_records': len(negative_data),
             'positive_quantity': positive_data['수량'].sum(),
             'negative_quantity': negative_data['수량'].sum(),
-            'unique_parts': self.filtered_data['제작사품번'].nunique(),
+            'unique_parts': part_keys(self.filtered_data, '제작사품번').nunique(),
             'date_range': {
                 'start': self.filtered_data['일자'].min().strftime('%Y-%m-%d'),
                 'end': self.filtered_data['일자'].max().strftime('%Y-%m-%d')
             }
         }
     
+    def get_ledger(self) -> Optional[AdjustmentLedger]:
+        """전체 재고조정 기록의 품번별 누적 합 (시점 전산재고 재구성용, 기간 필터와 무관)"""
+        if self.data is None:
+            return None
+        if self._ledger_source is not self.data:
+            self._ledger = AdjustmentLedger(self.data)
+            self._ledger_source = self.data
+        return self._ledger
+    
     def get_filtered_data(self) -> Optional[pd.DataFrame]:
         """필터링된 재고조정 데이터 반환"""
         return self.filtered_data 
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import re
+from datetime import date, datetime
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .perf_monitor import track_stage
+from .part_key import part_keys
+from .money import to_won, to_scaled_price, amount_won
+
+# 파일명 속 내보내기 일시 (PART_20250627.xlsx, PART_2025-06-27_1530.xlsx, PART20250627153000.xlsx 등)
+_FILENAME_TIME_PATTERN = re.compile(
+    r'(?<!\d)(20\d{2})[-_.]?(\d{2})[-_.]?(\d{2})'
+    r'(?:[-_T ]?(\d{2})[-_:.]?(\d{2})(?:[-_:.]?(\d{2}))?)?(?!\d)'
+)
+
+TimeLike = Union[str, date, datetime, pd.Timestamp]
+
+
+def export_time_from_filename(filename: str) -> Optional[pd.Timestamp]:
+    """
+    파일명에서 내보내기 일시 추출 (없거나 올바른 날짜가 아니면 None)
+
+    시각이 없으면 그날 0시 (cutoff()에서 그날 전체로 처리)
+    """
+    match = _FILENAME_TIME_PATTERN.search(os.path.basename(str(filename)))
+    if match is None:
+        return None
+    parts = [int(value) if value else 0 for value in match.groups()]
+    try:
+        return pd.Timestamp(datetime(*parts))
+    except ValueError:
+        return None
+
+
+def cutoff(value: TimeLike) -> pd.Timestamp:
+    """
+    기준 시점 → 반영할 재고조정의 상한 (이 시각 전의 조정만 반영)
+
+    날짜만 있으면(0시) 그날 조정까지 포함하도록 다음 날 0시 (filter_by_date_range의 종료일과 같은 기준)
+    """
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_localize(None)
+    if timestamp == timestamp.normalize():
+        timestamp += pd.Timedelta(days=1)
+    return timestamp
+
+
+class AdjustmentLedger:
+    """
+    재고조정 기록의 품번별 누적 수량 (임의 시점의 전산재고 재구성용)
+
+    조정 기록을 (품번 키, 일자) 순으로 정렬해 부호 있는 수량의 누적 합을 만들어 두고,
+    품번/시점마다 이분 탐색으로 그 시점 전까지의 조정 합계를 구합니다 (품번당 O(log n), 전체 품번 한 번에 계산).
+    """
+
+    def __init__(self, adjustments: pd.DataFrame):
+        """
+        Args:
+            adjustments: AdjustmentProcessor.data (일자, 제작사품번, 수량, 조정구분)
+        """
+        keys = part_keys(adjustments, '제작사품번').to_numpy(dtype=object)
+        times = adjustments['일자'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        types = adjustments['조정구분'].to_numpy(dtype=object)
+        sign = np.where(types == '+', 1.0, np.where(types == '-', -1.0, 0.0))
+        quantity = sign * pd.to_numeric(adjustments['수량'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+
+        valid = keys != ''
+        codes, uniques = pd.factorize(keys[valid])
+        self._index = pd.Index(uniques)
+        self._times = np.unique(times[valid])
+
+        # (품번 코드, 일자 순위)를 정수 하나로 합쳐 정렬 → 품번별 구간이 이어지고 구간 안은 일자순
+        self._stride = len(self._times) + 1
+        composite = codes.astype(np.int64) * self._stride + np.searchsorted(self._times, times[valid])
+        order = np.argsort(composite, kind='stable')
+        self._composite = composite[order]
+        self._cumulative = np.concatenate([[0.0], np.cumsum(quantity[valid][order])])
+        self._starts = np.searchsorted(self._composite, np.arange(len(uniques), dtype=np.int64) * self._stride)
+
+    def __len__(self) -> int:
+        """조정 기록이 있는 품번 수"""
+        return len(self._index)
+
+    def net_before(self, keys, before: TimeLike) -> np.ndarray:
+        """
+        품번별로 before 전(미만)까지 누적된 조정 수량 (+ 증가, - 감소, 기록 없는 품번은 0)
+
+        Args:
+            keys: 정규화 품번 키
+            before: 상한 시각 (포함하지 않음, 날짜 기준이면 cutoff() 사용)
+        """
+        slots = self._index.get_indexer(pd.Series(keys, dtype=object).to_numpy())
+        found = slots >= 0
+        result = np.zeros(len(slots), dtype=np.float64)
+        if not found.any():
+            return result
+
+        rank = np.searchsorted(self._times, pd.Timestamp(before).to_datetime64().astype('datetime64[ns]').view(np.int64))
+        slots = slots[found].astype(np.int64)
+        ends = np.searchsorted(self._composite, slots * self._stride + rank)
+        result[found] = self._cumulative[ends] - self._cumulative[self._starts[slots]]
+        return result
+
+    def change_between(self, keys, start: TimeLike, end: TimeLike) -> np.ndarray:
+        """
+        품번별 start 시점 → end 시점 재고 변화량 (end가 더 이르면 되돌린 변화량)
+
+        시점은 cutoff() 기준 (날짜만 있으면 그날 조정까지 포함)
+        """
+        return self.net_before(keys, cutoff(end)) - self.net_before(keys, cutoff(start))
+
+
+@track_stage('book_stock_as_of', rows=lambda result, *args, **kwargs: len(result))
+def book_stock_as_of(inventory_df: pd.DataFrame, ledger: AdjustmentLedger,
+                     export_time: TimeLike, at_time: TimeLike) -> pd.DataFrame:
+    """
+    PART 내보내기 시점 재고를 at_time 시점 전산재고로 재구성 (실재고가 있으면 시점 기준 차이/차액 포함)
+
+    Args:
+        inventory_df: PART 데이터 또는 실재고 데이터 (제작사 품번, 부품명, 단가, 재고, 재고액)
+        ledger: 재고조정 누적 합
+        export_time: PART 내보내기 일시
+        at_time: 재구성할 시점 (보통 재고조사일)
+
+    Returns:
+        입력과 같은 행 순서의 데이터프레임 (조정수량 = 내보내기 → 기준 시점 사이 조정 합계)
+    """
+    delta = ledger.change_between(part_keys(inventory_df, '제작사 품번'), export_time, at_time)
+    재고 = pd.to_numeric(inventory_df['재고'], errors='coerce').to_numpy(dtype=np.float64)
+    시점재고액 = to_won(inventory_df['재고액']) + amount_won(delta, to_scaled_price(inventory_df['단가']))
+
+    result = pd.DataFrame({
+        '제작사 품번': inventory_df['제작사 품번'].to_numpy(),
+        '부품명': inventory_df['부품명'].to_numpy(),
+        '단가': inventory_df['단가'].to_numpy(),
+        '재고': 재고,
+        '재고액': to_won(inventory_df['재고액']),
+        '조정수량': np.round(delta, 2),
+        '시점재고': np.round(재고 + delta, 2),
+        '시점재고액': 시점재고액,
+    })
+    if '실재고' in inventory_df.columns:
+        실재고 = pd.to_numeric(inventory_df['실재고'], errors='coerce').to_numpy(dtype=np.float64)
+        result['실재고'] = 실재고
+        result['실재고액'] = to_won(inventory_df['실재고액'])
+        result['시점차이'] = np.round(실재고 - result['시점재고'].to_numpy(), 2)
+        result['시점차액'] = result['실재고액'].to_numpy() - 시점재고액
+    return result
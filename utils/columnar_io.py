@@ -0,0 +1,151 @@
+import os
+import json
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# 타입이 섞인 object 컬럼(예: 숫자 품번과 문자 품번)은 값 문자열 + 타입 코드 두 컬럼으로 저장
+_MIXED_SUFFIX = '\x00kind'
+_MIXED_META_KEY = b'inventory_app.mixed_columns'
+
+_KIND_NULL, _KIND_TEXT, _KIND_INT, _KIND_FLOAT, _KIND_BOOL = 0, 1, 2, 3, 4
+
+
+def _value_kinds(values: np.ndarray) -> np.ndarray:
+    """값별 타입 코드 (지원하지 않는 타입이 있으면 -1)"""
+    kinds = np.empty(len(values), dtype=np.int8)
+    for i, value in enumerate(values):
+        if isinstance(value, str):
+            kinds[i] = _KIND_TEXT
+        elif isinstance(value, (bool, np.bool_)):
+            kinds[i] = _KIND_BOOL
+        elif isinstance(value, (int, np.integer)):
+            kinds[i] = _KIND_INT
+        elif isinstance(value, (float, np.floating)):
+            kinds[i] = _KIND_NULL if np.isnan(value) else _KIND_FLOAT
+        elif value is None or value is pd.NaT:
+            kinds[i] = _KIND_NULL
+        else:
+            kinds[i] = -1
+    return kinds
+
+
+def _encode_mixed(values: np.ndarray):
+    """섞인 타입 컬럼 → (문자열 배열, 타입 코드 배열), 지원하지 않는 타입이면 None"""
+    kinds = _value_kinds(values)
+    if (kinds < 0).any():
+        return None
+    text = np.array([None if kind == _KIND_NULL else repr(value) if kind == _KIND_FLOAT else str(value)
+                     for value, kind in zip(values, kinds)], dtype=object)
+    return text, kinds
+
+
+def _decode_mixed(text: pd.Series, kinds: np.ndarray) -> np.ndarray:
+    values = np.full(len(text), None, dtype=object)
+    text = text.to_numpy(dtype=object)
+    # 문자열은 그대로, 정수는 배열 단위로 변환 (int64 범위를 넘으면 값별 변환)
+    positions = np.flatnonzero(kinds == _KIND_TEXT)
+    values[positions] = text[positions]
+    positions = np.flatnonzero(kinds == _KIND_INT)
+    if len(positions):
+        try:
+            values[positions] = text[positions].astype(np.int64).astype(object)
+        except OverflowError:
+            values[positions] = [int(value) for value in text[positions]]
+    for kind, convert in [(_KIND_FLOAT, float), (_KIND_BOOL, lambda value: value == 'True')]:
+        positions = np.flatnonzero(kinds == kind)
+        if len(positions):
+            values[positions] = [convert(value) for value in text[positions]]
+    return values
+
+
+def frame_to_table(df: pd.DataFrame) -> pa.Table:
+    """
+    데이터프레임 → Arrow 테이블 (값 타입 보존)
+
+    Arrow가 바로 변환하지 못하는 섞인 타입 object 컬럼은 타입 코드를 붙여 저장하므로
+    읽을 때 숫자 품번은 숫자, 문자 품번은 문자로 그대로 복원됩니다.
+    """
+    columns = {}
+    mixed = []
+    for column in df.columns:
+        series = df[column]
+        if series.dtype == object:
+            try:
+                pa.array(series, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                encoded = _encode_mixed(series.to_numpy(dtype=object))
+                if encoded is None:
+                    raise
+                columns[column] = pd.Series(encoded[0], index=df.index, dtype=object)
+                columns[column + _MIXED_SUFFIX] = pd.Series(encoded[1], index=df.index)
+                mixed.append(column)
+                continue
+        columns[column] = series
+
+    encoded_df = pd.DataFrame(columns, index=df.index)
+    table = pa.Table.from_pandas(encoded_df, preserve_index=None)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_MIXED_META_KEY] = json.dumps(mixed, ensure_ascii=False).encode('utf-8')
+    return table.replace_schema_metadata(metadata)
+
+
+def table_to_frame(table: pa.Table, date_as_object: bool = True) -> pd.DataFrame:
+    """
+    Arrow 테이블 → 데이터프레임 (frame_to_table로 저장한 섞인 타입 컬럼 복원)
+
+    date_as_object=False이면 날짜 컬럼을 엑셀에서 읽은 것과 같은 datetime64로 변환
+    """
+    metadata = table.schema.metadata or {}
+    mixed = json.loads(metadata.get(_MIXED_META_KEY, b'[]').decode('utf-8'))
+    df = table.to_pandas(date_as_object=date_as_object)
+    for column in mixed:
+        kind_column = column + _MIXED_SUFFIX
+        if column not in df.columns or kind_column not in df.columns:
+            # 일부 컬럼만 읽은 경우
+            continue
+        df[column] = _decode_mixed(df[column], df[kind_column].to_numpy(dtype=np.int8))
+        df = df.drop(columns=[kind_column])
+    return df
+
+
+def stored_columns(columns: List[str], names: List[str]) -> List[str]:
+    """
+    저장된 파일에서 읽을 컬럼 목록 (일부 컬럼만 읽을 때 사용)
+
+    파일에 없는 컬럼은 빼고, 섞인 타입 컬럼은 타입 코드 컬럼을 함께 포함합니다.
+    """
+    selected = []
+    for column in columns:
+        if column in names:
+            selected.append(column)
+            if column + _MIXED_SUFFIX in names:
+                selected.append(column + _MIXED_SUFFIX)
+    return selected
+
+
+def write_frame(df: pd.DataFrame, path: str):
+    """
+    데이터프레임을 Arrow IPC(Feather v2) 파일로 저장 (압축 없음 → 메모리 맵으로 바로 읽기 가능)
+
+    임시 파일에 쓴 뒤 교체하므로 저장 중 중단돼도 기존 파일이 깨지지 않습니다.
+    """
+    table = frame_to_table(df)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with pa.OSFile(temp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def read_frame(path: str) -> pd.DataFrame:
+    """write_frame으로 저장한 파일을 메모리 맵으로 읽기"""
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table_to_frame(table)
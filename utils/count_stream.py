@@ -0,0 +1,271 @@
+import os
+import glob
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .perf_monitor import track_stage
+from .columnar_io import table_to_frame, write_frame, read_frame
+from .file_reader import file_format, read_table
+from .inventory_template import META_SHEET_NAME, ROW_KEY_COLUMN, count_sheet_names
+from .data_validator import validate_count_sheet, validate_duplicate_codes, merge_check_results
+from .money import to_won, to_scaled_price, amount_won
+
+# 한 번에 처리하는 행 수 (메모리 사용량은 이 크기에 비례)
+DEFAULT_CHUNK_ROWS = 20_000
+
+_NUMERIC_COLUMNS = ['재고', '재고액', '단가', '실재고', '실재고액', '차이', '차액']
+_REQUIRED_COLUMNS = ['제작사 품번', '부품명'] + _NUMERIC_COLUMNS
+
+
+class InventoryTotals:
+    """
+    전산재고 vs 실재고 비교 합계 (행 단위 합계라 나눠서 누적해도 결과가 같음)
+
+    계산된 실재고 데이터(validate_inventory_data 결과)를 add()로 넘기면 누적합니다.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.increased_rows = 0
+        self.decreased_rows = 0
+        self.positive_amount = 0
+        self.negative_amount = 0
+        # 실재고 시트의 재고 × 단가 합계 (PART 재고액이 없을 때 전산재고액 추정용)
+        self.estimated_stock_value = 0
+
+    def add(self, inventory_data: pd.DataFrame) -> 'InventoryTotals':
+        차이 = pd.to_numeric(inventory_data['차이'], errors='coerce').to_numpy()
+        차액 = to_won(inventory_data['차액'])
+        self.rows += len(inventory_data)
+        self.increased_rows += int((차이 > 0).sum())
+        self.decreased_rows += int((차이 < 0).sum())
+        self.positive_amount += int(차액[차이 > 0].sum())
+        self.negative_amount += abs(int(차액[차이 < 0].sum()))
+        self.estimated_stock_value += int(
+            amount_won(inventory_data['재고'], to_scaled_price(inventory_data['단가'])).sum()
+        )
+        return self
+
+    def comparison(self, computer_stock_value: Optional[int] = None) -> Dict:
+        """
+        ReportGenerator 비교 결과 형식
+
+        Args:
+            computer_stock_value: 전산재고액 (None이면 실재고 시트의 재고 × 단가 합계)
+        """
+        if computer_stock_value is None:
+            computer_stock_value = self.estimated_stock_value
+        return {
+            'computer_stock_value': computer_stock_value,
+            'positive_amount': self.positive_amount,
+            'negative_amount': self.negative_amount,
+            'final_stock_value': computer_stock_value + self.positive_amount - self.negative_amount,
+            'difference': self.positive_amount - self.negative_amount,
+        }
+
+
+def _header_names(header: tuple) -> List:
+    """머리글 행 → 컬럼명 (pd.read_excel과 같이 빈 머리글은 'Unnamed: n')"""
+    names = list(header)
+    while names and names[-1] is None:
+        names.pop()
+    return [f"Unnamed: {i}" if name is None else name for i, name in enumerate(names)]
+
+
+def _open_xlsx(path: str):
+    """openpyxl 읽기 전용 모드로 열기 (시트 크기 정보가 없는 파일은 열 때 시트를 한 번 훑으므로 한 번만 열어 사용)"""
+    from openpyxl import load_workbook
+    return load_workbook(path, read_only=True, data_only=True)
+
+
+def _iter_sheet_chunks(worksheet, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """읽기 전용 시트를 행 단위로 읽어 chunk_rows씩 반환 (첫 행은 머리글)"""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    names = _header_names(header)
+    width = len(names)
+
+    buffer: List[tuple] = []
+    # 빈 행은 뒤에 값이 있는 행이 나올 때만 포함 (pd.read_excel과 같이 끝의 빈 행 제외)
+    pending_blank = 0
+    for row in rows:
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        if all(value is None for value in row):
+            pending_blank += 1
+            continue
+        buffer.extend([(None,) * width] * pending_blank)
+        pending_blank = 0
+        buffer.append(row)
+        if len(buffer) >= chunk_rows:
+            yield pd.DataFrame.from_records(buffer[:chunk_rows], columns=names)
+            buffer = buffer[chunk_rows:]
+    if buffer:
+        yield pd.DataFrame.from_records(buffer, columns=names)
+
+
+def _workbook_meta(workbook) -> Optional[Dict]:
+    """템플릿 메타 시트 읽기 (read_template_meta와 같은 결과, 앱에서 만든 템플릿이 아니면 None)"""
+    if META_SHEET_NAME not in workbook.sheetnames:
+        return None
+    rows = list(workbook[META_SHEET_NAME].iter_rows(values_only=True))
+    # 첫 행은 머리글
+    if len(rows) < 2 or len(rows[0]) < 2:
+        return None
+    return {str(row[0]): row[1] for row in rows[1:] if len(row) >= 2}
+
+
+def _count_worksheets(workbook, meta: Optional[Dict]) -> List:
+    """실재고 입력 시트 (조별 분할 템플릿이면 나눈 시트 전부, 아니면 첫 번째 시트)"""
+    return [workbook[name] for name in count_sheet_names(workbook.sheetnames, meta)]
+
+
+def iter_count_chunks(path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    실재고 파일을 chunk_rows행씩 읽기
+
+    - xlsx: openpyxl 읽기 전용 모드 (시트 전체를 메모리에 올리지 않음, 조별 분할 템플릿은 시트 순서대로)
+    - parquet: 행 묶음 단위로 읽기
+    - feather/arrow: 메모리 맵 테이블을 잘라서 변환
+    - csv/xls: 전체를 읽은 뒤 나눠서 반환 (CSV는 pyarrow로 읽어 엑셀보다 메모리 사용량이 작음)
+    """
+    fmt = file_format(path)
+    if fmt == 'xlsx':
+        workbook = _open_xlsx(path)
+        try:
+            for worksheet in _count_worksheets(workbook, _workbook_meta(workbook)):
+                yield from _iter_sheet_chunks(worksheet, chunk_rows)
+        finally:
+            workbook.close()
+    elif fmt == 'parquet':
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            yield table_to_frame(pa.Table.from_batches([batch], schema=parquet_file.schema_arrow), date_as_object=False)
+    elif fmt == 'feather':
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+            for start in range(0, table.num_rows, chunk_rows):
+                yield table_to_frame(table.slice(start, chunk_rows), date_as_object=False)
+    else:
+        df = read_table(path)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows].reset_index(drop=True)
+
+
+def _read_chunks(out_dir: str) -> pd.DataFrame:
+    paths = sorted(glob.glob(os.path.join(out_dir, 'chunk-*.arrow')))
+    if not paths:
+        return pd.DataFrame(columns=_REQUIRED_COLUMNS)
+    return pd.concat([read_frame(path) for path in paths], ignore_index=True)
+
+
+@track_stage('stream_count_sheet', rows=lambda result, *args, **kwargs: len(result[2]) if result[2] is not None else 0)
+def stream_count_sheet(path: str, processor, out_dir: str, part_data: Optional[pd.DataFrame] = None,
+                       part_fingerprint: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                       progress_callback: Optional[Callable[[int, Optional[int], InventoryTotals], None]] = None
+                       ) -> Tuple[bool, str, Optional[pd.DataFrame], Dict]:
+    """
+    대용량 실재고 파일을 나눠서 검사/계산 (메모리 사용량이 chunk_rows에 비례)
+
+    행 묶음마다 원본 값 검사 → 숫자 변환/실재고액 계산(processor.validate_inventory_data) → 합계 누적 후
+    out_dir에 Arrow 파일로 저장하고, 끝나면 저장한 파일을 합쳐 반환합니다.
+    품번 중복은 행 묶음을 넘어 검사해야 하므로 끝에 전체 품번 키로 한 번 검사합니다.
+
+    현재 PART로 만든 앱 템플릿(part_fingerprint 일치)이면 행 키 정렬(align_to_template)이 계산보다
+    먼저여야 하므로 숫자 변환한 입력값만 저장하고 info['needs_alignment']=True를 반환합니다.
+    (호출한 쪽에서 정렬 후 validate_inventory_data 실행, 진행 중 합계는 정렬 전 기준)
+
+    Args:
+        path: 실재고 파일 경로
+        processor: PartDataProcessor
+        out_dir: 행 묶음 결과를 저장할 폴더
+        part_data: PART 데이터 (PART에 없는 품번 검사용)
+        part_fingerprint: 현재 PART 지문 (템플릿 판별용)
+        chunk_rows: 한 번에 처리할 행 수
+        progress_callback: 행 묶음 처리 후 호출 (처리한 행 수, 전체 행 수 추정치 또는 None, 누적 합계)
+
+    Returns:
+        (성공여부, 메시지, 데이터프레임, {'totals', 'validation', 'template_meta', 'needs_alignment'})
+    """
+    workbook = _open_xlsx(path) if file_format(path) == 'xlsx' else None
+    try:
+        return _stream(path, workbook, processor, out_dir, part_data, part_fingerprint, chunk_rows, progress_callback)
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def _stream(path, workbook, processor, out_dir, part_data, part_fingerprint, chunk_rows, progress_callback):
+    if workbook is not None:
+        template_meta = _workbook_meta(workbook)
+        worksheets = _count_worksheets(workbook, template_meta)
+        # 시트 크기 정보 기준 추정치 (진행률 표시용)
+        sizes = [worksheet.max_row for worksheet in worksheets]
+        total_rows = sum(size - 1 for size in sizes) if all(sizes) else None
+        # (시트 이름, 행 묶음) - 데이터 검사 결과는 시트별 행 번호로 표시
+        chunks = (
+            (worksheet.title, chunk)
+            for worksheet in worksheets for chunk in _iter_sheet_chunks(worksheet, chunk_rows)
+        )
+    else:
+        template_meta = None
+        total_rows = None
+        chunks = ((None, chunk) for chunk in iter_count_chunks(path, chunk_rows))
+    is_template = bool(template_meta) and part_fingerprint is not None \
+        and template_meta.get('part_fingerprint') == part_fingerprint
+
+    os.makedirs(out_dir, exist_ok=True)
+    totals = InventoryTotals()
+    checks = []
+    needs_alignment = False
+    processed_rows = 0
+    # 시트 이름 → 지금까지 읽은 행 수 (시트 순서 유지)
+    sheet_rows: Dict[str, int] = {}
+
+    for index, (sheet, chunk) in enumerate(chunks):
+        missing_cols = [col for col in _REQUIRED_COLUMNS if col not in chunk.columns]
+        if missing_cols:
+            return False, f"필수 컬럼이 없습니다: {', '.join(missing_cols)}", None, {}
+
+        if sheet is None:
+            checks.append(validate_count_sheet(chunk, part_data, row_offset=processed_rows, check_duplicates=False))
+        else:
+            checks.append(validate_count_sheet(chunk, part_data, row_offset=sheet_rows.get(sheet, 0),
+                                               check_duplicates=False, sheets=[(sheet, len(chunk))]))
+            sheet_rows[sheet] = sheet_rows.get(sheet, 0) + len(chunk)
+        needs_alignment = is_template and ROW_KEY_COLUMN in chunk.columns
+
+        success, message, valued = processor.validate_inventory_data(chunk)
+        if not success:
+            return False, message, None, {}
+        totals.add(valued)
+
+        if needs_alignment:
+            stored = chunk
+            for col in _NUMERIC_COLUMNS:
+                stored[col] = pd.to_numeric(stored[col], errors='coerce')
+        else:
+            stored = valued.drop(columns=[ROW_KEY_COLUMN], errors='ignore')
+            # 행 묶음마다 정수/실수가 달라지지 않도록 단가는 실수로 통일
+            stored['단가'] = stored['단가'].astype(np.float64)
+        write_frame(stored, os.path.join(out_dir, f"chunk-{index:05d}.arrow"))
+
+        processed_rows += len(chunk)
+        del chunk, valued, stored
+        if progress_callback is not None:
+            progress_callback(processed_rows, total_rows, totals)
+
+    data = _read_chunks(out_dir)
+    checks.append(validate_duplicate_codes(data, sheets=list(sheet_rows.items()) or None))
+    info = {
+        'totals': totals,
+        'validation': merge_check_results(checks, processed_rows),
+        'template_meta': template_meta,
+        'needs_alignment': needs_alignment,
+    }
+    return True, "✅ 실재고 데이터 처리 완료", data, info
@@ -0,0 +1,100 @@
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from typing import Optional, Tuple, Dict, List
+
+
+class PagedTable:
+    """대용량 데이터프레임 페이지 조회 클래스 (서버 측 정렬/필터/페이지 분할)"""
+
+    # 정렬/필터 조합별 결과를 최근 사용한 순으로 보관할 최대 개수 (검색어마다 쌓이지 않도록)
+    VIEW_CACHE_SIZE = 8
+
+    def __init__(self, df: pd.DataFrame, positions: Optional[np.ndarray] = None):
+        """
+        Args:
+            df: 원본 데이터프레임 (복사하지 않고 참조만 유지)
+            positions: 표시할 행 위치 배열 (예: 재고차이(-) 행만), None이면 전체 행
+        """
+        self.df = df
+        self.positions = (
+            np.arange(len(df), dtype=np.int64) if positions is None
+            else np.asarray(positions, dtype=np.int64)
+        )
+        # (컬럼, 오름차순 여부)별 정렬 순서 (positions 기준 위치 배열)
+        self._sort_orders: Dict[Tuple[str, bool], np.ndarray] = {}
+        # (정렬 컬럼, 정렬 방향, 필터 컬럼, 검색어) 조합별 최종 행 위치 (LRU)
+        self._view_cache: 'OrderedDict[Tuple, np.ndarray]' = OrderedDict()
+
+    @property
+    def columns(self) -> List[str]:
+        return [col for col in self.df.columns if not str(col).startswith('_')]
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def _sort_order(self, column: str, ascending: bool = True) -> np.ndarray:
+        """컬럼 정렬 순서 계산 (방향별 최초 1회만 계산 후 재사용, 결측값은 방향과 관계없이 맨 뒤)"""
+        key = (column, ascending)
+        if key not in self._sort_orders:
+            values = pd.Series(self.df[column].to_numpy()[self.positions])
+            if values.dtype == object or values.dtype.kind in 'OUS':
+                # 숫자/문자 혼합 컬럼은 문자열 기준 정렬 (결측값은 그대로 두어 맨 뒤로)
+                present = values.notna()
+                values = values.where(~present, values[present].astype(str).str.strip().str.upper())
+            sorted_values = values.sort_values(ascending=ascending, na_position='last', kind='stable')
+            order = sorted_values.index.to_numpy()
+            self._sort_orders[key] = self.positions[order]
+        return self._sort_orders[key]
+
+    def _filter_mask(self, column: Optional[str], query: str) -> np.ndarray:
+        """검색어 포함 여부 마스크 (df 전체 행 기준)"""
+        columns = [column] if column else self.columns
+        mask = np.zeros(len(self.df), dtype=bool)
+        for col in columns:
+            values = self.df[col].iloc[self.positions].astype(str)
+            mask[self.positions] |= values.str.contains(query, case=False, regex=False, na=False).to_numpy()
+        return mask
+
+    def view_positions(self, sort_column: Optional[str] = None, ascending: bool = True,
+                       filter_text: str = '', filter_column: Optional[str] = None) -> np.ndarray:
+        """정렬/필터가 적용된 행 위치 배열 반환 (최근 사용한 조합 VIEW_CACHE_SIZE개 캐시)"""
+        query = (filter_text or '').strip()
+        cache_key = (sort_column, ascending, filter_column if query else None, query)
+
+        order = self._view_cache.get(cache_key)
+        if order is not None:
+            self._view_cache.move_to_end(cache_key)
+            return order
+
+        if sort_column:
+            order = self._sort_order(sort_column, ascending)
+        else:
+            order = self.positions if ascending else self.positions[::-1]
+        if query:
+            order = order[self._filter_mask(filter_column, query)[order]]
+        self._view_cache[cache_key] = order
+        while len(self._view_cache) > self.VIEW_CACHE_SIZE:
+            self._view_cache.popitem(last=False)
+        return order
+
+    def get_page(self, page: int, page_size: int = 50, sort_column: Optional[str] = None,
+                 ascending: bool = True, filter_text: str = '',
+                 filter_column: Optional[str] = None) -> Tuple[pd.DataFrame, int, int]:
+        """
+        한 페이지 분량의 행만 추출
+
+        Returns:
+            (페이지 데이터프레임, 조건에 맞는 전체 행 수, 전체 페이지 수)
+        """
+        order = self.view_positions(sort_column, ascending, filter_text, filter_column)
+        total_rows = len(order)
+        total_pages = max(1, -(-total_rows // page_size))
+        page = min(max(1, int(page)), total_pages)
+
+        start = (page - 1) * page_size
+        page_positions = order[start:start + page_size]
+
+        # 표시할 행만 take (전체 데이터 복사 없음)
+        page_df = self.df.iloc[page_positions][self.columns]
+        return page_df, total_rows, total_pages
@@ -1,10 +1,16 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
-import streamlit as st
 import os
 from typing import Optional, Tuple, Dict
 
+from .perf_monitor import track_stage
+from .inventory_template import ROW_KEY_COLUMN
+from .data_validator import validate_part_data
+from .file_reader import read_table
+from .part_key import PART_KEY_COLUMN, normalize_part_codes
+from .money import to_won, to_scaled_price, from_scaled_price, unit_price_scaled, amount_won
+
 class PartDataProcessor:
     """PART 파일 데이터 처리 클래스"""
     
@@ -12,25 +18,30 @@ class PartDataProcessor:
         self.required_columns = ['제작사 품번', '부품명', '재고', '재고액']
         self.data = None
         self.unit_prices = None
+        self.validation = None
     
+    @track_stage('load_part_file')
     def load_part_file(self, file_path: str) -> Tuple[bool, str, Optional[pd.DataFrame]]:
         """
-        PART 엑셀 파일을 로드하고 필요한 컬럼을 추출
+        PART 파일(xlsx/xls/csv/parquet/feather)을 로드하고 필요한 컬럼을 추출
         
         Returns:
             (성공여부, 메시지, 데이터프레임)
         """
         try:
-            # openpyxl 엔진만 사용 (자동 변환된 .xlsx 파일)
-            df = pd.read_excel(file_path, engine='openpyxl')
+            # 형식별 리더로 필요한 컬럼만 읽기 (xlsx/xls/csv/parquet/feather)
+            df = read_table(file_path, columns=self.required_columns)
             
             # 필요한 컬럼 존재 확인
             missing_columns = [col for col in self.required_columns if col not in df.columns]
             if missing_columns:
                 return False, f"필수 컬럼이 없습니다: {', '.join(missing_columns)}", None
             
-            # 필요한 컬럼만 추출
-            processed_df = df[self.required_columns].copy()
+            # 필요한 컬럼만 추출 (copy-on-write: 값을 바꾸는 시점에만 복사)
+            processed_df = df[self.required_columns]
+            
+            # 원본 데이터 품질 검사 (품번 없는 행 제외 전)
+            self.validation = validate_part_data(processed_df)
             
             # 데이터 정리
             processed_df = self._clean_data(processed_df)
@@ -38,6 +49,9 @@ class PartDataProcessor:
             # 단가 계산
             processed_df = self._calculate_unit_prices(processed_df)
             
+            # 정규화 품번 키 (재고조정/실재고 매칭용)
+            processed_df[PART_KEY_COLUMN] = normalize_part_codes(processed_df['제작사 품번'])
+            
             self.data = processed_df
             
             return True, f"✅ 성공적으로 로드됨 ({len(processed_df):,}개 품목)", processed_df
@@ -48,71 +62,63 @@ class PartDataProcessor:
     def _clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """데이터 정리 및 검증"""
         # 결측값 처리
-        df = df.dropna(subset=['제작사 품번', '부품명']).copy()  # 추가적인 copy() 호출
+        df = df.dropna(subset=['제작사 품번', '부품명'])
         
-        # 숫자 컬럼 타입 변환 (pandas 2.x 호환)
-        df.loc[:, '재고'] = pd.to_numeric(df['재고'], errors='coerce').fillna(0)
-        df.loc[:, '재고액'] = pd.to_numeric(df['재고액'], errors='coerce').fillna(0)
+        # 숫자 변환, 음수값은 0으로 (재고액은 원 단위 정수)
+        재고 = pd.to_numeric(df['재고'], errors='coerce').fillna(0).clip(lower=0)
+        재고액 = pd.to_numeric(df['재고액'], errors='coerce').fillna(0).clip(lower=0)
         
-        # 음수값 처리 (0으로 변환)
-        df.loc[:, '재고'] = df['재고'].clip(lower=0)
-        df.loc[:, '재고액'] = df['재고액'].clip(lower=0)
-        
-        return df
+        return df.assign(재고=재고, 재고액=to_won(재고액))
     
     def _calculate_unit_prices(self, df: pd.DataFrame) -> pd.DataFrame:
-        """단가 계산 (재고액 ÷ 재고)"""
-        # 재고가 0인 경우 단가를 0으로 설정
-        df.loc[:, '단가'] = np.where(
-            df['재고'] > 0,
-            df['재고액'] / df['재고'],
-            0
-        )
-        
-        # 단가를 소수점 둘째 자리까지 반올림
-        df.loc[:, '단가'] = df['단가'].round(2)
-        
-        return df
+        """단가 계산 (재고액 ÷ 재고, 소수점 둘째 자리 반올림, 재고가 0이면 0)"""
+        return df.assign(단가=from_scaled_price(unit_price_scaled(df['재고액'], df['재고'])))
     
-    def get_summary_stats(self) -> Dict:
-        """데이터 요약 통계 반환"""
-        if self.data is None:
+    def get_summary_stats(self, part_data: Optional[pd.DataFrame] = None) -> Dict:
+        """
+        데이터 요약 통계 반환
+        
+        Args:
+            part_data: 통계를 낼 PART 데이터 (None이면 마지막으로 로드한 데이터)
+        """
+        data = part_data if part_data is not None else self.data
+        if data is None:
             return {}
         
         return {
-            'total_items': len(self.data),
-            'total_stock': self.data['재고'].sum(),
-            'total_stock_value': self.data['재고액'].sum(),
-            'avg_unit_price': self.data['단가'].mean(),
-            'zero_stock_items': len(self.data[self.data['재고'] == 0]),
-            'zero_value_items': len(self.data[self.data['재고액'] == 0])
+            'total_items': len(data),
+            'total_stock': data['재고'].sum(),
+            'total_stock_value': data['재고액'].sum(),
+            'avg_unit_price': data['단가'].mean(),
+            'zero_stock_items': int((data['재고'] == 0).sum()),
+            'zero_value_items': int((data['재고액'] == 0).sum())
         }
     
-    def create_inventory_template(self) -> pd.DataFrame:
-        """실재고 입력용 템플릿 생성 (재고가 있는 품목만, 부품명 오름차순 정렬)"""
-        if self.data is None:
-            raise ValueError("먼저 PART 파일을 로드해주세요.")
-        
-        # 재고가 0보다 큰 품목만 필터링
-        filtered_data = self.data[self.data['재고'] > 0].copy()
-        
-        # 부품명 오름차순으로 정렬
-        filtered_data = filtered_data.sort_values('부품명', ascending=True)
+    @track_stage('create_inventory_template')
+    def create_inventory_template(self, part_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        실재고 입력용 템플릿 생성 (재고가 있는 품목만, 부품명 오름차순 정렬)
         
-        # 기본 컬럼 복사
-        template = filtered_data[['제작사 품번', '부품명', '재고', '재고액', '단가']].copy()
+        Args:
+            part_data: 템플릿을 만들 PART 데이터 (None이면 마지막으로 로드한 데이터)
+        """
+        data = part_data if part_data is not None else self.data
+        if data is None:
+            raise ValueError("먼저 PART 파일을 로드해주세요.")
         
-        # 실재고 입력용 컬럼 추가 (빈 값으로)
-        template['실재고'] = ''
-        template['실재고액'] = ''
-        template['차이'] = ''
-        template['차액'] = ''
+        # 재고가 0보다 큰 품목만, 부품명 오름차순으로 정렬
+        # 행 키: PART 데이터 내 행 위치 (재업로드 시 품번 비교 없이 정렬하는 데 사용)
+        row_keys = np.flatnonzero((data['재고'] > 0).to_numpy())
+        names = data['부품명'].iloc[row_keys].reset_index(drop=True)
+        row_keys = row_keys[names.sort_values(kind='stable').index.to_numpy()]
         
-        # 인덱스 리셋
-        template = template.reset_index(drop=True)
+        # 필요한 행/컬럼만 한 번에 가져오기
+        template = data[['제작사 품번', '부품명', '재고', '재고액', '단가']].take(row_keys).reset_index(drop=True)
         
-        return template
+        # 실재고 입력용 컬럼 추가 (빈 값으로), 숨김 행 키 컬럼은 맨 뒤
+        return template.assign(실재고='', 실재고액='', 차이='', 차액='', **{ROW_KEY_COLUMN: row_keys})
     
+    @track_stage('validate_inventory_data')
     def validate_inventory_data(self, df: pd.DataFrame) -> Tuple[bool, str, pd.DataFrame]:
         """업로드된 실재고 데이터 검증 및 계산"""
         try:
@@ -122,100 +128,66 @@ class PartDataProcessor:
             if missing_cols:
                 return False, f"필수 컬럼이 없습니다: {', '.join(missing_cols)}", df
             
-            # 데이터 타입 변환
+            # 데이터 타입 변환 (업로드 원본은 바꾸지 않음)
             numeric_cols = ['재고', '재고액', '단가', '실재고', '실재고액', '차이', '차액']
-            for col in numeric_cols:
-                df.loc[:, col] = pd.to_numeric(df[col], errors='coerce')
+            df = df.assign(**{col: pd.to_numeric(df[col], errors='coerce') for col in numeric_cols})
             
             # 계산 수행
             df = self._calculate_inventory_values(df)
             
+            # 정규화 품번 키 (재고조정 매칭용)
+            df[PART_KEY_COLUMN] = normalize_part_codes(df['제작사 품번'])
+            
             return True, "✅ 실재고 데이터 처리 완료", df
             
         except Exception as e:
             return False, f"데이터 처리 오류: {str(e)}", df
     
     def _calculate_inventory_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """실재고 관련 값들 자동 계산 (총액 기준 처리 방식)"""
-        df = df.copy()
-        
-        for idx, row in df.iterrows():
-            재고 = row['재고']
-            재고액 = row['재고액']
-            단가 = row['단가']
-            실재고 = row['실재고']
-            차이 = row['차이']
-            
-            # 차이값이 입력된 경우 (우선순위)
-            if pd.notna(차이) and 차이 != '':
-                실재고_계산 = 재고 + 차이
-                
-                # 총액 기준 처리 방식
-                실재고액_계산, 차액_계산 = self._calculate_stock_value_by_total(
-                    재고, 재고액, 단가, 실재고_계산
-                )
-                
-                df.at[idx, '실재고'] = 실재고_계산
-                df.at[idx, '실재고액'] = 실재고액_계산
-                df.at[idx, '차액'] = 차액_계산
-                
-            # 실재고가 입력된 경우
-            elif pd.notna(실재고) and 실재고 != '':
-                차이_계산 = 실재고 - 재고
-                
-                # 총액 기준 처리 방식
-                실재고액_계산, 차액_계산 = self._calculate_stock_value_by_total(
-                    재고, 재고액, 단가, 실재고
-                )
-                
-                df.at[idx, '실재고액'] = 실재고액_계산
-                df.at[idx, '차이'] = 차이_계산
-                df.at[idx, '차액'] = 차액_계산
-                
-            # 아무것도 입력되지 않은 경우: 실재고 = 재고로 설정하고 총액 기준 처리 적용
-            else:
-                실재고_계산 = 재고  # 실재고 = 재고 (변동 없음)
-                차이_계산 = 0       # 차이 = 0
-                
-                # 총액 기준 처리 방식 적용 (변동수량=0이어도 일관성 유지)
-                실재고액_계산, 차액_계산 = self._calculate_stock_value_by_total(
-                    재고, 재고액, 단가, 실재고_계산
-                )
-                
-                df.at[idx, '실재고'] = 실재고_계산
-                df.at[idx, '실재고액'] = 실재고액_계산
-                df.at[idx, '차이'] = 차이_계산
-                df.at[idx, '차액'] = 차액_계산
-        
-        # 정수 타입으로 변환 (원 단위)
-        df.loc[:, '실재고액'] = df['실재고액'].round(0).astype(int)
-        df.loc[:, '차액'] = df['차액'].round(0).astype(int)
-        
-        return df
+        """
+        실재고 관련 값들 자동 계산 (총액 기준 처리 방식, 전체 행 일괄 계산)
+        
+        - 차이값이 입력된 행: 실재고 = 재고 + 차이 (우선순위)
+        - 실재고가 입력된 행: 차이 = 실재고 - 재고
+        - 아무것도 입력되지 않은 행: 실재고 = 재고, 차이 = 0
+        """
+        재고 = pd.to_numeric(df['재고'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+        실재고 = pd.to_numeric(df['실재고'], errors='coerce').to_numpy(dtype=np.float64)
+        차이 = pd.to_numeric(df['차이'], errors='coerce').to_numpy(dtype=np.float64)
+        
+        has_diff = ~np.isnan(차이)
+        has_count = ~has_diff & ~np.isnan(실재고)
+        
+        실재고_계산 = np.where(has_diff, 재고 + 차이, np.where(has_count, 실재고, 재고))
+        차이_계산 = np.where(has_diff, 차이, np.where(has_count, 실재고 - 재고, 0.0))
+        
+        # 총액 기준 처리 방식 (금액은 원 단위 정수)
+        재고액 = to_won(df['재고액'])
+        실재고액, 차액 = self._calculate_stock_value_by_total(
+            재고, 재고액, to_scaled_price(df['단가']), 실재고_계산
+        )
+        
+        return df.assign(재고=재고, 재고액=재고액, 실재고=실재고_계산, 차이=차이_계산, 실재고액=실재고액, 차액=차액)
     
-    def _calculate_stock_value_by_total(self, 전산재고, 전산재고액, 단가, 실재고):
-        """총액 기준 처리 방식으로 실재고액 계산"""
+    def _calculate_stock_value_by_total(self, 전산재고: np.ndarray, 전산재고액: np.ndarray,
+                                        단가: np.ndarray, 실재고: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        총액 기준 처리 방식으로 실재고액 계산 (원 단위 int64)
+        
+        변동 수량분 금액(변동수량 × 단가, 원 단위 반올림)만 전산재고액에 가감하므로
+        변동이 없는 품목은 전산재고액이 그대로 유지됩니다.
+        
+        Args:
+            전산재고: 전산 재고 수량
+            전산재고액: 전산 재고액 (원)
+            단가: 1/100원 단위 단가
+            실재고: 실재고 수량
         
-        # 변동 수량 계산
+        Returns:
+            (실재고액, 차액)
+        """
         변동수량 = 실재고 - 전산재고
+        차액 = amount_won(변동수량, 단가)
+        실재고액 = 전산재고액 + 차액
         
-        if 변동수량 == 0:
-            # 변동이 없는 경우
-            실재고액 = 전산재고액
-            차액 = 0
-            
-        elif 변동수량 < 0:
-            # 감소의 경우: 감소분 재고액을 차감
-            감소수량 = abs(변동수량)
-            감소분재고액 = round(감소수량 * 단가, 0)  # 원 단위 반올림
-            실재고액 = 전산재고액 - 감소분재고액
-            차액 = -감소분재고액
-            
-        else:
-            # 증가의 경우: 증가분 재고액을 추가
-            증가수량 = 변동수량
-            증가분재고액 = round(증가수량 * 단가, 0)  # 원 단위 반올림
-            실재고액 = 전산재고액 + 증가분재고액
-            차액 = 증가분재고액
-        
-        return int(실재고액), int(차액) 
\ No newline at end of file
+        return 실재고액, 차액
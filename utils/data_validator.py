@@ -0,0 +1,237 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .perf_monitor import track_stage
+from .part_key import normalize_part_codes, part_keys
+
+# 검사 규칙: 규칙 ID → (심각도, 검사항목)
+RULES = {
+    'missing_code': ('오류', '제작사 품번 없음'),
+    'missing_name': ('경고', '부품명 없음'),
+    'duplicate_code': ('경고', '제작사 품번 중복'),
+    'non_numeric': ('오류', '숫자가 아닌 값'),
+    'negative_value': ('오류', '음수 값'),
+    'negative_result': ('오류', '차이 반영 후 실재고 음수'),
+    'conflicting_input': ('경고', '실재고와 차이 불일치'),
+    'unknown_code': ('경고', 'PART 파일에 없는 품번'),
+}
+
+ISSUE_COLUMNS = ['시트', '행', '제작사 품번', '부품명', '검사항목', '심각도', '컬럼', '값']
+
+# 엑셀 행 번호 = 데이터 위치 + 2 (머리글 1행)
+EXCEL_ROW_OFFSET = 2
+
+# (시트 이름, 행 수) 목록 - 여러 시트를 이어 붙인 데이터의 시트별 구간 (조별 분할 템플릿)
+SheetRows = Sequence[Tuple[str, int]]
+
+
+def _display_values(values: pd.Series) -> np.ndarray:
+    """표시용 문자열 (결측값은 빈 문자열)"""
+    return values.astype(object).where(values.notna(), '').astype(str).to_numpy()
+
+
+def _sorted_issues(frames: List[pd.DataFrame], sheet_order: List[str]) -> pd.DataFrame:
+    """문제 표 합치기 (시트 순서 → 시트 안 행 번호 순)"""
+    if not frames:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(frames, ignore_index=True)
+    rank = issues['시트'].map({name: index for index, name in enumerate(sheet_order)}).to_numpy()
+    order = np.lexsort((issues['행'].to_numpy(), rank))
+    return issues.iloc[order].reset_index(drop=True)
+
+
+def _blank_mask(values: pd.Series) -> np.ndarray:
+    """결측값 또는 공백 문자열"""
+    blank = values.isna().to_numpy()
+    if values.dtype == object:
+        blank = blank | (values.astype(str).str.strip() == '').to_numpy()
+    return blank
+
+
+class _Checks:
+    """규칙별 마스크 수집 (마스크는 df 전체 행 기준 불리언 배열)"""
+
+    def __init__(self, df: pd.DataFrame, row_offset: int = 0, sheets: Optional[SheetRows] = None):
+        self.df = df
+        # 나눠서 검사하는 경우 df 첫 행의 (시트 안) 위치
+        self.row_offset = row_offset
+        # 여러 시트를 이어 붙인 데이터면 시트별 구간 (없으면 시트 이름 없이 df 위치 기준)
+        self.sheets = list(sheets) if sheets else None
+        self.checks: List[Tuple[str, Optional[str], np.ndarray]] = []
+
+    @property
+    def sheet_order(self) -> List[str]:
+        return [name for name, _ in self.sheets] if self.sheets else ['']
+
+    def locate(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """df 행 위치 → (시트 이름, 시트 안 엑셀 행 번호)"""
+        if not self.sheets:
+            return np.full(len(positions), '', dtype=object), positions + EXCEL_ROW_OFFSET + self.row_offset
+        sizes = np.array([rows for _, rows in self.sheets], dtype=np.int64)
+        ends = np.cumsum(sizes)
+        sheet_index = np.minimum(np.searchsorted(ends, positions, side='right'), len(sizes) - 1)
+        names = np.array(self.sheet_order, dtype=object)[sheet_index]
+        return names, positions - (ends - sizes)[sheet_index] + EXCEL_ROW_OFFSET + self.row_offset
+
+    def add(self, rule: str, column: Optional[str], mask: np.ndarray):
+        self.checks.append((rule, column, np.asarray(mask, dtype=bool)))
+
+    def numeric(self, column: str) -> np.ndarray:
+        """숫자 변환 값 (변환 불가 셀은 non_numeric 규칙에 기록, 컬럼이 없으면 결측값)"""
+        if column not in self.df.columns:
+            return np.full(len(self.df), np.nan)
+        raw = self.df[column]
+        values = pd.to_numeric(raw, errors='coerce')
+        self.add('non_numeric', column, values.isna().to_numpy() & ~_blank_mask(raw))
+        return values.to_numpy(dtype=np.float64)
+
+    def result(self) -> Dict:
+        """
+        검사 결과 구성
+
+        Returns:
+            {'issues': 행별 문제 표, 'counts': 규칙별 건수, 'error_rows': 오류 행 수,
+             'warning_rows': 경고만 있는 행 수, 'total_rows': 검사 행 수, 'sheets': 시트 순서}
+        """
+        df = self.df
+        codes = df['제작사 품번'] if '제작사 품번' in df.columns else pd.Series([''] * len(df))
+        names = df['부품명'] if '부품명' in df.columns else pd.Series([''] * len(df))
+
+        frames = []
+        counts = {}
+        error_rows = np.zeros(len(df), dtype=bool)
+        issue_rows = np.zeros(len(df), dtype=bool)
+        for rule, column, mask in self.checks:
+            positions = np.flatnonzero(mask)
+            if len(positions) == 0:
+                continue
+            severity, label = RULES[rule]
+            counts[label] = counts.get(label, 0) + len(positions)
+            issue_rows[positions] = True
+            if severity == '오류':
+                error_rows[positions] = True
+
+            # 문제 행만 문자열로 변환
+            values = _display_values(df[column].iloc[positions]) if column in df.columns else ''
+            sheet_names, rows = self.locate(positions)
+            frames.append(pd.DataFrame({
+                '시트': sheet_names,
+                '행': rows,
+                '제작사 품번': _display_values(codes.iloc[positions]),
+                '부품명': _display_values(names.iloc[positions]),
+                '검사항목': label,
+                '심각도': severity,
+                '컬럼': column or '',
+                '값': values,
+            }))
+
+        return {
+            'issues': _sorted_issues(frames, self.sheet_order),
+            'counts': counts,
+            'error_rows': int(error_rows.sum()),
+            'warning_rows': int((issue_rows & ~error_rows).sum()),
+            'total_rows': len(df),
+            'sheets': self.sheet_order,
+        }
+
+
+@track_stage('validate_part_data', rows=lambda result, df, *args, **kwargs: len(df))
+def validate_part_data(df: pd.DataFrame) -> Dict:
+    """
+    PART 원본 데이터 검사 (정리 전 데이터 기준)
+
+    품번 없는 행(로드 시 제외됨), 부품명 없음, 품번 중복, 숫자가 아닌 재고/재고액, 음수 재고/재고액
+    """
+    checks = _Checks(df)
+
+    codes = normalize_part_codes(df['제작사 품번'])
+    missing_code = (codes == '').to_numpy()
+    checks.add('missing_code', '제작사 품번', missing_code)
+    checks.add('missing_name', '부품명', _blank_mask(df['부품명']) & ~missing_code)
+    checks.add('duplicate_code', '제작사 품번', codes.duplicated(keep=False).to_numpy() & ~missing_code)
+
+    for column in ['재고', '재고액']:
+        values = checks.numeric(column)
+        checks.add('negative_value', column, values < 0)
+
+    return checks.result()
+
+
+@track_stage('validate_count_sheet', rows=lambda result, df, *args, **kwargs: len(df))
+def validate_count_sheet(df: pd.DataFrame, part_data: Optional[pd.DataFrame] = None,
+                         row_offset: int = 0, check_duplicates: bool = True,
+                         sheets: Optional[SheetRows] = None) -> Dict:
+    """
+    업로드된 실재고 시트 검사 (숫자 변환 전 원본 값 기준, 모든 규칙을 컬럼 단위 마스크로 일괄 계산)
+
+    Args:
+        df: 업로드된 실재고 데이터
+        part_data: PART 데이터 (있으면 PART에 없는 품번 검사)
+        row_offset: 시트를 나눠 검사할 때 df 첫 행의 시트 안 위치 (결과의 엑셀 행 번호에 반영)
+        check_duplicates: 품번 중복 검사 여부 (나눠 검사할 때는 끝에 validate_duplicate_codes로 한 번에 검사)
+        sheets: df가 여러 시트를 이어 붙인 데이터면 (시트 이름, 행 수) 목록 (결과에 시트 이름과 시트 안 행 번호 표시)
+    """
+    checks = _Checks(df, row_offset, sheets)
+
+    codes = normalize_part_codes(df['제작사 품번'])
+    missing_code = (codes == '').to_numpy()
+    checks.add('missing_code', '제작사 품번', missing_code)
+    if check_duplicates:
+        checks.add('duplicate_code', '제작사 품번', codes.duplicated(keep=False).to_numpy() & ~missing_code)
+
+    재고 = checks.numeric('재고')
+    실재고 = checks.numeric('실재고')
+    차이 = checks.numeric('차이')
+    for column in ['실재고액', '차액']:
+        if column in df.columns:
+            checks.numeric(column)
+
+    checks.add('negative_value', '실재고', 실재고 < 0)
+    checks.add('negative_result', '차이', 재고 + 차이 < 0)
+
+    # 실재고와 차이가 모두 입력되었는데 서로 맞지 않는 행 (차이가 우선 적용됨)
+    both = ~np.isnan(실재고) & ~np.isnan(차이)
+    checks.add('conflicting_input', '차이', both & (np.abs((실재고 - 재고) - 차이) > 1e-9))
+
+    if part_data is not None:
+        part_codes = part_keys(part_data, '제작사 품번')
+        checks.add('unknown_code', '제작사 품번', ~codes.isin(part_codes).to_numpy() & ~missing_code)
+
+    return checks.result()
+
+
+def validate_duplicate_codes(df: pd.DataFrame, sheets: Optional[SheetRows] = None) -> Dict:
+    """품번 중복 검사만 수행 (시트 전체 기준, 품번 키 컬럼이 있으면 재사용, sheets는 validate_count_sheet와 같음)"""
+    checks = _Checks(df, sheets=sheets)
+    codes = part_keys(df, '제작사 품번')
+    missing_code = (codes == '').to_numpy()
+    checks.add('duplicate_code', '제작사 품번', codes.duplicated(keep=False).to_numpy() & ~missing_code)
+    return checks.result()
+
+
+def merge_check_results(results: List[Dict], total_rows: int) -> Dict:
+    """
+    나눠서 검사한 결과 합치기 (행 번호는 각 결과에서 시트 기준으로 계산된 값)
+
+    오류/경고 행 수는 합친 문제 표의 (시트, 행 번호)로 다시 계산하므로 여러 결과에 나온 행도 한 번만 셉니다.
+    """
+    sheet_order = list(dict.fromkeys(name for result in results for name in result.get('sheets', [''])))
+    frames = [result['issues'] for result in results if not result['issues'].empty]
+    issues = _sorted_issues(frames, sheet_order)
+
+    counts: Dict[str, int] = {}
+    for result in results:
+        for label, count in result['counts'].items():
+            counts[label] = counts.get(label, 0) + count
+
+    rows = issues[['시트', '행']]
+    error_rows = len(rows[issues['심각도'] == '오류'].drop_duplicates())
+    return {
+        'issues': issues,
+        'counts': counts,
+        'error_rows': error_rows,
+        'warning_rows': len(rows.drop_duplicates()) - error_rows,
+        'total_rows': total_rows,
+        'sheets': sheet_order,
+    }
@@ -1,7 +1,8 @@
 import os
 import tempfile
-import pandas as pd
-import streamlit as st
+from contextlib import contextmanager
+
+from .file_reader import xls_supported
 
 
 class ExcelFileConverter:
@@ -11,29 +12,46 @@ class ExcelFileConverter:
     def process_uploaded_file(uploaded_file):
         """업로드된 파일을 처리하고 필요시 변환"""
         try:
-            # 임시 파일로 저장
-            temp_dir = tempfile.gettempdir()
-            temp_path = os.path.join(temp_dir, uploaded_file.name)
+            # 임시 파일로 저장 (세션마다 고유한 파일명: 같은 이름의 동시 업로드 충돌 방지)
+            suffix = os.path.splitext(uploaded_file.name)[1]
+            fd, temp_path = tempfile.mkstemp(prefix='upload_', suffix=suffix)
             
-            with open(temp_path, "wb") as f:
+            with os.fdopen(fd, "wb") as f:
                 f.write(uploaded_file.getbuffer())
             
-            # .xls 파일인 경우 처리
-            if uploaded_file.name.endswith('.xls'):
+            # .xls 파일인 경우 처리 (xlrd가 있거나 내용이 xlsx이면 그대로 읽음)
+            if suffix.lower() == '.xls' and not xls_supported(temp_path):
                 return ExcelFileConverter.handle_xls_file(temp_path)
             else:
                 return temp_path
                 
         except Exception as e:
+            import streamlit as st
             st.error(f"파일 처리 중 오류: {str(e)}")
             return None
     
+    @staticmethod
+    @contextmanager
+    def temp_upload(uploaded_file):
+        """
+        업로드 파일을 임시 파일로 저장해 경로 반환 (처리할 수 없으면 None)
+        
+        with 블록이 끝나면 오류/재실행 여부와 관계없이 삭제합니다.
+        """
+        temp_path = ExcelFileConverter.process_uploaded_file(uploaded_file)
+        try:
+            yield temp_path
+        finally:
+            ExcelFileConverter.cleanup_temp_file(temp_path)
+    
     @staticmethod
     def handle_xls_file(xls_path):
         """XLS 파일 처리 (웹 환경 호환)"""
+        # 화면 출력이 필요할 때만 streamlit 로드 (utils 패키지는 streamlit 없이 import 가능)
+        import streamlit as st
         try:
-            st.error("❌ .xls 파일은 웹 환경에서 지원되지 않습니다")
-            st.error("🌐 **웹앱 환경에서는 .xlsx 파일만 지원됩니다**")
+            st.error("❌ .xls 파일을 읽을 수 없는 환경입니다 (xlrd 미설치)")
+            st.error("🌐 **.xlsx, .csv, .parquet, .feather 파일을 업로드해주세요**")
             st.info("💡 **해결 방법:**")
             st.info("1. Excel에서 파일을 열어 '다른 이름으로 저장' → '.xlsx' 형식 선택")
             st.info("2. 또는 Google Sheets에서 열어서 .xlsx로 다운로드")
@@ -0,0 +1,153 @@
+import os
+import codecs
+import zipfile
+import importlib.util
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.feather as pa_feather
+import pyarrow.parquet as pq
+
+from .columnar_io import table_to_frame, stored_columns
+from .inventory_template import read_template_meta, count_sheet_names
+
+# 확장자 → 형식
+FORMATS = {
+    '.xlsx': 'xlsx',
+    '.xls': 'xls',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+}
+
+# 파일 업로드 위젯에 넘길 확장자 목록
+UPLOAD_TYPES = [extension.lstrip('.') for extension in FORMATS]
+
+_NS = np.dtype('datetime64[ns]')
+
+# CSV 인코딩 판별용 앞부분 크기
+_ENCODING_SAMPLE_BYTES = 1024 * 1024
+
+# CSV에서 항상 문자열로 읽는 품번 컬럼 (숫자로만 된 품번도 앞자리 0 유지, 엑셀 텍스트 셀과 같은 키)
+TEXT_COLUMNS = ('제작사 품번', '제작사품번')
+
+
+def file_format(path: str) -> str:
+    """파일 형식 (확장자 기준, 지원하지 않으면 ValueError)"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {extension or '(확장자 없음)'}")
+    return FORMATS[extension]
+
+
+def xls_supported(path: Optional[str] = None) -> bool:
+    """.xls 읽기 가능 여부 (xlrd 설치 시, path를 주면 내용이 xlsx인 .xls 파일도 가능)"""
+    if path is not None and zipfile.is_zipfile(path):
+        return True
+    return importlib.util.find_spec('xlrd') is not None
+
+
+def _excel_engine(fmt: str, path: str) -> str:
+    """엑셀 읽기 엔진 (ERP 내보내기 .xls 중 내용이 xlsx(zip)인 파일은 확장자와 관계없이 openpyxl)"""
+    if fmt == 'xlsx' or zipfile.is_zipfile(path):
+        return 'openpyxl'
+    if not xls_supported():
+        raise ValueError(".xls 파일을 읽으려면 xlrd 패키지가 필요합니다. .xlsx로 저장 후 업로드해주세요.")
+    return 'xlrd'
+
+
+def detect_csv_encoding(path: str) -> str:
+    """CSV 인코딩 판별 (UTF-8로 읽을 수 없으면 ERP 기본 내보내기 형식인 CP949)"""
+    with open(path, 'rb') as f:
+        sample = f.read(_ENCODING_SAMPLE_BYTES)
+    try:
+        # 앞부분만 읽으므로 마지막 글자가 잘려 있어도 오류로 보지 않음
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def _read_csv(path: str, columns: Optional[List[str]], text_columns: Optional[List] = None) -> pa.Table:
+    read_options = pa_csv.ReadOptions(encoding=detect_csv_encoding(path))
+    with pa_csv.open_csv(path, read_options=read_options) as reader:
+        names = reader.schema.names
+    # 품번 컬럼은 타입 추론 없이 문자열로 ("00123"이 123이 되지 않도록)
+    text_names = set(TEXT_COLUMNS)
+    for column in text_columns or []:
+        if isinstance(column, int):
+            if column < len(names):
+                text_names.add(names[column])
+        else:
+            text_names.add(column)
+    # 엑셀과 같이 빈 칸만 결측값으로 처리 ('NA' 같은 부품명은 그대로)
+    convert_options = pa_csv.ConvertOptions(
+        null_values=[''], strings_can_be_null=True,
+        column_types={name: pa.string() for name in names if name in text_names}
+    )
+    if columns is not None:
+        # 파일에 없는 컬럼은 빼서 호출한 쪽의 필수 컬럼 검사에 걸리도록 함
+        convert_options.include_columns = stored_columns(columns, names)
+    return pa_csv.read_csv(path, read_options=read_options, convert_options=convert_options)
+
+
+def read_table(path: str, columns: Optional[List[str]] = None, text_columns: Optional[List] = None) -> pd.DataFrame:
+    """
+    입력 파일을 데이터프레임으로 읽기 (형식별 가장 빠른 방법 사용)
+
+    - xlsx: openpyxl (첫 번째 시트)
+    - xls: xlrd (설치된 경우)
+    - csv: pyarrow CSV (멀티스레드, UTF-8/CP949 자동 판별)
+    - parquet: pyarrow Parquet (메모리 맵)
+    - feather/arrow: Arrow IPC (메모리 맵, 앱에서 저장한 섞인 타입 품번 복원)
+
+    Args:
+        path: 파일 경로
+        columns: 필요한 컬럼만 읽을 때 컬럼명 목록 (CSV/Parquet/Feather는 나머지 컬럼을 변환하지 않음)
+        text_columns: CSV에서 TEXT_COLUMNS 외에 문자열로 읽을 컬럼 (이름 또는 위치)
+    """
+    fmt = file_format(path)
+    if fmt in ('xlsx', 'xls'):
+        df = pd.read_excel(path, engine=_excel_engine(fmt, path))
+        return df if columns is None else df[stored_columns(columns, list(df.columns))]
+    if fmt == 'csv':
+        table = _read_csv(path, columns, text_columns)
+    elif fmt == 'parquet':
+        if columns is not None:
+            columns = stored_columns(columns, pq.read_schema(path, memory_map=True).names)
+        table = pq.read_table(path, columns=columns, memory_map=True)
+    else:
+        if columns is not None:
+            with pa.memory_map(path, 'r') as source:
+                names = pa.ipc.open_file(source).schema.names
+            columns = stored_columns(columns, names)
+        table = pa_feather.read_table(path, columns=columns, memory_map=True)
+    # 날짜는 엑셀에서 읽은 것과 같은 datetime64[ns]로
+    df = table_to_frame(table, date_as_object=False)
+    for column in df.columns[df.dtypes.map(lambda dtype: isinstance(dtype, np.dtype) and dtype.kind == 'M' and dtype != _NS)]:
+        df[column] = df[column].astype('datetime64[ns]')
+    return df
+
+
+def read_count_sheet(path: str) -> Tuple[pd.DataFrame, Optional[Dict], Optional[List[Tuple[str, int]]]]:
+    """
+    실재고 파일 읽기
+
+    Returns:
+        (첫 번째 시트 데이터 (조별 분할 템플릿이면 나눈 시트를 순서대로 이어 붙인 데이터),
+         템플릿 메타 (앱에서 만든 엑셀 템플릿이 아니면 None),
+         (시트 이름, 행 수) 목록 (데이터 검사의 시트별 행 번호용, 엑셀 파일이 아니면 None))
+    """
+    fmt = file_format(path)
+    if fmt in ('xlsx', 'xls'):
+        with pd.ExcelFile(path, engine=_excel_engine(fmt, path)) as excel_file:
+            meta = read_template_meta(excel_file)
+            names = count_sheet_names(excel_file.sheet_names, meta)
+            sheets = [excel_file.parse(name) for name in names]
+            sheet_rows = [(name, len(sheet)) for name, sheet in zip(names, sheets)]
+            return (sheets[0] if len(sheets) == 1 else pd.concat(sheets, ignore_index=True)), meta, sheet_rows
+    return read_table(path), None, None
@@ -0,0 +1,432 @@
+import hashlib
+import threading
+from io import BytesIO
+from datetime import datetime
+from collections import OrderedDict
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .part_key import normalize_part_codes
+
+# 템플릿 엑셀 형식이 바뀌면 올려서 기존 캐시 무효화
+TEMPLATE_FORMAT_VERSION = 3
+TEMPLATE_SHEET_NAME = 'Sheet1'
+META_SHEET_NAME = '_meta'
+# 분할 템플릿 최대 시트(조) 수
+MAX_SPLIT_PARTS = 30
+
+# 분할 템플릿 균등 기준 (이름 → 표시명)
+SPLIT_BALANCES = {'lines': '품목 수', 'value': '재고액'}
+
+# 템플릿 숨김 컬럼: PART 데이터 내 행 위치
+ROW_KEY_COLUMN = '_행키'
+PART_COLUMNS = ['제작사 품번', '부품명', '재고', '재고액', '단가']
+INPUT_COLUMNS = ['실재고', '실재고액', '차이', '차액']
+
+
+def part_fingerprint(df: pd.DataFrame) -> str:
+    """PART 데이터 지문 (컬럼 + 값 기준 해시, 같은 PART 파일이면 세션이 달라도 동일)"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(list(df.columns)).encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+
+def _cell_value(value):
+    """엑셀 셀 값 변환 (빈 문자열/결측값은 빈 셀)"""
+    if value is None or (isinstance(value, str) and value == ''):
+        return None
+    if isinstance(value, (float, np.floating)) and np.isnan(value):
+        return None
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def split_bounds(weights, parts: int) -> np.ndarray:
+    """
+    순서를 유지한 채 연속 구간 parts개로 나눌 경계 (구간별 가중치 합이 최대한 같도록)
+
+    가중치 누적 합에서 전체의 k/parts 지점에 가장 가까운 위치를 이분 탐색으로 찾습니다 (O(n + parts log n)).
+    구간마다 최소 1행을 두고, 가중치 합이 0이면 행 수로 나눕니다.
+
+    Returns:
+        경계 배열 (길이 parts+1, 구간 k = [bounds[k], bounds[k+1]))
+    """
+    weights = np.clip(np.nan_to_num(np.asarray(weights, dtype=np.float64)), 0, None)
+    n = len(weights)
+    parts = max(1, min(int(parts), n))
+    prefix = np.concatenate([[0.0], np.cumsum(weights)])
+    if prefix[-1] <= 0:
+        prefix = np.arange(n + 1, dtype=np.float64)
+
+    targets = prefix[-1] * np.arange(1, parts) / parts
+    cuts = np.searchsorted(prefix, targets)
+    # 바로 앞 경계가 목표에 더 가까우면 앞으로
+    cuts -= (targets - prefix[cuts - 1]) < (prefix[cuts] - targets)
+    # 경계가 겹치지 않도록 (구간마다 최소 1행)
+    offsets = np.arange(parts - 1)
+    cuts = np.clip(np.maximum.accumulate(cuts - offsets), 1, n - parts + 1) + offsets
+    return np.concatenate([[0], cuts, [n]]).astype(np.int64)
+
+
+def template_split(template: pd.DataFrame, parts: int, balance: str = 'lines') -> np.ndarray:
+    """템플릿(부품명 순)을 조별 연속 구간으로 나눌 경계 (balance: 'lines' 품목 수, 'value' 재고액 균등)"""
+    if balance not in SPLIT_BALANCES:
+        raise ValueError(f"알 수 없는 분할 기준: {balance}")
+    if balance == 'value':
+        weights = pd.to_numeric(template['재고액'], errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        weights = np.ones(len(template))
+    return split_bounds(weights, parts)
+
+
+def split_sheet_name(index: int) -> str:
+    """분할 템플릿 시트 이름 (0부터)"""
+    return f"{index + 1}조"
+
+
+def split_summary(template: pd.DataFrame, bounds: np.ndarray) -> pd.DataFrame:
+    """조별 담당 구간 요약 (시트, 품목 수, 재고액, 첫/끝 부품명)"""
+    # 빈 구간 없음 (split_bounds가 구간마다 최소 1행 보장, 빈 템플릿은 요약 없음)
+    starts, ends = bounds[:-1], bounds[1:]
+    if not len(template):
+        starts = ends = np.empty(0, dtype=np.int64)
+    names = template['부품명'].astype(str).to_numpy()
+    value_prefix = np.concatenate([[0.0], np.cumsum(
+        pd.to_numeric(template['재고액'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    )])
+    return pd.DataFrame({
+        '시트': [split_sheet_name(index) for index in range(len(starts))],
+        '품목 수': ends - starts,
+        '재고액': np.round(value_prefix[ends] - value_prefix[starts]).astype(np.int64),
+        '첫 부품명': names[starts],
+        '끝 부품명': names[ends - 1],
+    })
+
+
+def count_sheet_names(sheet_names: List[str], meta: Optional[Dict]) -> List[str]:
+    """실재고 입력 시트 목록 (분할 템플릿이면 나눈 시트 전부, 아니면 첫 번째 시트)"""
+    sheets = [name for name in sheet_names if name != META_SHEET_NAME]
+    try:
+        count = int(meta.get('sheet_count', 1)) if meta else 1
+    except (TypeError, ValueError):
+        count = 1
+    return sheets[:max(1, count)]
+
+
+def write_template_xlsx(template: pd.DataFrame, fingerprint: Optional[str] = None,
+                        bounds: Optional[np.ndarray] = None) -> bytes:
+    """
+    실재고 입력 템플릿을 엑셀 바이트로 변환
+
+    openpyxl write_only 모드로 행을 순서대로 기록하므로 셀 객체를 메모리에 쌓지 않습니다.
+    (pandas to_excel과 같은 시트 이름/머리글 서식)
+    행 키 컬럼은 숨기고, fingerprint가 있으면 숨김 시트(_meta)에 PART 지문을 기록합니다.
+    bounds(template_split 결과)가 있으면 조별 연속 구간을 시트 하나씩('1조', '2조', ...)에 나눠 기록합니다.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    workbook = Workbook(write_only=True)
+    if bounds is None or len(bounds) <= 2:
+        sheets = [(TEMPLATE_SHEET_NAME, 0, len(template))]
+    else:
+        sheets = [(split_sheet_name(index), int(start), int(end))
+                  for index, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]))]
+
+    thin = Side(style='thin')
+    header_font = Font(bold=True)
+    header_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    header_alignment = Alignment(horizontal='center', vertical='top')
+
+    # 컬럼 단위로 파이썬 값 변환 후 행 단위로 기록
+    columns = [template[column].to_numpy(dtype=object) for column in template.columns]
+    for sheet_name, start, end in sheets:
+        worksheet = workbook.create_sheet(sheet_name)
+        if ROW_KEY_COLUMN in template.columns:
+            key_letter = get_column_letter(template.columns.get_loc(ROW_KEY_COLUMN) + 1)
+            worksheet.column_dimensions[key_letter].hidden = True
+
+        header = []
+        for column in template.columns:
+            cell = WriteOnlyCell(worksheet, value=str(column))
+            cell.font = header_font
+            cell.border = header_border
+            cell.alignment = header_alignment
+            header.append(cell)
+        worksheet.append(header)
+
+        for row in zip(*(values[start:end] for values in columns)):
+            worksheet.append([_cell_value(value) for value in row])
+
+    if fingerprint is not None:
+        meta_sheet = workbook.create_sheet(META_SHEET_NAME)
+        meta_sheet.sheet_state = 'hidden'
+        meta_sheet.append(['항목', '값'])
+        meta_sheet.append(['format_version', TEMPLATE_FORMAT_VERSION])
+        meta_sheet.append(['part_fingerprint', fingerprint])
+        meta_sheet.append(['row_count', len(template)])
+        meta_sheet.append(['sheet_count', len(sheets)])
+        meta_sheet.append(['created_at', datetime.now().isoformat(timespec='seconds')])
+
+    buffer = BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def read_template_meta(excel_file: pd.ExcelFile) -> Optional[Dict]:
+    """업로드된 템플릿의 숨김 메타 시트 읽기 (앱에서 만든 템플릿이 아니면 None)"""
+    if META_SHEET_NAME not in excel_file.sheet_names:
+        return None
+    meta_df = excel_file.parse(META_SHEET_NAME)
+    if len(meta_df.columns) < 2:
+        return None
+    return dict(zip(meta_df.iloc[:, 0].astype(str), meta_df.iloc[:, 1]))
+
+
+def _text_values(series: pd.Series) -> np.ndarray:
+    return series.astype(str).str.strip().to_numpy()
+
+
+def _changed_rows(uploaded: pd.DataFrame, expected: pd.DataFrame) -> np.ndarray:
+    """PART 컬럼 값이 원본과 다른 행 마스크 (사용자가 입력 칸 외의 값을 수정한 행)"""
+    # 품번은 정규화 키로 비교 (엑셀이 숫자 품번을 숫자로 저장해도 수정으로 보지 않음)
+    changed = (normalize_part_codes(uploaded['제작사 품번']).to_numpy()
+               != normalize_part_codes(expected['제작사 품번']).to_numpy())
+    changed |= _text_values(uploaded['부품명']) != _text_values(expected['부품명'])
+    for column in ['재고', '재고액', '단가']:
+        uploaded_values = pd.to_numeric(uploaded[column], errors='coerce').to_numpy(dtype=float)
+        expected_values = pd.to_numeric(expected[column], errors='coerce').to_numpy(dtype=float)
+        changed |= ~np.isclose(uploaded_values, expected_values, rtol=0, atol=1e-6, equal_nan=True)
+    return changed
+
+
+def align_to_template(df: pd.DataFrame, part_data: pd.DataFrame,
+                      row_keys: np.ndarray) -> Tuple[pd.DataFrame, Dict]:
+    """
+    업로드된 템플릿을 행 키로 PART 데이터에 맞춰 정렬 (행 키 배열 인덱싱으로 O(n))
+
+    - 순서가 바뀐 시트는 템플릿 순서로 되돌림
+    - PART 컬럼(품번/부품명/재고/재고액/단가)이 수정된 행만 원본 값으로 복구
+    - 삭제된 행은 입력값 없이 복원 (기존 재고 유지)
+    - 행 키가 없거나 중복된 행은 해당 행만 품번으로 다시 매칭, 매칭되지 않으면 뒤에 그대로 추가
+
+    Args:
+        df: 업로드된 템플릿 데이터 (행 키 컬럼 포함)
+        part_data: 템플릿을 만든 PART 데이터
+        row_keys: 템플릿 순서대로의 행 키 배열 (create_inventory_template 결과의 행 키)
+
+    Returns:
+        (템플릿 순서로 정렬된 데이터 (행 키 컬럼 제외), 정렬 결과)
+    """
+    row_keys = np.asarray(row_keys, dtype=np.int64)
+    n_part = len(part_data)
+
+    # PART 행 위치 → 템플릿 행 번호
+    slot_of_key = np.full(n_part, -1, dtype=np.int64)
+    slot_of_key[row_keys] = np.arange(len(row_keys))
+
+    keys = pd.to_numeric(df[ROW_KEY_COLUMN], errors='coerce').to_numpy(dtype=float)
+    valid = np.isfinite(keys) & (keys >= 0) & (keys < n_part) & (np.floor(keys) == keys)
+    slots = np.full(len(df), -1, dtype=np.int64)
+    slots[valid] = slot_of_key[keys[valid].astype(np.int64)]
+    # 복사해 붙여넣어 같은 키가 여러 번 나온 경우 첫 행만 사용
+    slots[pd.Series(slots).duplicated().to_numpy() & (slots >= 0)] = -1
+
+    source = np.full(len(row_keys), -1, dtype=np.int64)
+    keyed_rows = np.flatnonzero(slots >= 0)
+    source[slots[keyed_rows]] = keyed_rows
+    reordered = bool(np.any(np.diff(slots[keyed_rows]) < 0))
+
+    expected = part_data[PART_COLUMNS].iloc[row_keys].reset_index(drop=True)
+
+    # 행 키를 잃은 행만 품번으로 다시 매칭 (비어 있는 템플릿 행 대상)
+    unkeyed_rows = np.flatnonzero(slots < 0)
+    rematched = 0
+    if len(unkeyed_rows) and np.any(source < 0):
+        empty_slots = np.flatnonzero(source < 0)
+        slot_by_code = dict(zip(normalize_part_codes(expected['제작사 품번'].iloc[empty_slots]), empty_slots))
+        codes = normalize_part_codes(df['제작사 품번'].iloc[unkeyed_rows])
+        still_unkeyed = []
+        for row, code in zip(unkeyed_rows, codes):
+            slot = slot_by_code.pop(code, None)
+            if slot is None:
+                still_unkeyed.append(row)
+            else:
+                source[slot] = row
+                rematched += 1
+        unkeyed_rows = np.asarray(still_unkeyed, dtype=np.int64)
+
+    # PART 컬럼은 원본 값, 입력 컬럼은 업로드 값 사용
+    filled = source >= 0
+    inputs = {}
+    for column in INPUT_COLUMNS:
+        values = np.full(len(row_keys), np.nan, dtype=object)
+        if column in df.columns:
+            values[filled] = df[column].to_numpy(dtype=object)[source[filled]]
+        inputs[column] = values
+    aligned = expected.assign(**inputs)
+
+    uploaded_part = df[PART_COLUMNS].iloc[source[filled]].reset_index(drop=True)
+    changed = _changed_rows(uploaded_part, expected[filled].reset_index(drop=True))
+
+    if len(unkeyed_rows):
+        # 템플릿에 없는 행은 기존과 같이 업로드 값 그대로 사용
+        extra = df.iloc[unkeyed_rows].drop(columns=[ROW_KEY_COLUMN])
+        aligned = pd.concat([aligned, extra[aligned.columns.intersection(extra.columns)]], ignore_index=True)
+
+    report = {
+        'template_rows': len(row_keys),
+        'matched_rows': int(filled.sum()),
+        'reordered': reordered,
+        'repaired_rows': int(changed.sum()),
+        'restored_rows': int((~filled).sum()),
+        'rematched_rows': rematched,
+        'extra_rows': len(unkeyed_rows),
+    }
+    return aligned, report
+
+
+class TemplateCache:
+    """PART 지문별 템플릿 엑셀 캐시 (세션 공용, LRU + 전체 크기 제한)"""
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 256 * 1024 * 1024, backend=None):
+        """
+        Args:
+            max_entries: 메모리에 둘 최대 템플릿 수
+            max_bytes: 메모리에 둘 최대 엑셀 크기 합계
+            backend: 프로세스 간 공유 캐시 (SharedDiskCache, 메모리에 없으면 조회)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(fingerprint: str, parts: int = 1, balance: str = 'lines') -> str:
+        if parts > 1:
+            return f"v{TEMPLATE_FORMAT_VERSION}:{fingerprint}:{parts}:{balance}"
+        return f"v{TEMPLATE_FORMAT_VERSION}:{fingerprint}"
+
+    def get(self, fingerprint: str, parts: int = 1, balance: str = 'lines') -> Optional[Dict]:
+        """캐시 조회 (조회된 항목은 최근 사용으로 이동)"""
+        key = self.make_key(fingerprint, parts, balance)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, fingerprint: str, excel_data: bytes, preview: pd.DataFrame, item_count: int,
+            row_keys: Optional[np.ndarray] = None, parts: int = 1, balance: str = 'lines',
+            split: Optional[pd.DataFrame] = None) -> Dict:
+        """
+        템플릿 저장
+
+        Args:
+            fingerprint: PART 데이터 지문
+            excel_data: 템플릿 엑셀 바이트
+            preview: 미리보기용 상위 행
+            item_count: 템플릿 품목 수
+            row_keys: 템플릿 순서대로의 행 키 배열 (재업로드 정렬용, 분할해도 시트 순서대로 이어 붙인 순서)
+            parts: 분할 시트(조) 수
+            balance: 분할 균등 기준 (SPLIT_BALANCES)
+            split: 조별 담당 구간 요약 (split_summary, 분할하지 않으면 None)
+        """
+        entry = {'excel': excel_data, 'preview': preview, 'item_count': item_count, 'row_keys': row_keys,
+                 'split': split}
+        size = len(excel_data)
+        if size > self.max_bytes:
+            # 제한보다 큰 템플릿은 캐시하지 않음
+            return entry
+
+        key = self.make_key(fingerprint, parts, balance)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= len(previous['excel'])
+            self._entries[key] = entry
+            self._total_bytes += size
+
+            # 오래 사용하지 않은 항목부터 제거
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= len(evicted['excel'])
+        return entry
+
+    def _backend_key(self, fingerprint: str, parts: int = 1, balance: str = 'lines') -> str:
+        return hashlib.blake2b(self.make_key(fingerprint, parts, balance).encode('ascii'), digest_size=20).hexdigest()
+
+    def _load_shared(self, fingerprint: str) -> Optional[Dict]:
+        """공유 캐시에서 조회 (있으면 메모리 캐시에도 저장)"""
+        if self.backend is None:
+            return None
+        try:
+            entry = self.backend.get('template', self._backend_key(fingerprint))
+        except OSError:
+            return None
+        if entry is None:
+            return None
+        return self.put(fingerprint, entry['excel'], entry['preview'], entry['item_count'], entry['row_keys'])
+
+    def get_or_create(self, fingerprint: str, part_data: pd.DataFrame, part_processor,
+                      parts: int = 1, balance: str = 'lines') -> Dict:
+        """
+        캐시에 없으면 템플릿 생성 후 저장 (공유 캐시가 있으면 다른 프로세스가 만든 템플릿 재사용)
+
+        parts가 2 이상이면 조별로 품목 수(balance='lines') 또는 재고액('value')이 같도록
+        부품명 순 연속 구간을 시트 parts개에 나눈 템플릿을 만듭니다.
+        """
+        parts = max(1, min(int(parts), MAX_SPLIT_PARTS))
+        entry = self.get(fingerprint, parts, balance)
+        if entry is not None:
+            return entry
+
+        def create() -> Dict:
+            template = part_processor.create_inventory_template(part_data)
+            bounds = template_split(template, parts, balance) if parts > 1 else None
+            return {
+                'excel': write_template_xlsx(template, fingerprint, bounds),
+                'preview': template.drop(columns=[ROW_KEY_COLUMN]).head(10),
+                'item_count': len(template),
+                'row_keys': template[ROW_KEY_COLUMN].to_numpy(),
+                'split': split_summary(template, bounds) if bounds is not None else None,
+            }
+
+        if self.backend is not None:
+            try:
+                entry = self.backend.get_or_compute('template', self._backend_key(fingerprint, parts, balance), create)
+            except OSError:
+                entry = None
+        if entry is None:
+            entry = create()
+        return self.put(fingerprint, entry['excel'], entry['preview'], entry['item_count'], entry['row_keys'],
+                        parts, balance, entry.get('split'))
+
+    def get_row_keys(self, fingerprint: str, part_data: pd.DataFrame, part_processor) -> np.ndarray:
+        """템플릿 행 키 배열 (캐시에 없으면 템플릿 데이터만 다시 계산)"""
+        entry = self.get(fingerprint) or self._load_shared(fingerprint)
+        if entry is not None and entry.get('row_keys') is not None:
+            return entry['row_keys']
+        return part_processor.create_inventory_template(part_data)[ROW_KEY_COLUMN].to_numpy()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
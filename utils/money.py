@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# 금액은 원 단위 int64, 단가는 1/100원 단위 int64 (소수점 둘째 자리까지)
+PRICE_SCALE = 100
+
+
+def round_half_away(values) -> np.ndarray:
+    """실수 배열을 정수로 반올림 (0.5는 0에서 먼 쪽으로, 결측값은 0)"""
+    values = np.nan_to_num(np.asarray(values, dtype=np.float64), nan=0.0, posinf=0.0, neginf=0.0)
+    return (np.sign(values) * np.floor(np.abs(values) + 0.5)).astype(np.int64)
+
+
+def div_round_half_away(numerator, denominator) -> np.ndarray:
+    """정수 나눗셈 반올림 (denominator > 0, 0.5는 0에서 먼 쪽으로)"""
+    numerator = np.asarray(numerator, dtype=np.int64)
+    denominator = np.asarray(denominator, dtype=np.int64)
+    quotient = (2 * np.abs(numerator) + denominator) // (2 * denominator)
+    return np.where(numerator < 0, -quotient, quotient).astype(np.int64)
+
+
+def _numeric(values) -> np.ndarray:
+    if isinstance(values, pd.Series):
+        values = pd.to_numeric(values, errors='coerce')
+    return np.asarray(values, dtype=np.float64)
+
+
+def _integral_mask(values: np.ndarray) -> np.ndarray:
+    """정수로 정확히 계산할 수 있는 값 (int64 범위 안의 정수값)"""
+    finite = np.isfinite(values)
+    mask = finite.copy()
+    mask[finite] = (values[finite] == np.floor(values[finite])) & (np.abs(values[finite]) < 2 ** 53)
+    return mask
+
+
+def to_won(values) -> np.ndarray:
+    """금액을 원 단위 int64로 변환 (결측값은 0)"""
+    return round_half_away(_numeric(values))
+
+
+def to_scaled_price(values) -> np.ndarray:
+    """단가(원)를 1/100원 단위 int64로 변환"""
+    return round_half_away(_numeric(values) * PRICE_SCALE)
+
+
+def from_scaled_price(scaled) -> np.ndarray:
+    """1/100원 단위 단가를 표시용 실수(원)로 변환"""
+    return np.asarray(scaled, dtype=np.int64) / PRICE_SCALE
+
+
+def unit_price_scaled(stock_value_won, stock_quantity) -> np.ndarray:
+    """재고액 ÷ 재고로 1/100원 단위 단가 계산 (재고가 0 이하이면 0)"""
+    value = np.asarray(stock_value_won, dtype=np.int64)
+    quantity = _numeric(stock_quantity)
+    result = np.zeros(len(value), dtype=np.int64)
+
+    positive = np.isfinite(quantity) & (quantity > 0)
+    exact = positive & _integral_mask(quantity)
+    result[exact] = div_round_half_away(value[exact] * PRICE_SCALE, quantity[exact].astype(np.int64))
+
+    # 소수 수량은 실수 나눗셈 후 반올림
+    fractional = positive & ~exact
+    result[fractional] = round_half_away(value[fractional] * PRICE_SCALE / quantity[fractional])
+    return result
+
+
+def amount_won(quantity, price_scaled) -> np.ndarray:
+    """수량 × 단가 금액을 원 단위 int64로 계산 (수량 결측값은 0원)"""
+    quantity = _numeric(quantity)
+    price = np.asarray(price_scaled, dtype=np.int64)
+    result = np.zeros(len(quantity), dtype=np.int64)
+
+    exact = _integral_mask(quantity)
+    result[exact] = div_round_half_away(quantity[exact].astype(np.int64) * price[exact], PRICE_SCALE)
+
+    fractional = np.isfinite(quantity) & ~exact
+    result[fractional] = round_half_away(quantity[fractional] * price[fractional] / PRICE_SCALE)
+    return result
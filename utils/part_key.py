@@ -0,0 +1,140 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# 정규화된 품번 키 컬럼 (화면/엑셀 출력에서는 숨김)
+PART_KEY_COLUMN = '_품번키'
+
+_LOOSE_PATTERN = re.compile(r'[^0-9A-Z가-힣]')
+
+
+def normalize_part_codes(codes) -> pd.Series:
+    """
+    품번 비교용 키로 정규화 (타입 통일, 앞뒤 공백 제거, 대문자)
+
+    - 문자열: 앞뒤 공백 제거 후 대문자 (' ab-12 ' → 'AB-12')
+    - 숫자: 정수값이면 정수 문자열 (엑셀 숫자 12345, 12345.0 → '12345')
+    - 결측값: 빈 문자열
+    """
+    values = pd.Series(codes).to_numpy(dtype=object)
+    keys = np.full(len(values), '', dtype=object)
+
+    is_text = np.fromiter((isinstance(value, str) for value in values), dtype=bool, count=len(values))
+    if is_text.any():
+        keys[is_text] = pd.Series(values[is_text], dtype=object).str.strip().str.upper().to_numpy()
+
+    others = np.flatnonzero(~is_text)
+    if len(others):
+        numbers = pd.to_numeric(pd.Series(values[others], dtype=object), errors='coerce').to_numpy(dtype=np.float64)
+        finite = np.isfinite(numbers)
+        integral = finite & (np.floor(np.where(finite, numbers, 0)) == numbers) & (np.abs(np.where(finite, numbers, 0)) < 2 ** 63)
+        keys[others[integral]] = numbers[integral].astype(np.int64).astype(str)
+        fractional = finite & ~integral
+        keys[others[fractional]] = [repr(float(number)) for number in numbers[fractional]]
+
+        # 숫자가 아닌 기타 객체 (결측값 제외)
+        rest = others[~finite]
+        present = pd.notna(values[rest])
+        keys[rest[present]] = [str(value).strip().upper() for value in values[rest[present]]]
+
+    return pd.Series(keys, index=getattr(codes, 'index', None), dtype=object)
+
+
+def part_keys(df: pd.DataFrame, code_column: str) -> pd.Series:
+    """데이터프레임의 품번 키 (로드 시 만든 키 컬럼이 있으면 재사용)"""
+    if PART_KEY_COLUMN in df.columns:
+        return df[PART_KEY_COLUMN]
+    return normalize_part_codes(df[code_column])
+
+
+def _loose_key(key: str) -> str:
+    """구분자(-, 공백, . 등)를 뺀 비교용 키"""
+    return _LOOSE_PATTERN.sub('', key)
+
+
+def _trigrams(key: str) -> set:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PartKeyIndex:
+    """정규화 품번 키 인덱스 (정확 매칭 + 유사 품번 후보 검색)"""
+
+    def __init__(self, keys: pd.Series, codes: Optional[pd.Series] = None):
+        """
+        Args:
+            keys: 정규화된 품번 키
+            codes: 후보 표시용 원본 품번 (None이면 키 사용)
+        """
+        keys = pd.Series(keys).reset_index(drop=True)
+        codes = keys if codes is None else pd.Series(codes).reset_index(drop=True)
+
+        # 키별 첫 번째 위치
+        first = ~keys.duplicated().to_numpy() & (keys != '').to_numpy()
+        self.positions = np.flatnonzero(first)
+        self.keys = keys.to_numpy(dtype=object)[self.positions]
+        self.codes = codes.to_numpy(dtype=object)[self.positions]
+        self._index = pd.Index(self.keys)
+
+        # 유사 검색용 인덱스 (처음 검색할 때 생성)
+        self._loose_index: Optional[Dict[str, int]] = None
+        self._postings: Optional[Dict[str, np.ndarray]] = None
+        self._gram_counts: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, keys) -> np.ndarray:
+        """키별 원본 행 위치 (없으면 -1)"""
+        slots = self._index.get_indexer(pd.Series(keys, dtype=object).to_numpy())
+        return np.where(slots >= 0, self.positions[np.maximum(slots, 0)], -1)
+
+    def _build_fuzzy_index(self):
+        self._loose_index = {}
+        postings: Dict[str, List[int]] = {}
+        gram_counts = np.zeros(len(self.keys), dtype=np.int32)
+        for slot, key in enumerate(self.keys):
+            self._loose_index.setdefault(_loose_key(key), slot)
+            grams = _trigrams(key)
+            gram_counts[slot] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(slot)
+        self._postings = {gram: np.asarray(slots, dtype=np.int32) for gram, slots in postings.items()}
+        self._gram_counts = gram_counts
+
+    def suggest(self, key: str, limit: int = 3, min_score: float = 0.5) -> List[Dict]:
+        """
+        유사 품번 후보 검색 (구분자 무시 일치 → 3-gram Dice 유사도 순)
+
+        Returns:
+            [{'code': 원본 품번, 'score': 유사도(0~1), 'position': 원본 행 위치}, ...]
+        """
+        if not key or len(self.keys) == 0:
+            return []
+        if self._postings is None:
+            self._build_fuzzy_index()
+
+        candidates = {}
+        loose_slot = self._loose_index.get(_loose_key(key))
+        if loose_slot is not None and self.keys[loose_slot] != key:
+            candidates[loose_slot] = 1.0
+
+        grams = _trigrams(key)
+        hit_lists = [self._postings[gram] for gram in grams if gram in self._postings]
+        if hit_lists:
+            common = np.bincount(np.concatenate(hit_lists), minlength=len(self.keys))
+            scores = 2 * common / (len(grams) + self._gram_counts)
+            top = min(limit + 1, len(scores))
+            best = np.argpartition(-scores, top - 1)[:top]
+            for slot in best[np.argsort(-scores[best], kind='stable')]:
+                score = float(scores[slot])
+                if score < min_score or self.keys[slot] == key:
+                    continue
+                candidates.setdefault(int(slot), round(score, 3))
+
+        ranked = sorted(candidates.items(), key=lambda item: -item[1])[:limit]
+        return [
+            {'code': self.codes[slot], 'score': score, 'position': int(self.positions[slot])}
+            for slot, score in ranked
+        ]
@@ -0,0 +1,237 @@
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import functools
+import contextvars
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional, Dict, List, Callable, Any
+
+import pandas as pd
+
+logger = logging.getLogger('stock_inventory.perf')
+if not logger.handlers:
+    # 구조화 로그: 한 줄에 JSON 하나
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def _infer_rows(result: Any, *args, **kwargs) -> Optional[int]:
+    """함수 반환값에서 처리 행 수 추정 (DataFrame 또는 DataFrame을 포함한 튜플)"""
+    if isinstance(result, pd.DataFrame):
+        return len(result)
+    if isinstance(result, tuple):
+        for item in result:
+            if isinstance(item, pd.DataFrame):
+                return len(item)
+    return None
+
+
+class AllocationCounter:
+    """
+    누적 할당량 측정 (tracemalloc + 함수 호출 훅)
+
+    tracemalloc은 현재/최대 사용량만 제공하므로, 함수 호출/반환마다 직전 시점 대비 최대 사용량
+    증가분을 더해 누적 할당량을 구합니다. 한 C 함수 안에서 할당 후 바로 해제된 임시 버퍼는
+    빠지므로 실제 할당량의 하한값입니다. 호출마다 훅이 실행되어 매우 느리므로 벤치마크 전용입니다.
+    """
+
+    def __init__(self):
+        self.allocated = 0
+        # 현재 측정 구간의 최대 사용량 (단계 중첩 시 PerfMonitor.stage에서 저장/복원)
+        self.high = 0
+        self._last = 0
+
+    def sample(self) -> int:
+        """마지막 확인 이후 할당량을 누적하고 현재 사용량 반환"""
+        current, peak = tracemalloc.get_traced_memory()
+        if peak > self._last:
+            self.allocated += peak - self._last
+        self.high = max(self.high, peak)
+        tracemalloc.reset_peak()
+        self._last = current
+        return current
+
+    def _on_event(self, frame, event, arg):
+        self.sample()
+
+    def install(self):
+        self._last = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        sys.setprofile(self._on_event)
+
+    def uninstall(self):
+        sys.setprofile(None)
+
+
+# 현재 실행 중인 세션 ID (측정 기록을 세션별로 구분, 스레드/작업마다 따로 유지)
+_current_session: contextvars.ContextVar = contextvars.ContextVar('perf_session', default=None)
+
+
+class PerfMonitor:
+    """파이프라인 단계별 성능 측정 클래스 (소요시간, 처리 행 수, 최대 메모리, 누적 할당량)"""
+
+    def __init__(self, enabled: bool = False, trace_memory: bool = False, max_records: int = 200):
+        self.enabled = False
+        self.trace_memory = False
+        self.records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+        self._allocations: Optional[AllocationCounter] = None
+        if enabled:
+            self.enable(trace_memory)
+
+    def enable(self, trace_memory: bool = False, trace_allocations: bool = False):
+        """
+        측정 활성화
+
+        Args:
+            trace_memory: tracemalloc으로 단계별 최대 메모리 측정
+            trace_allocations: 단계별 누적 할당량도 측정 (현재 스레드만, 벤치마크 전용)
+        """
+        trace_memory = trace_memory or trace_allocations
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+        if trace_allocations and self._allocations is None:
+            self._allocations = AllocationCounter()
+            self._allocations.install()
+        self.enabled = True
+
+    def disable(self):
+        """측정 비활성화 (직접 시작한 tracemalloc도 중지)"""
+        self.enabled = False
+        if self._allocations is not None:
+            self._allocations.uninstall()
+            self._allocations = None
+        if self._owns_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._owns_tracemalloc = False
+        self.trace_memory = False
+
+    @contextmanager
+    def session_scope(self, session_id: Optional[str]):
+        """이 구간에서 측정한 단계를 session_id 세션의 기록으로 표시"""
+        token = _current_session.set(session_id)
+        try:
+            yield
+        finally:
+            _current_session.reset(token)
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None):
+        """
+        단계 측정 컨텍스트
+
+        사용 예:
+            with perf_monitor.stage('read_count_sheet') as record:
+                df = pd.read_excel(path)
+                record['rows'] = len(df)
+        """
+        if not self.enabled:
+            yield {}
+            return
+
+        record = {'stage': name, 'rows': rows, 'session': _current_session.get()}
+        trace_memory = self.trace_memory and tracemalloc.is_tracing()
+        allocations = self._allocations if trace_memory else None
+        if allocations is not None:
+            # 바깥 단계의 최대 사용량은 안쪽 단계가 끝난 뒤 합쳐서 복원
+            start_memory = allocations.sample()
+            start_allocated = allocations.allocated
+            outer_high, allocations.high = allocations.high, start_memory
+        elif trace_memory:
+            start_memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        status = 'ok'
+        try:
+            yield record
+        except Exception:
+            status = 'error'
+            raise
+        finally:
+            record['wall_time_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            if allocations is not None:
+                allocations.sample()
+                peak = allocations.high
+                record['allocated_mb'] = round((allocations.allocated - start_allocated) / 1024 / 1024, 2)
+                allocations.high = max(outer_high, peak)
+            elif trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+            if trace_memory:
+                # 단계 시작 시점 대비 증가한 최대 메모리
+                record['peak_memory_mb'] = round(max(peak - start_memory, 0) / 1024 / 1024, 2)
+            record['status'] = status
+            record['timestamp'] = datetime.now().isoformat(timespec='seconds')
+            self._emit(record)
+
+    def _emit(self, record: Dict):
+        with self._lock:
+            self.records.append(record)
+        logger.info(json.dumps({'event': 'pipeline_stage', **record}, ensure_ascii=False, default=str))
+
+    def track(self, name: str, rows: Optional[Callable[..., Optional[int]]] = None):
+        """
+        함수 단위 측정 데코레이터
+
+        Args:
+            name: 단계 이름
+            rows: (반환값, *인자)로 처리 행 수를 구하는 함수 (기본: 반환값의 DataFrame 길이)
+        """
+        rows_getter = rows or _infer_rows
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                # 비활성화 상태에서는 속성 확인 1회 외에 추가 비용 없음
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.stage(name) as record:
+                    result = func(*args, **kwargs)
+                    record['rows'] = rows_getter(result, *args, **kwargs)
+                    if isinstance(result, bytes):
+                        record['output_bytes'] = len(result)
+                return result
+            return wrapper
+        return decorator
+
+    def get_records(self, limit: Optional[int] = None, session: Optional[str] = None) -> List[Dict]:
+        """최근 측정 기록 반환 (최신순, session을 주면 그 세션의 기록만)"""
+        with self._lock:
+            records = list(self.records)
+        if session is not None:
+            records = [record for record in records if record.get('session') == session]
+        records.reverse()
+        return records[:limit] if limit else records
+
+    def clear(self, session: Optional[str] = None):
+        """측정 기록 삭제 (session을 주면 그 세션의 기록만)"""
+        with self._lock:
+            if session is None:
+                self.records.clear()
+            else:
+                kept = [record for record in self.records if record.get('session') != session]
+                self.records.clear()
+                self.records.extend(kept)
+
+
+# 프로세스 공용 모니터 (환경변수 STOCK_APP_PERF=1 로 시작 시 활성화)
+perf_monitor = PerfMonitor(
+    enabled=os.getenv('STOCK_APP_PERF') == '1',
+    trace_memory=os.getenv('STOCK_APP_PERF_MEMORY') == '1'
+)
+
+
+def track_stage(name: str, rows: Optional[Callable[..., Optional[int]]] = None):
+    """공용 모니터로 함수 실행을 측정하는 데코레이터"""
+    return perf_monitor.track(name, rows)
@@ -2,12 +2,27 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
-from typing import Dict, Tuple, Optional
+from typing import Dict, Tuple, Optional, Callable
+
+from .perf_monitor import track_stage
+from .part_key import PartKeyIndex, part_keys
+from .money import to_won, to_scaled_price, from_scaled_price, unit_price_scaled, amount_won
+from .count_stream import InventoryTotals
+from .shared_cache import content_key
+from .xlsx_parts import (
+    SHEET_FORMAT_VERSION, CellStyles, SheetPartCache, XlsxPart, frame_sheet_xml, grid_sheet_xml, write_workbook
+)
+
+
+def _inventory_rows(result, generator, *args, **kwargs):
+    """성능 측정용 처리 행 수 (실재고 데이터 기준)"""
+    return len(generator.inventory_data) if generator.inventory_data is not None else None
+
 
 class ReportGenerator:
     """재고조사 보고서 생성 클래스"""
     
-    def __init__(self):
+    def __init__(self, sheet_cache: Optional[SheetPartCache] = None):
         self.report_data = None
         self.summary_stats = None
         # 다중 시트를 위한 데이터 저장
@@ -15,7 +30,13 @@ class ReportGenerator:
         self.inventory_data = None
         self.final_data = None
         self.adjustment_data = None
+        self.history_comparison = None
+        self.book_stock = None
+        self.review_list = None
+        # 시트 입력 해시 → 작성된 시트 XML (보고서를 다시 만들 때 바뀌지 않은 시트 재사용)
+        self.sheet_cache = sheet_cache if sheet_cache is not None else SheetPartCache()
     
+    @track_stage('generate_report_data', rows=_inventory_rows)
     def generate_report_data(
         self, 
         inventory_data: pd.DataFrame,
@@ -50,7 +71,7 @@ class ReportGenerator:
         # part_data가 없으면 inventory_data에서 추정
         if part_data is None:
             # inventory_data에서 전산재고 정보 추출
-            part_data = inventory_data.copy()
+            part_data = inventory_data
         
         # adjustment_summary가 없으면 기본값 사용
         if adjustment_summary is None:
@@ -90,6 +111,18 @@ class ReportGenerator:
         """재고조정 데이터 설정 (다중 시트용)"""
         self.adjustment_data = adjustment_data
     
+    def set_history_comparison(self, history_comparison: Optional[pd.DataFrame]):
+        """이전 조사 대비 품목별 재고차이 비교 설정 (기간비교 시트용, 없으면 None)"""
+        self.history_comparison = history_comparison
+    
+    def set_book_stock(self, book_stock: Optional[pd.DataFrame]):
+        """조사 시점 전산재고 재구성 결과 설정 (book_stock_as_of 결과, 시점재고비교 시트용, 없으면 None)"""
+        self.book_stock = book_stock
+    
+    def set_review_list(self, review_list: Optional[pd.DataFrame]):
+        """검토 대기열 상위 품목 설정 (ReviewQueue.top 결과, 검토대상 시트용, 없으면 None)"""
+        self.review_list = review_list
+    
     def _sort_by_part_code(self, df: pd.DataFrame, part_code_column: str = '제작사품번') -> pd.DataFrame:
         """
         제작사품번 기준 오름차순 정렬 (공통 함수)
@@ -98,61 +131,29 @@ class ReportGenerator:
         if df.empty or part_code_column not in df.columns:
             return df
         
-        result_df = df.copy()
-        
-        # 1. 제작사품번을 문자열로 통일하고 결측치 처리
-        result_df[part_code_column] = result_df[part_code_column].fillna('').astype(str)
+        # 1. 제작사품번을 문자열로 통일 (결측치, 'nan' 문자열은 빈 값)
+        codes = df[part_code_column].fillna('').astype(str).replace(['nan', 'NaN', 'None'], '')
         
-        # 2. 빈 값이나 'nan' 문자열 처리
-        result_df[part_code_column] = result_df[part_code_column].replace(['nan', 'NaN', 'None'], '')
+        # 2. 문자열 정규화 (공백 제거, 대소문자 통일)
+        codes = codes.str.strip().str.upper()
         
-        # 3. 문자열 정규화 (공백 제거, 대소문자 통일)
-        result_df[part_code_column] = result_df[part_code_column].str.strip().str.upper()
+        # 3. 빈 값은 맨 뒤로, 나머지는 문자열 기준 오름차순 (기존 정렬 상태 무시)
+        order = codes.mask(codes == '').reset_index(drop=True).sort_values(
+            kind='stable', na_position='last'
+        ).index.to_numpy()
         
-        # 4. 정렬 키 생성: 빈 값은 맨 뒤로, 나머지는 문자열 기준 오름차순
-        def create_sort_key(x):
-            if not x or x.strip() == '':
-                return (1, '')  # 빈 값은 맨 뒤
-            else:
-                return (0, x)   # 일반 값은 앞
-        
-        result_df['_sort_key'] = result_df[part_code_column].apply(create_sort_key)
-        
-        # 5. 강제로 제작사품번 기준 정렬 (기존 정렬 상태 완전 무시)
-        result_df = result_df.sort_values('_sort_key').drop('_sort_key', axis=1).reset_index(drop=True)
-        
-        return result_df
+        # 4. 정렬한 행을 한 번에 가져오기 (copy-on-write: 원본 df는 그대로)
+        return df.assign(**{part_code_column: codes}).take(order).reset_index(drop=True)
     
     def _calculate_inventory_comparison(self, part_data: pd.DataFrame, inventory_data: pd.DataFrame) -> Dict:
-        """전산재고 vs 실재고 비교 계산"""
+        """전산재고 vs 실재고 비교 계산 (대용량 업로드 시 행 묶음별로 누적하는 합계와 같은 계산)"""
         
-        # 전산재고액 계산
+        # 전산재고액 계산 (원 단위 정수 합계, 없으면 inventory_data의 재고 * 단가로 추정)
+        computer_stock_value = None
         if '재고액' in part_data.columns:
-            computer_stock_value = part_data['재고액'].sum()
-        else:
-            # inventory_data에서 전산재고액 추정 (재고 * 단가)
-            computer_stock_value = (inventory_data['재고'] * inventory_data['단가']).sum()
-        
-        # 실재고 증가/감소 분리
-        positive_diff = inventory_data[inventory_data['차이'] > 0]
-        negative_diff = inventory_data[inventory_data['차이'] < 0]
-        
-        positive_amount = positive_diff['차액'].sum() if not positive_diff.empty else 0
-        negative_amount = abs(negative_diff['차액'].sum()) if not negative_diff.empty else 0  # 절댓값
+            computer_stock_value = int(to_won(part_data['재고액']).sum())
         
-        # 최종재고액
-        final_stock_value = computer_stock_value + positive_amount - negative_amount
-        
-        # 차액 (실재고 - 전산재고)
-        difference = positive_amount - negative_amount
-        
-        return {
-            'computer_stock_value': computer_stock_value,
-            'positive_amount': positive_amount,
-            'negative_amount': negative_amount,
-            'final_stock_value': final_stock_value,
-            'difference': difference
-        }
+        return InventoryTotals().add(inventory_data).comparison(computer_stock_value)
     
     def _calculate_adjustment_impact(self, inventory_data: pd.DataFrame, final_data: pd.DataFrame, adj_summary: Dict) -> Dict:
         """재고조정 영향 계산"""
@@ -184,167 +185,158 @@ class ReportGenerator:
             'total_difference': total_difference
         }
     
-    def create_excel_report(self) -> bytes:
-        """다중 시트 엑셀 보고서 생성 (메모리에서 바이트로 반환)"""
+    @track_stage('create_excel_report', rows=_inventory_rows)
+    def create_excel_report(self, progress_callback: Optional[Callable[[str, int, int], None]] = None) -> bytes:
+        """
+        다중 시트 엑셀 보고서 생성 (메모리에서 바이트로 반환)
+        
+        시트마다 입력 데이터 해시로 작성된 시트 XML을 캐시하므로, 다시 만들 때는
+        입력이 바뀐 시트만 새로 작성하고 나머지는 압축된 상태 그대로 묶습니다.
+        
+        Args:
+            progress_callback: 시트 작성 진행 알림 함수 (작업명, 완료 단계 수, 전체 단계 수)
+        """
         
         if self.report_data is None:
             raise ValueError("먼저 generate_report_data()를 실행해주세요.")
         
-        # 메모리에서 엑셀 파일 생성
-        from io import BytesIO
-        buffer = BytesIO()
-        
-        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-            # 1. 재고조사요약 시트 - 전체 통계 및 계산 결과
-            summary_df = self._create_summary_sheet()
-            summary_df.to_excel(writer, sheet_name='재고조사요약', index=False, header=False)
-            
+        # 진행 단계: 7개 시트 (+ 기간비교/시점재고비교/검토대상 시트) + 요약 시트 스타일링 + 파일 저장
+        has_history = self.history_comparison is not None and not self.history_comparison.empty
+        has_book_stock = self.book_stock is not None and not self.book_stock.empty
+        has_review = self.review_list is not None and not self.review_list.empty
+        total_steps = 9 + int(has_history) + int(has_book_stock) + int(has_review)
+        completed_steps = [0]
+        
+        def report_progress(task_name: str):
+            completed_steps[0] += 1
+            if progress_callback is not None:
+                progress_callback(task_name, completed_steps[0], total_steps)
+        
+        # 시트 이름, 입력 데이터, 시트 데이터 생성 함수 (입력이 없으면 시트 생략)
+        part_inputs = (self.part_data,)
+        inventory_inputs = (self.inventory_data,)
+        adjustment_inputs = (self.adjustment_data, self.inventory_data, self.part_data)
+        sheet_specs = [
             # 2. PART원본데이터 시트 - 전산재고 원본 데이터
-            if self.part_data is not None:
-                part_df = self._create_part_data_sheet()
-                if not part_df.empty:
-                    part_df.to_excel(writer, sheet_name='PART원본데이터', index=False)
-            
+            ('PART원본데이터', part_inputs, self._create_part_data_sheet),
             # 3. ✅ 전체재고리스트 시트 - 순수 실재고 조사 결과 (재고조정 미적용)
-            if self.inventory_data is not None:
-                full_inventory_df = self._create_full_inventory_list_sheet()
-                if not full_inventory_df.empty:
-                    full_inventory_df.to_excel(writer, sheet_name='전체재고리스트', index=False)
-            
+            ('전체재고리스트', inventory_inputs, self._create_full_inventory_list_sheet),
             # 4. ✅ 재고차이리스트(-) 시트 - 실재고 부족 항목 (원본 조사 결과)
-            if self.inventory_data is not None:
-                negative_diff_df = self._create_negative_diff_sheet()
-                if not negative_diff_df.empty:
-                    negative_diff_df.to_excel(writer, sheet_name='재고차이리스트(-)', index=False)
-            
+            ('재고차이리스트(-)', inventory_inputs, self._create_negative_diff_sheet),
             # 5. ✅ 재고차이리스트(+) 시트 - 실재고 초과 항목 (원본 조사 결과)
-            if self.inventory_data is not None:
-                positive_diff_df = self._create_positive_diff_sheet()
-                if not positive_diff_df.empty:
-                    positive_diff_df.to_excel(writer, sheet_name='재고차이리스트(+)', index=False)
-            
+            ('재고차이리스트(+)', inventory_inputs, self._create_positive_diff_sheet),
             # 6. ✅ 재고조정리스트(-) 시트 - 별도 재고 감소 조정 내역 (독립적 관리)
-            if self.adjustment_data is not None:
-                negative_adj_df = self._create_negative_adjustment_sheet()
-                if not negative_adj_df.empty:
-                    negative_adj_df.to_excel(writer, sheet_name='재고조정리스트(-)', index=False)
-            
+            ('재고조정리스트(-)', adjustment_inputs, self._create_negative_adjustment_sheet),
             # 7. ✅ 재고조정리스트(+) 시트 - 별도 재고 증가 조정 내역 (독립적 관리)
-            if self.adjustment_data is not None:
-                positive_adj_df = self._create_positive_adjustment_sheet()
-                if not positive_adj_df.empty:
-                    positive_adj_df.to_excel(writer, sheet_name='재고조정리스트(+)', index=False)
-            
-            # 워크시트 스타일링
-            workbook = writer.book
-            worksheet = writer.sheets['재고조사요약']
-            
-            # 스타일 임포트
-            from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-            from openpyxl.utils import get_column_letter
-            
-            # 색상 정의
-            title_fill = PatternFill(start_color="2F5597", end_color="2F5597", fill_type="solid")    # 제목용 진한 네이비
-            info_fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")   # 연한 파란색
-            positive_fill = PatternFill(start_color="E8F5E8", end_color="E8F5E8", fill_type="solid")  # 연한 초록색
-            negative_fill = PatternFill(start_color="FFE8E8", end_color="FFE8E8", fill_type="solid")  # 연한 빨간색
-            total_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")    # 연한 노란색
-            
-            # 폰트 정의
-            title_font = Font(name='맑은 고딕', size=14, bold=True, color="FFFFFF")  # 제목용 흰색 글자
-            info_font = Font(name='맑은 고딕', size=11, bold=True)
-            data_font = Font(name='맑은 고딕', size=10)
-            amount_font = Font(name='맑은 고딕', size=10, bold=True)
-            
-            # 정렬 정의
-            center_align = Alignment(horizontal='center', vertical='center')
-            left_align = Alignment(horizontal='left', vertical='center')
-            right_align = Alignment(horizontal='right', vertical='center')
-            
-            # 테두리 정의
-            thin_border = Border(
-                left=Side(style='thin'), 
-                right=Side(style='thin'), 
-                top=Side(style='thin'), 
-                bottom=Side(style='thin')
-            )
-            
-            # 컬럼 너비 조정 (2컬럼 구조)
-            worksheet.column_dimensions['A'].width = 35
-            worksheet.column_dimensions['B'].width = 20
+            ('재고조정리스트(+)', adjustment_inputs, self._create_positive_adjustment_sheet),
+        ]
+        if has_history:
+            # 8. 기간비교(재고차이) 시트 - 이전 조사 대비 품목별 재고차이 (이전 조사가 있을 때만)
+            sheet_specs.append(('기간비교(재고차이)', (self.history_comparison,), lambda: self.history_comparison))
+        if has_book_stock:
+            # 9. 시점재고비교 시트 - PART 내보내기 이후 조사 시점까지 조정된 품목의 조사 시점 전산재고 대비 차이
+            sheet_specs.append(('시점재고비교', (self.book_stock,), self._create_book_stock_sheet))
+        if has_review:
+            # 10. 검토대상 시트 - 차이가 큰 순서의 검토 대기열 상위 품목
+            sheet_specs.append((
+                '검토대상(차이상위)', (self.review_list,),
+                lambda: self.review_list.rename(columns={'제작사 품번': '제작사품번'})
+            ))
+        
+        # 1. 재고조사요약 시트 - 전체 통계 및 계산 결과 (작고 매번 바뀌므로 항상 새로 작성)
+        styles = CellStyles()
+        summary_xml = self._summary_sheet_xml(self._create_summary_sheet(), styles)
+        sheets = [('재고조사요약', XlsxPart(summary_xml))]
+        report_progress('재고조사요약')
+        
+        # 같은 데이터프레임을 여러 시트가 쓰므로 해시는 한 번씩만 계산
+        digests: Dict[int, str] = {}
+        
+        def digest(frame) -> Optional[str]:
+            if frame is None:
+                return None
+            if id(frame) not in digests:
+                digests[id(frame)] = content_key(frame)
+            return digests[id(frame)]
+        
+        for sheet_name, inputs, build_sheet in sheet_specs:
+            if inputs[0] is not None:
+                key = content_key('report_sheet', SHEET_FORMAT_VERSION, sheet_name, [digest(frame) for frame in inputs])
+                part = self.sheet_cache.get(key)
+                if part is SheetPartCache.MISSING:
+                    sheet_df = build_sheet()
+                    part = None if sheet_df.empty else XlsxPart(frame_sheet_xml(sheet_df))
+                    self.sheet_cache.put(key, part)
+                if part is not None:
+                    sheets.append((sheet_name, part))
+            report_progress(sheet_name)
+        
+        # 요약 시트 서식은 시트 작성 시 등록, 여기서 서식 목록(styles.xml) 완성
+        report_progress('서식 적용')
+        workbook = write_workbook(sheets, styles)
+        report_progress('파일 저장')
+        return workbook
+    
+    @staticmethod
+    def _summary_sheet_xml(summary_df: pd.DataFrame, styles: CellStyles) -> bytes:
+        """요약 시트 XML (2컬럼 구조, 제목/점포 정보/금액 행별 서식)"""
+        font_name = '맑은 고딕'
+        
+        # 색상 정의
+        title_fill = '2F5597'     # 제목용 진한 네이비
+        info_fill = 'E7F3FF'      # 연한 파란색
+        positive_fill = 'E8F5E8'  # 연한 초록색
+        negative_fill = 'FFE8E8'  # 연한 빨간색
+        total_fill = 'FFF2CC'     # 연한 노란색
+        
+        # 폰트 정의 (이름, 크기, 굵게, 색상)
+        title_font = (font_name, 14, True, 'FFFFFF')  # 제목용 흰색 글자
+        info_font = (font_name, 11, True, None)
+        data_font = (font_name, 10, False, None)
+        amount_font = (font_name, 10, True, None)
+        negative_amount_font = (font_name, 10, True, 'CC0000')
+        
+        # 정렬 정의
+        center_align = ('center', 'center')
+        left_align = ('left', 'center')
+        right_align = ('right', 'center')
+        
+        values = summary_df.values.tolist()
+        cell_styles = []
+        for row_idx, (value_a, value_b) in enumerate(values, 1):
+            style_a = style_b = 0
             
-            # 먼저 제목 셀 병합
-            worksheet.merge_cells('A1:B1')
+            # 제목 행 (1행)
+            if row_idx == 1:
+                style_a = styles.add(font=title_font, fill=title_fill, border=True, align=center_align)
             
-            # 행별 스타일 적용
-            max_row = worksheet.max_row
+            # 점포 정보 섹션 (3-6행)
+            elif 3 <= row_idx <= 6:
+                style_a = styles.add(font=info_font, fill=info_fill, border=True, align=left_align)
+                style_b = styles.add(font=data_font, border=True, align=left_align)
             
-            for row_idx in range(1, max_row + 1):
-                cell_a = worksheet[f'A{row_idx}']
-                cell_b = worksheet[f'B{row_idx}']
-                
-                # 제목 행 (1행)
-                if row_idx == 1:
-                    cell_a.font = title_font
-                    cell_a.alignment = center_align
-                    cell_a.fill = title_fill
-                    cell_a.border = thin_border
-                
-                # 빈 행 (2행)
-                elif row_idx == 2:
-                    continue
-                
-                # 점포 정보 섹션 (3-6행)
-                elif 3 <= row_idx <= 6:
-                    cell_a.fill = info_fill
-                    cell_a.font = info_font
-                    cell_a.alignment = left_align
-                    cell_a.border = thin_border
-                    
-                    cell_b.font = data_font
-                    cell_b.alignment = left_align
-                    cell_b.border = thin_border
-                
-                # 빈 행 (7행)
-                elif row_idx == 7:
-                    continue
+            # 데이터 행들 (8행부터, 금액이 있는 행만)
+            elif row_idx >= 8 and value_a and str(value_a).strip() \
+                    and value_b and str(value_b).replace(',', '').replace('-', '').isdigit():
+                # 양수/음수/합계에 따른 색상 적용
+                fill = None
+                if '(+)' in str(value_a):
+                    fill = positive_fill
+                elif '(-)' in str(value_a):
+                    fill = negative_fill
+                elif '계' in str(value_a) or '차액' in str(value_a):
+                    fill = total_fill
                 
-                # 데이터 행들 (8행부터)
-                elif cell_a.value and str(cell_a.value).strip():
-                    # 금액이 있는 행인지 확인
-                    if cell_b.value and str(cell_b.value).replace(',', '').replace('-', '').isdigit():
-                        # 양수/음수/합계에 따른 색상 적용
-                        if '(+)' in str(cell_a.value):
-                            cell_a.fill = positive_fill
-                            cell_b.fill = positive_fill
-                        elif '(-)' in str(cell_a.value):
-                            cell_a.fill = negative_fill
-                            cell_b.fill = negative_fill
-                        elif '계' in str(cell_a.value) or '차액' in str(cell_a.value):
-                            cell_a.fill = total_fill
-                            cell_b.fill = total_fill
-                        
-                        cell_a.font = info_font
-                        cell_a.alignment = left_align
-                        cell_a.border = thin_border
-                        
-                        cell_b.font = amount_font
-                        cell_b.alignment = right_align
-                        cell_b.border = thin_border
-                        
-                        # 음수 금액은 빨간색으로
-                        if str(cell_b.value).startswith('-'):
-                            cell_b.font = Font(name='맑은 고딕', size=10, bold=True, color="CC0000")
+                # 음수 금액은 빨간색으로
+                font_b = negative_amount_font if str(value_b).startswith('-') else amount_font
+                style_a = styles.add(font=info_font, fill=fill, border=True, align=left_align)
+                style_b = styles.add(font=font_b, fill=fill, border=True, align=right_align)
             
-            # 행 높이 조정
-            for row in range(1, max_row + 1):
-                if row == 1:  # 제목 행은 더 높게
-                    worksheet.row_dimensions[row].height = 35
-                else:
-                    worksheet.row_dimensions[row].height = 25
-        
-        buffer.seek(0)
-        return buffer.getvalue()
+            cell_styles.append([style_a, style_b])
+        
+        # 행 높이: 제목 행은 더 높게
+        row_heights = [35 if row_idx == 1 else 25 for row_idx in range(1, len(values) + 1)]
+        return grid_sheet_xml(values, cell_styles, column_widths=[35, 20], row_heights=row_heights, merges=['A1:B1'])
     
     def _create_summary_sheet(self) -> pd.DataFrame:
         """요약 보고서 시트 데이터 생성"""
@@ -405,7 +397,7 @@ class ReportGenerator:
             return pd.DataFrame()
         
         # 차이가 음수인 데이터만 필터링
-        negative_data = self.inventory_data[self.inventory_data['차이'] < 0].copy()
+        negative_data = self.inventory_data[self.inventory_data['차이'] < 0]
         
         if negative_data.empty:
             return pd.DataFrame()
@@ -414,7 +406,7 @@ class ReportGenerator:
         result_df = negative_data[[
             '제작사 품번', '부품명', '단가', '재고', '재고액', 
             '실재고', '실재고액', '차액', '차이'
-        ]].copy()
+        ]]
         
         # 컬럼명 정리
         result_df.columns = [
@@ -448,7 +440,7 @@ class ReportGenerator:
             return pd.DataFrame()
         
         # 차이가 양수인 데이터만 필터링
-        positive_data = self.inventory_data[self.inventory_data['차이'] > 0].copy()
+        positive_data = self.inventory_data[self.inventory_data['차이'] > 0]
         
         if positive_data.empty:
             return pd.DataFrame()
@@ -457,7 +449,7 @@ class ReportGenerator:
         result_df = positive_data[[
             '제작사 품번', '부품명', '단가', '재고', '재고액', 
             '실재고', '실재고액', '차액', '차이'
-        ]].copy()
+        ]]
         
         # 컬럼명 정리
         result_df.columns = [
@@ -496,12 +488,12 @@ class ReportGenerator:
         
         # 조정구분이 '+'인 데이터만 필터링
         if '조정구분' in self.adjustment_data.columns:
-            positive_data = self.adjustment_data[self.adjustment_data['조정구분'] == '+'].copy()
+            positive_data = self.adjustment_data[self.adjustment_data['조정구분'] == '+']
         else:
             # 수량변경에서 +가 포함된 데이터 필터링 (더 안전한 방법)
             mask = (self.adjustment_data['수량변경'].astype(str).str.contains('+', na=False) | 
                    self.adjustment_data['수량변경'].astype(str).str.contains('증가', na=False))
-            positive_data = self.adjustment_data[mask].copy()
+            positive_data = self.adjustment_data[mask]
         
         if positive_data.empty:
             return pd.DataFrame()
@@ -534,12 +526,12 @@ class ReportGenerator:
         
         # 조정구분이 '-'인 데이터만 필터링
         if '조정구분' in self.adjustment_data.columns:
-            negative_data = self.adjustment_data[self.adjustment_data['조정구분'] == '-'].copy()
+            negative_data = self.adjustment_data[self.adjustment_data['조정구분'] == '-']
         else:
             # 수량변경에서 -가 포함된 데이터 필터링 (더 안전한 방법)
             mask = (self.adjustment_data['수량변경'].astype(str).str.contains('-', na=False) | 
                    self.adjustment_data['수량변경'].astype(str).str.contains('감소', na=False))
-            negative_data = self.adjustment_data[mask].copy()
+            negative_data = self.adjustment_data[mask]
         
         if negative_data.empty:
             return pd.DataFrame()
@@ -561,52 +553,69 @@ class ReportGenerator:
         
         return result_df
     
+    def _create_book_stock_sheet(self) -> pd.DataFrame:
+        """시점재고비교 시트 생성 (PART 내보내기 ~ 조사 시점 사이에 조정이 있었던 품목만)"""
+        if self.book_stock is None:
+            return pd.DataFrame()
+        
+        changed = self.book_stock[self.book_stock['조정수량'] != 0]
+        if changed.empty:
+            return pd.DataFrame()
+        
+        # 실재고가 있으면 조사 시점 전산재고 기준 차이/차액까지 표시
+        columns = ['제작사 품번', '부품명', '단가', '재고', '재고액', '조정수량', '시점재고', '시점재고액']
+        if '실재고' in changed.columns:
+            columns += ['실재고', '실재고액', '시점차이', '시점차액']
+        result_df = changed[columns].rename(columns={'제작사 품번': '제작사품번'})
+        result_df = self._sort_by_part_code(result_df, '제작사품번')
+        
+        # 합계 행 추가 (단가 제외 숫자 컬럼 합계)
+        total_row = {column: result_df[column].sum() for column in result_df.columns[3:]}
+        total_row.update({'제작사품번': '합계', '부품명': '', '단가': ''})
+        return pd.concat([result_df, pd.DataFrame([total_row])], ignore_index=True)
+    
     def _process_adjustment_data(self, data: pd.DataFrame) -> pd.DataFrame:
         """재고조정 데이터 공통 처리"""
-        result_df = data.copy()
+        result_df = data
+        
+        # 정규화 품번 키 (단가 매칭용)
+        keys = part_keys(result_df, '제작사품번').astype(object).to_numpy()
         
         # 필요한 컬럼만 선택
         if '조정구분' in result_df.columns:
-            result_df = result_df[['일자', '조정구분', '제작사품번', '부품명', '수량']].copy()
+            result_df = result_df[['일자', '조정구분', '제작사품번', '부품명', '수량']]
             result_df.columns = ['일자', '구분', '제작사품번', '부품명', '수량']
         else:
-            result_df = result_df[['일자', '수량변경', '제작사품번', '부품명', '수량']].copy()
+            result_df = result_df[['일자', '수량변경', '제작사품번', '부품명', '수량']]
             result_df.columns = ['일자', '구분', '제작사품번', '부품명', '수량']
         
-        # 단가와 금액 계산 - dtype 명시적 설정
-        result_df = result_df.copy()
-        result_df['단가'] = 0.0
-        result_df['금액'] = 0.0
+        # 단가와 금액 계산 (단가: 1/100원 단위, 금액: 원 단위 정수)
+        price_scaled = np.zeros(len(result_df), dtype=np.int64)
         
-        # inventory_data나 part_data에서 단가 매칭
+        # inventory_data나 part_data에서 단가 매칭 (정규화 품번 키, 품번별 첫 번째 행 기준)
         if self.inventory_data is not None:
-            for idx, row in result_df.iterrows():
-                part_code = row['제작사품번']
-                quantity = float(row['수량'])
-                
-                # inventory_data에서 단가 찾기
-                matching_rows = self.inventory_data[self.inventory_data['제작사 품번'] == part_code]
-                if not matching_rows.empty:
-                    unit_price = float(matching_rows.iloc[0]['단가'])
-                    result_df.at[idx, '단가'] = unit_price
-                    result_df.at[idx, '금액'] = quantity * unit_price
-                elif self.part_data is not None:
-                    # part_data에서 단가 찾기
-                    matching_parts = self.part_data[self.part_data['제작사 품번'] == part_code]
-                    if not matching_parts.empty:
-                        # 재고액/재고로 단가 계산
-                        stock = float(matching_parts.iloc[0]['재고'])
-                        stock_value = float(matching_parts.iloc[0]['재고액'])
-                        if stock > 0:
-                            unit_price = stock_value / stock
-                            result_df.at[idx, '단가'] = unit_price
-                            result_df.at[idx, '금액'] = quantity * unit_price
+            # inventory_data에서 단가 찾기
+            inventory_index = PartKeyIndex(part_keys(self.inventory_data, '제작사 품번'))
+            inventory_rows = inventory_index.lookup(keys)
+            found = inventory_rows >= 0
+            price_scaled[found] = to_scaled_price(self.inventory_data['단가'])[inventory_rows[found]]
+            
+            if self.part_data is not None and not found.all():
+                # part_data에서 단가 찾기 (재고액/재고로 단가 계산, 재고가 없으면 0)
+                part_index = PartKeyIndex(part_keys(self.part_data, '제작사 품번'))
+                part_rows = part_index.lookup(keys)
+                fallback = ~found & (part_rows >= 0)
+                part_prices = unit_price_scaled(to_won(self.part_data['재고액']), self.part_data['재고'])
+                price_scaled[fallback] = part_prices[part_rows[fallback]]
+        
+        result_df = result_df.assign(단가=from_scaled_price(price_scaled),
+                                     금액=amount_won(result_df['수량'], price_scaled))
         
         # ✅ 공통 정렬 함수 사용 (숫자/문자/혼합 대응) - 재고조정리스트
         result_df = self._sort_by_part_code(result_df, '제작사품번')
         
         # 일자 포맷 변경
-        result_df['일자'] = pd.to_datetime(result_df['일자']).dt.strftime('%Y-%m-%d')
+        result_df = result_df.assign(일자=pd.to_datetime(result_df['일자']).dt.strftime('%Y-%m-%d'))
         
         return result_df
     
@@ -627,8 +636,8 @@ class ReportGenerator:
         if self.part_data is None:
             return pd.DataFrame()
         
-        # PART 원본 데이터 복사
-        result_df = self.part_data.copy()
+        # PART 원본 데이터 (copy-on-write: 컬럼 선택/정렬 결과만 새로 만듦)
+        result_df = self.part_data
         
         # 컬럼명 한글로 변경
         column_mapping = {
@@ -641,7 +650,7 @@ class ReportGenerator:
         
         # 필요한 컬럼만 선택하고 컬럼명 변경
         if set(column_mapping.keys()).issubset(result_df.columns):
-            result_df = result_df[list(column_mapping.keys())].copy()
+            result_df = result_df[list(column_mapping.keys())]
             result_df.columns = list(column_mapping.values())
         
         # ✅ 공통 정렬 함수 사용 (숫자/문자/혼합 대응) - PART원본데이터
@@ -670,15 +679,15 @@ class ReportGenerator:
         if self.inventory_data is None:
             return pd.DataFrame()
         
-        # ✅ 원본 실재고 조사 데이터 복사 (재고조정 미적용 상태)
-        result_df = self.inventory_data.copy()
+        # ✅ 원본 실재고 조사 데이터 (재고조정 미적용 상태)
+        result_df = self.inventory_data
         
         # 필요한 컬럼만 선택하고 컬럼명 정리
         if '제작사 품번' in result_df.columns:
             result_df = result_df[[
                 '제작사 품번', '부품명', '단가', '재고', '재고액',
                 '실재고', '실재고액', '차이', '차액'
-            ]].copy()
+            ]]
             
             # 컬럼명 정리
             result_df.columns = [
@@ -689,10 +698,6 @@ class ReportGenerator:
         # ✅ 강제로 제작사품번 기준 정렬 (기존 정렬 상태 완전 무시)
         result_df = self._sort_by_part_code(result_df, '제작사품번')
         
-        # 디버깅: 정렬 결과 확인 (개발용)
-        if not result_df.empty:
-            print(f"전체재고리스트 정렬 후 제작사품번 순서 (상위 10개): {result_df['제작사품번'].head(10).tolist()}")
-        
         # 합계 행 추가
         if not result_df.empty:
             total_row = pd.DataFrame({
@@ -0,0 +1,189 @@
+import copy
+import time
+import uuid
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any
+
+from .shared_cache import content_key
+from .task_scheduler import estimate_report_memory
+
+# 보고서 엑셀 내용을 결정하는 생성기 데이터 (공유 캐시 키)
+REPORT_INPUT_ATTRIBUTES = (
+    'part_data', 'inventory_data', 'final_data', 'adjustment_data', 'history_comparison', 'book_stock',
+    'review_list'
+)
+
+
+class ReportJob:
+    """백그라운드 엑셀 보고서 생성 작업 상태"""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = 'queued'  # queued → running → done / error
+        self.current_task = None
+        self.completed_steps = 0
+        self.total_steps = 0
+        self.result: Optional[bytes] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        # 무거운 작업 스케줄러 티켓 (스케줄러를 쓰지 않으면 None)
+        self.ticket_id: Optional[str] = None
+        self.queue_position = 0
+        self.finished_at: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        """진행률 (0.0 ~ 1.0)"""
+        if self.status == 'done':
+            return 1.0
+        if not self.total_steps:
+            return 0.0
+        return min(self.completed_steps / self.total_steps, 1.0)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in ('done', 'error')
+
+
+class ReportJobManager:
+    """엑셀 보고서 생성 작업을 스크립트 실행과 분리해 백그라운드 스레드에서 처리하는 클래스"""
+
+    def __init__(self, max_workers: int = 2, result_ttl: float = 3600, cache: Optional[Any] = None,
+                 scheduler: Optional[Any] = None):
+        """
+        Args:
+            max_workers: 동시에 생성할 최대 보고서 수
+            result_ttl: 완료된 작업을 보관하는 시간(초), 지나면 결과 삭제
+            cache: 완성된 보고서를 프로세스 간에 공유할 SharedDiskCache (None이면 사용 안 함)
+            scheduler: 다른 무거운 작업과 동시 실행 수/메모리 예산을 나눠 쓰는 HeavyTaskScheduler
+                (지정하면 시작 순서는 스케줄러가 정하고, 스레드는 대기 작업 수만큼 둠)
+        """
+        self.result_ttl = result_ttl
+        self.cache = cache
+        self.scheduler = scheduler
+        if scheduler is not None:
+            # 대기 중인 작업도 스레드에서 차례를 기다리므로 스케줄러가 시작시킨 작업이 스레드를 못 얻는 일이 없도록
+            max_workers = scheduler.max_concurrent + scheduler.max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='report-job')
+        self._jobs: Dict[str, ReportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, report_generator: Any, session_id: str = '') -> str:
+        """
+        보고서 생성 작업 등록
+
+        제출 시점의 생성기 상태를 얕은 복사로 고정하므로
+        작업 중 다른 세션이 같은 생성기로 보고서 데이터를 다시 만들어도 결과가 섞이지 않습니다.
+
+        Args:
+            report_generator: generate_report_data()를 실행한 ReportGenerator
+            session_id: 요청한 세션 ID (스케줄러의 세션별 대기 순서용)
+
+        Returns:
+            작업 ID (스케줄러 대기열이 가득 차면 SchedulerBusy)
+        """
+        if report_generator.report_data is None:
+            raise ValueError("먼저 generate_report_data()를 실행해주세요.")
+
+        self._cleanup()
+        snapshot = copy.copy(report_generator)
+        job = ReportJob(uuid.uuid4().hex)
+        cache_key = self._cache_key(snapshot)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            # 같은 입력의 보고서를 다른 세션/프로세스가 이미 만들었으면 바로 완료
+            job.result = cached
+            job.status = 'done'
+            job.finished_at = time.time()
+        elif self.scheduler is not None:
+            frames = (getattr(snapshot, name, None) for name in REPORT_INPUT_ATTRIBUTES)
+            job.ticket_id = self.scheduler.enqueue(session_id, 'create_excel_report', estimate_report_memory(frames))
+        with self._lock:
+            self._jobs[job.job_id] = job
+        if cached is None:
+            # 제출한 세션의 실행 문맥(측정 기록의 세션 구분 등)을 작업 스레드에서도 유지
+            context = contextvars.copy_context()
+            self._executor.submit(context.run, self._run, job, snapshot, cache_key)
+        return job.job_id
+
+    def _cache_key(self, report_generator: Any) -> Optional[str]:
+        """보고서 입력 내용 해시 (생성 시각 제외)"""
+        if self.cache is None:
+            return None
+        report_data = {key: value for key, value in report_generator.report_data.items() if key != 'generated_at'}
+        return content_key(
+            'report', report_data,
+            *(getattr(report_generator, name, None) for name in REPORT_INPUT_ATTRIBUTES)
+        )
+
+    def _cache_get(self, cache_key: Optional[str]) -> Optional[bytes]:
+        if cache_key is None:
+            return None
+        try:
+            return self.cache.get('report', cache_key)
+        except OSError:
+            return None
+
+    def _run(self, job: ReportJob, report_generator: Any, cache_key: Optional[str] = None):
+        try:
+            if job.ticket_id is not None:
+                # 스케줄러가 시작시킬 때까지 대기 (대기 순번은 get()에서 갱신)
+                self.scheduler.wait(job.ticket_id)
+            self._generate(job, report_generator, cache_key)
+        finally:
+            if job.ticket_id is not None:
+                self.scheduler.release(job.ticket_id)
+
+    def _generate(self, job: ReportJob, report_generator: Any, cache_key: Optional[str] = None):
+        job.status = 'running'
+
+        def on_progress(task_name: str, completed: int, total: int):
+            job.current_task = task_name
+            job.completed_steps = completed
+            job.total_steps = total
+
+        try:
+            excel_data = report_generator.create_excel_report(progress_callback=on_progress)
+            if not excel_data:
+                raise ValueError("데이터가 비어있습니다.")
+            job.result = excel_data
+            job.status = 'done'
+            if cache_key is not None:
+                try:
+                    self.cache.put('report', cache_key, excel_data)
+                except OSError:
+                    # 캐시 저장 실패는 보고서 결과에 영향 없음
+                    pass
+        except Exception as e:
+            job.error = str(e)
+            job.status = 'error'
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, job_id: Optional[str]) -> Optional[ReportJob]:
+        """작업 조회 (없거나 만료되면 None)"""
+        if not job_id:
+            return None
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None and job.status == 'queued' and job.ticket_id is not None:
+            job.queue_position = max(self.scheduler.position(job.ticket_id), 0)
+        return job
+
+    def discard(self, job_id: Optional[str]):
+        """결과를 가져간 작업 삭제"""
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def _cleanup(self):
+        """보관 시간이 지난 완료 작업 삭제 (결과를 가져가지 않은 세션 대비)"""
+        now = time.time()
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished_at is not None and now - job.finished_at > self.result_ttl
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
@@ -0,0 +1,245 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .money import to_won
+
+# 순위 기준 (이름 → 표시명)
+REVIEW_METRICS = {
+    'amount': '차액 크기 (|차액|)',
+    'quantity': '차이 수량 크기 (|차이|)',
+    'ratio': '재고액 대비 차액 (|차액| ÷ 재고액)',
+}
+
+# 순위 기준별 점수 컬럼명 (검토 목록/보고서 시트)
+SCORE_COLUMNS = {'amount': '|차액|', 'quantity': '|차이|', 'ratio': '차액비율(%)'}
+
+# 검토 목록에 표시하는 컬럼
+REVIEW_COLUMNS = ['제작사 품번', '부품명', '단가', '재고', '재고액', '실재고', '실재고액', '차이', '차액']
+
+
+def review_scores(df: pd.DataFrame, metric: str) -> np.ndarray:
+    """
+    품목별 검토 우선순위 점수 (클수록 먼저 검토, 차이가 없으면 0)
+
+    ratio는 전산재고액이 0 이하인데 차액이 있으면(장부에 없는 재고 발견 등) inf로 가장 먼저 검토합니다.
+    """
+    if metric not in REVIEW_METRICS:
+        raise ValueError(f"알 수 없는 순위 기준: {metric}")
+    차액 = np.abs(to_won(df['차액'])).astype(np.float64)
+    if metric == 'amount':
+        return 차액
+    if metric == 'quantity':
+        차이 = pd.to_numeric(df['차이'], errors='coerce').to_numpy(dtype=np.float64)
+        return np.abs(np.nan_to_num(차이, nan=0.0, posinf=0.0, neginf=0.0))
+    재고액 = to_won(df['재고액']).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(재고액 > 0, 차액 / 재고액, np.where(차액 > 0, np.inf, 0.0))
+
+
+def top_positions(scores: np.ndarray, n: int, min_score: float = 0.0) -> np.ndarray:
+    """
+    점수 상위 n개 위치 (점수 내림차순, 같은 점수는 앞 행부터, 점수 0은 제외)
+
+    전체를 정렬하지 않고 argpartition으로 n개를 고른 뒤 그 n개만 정렬합니다 (O(N + n log n)).
+    """
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.flatnonzero((scores > 0) & (scores >= min_score))
+    if len(candidates) > n:
+        candidates = candidates[np.argpartition(-scores[candidates], n - 1)[:n]]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+class ReviewQueue:
+    """
+    검토 대기열 (차이가 큰 품목부터, 상위 capacity개를 최소 힙으로 유지)
+
+    행이 추가되거나(extend, 실재고 행 묶음) 일부 행 값이 바뀌면(update, 재고조정 반영 등)
+    바뀐 행만 다시 계산해 힙에 반영하므로 전체 품목을 다시 정렬하지 않습니다.
+    힙 안 품목의 점수가 내려가면 밖의 품목이 더 클 수 있어 다음 조회 때 argpartition으로 다시 고릅니다.
+    기준값(min_score)은 조회할 때 힙 안에서만 거르므로 바꿔도 전체를 다시 계산하지 않습니다.
+    """
+
+    def __init__(self, data: Optional[pd.DataFrame] = None, metric: str = 'amount', capacity: int = 500):
+        """
+        Args:
+            data: 실재고 데이터 (REVIEW_COLUMNS 포함)
+            metric: 순위 기준 (REVIEW_METRICS)
+            capacity: 힙에 유지할 상위 품목 수 (조회 가능한 최대 개수)
+        """
+        if metric not in REVIEW_METRICS:
+            raise ValueError(f"알 수 없는 순위 기준: {metric}")
+        self.metric = metric
+        self.capacity = max(1, capacity)
+        self.data = pd.DataFrame(columns=REVIEW_COLUMNS)
+        self._scores = np.empty(0, dtype=np.float64)
+        # (점수, -위치) 최소 힙 (같은 점수면 뒤 행이 먼저 빠짐) - 위치의 현재 점수와 다른 항목은 지난 값이라 무시
+        self._heap: List[Tuple[float, int]] = []
+        # 힙에 든 위치 → 현재 점수
+        self._members: Dict[int, float] = {}
+        self._stale = False
+        if data is not None:
+            self.extend(data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def extend(self, rows: pd.DataFrame):
+        """행 추가 (실재고 파일을 나눠 처리할 때 행 묶음마다 호출 가능)"""
+        start = len(self.data)
+        rows = rows[REVIEW_COLUMNS].reset_index(drop=True)
+        self.data = rows if start == 0 else pd.concat([self.data, rows], ignore_index=True)
+        scores = review_scores(rows, self.metric)
+        self._scores = np.concatenate([self._scores, scores])
+        # 이번 묶음에서 힙에 들어갈 수 있는 것은 묶음 안 상위 capacity개뿐
+        for position in top_positions(scores, self.capacity):
+            self._offer(start + int(position), float(scores[position]))
+
+    def update(self, positions, rows: pd.DataFrame):
+        """
+        일부 행 값 변경 (바뀐 행만 점수를 다시 계산해 힙에 반영)
+
+        Args:
+            positions: 바뀐 행 위치
+            rows: 바뀐 행의 새 값 (positions와 같은 순서)
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        if not len(positions):
+            return
+        rows = rows[REVIEW_COLUMNS]
+        changed = {}
+        for column in REVIEW_COLUMNS:
+            values = self.data[column].to_numpy()
+            new_values = rows[column].to_numpy()
+            old_values = values[positions]
+            if ((old_values == new_values) | (pd.isna(old_values) & pd.isna(new_values))).all():
+                continue
+            merged = values.astype(np.result_type(values.dtype, new_values.dtype), copy=True)
+            merged[positions] = new_values
+            changed[column] = merged
+        # copy-on-write: 값이 바뀐 컬럼만 새로 만들고 나머지는 공유
+        if changed:
+            self.data = self.data.assign(**changed)
+
+        new_scores = review_scores(rows, self.metric)
+        for position, score in zip(positions.tolist(), new_scores.tolist()):
+            old_score = self._scores[position]
+            self._scores[position] = score
+            if position in self._members and score < old_score:
+                self._stale = True
+            self._offer(position, score)
+
+    def refresh(self, data: pd.DataFrame):
+        """
+        새 데이터로 갱신 (행 구성이 같으면 값이 바뀐 행만 update, 절반 이상 바뀌었으면 다시 계산)
+
+        재고조정을 다시 반영하는 등 일부 품목의 실재고/차액만 바뀌는 경우에 사용합니다.
+        """
+        if len(data) != len(self.data):
+            self._reset(data)
+            return
+        changed = np.zeros(len(data), dtype=bool)
+        for column in REVIEW_COLUMNS:
+            old_values = self.data[column].to_numpy()
+            new_values = data[column].to_numpy()
+            changed |= ~((old_values == new_values) | (pd.isna(old_values) & pd.isna(new_values)))
+        positions = np.flatnonzero(changed)
+        if len(positions) * 2 >= len(data):
+            self._reset(data)
+        else:
+            self.update(positions, data.iloc[positions])
+
+    def set_metric(self, metric: str):
+        """순위 기준 변경 (점수만 다시 계산하고 상위 품목 재선정, 전체 정렬 없음)"""
+        if metric not in REVIEW_METRICS:
+            raise ValueError(f"알 수 없는 순위 기준: {metric}")
+        if metric != self.metric:
+            self.metric = metric
+            self._scores = review_scores(self.data, metric)
+            self._rebuild()
+
+    def count(self, min_score: float = 0.0) -> int:
+        """기준값 이상인 검토 대상 품목 수 (점수 0 제외)"""
+        return int(((self._scores > 0) & (self._scores >= min_score)).sum())
+
+    def top(self, n: Optional[int] = None, min_score: float = 0.0) -> pd.DataFrame:
+        """
+        검토 목록 (순위, 점수 컬럼 포함, 점수 내림차순)
+
+        Args:
+            n: 최대 개수 (None이면 capacity, capacity보다 크면 capacity를 늘려 다시 선정)
+            min_score: 이 점수 미만 품목 제외 (ratio는 비율, 0.1 = 10%)
+        """
+        n = self.capacity if n is None else max(0, n)
+        if n > self.capacity:
+            self.capacity = n
+            self._stale = True
+        if self._stale:
+            self._rebuild()
+
+        entries = [(score, position) for position, score in self._members.items()
+                   if score > 0 and score >= min_score]
+        best = heapq.nsmallest(n, entries, key=lambda entry: (-entry[0], entry[1]))
+        positions = np.array([position for _, position in best], dtype=np.int64)
+
+        result = self.data.iloc[positions].reset_index(drop=True)
+        scores = self._scores[positions]
+        if self.metric == 'ratio':
+            # 백분율 (전산재고액이 없는 품목은 빈 값)
+            scores = np.where(np.isinf(scores), np.nan, np.round(scores * 100, 1))
+        elif self.metric == 'amount':
+            # 원 단위 정수
+            scores = scores.astype(np.int64)
+        result.insert(0, '순위', np.arange(1, len(result) + 1))
+        result[SCORE_COLUMNS[self.metric]] = scores
+        return result
+
+    # ---- 내부 ----
+
+    def _offer(self, position: int, score: float):
+        """위치 하나의 새 점수를 힙에 반영"""
+        if position in self._members:
+            self._members[position] = score
+            heapq.heappush(self._heap, (score, -position))
+        elif score <= 0:
+            return
+        elif len(self._members) < self.capacity:
+            self._members[position] = score
+            heapq.heappush(self._heap, (score, -position))
+        else:
+            lowest = self._peek_lowest()
+            if (score, -position) <= lowest:
+                return
+            heapq.heappop(self._heap)
+            del self._members[-lowest[1]]
+            self._members[position] = score
+            heapq.heappush(self._heap, (score, -position))
+
+        # 지난 값 항목이 쌓이면 힙 정리
+        if len(self._heap) > 4 * self.capacity + 64:
+            self._heapify_members()
+
+    def _peek_lowest(self) -> Tuple[float, int]:
+        """힙 안 현재 점수가 가장 낮은 품목 (점수, -위치) (지난 값 항목은 버림)"""
+        while self._heap and self._members.get(-self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0]
+
+    def _heapify_members(self):
+        self._heap = [(score, -position) for position, score in self._members.items()]
+        heapq.heapify(self._heap)
+
+    def _reset(self, data: pd.DataFrame):
+        self.data = data[REVIEW_COLUMNS].reset_index(drop=True)
+        self._scores = review_scores(self.data, self.metric)
+        self._rebuild()
+
+    def _rebuild(self):
+        """전체 점수에서 상위 capacity개 다시 선정 (argpartition, 전체 정렬 없음)"""
+        positions = top_positions(self._scores, self.capacity)
+        self._members = {int(position): float(self._scores[position]) for position in positions}
+        self._heapify_members()
+        self._stale = False
@@ -0,0 +1,364 @@
+import os
+import uuid
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .columnar_io import write_frame, read_frame
+
+# 세션별로 관리하는 대용량 값 (main()에서 초기화하는 세션 상태 키)
+MANAGED_KEYS = (
+    'part_data', 'inventory_data', 'adjustment_data', 'adjustment_filtered', 'final_data',
+    'excel_report_data', 'processed_inventory_excel',
+)
+
+
+def estimate_nbytes(value: Any) -> int:
+    """값의 메모리 크기 (데이터프레임은 문자열 포함 실제 크기)"""
+    if value is None:
+        return 0
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return 0
+
+
+class _Spilled:
+    """디스크로 내린 값의 위치"""
+
+    __slots__ = ('path', 'kind', 'nbytes')
+
+    def __init__(self, path: str, kind: str, nbytes: int):
+        self.path = path
+        self.kind = kind
+        self.nbytes = nbytes
+
+
+class SessionToken:
+    """세션 상태에 보관하는 세션 식별자 (세션이 사라져 수거되면 관리자의 해당 세션 데이터도 삭제)"""
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+
+
+class SessionDataManager:
+    """
+    세션별 대용량 데이터(데이터프레임, 엑셀 바이트)를 관리하는 클래스 (전체 세션 공용)
+
+    메모리에 올라간 전체 크기가 한도를 넘으면 가장 오래 사용하지 않은 세션의 값부터
+    디스크(데이터프레임은 Arrow IPC, 바이트는 파일)로 내리고, 다시 접근하면 읽어 올립니다.
+    관리 값에서 만든 파생 값(페이지 표, 지문 등)은 cached()로 보관해 원본을 내릴 때 함께 버립니다.
+    디스크 쓰기는 잠금 밖에서 하므로 내리는 동안에도 다른 세션의 조회/저장은 기다리지 않습니다.
+    """
+
+    def __init__(self, max_resident_bytes: int = 512 * 1024 * 1024, spill_dir: Optional[str] = None):
+        """
+        Args:
+            max_resident_bytes: 메모리에 둘 최대 크기 (현재 사용 중인 세션은 한도를 넘어도 유지)
+            spill_dir: 디스크로 내린 값을 저장할 폴더 (None이면 임시 폴더를 만들고 관리자 수거/종료 시 삭제)
+        """
+        self.max_resident_bytes = max_resident_bytes
+        if spill_dir:
+            self.spill_dir = spill_dir
+            os.makedirs(self.spill_dir, exist_ok=True)
+        else:
+            self.spill_dir = tempfile.mkdtemp(prefix='session_spill_')
+            weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+        # 세션 ID → {키: 값 또는 _Spilled}, 최근 사용한 세션이 뒤
+        self._sessions: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._sizes: Dict[str, Dict[str, int]] = {}
+        # 세션 ID → {이름: (원본 키 목록, 값 교체 시 유지 여부, 파생 값)}
+        self._derived: Dict[str, Dict[str, Tuple[Tuple[str, ...], bool, Any]]] = {}
+        # 세션 ID → {키: 변경 횟수} (값 교체/디스크로 내림마다 증가, cached()가 만드는 동안 바뀌었는지 확인)
+        self._versions: Dict[str, Dict[str, int]] = {}
+        # 디스크에 쓰는 중인 (세션 ID, 키)와 그 크기 합 (다른 스레드가 같은 값을 중복해서 내리지 않도록)
+        self._spilling: set = set()
+        self._spilling_bytes = 0
+        # 디스크로 내린 데이터프레임 (다른 곳에서 참조하지 않으면 수거되어야 함, stats()의 spilled_alive)
+        self._spilled_refs: List[weakref.ref] = []
+        self._resident_bytes = 0
+        self._lock = threading.RLock()
+        self.spill_count = 0
+        self.load_count = 0
+
+    def register(self) -> SessionToken:
+        """새 세션 등록 (반환된 토큰을 세션 상태에 보관)"""
+        token = SessionToken(uuid.uuid4().hex)
+        with self._lock:
+            self._sessions[token.session_id] = {}
+            self._sizes[token.session_id] = {}
+        weakref.finalize(token, self.drop, token.session_id)
+        return token
+
+    def view(self, token: SessionToken, state: Any) -> 'SessionData':
+        """세션 상태와 관리 데이터를 하나로 다루는 접근 객체"""
+        return SessionData(self, token.session_id, state)
+
+    def _touch(self, session_id: str, create: bool = False) -> Optional[Dict[str, Any]]:
+        """세션 값 목록 (최근 사용으로 이동, create=False이면 없는 세션은 None)"""
+        values = self._sessions.get(session_id)
+        if values is None:
+            if not create:
+                return None
+            values = self._sessions[session_id] = {}
+            self._sizes[session_id] = {}
+        self._sessions.move_to_end(session_id)
+        return values
+
+    def contains(self, session_id: str, key: str) -> bool:
+        with self._lock:
+            return key in self._sessions.get(session_id, {})
+
+    def get(self, session_id: str, key: str, default: Any = None) -> Any:
+        """값 조회 (디스크로 내린 값은 다시 읽어 메모리에 올림)"""
+        with self._lock:
+            values = self._touch(session_id)
+            if values is None or key not in values:
+                return default
+            value = values[key]
+            if not isinstance(value, _Spilled):
+                return value
+            spilled, value = value, self._load(value)
+            values[key] = value
+            # 다시 내릴 때는 새 파일에 쓰므로 읽은 파일은 삭제
+            os.remove(spilled.path)
+            self._resident_bytes += self._sizes[session_id][key]
+            self.load_count += 1
+        self._enforce_limit(session_id)
+        return value
+
+    def put(self, session_id: str, key: str, value: Any):
+        """값 저장 (한도를 넘으면 다른 세션의 값을 디스크로 내림)"""
+        nbytes = estimate_nbytes(value)
+        with self._lock:
+            values = self._touch(session_id, create=True)
+            self._discard(session_id, key)
+            self._invalidate(session_id, key, replaced=True)
+            values[key] = value
+            self._sizes[session_id][key] = nbytes
+            self._resident_bytes += nbytes
+            self._bump(session_id, key)
+        self._enforce_limit(session_id)
+
+    def cached(self, session_id: str, name: str, sources: Tuple[str, ...], build: Callable[[], Any],
+               keep_on_put: bool = False) -> Any:
+        """
+        관리 값에서 만든 파생 값 조회 (없으면 build()로 만들어 보관)
+
+        파생 값은 원본 데이터프레임을 참조할 수 있으므로 세션 상태에 두지 않고 여기에 보관해
+        원본(sources)을 디스크로 내리면 함께 버립니다. 원본 값을 바꾸면 keep_on_put=False인 값도 버립니다.
+        크기는 메모리 한도에 포함하지 않습니다.
+        build()는 잠금 밖에서 실행하므로 그동안 원본이 바뀌거나 디스크로 내려갔으면 보관하지 않습니다.
+        """
+        with self._lock:
+            entry = self._derived.get(session_id, {}).get(name)
+            if entry is not None and entry[0] == sources:
+                return entry[2]
+            versions = self._source_versions(session_id, sources)
+        value = build()
+        with self._lock:
+            if session_id in self._sessions and self._source_versions(session_id, sources) == versions:
+                self._derived.setdefault(session_id, {})[name] = (sources, keep_on_put, value)
+        return value
+
+    def _bump(self, session_id: str, key: str):
+        """원본 값 변경 횟수 증가 (값 교체/디스크로 내림)"""
+        versions = self._versions.setdefault(session_id, {})
+        versions[key] = versions.get(key, 0) + 1
+
+    def _source_versions(self, session_id: str, sources: Tuple[str, ...]) -> Tuple[int, ...]:
+        versions = self._versions.get(session_id, {})
+        return tuple(versions.get(key, 0) for key in sources)
+
+    def _invalidate(self, session_id: str, key: str, replaced: bool = False):
+        """원본 키에서 만든 파생 값 제거 (replaced=True면 값 교체, keep_on_put 값은 유지)"""
+        derived = self._derived.get(session_id)
+        if not derived:
+            return
+        for name, (sources, keep_on_put, _) in list(derived.items()):
+            if key in sources and not (replaced and keep_on_put):
+                del derived[name]
+
+    def _discard(self, session_id: str, key: str):
+        """기존 값 제거 (메모리 크기/디스크 파일 정리)"""
+        old = self._sessions[session_id].pop(key, None)
+        old_size = self._sizes[session_id].pop(key, 0)
+        if isinstance(old, _Spilled):
+            if os.path.exists(old.path):
+                os.remove(old.path)
+        elif old is not None:
+            self._resident_bytes -= old_size
+
+    def _enforce_limit(self, active_session_id: str):
+        """
+        한도를 넘으면 오래 사용하지 않은 세션부터 디스크로 내림 (현재 세션 제외)
+
+        잠금 안에서 내릴 값을 고르고, 잠금 밖에서 파일로 쓴 뒤, 다시 잠금 안에서
+        그동안 값이 바뀌지 않은 것만 디스크 위치로 교체합니다.
+        """
+        with self._lock:
+            candidates = self._spill_candidates(active_session_id)
+        for session_id, key, value, nbytes in candidates:
+            try:
+                path, kind = self._write_spill(session_id, key, value)
+            except OSError:
+                # 디스크에 쓰지 못하면 메모리에 그대로 둠
+                path = None
+            with self._lock:
+                self._spilling.discard((session_id, key))
+                self._spilling_bytes -= nbytes
+                values = self._sessions.get(session_id)
+                if path is None:
+                    continue
+                if values is None:
+                    # 쓰는 동안 세션이 끝남 (drop()이 지운 뒤 다시 만든 폴더까지 삭제)
+                    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+                    continue
+                if values.get(key) is not value:
+                    # 쓰는 동안 값이 바뀜
+                    os.remove(path)
+                    continue
+                values[key] = _Spilled(path, kind, nbytes)
+                self._invalidate(session_id, key)
+                self._bump(session_id, key)
+                if kind == 'frame':
+                    self._spilled_refs.append(weakref.ref(value))
+                self._resident_bytes -= nbytes
+                self.spill_count += 1
+
+    def _spill_candidates(self, active_session_id: str) -> List[Tuple[str, str, Any, int]]:
+        """내릴 값 목록 (이미 다른 스레드가 쓰는 중인 값은 제외하고 그 크기만큼 덜 내림)"""
+        candidates = []
+        excess = self._resident_bytes - self._spilling_bytes - self.max_resident_bytes
+        for session_id, values in self._sessions.items():
+            if excess <= 0:
+                break
+            if session_id == active_session_id:
+                continue
+            for key, value in values.items():
+                nbytes = self._sizes[session_id][key]
+                if value is None or isinstance(value, _Spilled) or not nbytes or (session_id, key) in self._spilling:
+                    continue
+                candidates.append((session_id, key, value, nbytes))
+                self._spilling.add((session_id, key))
+                self._spilling_bytes += nbytes
+                excess -= nbytes
+        return candidates
+
+    def _write_spill(self, session_id: str, key: str, value: Any) -> Tuple[str, str]:
+        """값을 파일로 저장 (잠금 밖에서 호출, 파일명이 매번 달라 같은 키를 동시에 써도 겹치지 않음)"""
+        session_dir = os.path.join(self.spill_dir, session_id)
+        os.makedirs(session_dir, exist_ok=True)
+        name = f"{key}.{uuid.uuid4().hex[:8]}"
+        if isinstance(value, pd.DataFrame):
+            path = os.path.join(session_dir, f"{name}.arrow")
+            write_frame(value, path)
+            return path, 'frame'
+        path = os.path.join(session_dir, f"{name}.bin")
+        with open(path, 'wb') as f:
+            f.write(value)
+        return path, 'bytes'
+
+    @staticmethod
+    def _load(spilled: _Spilled) -> Any:
+        if spilled.kind == 'frame':
+            return read_frame(spilled.path)
+        with open(spilled.path, 'rb') as f:
+            return f.read()
+
+    def drop(self, session_id: str):
+        """세션 데이터 삭제 (세션 종료 시)"""
+        with self._lock:
+            values = self._sessions.pop(session_id, None)
+            sizes = self._sizes.pop(session_id, {})
+            self._derived.pop(session_id, None)
+            self._versions.pop(session_id, None)
+            if values is None:
+                return
+            for key, value in values.items():
+                if value is not None and not isinstance(value, _Spilled):
+                    self._resident_bytes -= sizes.get(key, 0)
+        shutil.rmtree(os.path.join(self.spill_dir, session_id), ignore_errors=True)
+
+    def stats(self) -> Dict:
+        """메모리/디스크 사용 현황"""
+        with self._lock:
+            spilled_bytes = sum(
+                value.nbytes for values in self._sessions.values()
+                for value in values.values() if isinstance(value, _Spilled)
+            )
+            self._spilled_refs = [ref for ref in self._spilled_refs if ref() is not None]
+            return {
+                'sessions': len(self._sessions),
+                'resident_bytes': self._resident_bytes,
+                'spilled_bytes': spilled_bytes,
+                'max_resident_bytes': self.max_resident_bytes,
+                'spill_count': self.spill_count,
+                'load_count': self.load_count,
+                # 디스크로 내렸는데 아직 메모리에 남은 데이터프레임 수 (0이 아니면 어딘가에서 참조 중)
+                'spilled_alive': len(self._spilled_refs),
+            }
+
+
+class SessionData:
+    """
+    세션 상태 래퍼
+
+    MANAGED_KEYS는 SessionDataManager에, 나머지 키는 원래 세션 상태에 저장합니다.
+    st.session_state와 같이 속성/키/get/in으로 사용합니다.
+    """
+
+    def __init__(self, manager: SessionDataManager, session_id: str, state: Any):
+        object.__setattr__(self, '_manager', manager)
+        object.__setattr__(self, '_session_id', session_id)
+        object.__setattr__(self, '_state', state)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in MANAGED_KEYS:
+            if not self._manager.contains(self._session_id, name):
+                raise AttributeError(name)
+            return self._manager.get(self._session_id, name)
+        return getattr(self._state, name)
+
+    def __setattr__(self, name: str, value: Any):
+        if name in MANAGED_KEYS:
+            self._manager.put(self._session_id, name, value)
+        else:
+            setattr(self._state, name, value)
+
+    def __getitem__(self, name: str) -> Any:
+        if name in MANAGED_KEYS:
+            if not self._manager.contains(self._session_id, name):
+                raise KeyError(name)
+            return self._manager.get(self._session_id, name)
+        return self._state[name]
+
+    def __setitem__(self, name: str, value: Any):
+        self.__setattr__(name, value)
+
+    def __contains__(self, name: str) -> bool:
+        if name in MANAGED_KEYS:
+            return self._manager.contains(self._session_id, name)
+        return name in self._state
+
+    def get(self, name: str, default: Any = None) -> Any:
+        if name in MANAGED_KEYS:
+            return self._manager.get(self._session_id, name, default)
+        return self._state.get(name, default)
+
+    def cached(self, name: str, sources: Tuple[str, ...], build: Callable[[], Any], keep_on_put: bool = False) -> Any:
+        """관리 값에서 만든 파생 값 (SessionDataManager.cached 참고)"""
+        return self._manager.cached(self._session_id, name, sources, build, keep_on_put)
+
+    def pop(self, name: str, default: Any = None) -> Any:
+        if name in MANAGED_KEYS:
+            value = self.get(name, default)
+            self._manager.put(self._session_id, name, None)
+            return value
+        return self._state.pop(name, default)
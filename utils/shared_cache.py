@@ -0,0 +1,375 @@
+import io
+import os
+import json
+import stat
+import time
+import hashlib
+import zipfile
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .columnar_io import write_frame, read_frame, frame_to_table, table_to_frame
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# 캐시 형식이 바뀌면 올려서 기존 항목 무시
+CACHE_FORMAT_VERSION = 2
+
+_EXTENSIONS = {'frame': '.arrow', 'bytes': '.bin', 'bundle': '.bundle'}
+
+
+def default_cache_dir() -> str:
+    """공유 캐시 위치 (INVENTORY_SHARED_CACHE_DIR 환경변수, 없으면 시스템 임시 폴더 아래 사용자별 폴더)"""
+    user = os.getuid() if hasattr(os, 'getuid') else os.getenv('USERNAME', 'user')
+    return os.getenv('INVENTORY_SHARED_CACHE_DIR') or os.path.join(tempfile.gettempdir(), f'inventory_app_cache_{user}')
+
+
+def ensure_private_dir(path: str):
+    """
+    현재 사용자만 쓸 수 있는 폴더 준비 (없으면 0o700으로 생성)
+
+    다른 사용자 소유이거나 그룹/다른 사용자가 쓸 수 있는 폴더, 심볼릭 링크면 PermissionError
+    (다른 사용자가 캐시 항목을 바꿔 넣지 못하도록)
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    if not hasattr(os, 'getuid'):  # Windows: 사용자 프로필 아래 임시 폴더 사용
+        return
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"캐시 폴더가 일반 폴더가 아닙니다: {path}")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"다른 사용자 소유의 캐시 폴더입니다: {path}")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise PermissionError(f"그룹/다른 사용자가 쓸 수 있는 캐시 폴더입니다: {path}")
+
+
+def _pack(value: Any, members: Dict[str, bytes]) -> Any:
+    """
+    묶음 항목 구성 (dict/list 안의 데이터프레임은 Arrow IPC, 배열은 .npy, 바이트는 그대로 별도 멤버)
+
+    pickle을 쓰지 않으므로 읽을 때 임의 코드가 실행되지 않습니다. 지원하지 않는 값은 TypeError.
+    """
+    if isinstance(value, pd.DataFrame):
+        name = f"{len(members)}.arrow"
+        sink = pa.BufferOutputStream()
+        table = frame_to_table(value)
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        members[name] = sink.getvalue().to_pybytes()
+        return {'frame': name}
+    if isinstance(value, np.ndarray):
+        name = f"{len(members)}.npy"
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        members[name] = buffer.getvalue()
+        return {'array': name}
+    if isinstance(value, (bytes, bytearray)):
+        name = f"{len(members)}.bin"
+        members[name] = bytes(value)
+        return {'bytes': name}
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("묶음 항목의 dict 키는 문자열이어야 합니다.")
+        return {'dict': {key: _pack(item, members) for key, item in value.items()}}
+    if isinstance(value, (list, tuple)):
+        return {'list': [_pack(item, members) for item in value]}
+    if isinstance(value, np.generic):
+        value = value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return {'value': value}
+    raise TypeError(f"공유 캐시에 저장할 수 없는 값: {type(value).__name__}")
+
+
+def _unpack(spec: Dict, archive: zipfile.ZipFile) -> Any:
+    if 'frame' in spec:
+        with pa.ipc.open_file(pa.BufferReader(archive.read(spec['frame']))) as reader:
+            return table_to_frame(reader.read_all())
+    if 'array' in spec:
+        return np.load(io.BytesIO(archive.read(spec['array'])), allow_pickle=False)
+    if 'bytes' in spec:
+        return archive.read(spec['bytes'])
+    if 'dict' in spec:
+        return {key: _unpack(item, archive) for key, item in spec['dict'].items()}
+    if 'list' in spec:
+        return [_unpack(item, archive) for item in spec['list']]
+    return spec['value']
+
+
+def write_bundle(value: Any) -> bytes:
+    """dict/list 값을 묶음 파일(zip: 구성 JSON + 멤버) 바이트로 변환"""
+    members: Dict[str, bytes] = {}
+    spec = _pack(value, members)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as archive:
+        archive.writestr('spec.json', json.dumps(spec, ensure_ascii=False))
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def read_bundle(path: str) -> Any:
+    with zipfile.ZipFile(path) as archive:
+        return _unpack(json.loads(archive.read('spec.json')), archive)
+
+
+def _update_hash(hasher, part: Any):
+    """키 구성 값을 해시에 반영 (타입 구분 포함)"""
+    if part is None:
+        hasher.update(b'N')
+    elif isinstance(part, pd.DataFrame):
+        hasher.update(b'F')
+        hasher.update(repr(list(part.columns)).encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+    elif isinstance(part, (bytes, bytearray, memoryview)):
+        hasher.update(b'B')
+        hasher.update(bytes(part))
+    elif isinstance(part, str):
+        hasher.update(b'S')
+        hasher.update(part.encode('utf-8'))
+    else:
+        hasher.update(b'J')
+        hasher.update(json.dumps(part, ensure_ascii=False, sort_keys=True, default=str).encode('utf-8'))
+    hasher.update(b'\x00')
+
+
+def content_key(*parts: Any) -> str:
+    """
+    내용 기반 캐시 키 (같은 파일/데이터면 프로세스가 달라도 같은 키)
+
+    Args:
+        *parts: 바이트, 문자열, 데이터프레임, JSON으로 바꿀 수 있는 값, None
+    """
+    hasher = hashlib.blake2b(digest_size=20)
+    hasher.update(f"v{CACHE_FORMAT_VERSION}".encode('ascii'))
+    for part in parts:
+        _update_hash(hasher, part)
+    return hasher.hexdigest()
+
+
+@contextmanager
+def file_lock(path: str, blocking: bool = True, timeout: Optional[float] = None):
+    """
+    프로세스 간 배타 잠금 (POSIX flock / Windows msvcrt)
+
+    blocking=False이면 잠겨 있을 때 바로 BlockingIOError,
+    timeout(초)을 주면 그 시간 안에 잠그지 못했을 때 TimeoutError
+    """
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    wait = blocking and deadline is None
+                    fcntl.flock(fd, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if not blocking:
+                    raise BlockingIOError(path)
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(path)
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+class SharedDiskCache:
+    """
+    여러 Streamlit 프로세스(레플리카)가 같은 서버에서 공유하는 디스크 캐시
+
+    - 키: 입력 내용 해시 (content_key)
+    - 저장: 임시 파일에 쓴 뒤 os.replace로 교체 (읽는 쪽은 완성된 파일만 봄)
+    - 잠금: 키별 잠금 파일로 같은 항목을 여러 프로세스가 동시에 계산하지 않음
+    - 크기 제한: 전체 크기가 max_bytes를 넘으면 오래 사용하지 않은 항목부터 삭제
+
+    데이터프레임은 Arrow IPC, 바이트는 그대로, dict/list 값은 묶음 파일(Arrow/.npy/JSON)로 저장합니다. (pickle 미사용)
+    캐시 폴더는 현재 사용자만 쓸 수 있어야 합니다. (ensure_private_dir)
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = 1024 * 1024 * 1024,
+                 lock_timeout: float = 30.0):
+        """
+        Args:
+            lock_timeout: get_or_compute에서 다른 프로세스의 같은 키 계산을 기다리는 최대 시간(초),
+                넘으면 기다리지 않고 직접 계산 (느린 계산 하나에 다른 프로세스가 계속 묶이지 않도록)
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.lock_timeout = lock_timeout
+        ensure_private_dir(self.cache_dir)
+        self._local_lock = threading.Lock()
+        self._written_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_base(self, namespace: str, key: str) -> str:
+        directory = os.path.join(self.cache_dir, namespace, key[:2])
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, key)
+
+    def _find(self, base: str) -> Optional[tuple]:
+        for kind, extension in _EXTENSIONS.items():
+            path = base + extension
+            if os.path.exists(path):
+                return kind, path
+        return None
+
+    @staticmethod
+    def _read(kind: str, path: str) -> Any:
+        if kind == 'frame':
+            return read_frame(path)
+        if kind == 'bundle':
+            return read_bundle(path)
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def _lookup(self, namespace: str, key: str) -> Optional[Any]:
+        found = self._find(self._entry_base(namespace, key))
+        if found is None:
+            return None
+        kind, path = found
+        try:
+            value = self._read(kind, path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile, pa.ArrowException):
+            # 다른 프로세스가 삭제했거나 손상된 항목은 없는 것으로 처리
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """캐시 조회 (없으면 None, 조회된 항목은 최근 사용 시각 갱신)"""
+        value = self._lookup(namespace, key)
+        with self._local_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, namespace: str, key: str, value: Any):
+        """캐시 저장 (원자적 교체, 데이터프레임/바이트/dict·list 묶음 외의 값은 TypeError)"""
+        base = self._entry_base(namespace, key)
+        if isinstance(value, pd.DataFrame):
+            kind = 'frame'
+        elif isinstance(value, (bytes, bytearray)):
+            kind = 'bytes'
+        else:
+            kind = 'bundle'
+            value = write_bundle(value)
+        path = base + _EXTENSIONS[kind]
+
+        if kind == 'frame':
+            write_frame(value, path)
+        else:
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    f.write(value)
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+        with self._local_lock:
+            self._written_since_evict += os.path.getsize(path)
+            should_evict = self._written_since_evict > self.max_bytes // 10
+            if should_evict:
+                self._written_since_evict = 0
+        if should_evict:
+            self.evict()
+
+    def get_or_compute(self, namespace: str, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        캐시에 없으면 계산 후 저장
+
+        같은 키를 다른 프로세스가 계산 중이면 끝날 때까지 기다렸다가 그 결과를 사용합니다.
+        잠금은 키별이므로 다른 키의 계산은 막지 않고, 같은 키도 lock_timeout초까지만 기다린 뒤
+        직접 계산합니다. (중복 계산을 허용해 느린 계산 하나에 다른 프로세스가 계속 묶이지 않도록)
+        compute()가 None을 반환하면 저장하지 않습니다.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+
+        try:
+            with file_lock(self._entry_base(namespace, key) + '.lock', timeout=self.lock_timeout):
+                # 잠금을 기다리는 동안 다른 프로세스가 저장했을 수 있음
+                value = self._lookup(namespace, key)
+                if value is not None:
+                    return value
+                value = compute()
+                if value is not None:
+                    self.put(namespace, key, value)
+                return value
+        except TimeoutError:
+            value = compute()
+            if value is not None:
+                self.put(namespace, key, value)
+            return value
+
+    def _entries(self):
+        """(경로, 크기, 최근 사용 시각) 목록"""
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(tuple(_EXTENSIONS.values())):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    yield path, stat.st_size, stat.st_mtime
+
+    def evict(self):
+        """전체 크기가 한도를 넘으면 오래 사용하지 않은 항목부터 삭제 (한도의 90%까지)"""
+        try:
+            with file_lock(os.path.join(self.cache_dir, '.evict.lock'), blocking=False):
+                entries = sorted(self._entries(), key=lambda entry: entry[2])
+                total = sum(size for _, size, _ in entries)
+                if total <= self.max_bytes:
+                    return
+                target = self.max_bytes * 0.9
+                for path, size, _ in entries:
+                    if total <= target:
+                        break
+                    # 잠금 파일은 다른 프로세스가 기다리는 중일 수 있으므로 남겨 둠 (빈 파일)
+                    try:
+                        os.remove(path)
+                        total -= size
+                    except OSError:
+                        continue
+        except BlockingIOError:
+            # 다른 프로세스가 정리 중
+            return
+
+    def stats(self) -> Dict:
+        entries = list(self._entries())
+        return {
+            'entries': len(entries),
+            'total_bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
@@ -0,0 +1,207 @@
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .perf_monitor import track_stage
+from .columnar_io import write_frame, read_frame
+from .part_key import PART_KEY_COLUMN, part_keys
+from .money import to_won
+from .survey_store import SurveyStore, default_store_dir
+
+INDEX_NAME = 'index.json'
+
+# 조사별 품목 결과 컬럼 (품번 키 순으로 정렬해 저장)
+HISTORY_COLUMNS = [PART_KEY_COLUMN, '제작사 품번', '부품명', '단가', '재고', '실재고', '차이', '차액']
+
+
+def parse_survey_date(survey_date: str) -> Optional[str]:
+    """점포 정보의 재고조사일시('2025년 06월 27일') → ISO 날짜 문자열 (형식이 다르면 None)"""
+    try:
+        return datetime.strptime(str(survey_date).strip(), '%Y년 %m월 %d일').date().isoformat()
+    except ValueError:
+        return None
+
+
+def _part_results(inventory_data: pd.DataFrame) -> pd.DataFrame:
+    """실재고 조사 결과 → 품번 키별 결과 (같은 품번 여러 행은 수량/금액 합산)"""
+    keys = part_keys(inventory_data, '제작사 품번')
+    df = pd.DataFrame({
+        PART_KEY_COLUMN: keys.to_numpy(dtype=object),
+        '제작사 품번': inventory_data['제작사 품번'].to_numpy(dtype=object),
+        '부품명': inventory_data['부품명'].to_numpy(dtype=object),
+        '단가': pd.to_numeric(inventory_data['단가'], errors='coerce').to_numpy(dtype=np.float64),
+        '재고': pd.to_numeric(inventory_data['재고'], errors='coerce').to_numpy(dtype=np.float64),
+        '실재고': pd.to_numeric(inventory_data['실재고'], errors='coerce').to_numpy(dtype=np.float64),
+        '차이': pd.to_numeric(inventory_data['차이'], errors='coerce').fillna(0).to_numpy(dtype=np.float64),
+        '차액': to_won(inventory_data['차액']),
+    })
+    df = df[df[PART_KEY_COLUMN] != '']
+
+    grouped = df.groupby(PART_KEY_COLUMN, sort=True)
+    result = grouped[['제작사 품번', '부품명', '단가']].first()
+    result[['재고', '실재고', '차이', '차액']] = grouped[['재고', '실재고', '차이', '차액']].sum()
+    return result.reset_index()[HISTORY_COLUMNS]
+
+
+@track_stage('compare_surveys', rows=lambda result, surveys, *args, **kwargs: sum(len(df) for _, df in surveys))
+def compare_surveys(surveys: List[Tuple[Dict, pd.DataFrame]], window: int = 3, chronic_min: int = 3) -> pd.DataFrame:
+    """
+    여러 조사의 품목별 재고차이 비교 (품번 키 합집합 기준 행렬로 일괄 계산)
+
+    Args:
+        surveys: [(조사 정보, 품목별 결과), ...] 오래된 조사부터
+        window: 최근 몇 회 조사의 차액을 합산할지
+        chronic_min: 상습 부족으로 표시할 최소 부족 횟수
+
+    Returns:
+        품목별 회차별 차이 + 조사횟수/부족횟수/연속부족/누적차이/누적차액/최근 N회 차액/상습부족
+        (한 번이라도 차이가 있었던 품목만, 상습 부족 → 누적 차액 순)
+    """
+    all_keys = pd.Index(np.concatenate([df[PART_KEY_COLUMN].to_numpy(dtype=object) for _, df in surveys])).unique()
+    n_parts, n_surveys = len(all_keys), len(surveys)
+
+    quantity = np.full((n_parts, n_surveys), np.nan)
+    amount = np.zeros((n_parts, n_surveys), dtype=np.int64)
+    codes = np.empty(n_parts, dtype=object)
+    names = np.empty(n_parts, dtype=object)
+    labels = []
+    seen: Dict[str, int] = {}
+    for column, (info, df) in enumerate(surveys):
+        positions = all_keys.get_indexer(df[PART_KEY_COLUMN].to_numpy(dtype=object))
+        quantity[positions, column] = df['차이'].to_numpy(dtype=np.float64)
+        amount[positions, column] = df['차액'].to_numpy(dtype=np.int64)
+        # 품번/부품명은 가장 최근 조사 기준
+        codes[positions] = df['제작사 품번'].to_numpy(dtype=object)
+        names[positions] = df['부품명'].to_numpy(dtype=object)
+        # 같은 날 조사가 여러 번이면 순번 표시
+        label = info.get('survey_date') or f"{column + 1}회차"
+        seen[label] = seen.get(label, 0) + 1
+        labels.append(label if seen[label] == 1 else f"{label}({seen[label]})")
+
+    counted = ~np.isnan(quantity)
+    shortage = counted & (quantity < 0)
+    # 가장 최근 조사부터 거꾸로 이어진 부족 횟수
+    streak = np.cumprod(shortage[:, ::-1], axis=1).sum(axis=1)
+    shortage_count = shortage.sum(axis=1)
+
+    result = pd.DataFrame({'제작사품번': codes, '부품명': names})
+    for column, label in enumerate(labels):
+        result[f"{label} 차이"] = quantity[:, column]
+    result['조사횟수'] = counted.sum(axis=1)
+    result['부족횟수'] = shortage_count
+    result['연속부족'] = streak
+    result['누적차이'] = np.nansum(quantity, axis=1)
+    result['누적차액'] = amount.sum(axis=1)
+    result[f"최근{min(window, n_surveys)}회 차액"] = amount[:, -window:].sum(axis=1)
+    result['상습부족'] = np.where(shortage_count >= chronic_min, 'Y', '')
+
+    changed = (np.nan_to_num(quantity) != 0).any(axis=1)
+    result = result[changed]
+    order = np.lexsort((result['누적차액'].to_numpy(), -result['부족횟수'].to_numpy(), result['상습부족'].to_numpy() != 'Y'))
+    return result.iloc[order].reset_index(drop=True)
+
+
+class SurveyHistory:
+    """
+    완료된 조사의 품목별 결과 이력 (기간별 재고차이 비교용)
+
+    조사마다 품번 키 순으로 정렬한 품목별 결과를 Arrow 파일 하나로 저장하고,
+    조사 목록(점포명, 조사일자)은 index.json으로 관리합니다.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = base_dir or os.path.join(default_store_dir(), 'history')
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    def _index_path(self) -> str:
+        return os.path.join(self.base_dir, INDEX_NAME)
+
+    def _frame_path(self, survey_id: str) -> str:
+        if not SurveyStore.is_valid_id(survey_id):
+            raise ValueError(f"잘못된 조사 ID: {survey_id}")
+        return os.path.join(self.base_dir, f"{survey_id}.arrow")
+
+    def _read_index(self) -> List[Dict]:
+        try:
+            with open(self._index_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def _write_index(self, entries: List[Dict]):
+        path = self._index_path()
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=1)
+        os.replace(temp_path, path)
+
+    @track_stage('record_survey_history', rows=lambda result, history, survey_id, store_info, inventory_data: len(inventory_data))
+    def record(self, survey_id: str, store_info: Dict, inventory_data: pd.DataFrame) -> Dict:
+        """
+        조사 결과 기록 (같은 조사 ID로 다시 기록하면 덮어씀)
+
+        Returns:
+            기록된 조사 정보
+        """
+        results = _part_results(inventory_data)
+        entry = {
+            'survey_id': survey_id,
+            'store_name': store_info.get('store_name', ''),
+            'survey_date': parse_survey_date(store_info.get('survey_date', '')) or datetime.now().date().isoformat(),
+            'rows': len(results),
+            'shortage_amount': int(results.loc[results['차이'] < 0, '차액'].sum()),
+            'recorded_at': time.time(),
+        }
+        with self._lock:
+            write_frame(results, self._frame_path(survey_id))
+            entries = [item for item in self._read_index() if item['survey_id'] != survey_id]
+            entries.append(entry)
+            self._write_index(entries)
+        return entry
+
+    def entries(self, store_name: Optional[str] = None) -> List[Dict]:
+        """기록된 조사 목록 (조사일자 순, store_name이 있으면 해당 점포만)"""
+        entries = self._read_index()
+        if store_name is not None:
+            entries = [entry for entry in entries if entry['store_name'] == store_name]
+        return sorted(entries, key=lambda entry: (entry['survey_date'], entry['recorded_at']))
+
+    def load(self, survey_id: str) -> pd.DataFrame:
+        """조사 1건의 품목별 결과"""
+        return read_frame(self._frame_path(survey_id))
+
+    def comparison(self, survey_id: str, last_n: int = 8, window: int = 3,
+                   chronic_min: int = 3) -> Tuple[Optional[pd.DataFrame], List[Dict]]:
+        """
+        해당 조사와 같은 점포의 이전 조사들을 비교 (해당 조사까지 최근 last_n회)
+
+        Returns:
+            (compare_surveys 결과 (이전 조사가 없으면 None), 비교한 조사 정보 목록)
+        """
+        current = next((entry for entry in self._read_index() if entry['survey_id'] == survey_id), None)
+        if current is None:
+            return None, []
+
+        entries = [
+            entry for entry in self.entries(current['store_name'])
+            if (entry['survey_date'], entry['recorded_at']) <= (current['survey_date'], current['recorded_at'])
+        ][-last_n:]
+        if len(entries) < 2:
+            return None, entries
+
+        surveys = [(entry, self.load(entry['survey_id'])) for entry in entries]
+        return compare_surveys(surveys, window=window, chronic_min=chronic_min), entries
+
+    def delete(self, survey_id: str):
+        with self._lock:
+            path = self._frame_path(survey_id)
+            if os.path.exists(path):
+                os.remove(path)
+            self._write_index([entry for entry in self._read_index() if entry['survey_id'] != survey_id])
@@ -0,0 +1,225 @@
+import os
+import re
+import json
+import time
+import uuid
+import shutil
+import threading
+from datetime import datetime, date
+from typing import Dict, List, Optional, Any
+
+import numpy as np
+import pandas as pd
+
+from .perf_monitor import track_stage
+from .columnar_io import write_frame, read_frame
+
+MANIFEST_NAME = 'manifest.json'
+STORE_FORMAT_VERSION = 1
+
+# 저장하는 데이터프레임 단계
+FRAME_STAGES = ['part_data', 'inventory_data', 'adjustment_data', 'adjustment_filtered', 'final_data']
+# 저장하는 바이너리 결과 (단계 → 파일명)
+BLOB_STAGES = {'excel_report_data': 'excel_report.xlsx'}
+
+_SURVEY_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+def default_store_dir() -> str:
+    """조사 저장 위치 (INVENTORY_SURVEY_DIR 환경변수, 없으면 앱 폴더의 surveys)"""
+    return os.getenv('INVENTORY_SURVEY_DIR') or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'surveys'
+    )
+
+
+def _json_default(value):
+    """JSON 변환 보조 (numpy 값, 날짜, 데이터프레임)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (datetime, date, pd.Timestamp)):
+        return value.isoformat()
+    if isinstance(value, pd.DataFrame):
+        return value.astype(object).where(value.notna(), None).to_dict('records')
+    raise TypeError(f"저장할 수 없는 값: {type(value).__name__}")
+
+
+class SurveyStore:
+    """
+    조사별 처리 결과를 디스크에 저장하는 로컬 저장소
+
+    조사 ID마다 폴더를 만들고 단계별 데이터프레임은 Arrow IPC 파일로,
+    점포 정보/요약 같은 작은 값은 manifest.json에 저장합니다.
+    새로고침이나 서버 재시작 후에도 엑셀을 다시 읽지 않고 메모리 맵으로 바로 불러옵니다.
+    """
+
+    def __init__(self, base_dir: Optional[str] = None, max_surveys: int = 50):
+        """
+        Args:
+            base_dir: 저장 폴더 (None이면 default_store_dir())
+            max_surveys: 보관할 최대 조사 수 (넘으면 오래된 조사부터 삭제)
+        """
+        self.base_dir = base_dir or default_store_dir()
+        self.max_surveys = max_surveys
+        self._lock = threading.Lock()
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    @staticmethod
+    def is_valid_id(survey_id: Optional[str]) -> bool:
+        """조사 ID 형식 확인 (URL 파라미터로 들어온 값이 경로를 벗어나지 않도록)"""
+        return bool(survey_id) and bool(_SURVEY_ID_PATTERN.match(str(survey_id)))
+
+    def _survey_dir(self, survey_id: str) -> str:
+        if not self.is_valid_id(survey_id):
+            raise ValueError(f"잘못된 조사 ID: {survey_id}")
+        return os.path.join(self.base_dir, survey_id)
+
+    def _manifest_path(self, survey_id: str) -> str:
+        return os.path.join(self._survey_dir(survey_id), MANIFEST_NAME)
+
+    def _read_manifest(self, survey_id: str) -> Optional[Dict]:
+        try:
+            with open(self._manifest_path(survey_id), 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get('format_version') != STORE_FORMAT_VERSION:
+            return None
+        return manifest
+
+    def _write_manifest(self, survey_id: str, manifest: Dict):
+        path = self._manifest_path(survey_id)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, default=_json_default)
+        os.replace(temp_path, path)
+
+    def create(self, name: str = '') -> str:
+        """
+        새 조사 생성
+
+        Returns:
+            조사 ID
+        """
+        survey_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            os.makedirs(self._survey_dir(survey_id))
+            self._write_manifest(survey_id, {
+                'format_version': STORE_FORMAT_VERSION,
+                'survey_id': survey_id,
+                'name': name,
+                'created_at': now,
+                'updated_at': now,
+                'stages': {},
+                'meta': {},
+            })
+        self._evict()
+        return survey_id
+
+    def exists(self, survey_id: Optional[str]) -> bool:
+        return self.is_valid_id(survey_id) and self._read_manifest(survey_id) is not None
+
+    @track_stage('survey_save', rows=lambda result, store, survey_id, frames=None, *args, **kwargs: (
+        sum(len(df) for df in frames.values() if df is not None) if frames else 0
+    ))
+    def save(self, survey_id: str, frames: Optional[Dict[str, Optional[pd.DataFrame]]] = None,
+             blobs: Optional[Dict[str, Optional[bytes]]] = None, **meta: Any):
+        """
+        단계 결과 저장 (주어진 항목만 덮어씀, None 값은 해당 단계 삭제)
+
+        Args:
+            survey_id: 조사 ID
+            frames: {단계: 데이터프레임} (FRAME_STAGES)
+            blobs: {단계: 바이트} (BLOB_STAGES)
+            **meta: JSON으로 저장할 작은 값 (점포 정보, 요약, 진행 단계 등)
+        """
+        survey_dir = self._survey_dir(survey_id)
+        with self._lock:
+            manifest = self._read_manifest(survey_id)
+            if manifest is None:
+                raise KeyError(f"조사를 찾을 수 없습니다: {survey_id}")
+
+            for stage, df in (frames or {}).items():
+                if stage not in FRAME_STAGES:
+                    raise ValueError(f"알 수 없는 단계: {stage}")
+                path = os.path.join(survey_dir, f"{stage}.arrow")
+                if df is None:
+                    manifest['stages'].pop(stage, None)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                write_frame(df, path)
+                manifest['stages'][stage] = {'rows': len(df), 'saved_at': time.time()}
+
+            for stage, data in (blobs or {}).items():
+                path = os.path.join(survey_dir, BLOB_STAGES[stage])
+                if data is None:
+                    manifest['stages'].pop(stage, None)
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                temp_path = f"{path}.{os.getpid()}.tmp"
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                os.replace(temp_path, path)
+                manifest['stages'][stage] = {'bytes': len(data), 'saved_at': time.time()}
+
+            manifest['meta'].update(meta)
+            manifest['updated_at'] = time.time()
+            self._write_manifest(survey_id, manifest)
+
+    @track_stage('survey_load', rows=lambda result, *args, **kwargs: (
+        sum(len(df) for df in result['frames'].values()) if result else 0
+    ))
+    def load(self, survey_id: str) -> Optional[Dict]:
+        """
+        저장된 조사 불러오기 (데이터프레임은 메모리 맵으로 읽음)
+
+        Returns:
+            {'frames': {단계: 데이터프레임}, 'blobs': {단계: 바이트}, 'meta': {...}, 'manifest': {...}}
+            조사가 없으면 None
+        """
+        if not self.is_valid_id(survey_id):
+            return None
+        manifest = self._read_manifest(survey_id)
+        if manifest is None:
+            return None
+
+        survey_dir = self._survey_dir(survey_id)
+        frames = {}
+        blobs = {}
+        for stage in manifest['stages']:
+            if stage in FRAME_STAGES:
+                frames[stage] = read_frame(os.path.join(survey_dir, f"{stage}.arrow"))
+            elif stage in BLOB_STAGES:
+                with open(os.path.join(survey_dir, BLOB_STAGES[stage]), 'rb') as f:
+                    blobs[stage] = f.read()
+        return {'frames': frames, 'blobs': blobs, 'meta': manifest['meta'], 'manifest': manifest}
+
+    def list_surveys(self) -> List[Dict]:
+        """저장된 조사 목록 (최근 수정 순)"""
+        surveys = []
+        for entry in os.listdir(self.base_dir):
+            if not self.is_valid_id(entry):
+                continue
+            manifest = self._read_manifest(entry)
+            if manifest is not None:
+                surveys.append({
+                    'survey_id': entry,
+                    'name': manifest.get('name', ''),
+                    'created_at': manifest['created_at'],
+                    'updated_at': manifest['updated_at'],
+                    'stages': sorted(manifest['stages']),
+                    'step': manifest['meta'].get('step', 1),
+                })
+        return sorted(surveys, key=lambda survey: survey['updated_at'], reverse=True)
+
+    def delete(self, survey_id: str):
+        """조사 삭제"""
+        with self._lock:
+            shutil.rmtree(self._survey_dir(survey_id), ignore_errors=True)
+
+    def _evict(self):
+        """보관 개수를 넘은 오래된 조사 삭제"""
+        for survey in self.list_surveys()[self.max_surveys:]:
+            self.delete(survey['survey_id'])
@@ -0,0 +1,233 @@
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# 파일 크기 대비 읽기 중 최대 메모리 사용량 배수 (합성 데이터 10k SKU 측정값 기준 여유 포함)
+FILE_MEMORY_FACTORS = {'xlsx': 20, 'xls': 20, 'csv': 4, 'parquet': 8, 'feather': 2}
+# 보고서 입력 데이터프레임 크기 대비 엑셀 작성 중 최대 메모리 사용량 배수 (시트 XML 문자열)
+REPORT_MEMORY_FACTOR = 6
+
+
+def estimate_file_memory(path: str, size: Optional[int] = None) -> int:
+    """파일을 데이터프레임으로 읽는 동안의 최대 메모리 사용량 추정 (바이트)"""
+    from .file_reader import file_format
+    if size is None:
+        size = os.path.getsize(path)
+    try:
+        factor = FILE_MEMORY_FACTORS.get(file_format(path), max(FILE_MEMORY_FACTORS.values()))
+    except ValueError:
+        factor = max(FILE_MEMORY_FACTORS.values())
+    return int(size * factor)
+
+
+def estimate_report_memory(frames: Iterable[Any]) -> int:
+    """엑셀 보고서 작성 중 최대 메모리 사용량 추정 (바이트)"""
+    from .session_data import estimate_nbytes
+    return int(sum(estimate_nbytes(frame) for frame in frames) * REPORT_MEMORY_FACTOR)
+
+
+class SchedulerBusy(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음 (잠시 후 다시 시도)"""
+
+
+class _Ticket:
+    """대기/실행 중인 작업 하나"""
+
+    __slots__ = ('ticket_id', 'session_id', 'name', 'cost', 'queued_at', 'started_at')
+
+    def __init__(self, session_id: str, name: str, cost: int):
+        self.ticket_id = uuid.uuid4().hex
+        self.session_id = session_id
+        self.name = name
+        self.cost = cost
+        self.queued_at = time.time()
+        self.started_at: Optional[float] = None
+
+
+class HeavyTaskScheduler:
+    """
+    무거운 처리(PART 분석, 실재고 계산, 엑셀 보고서 생성)의 동시 실행 수/메모리 사용량을 제한하는 클래스 (전체 세션 공용)
+
+    작업은 예상 메모리 사용량과 함께 등록하고, 실행 중인 작업 수가 max_concurrent 미만이고
+    예상 사용량 합계가 memory_budget 이내일 때 시작합니다. 대기열은 세션별 FIFO이며
+    세션 사이에는 돌아가며 하나씩 시작하므로 한 세션이 여러 작업을 올려도 다른 세션이 밀리지 않습니다.
+    순서를 건너뛰지 않으므로 큰 작업이 작은 작업들에 계속 밀리지 않고,
+    혼자서 예산을 넘는 작업은 실행 중인 작업이 없을 때 시작합니다.
+    """
+
+    def __init__(self, max_concurrent: int = 2, memory_budget: int = 1024 * 1024 * 1024, max_queued: int = 32):
+        """
+        Args:
+            max_concurrent: 동시에 실행할 최대 작업 수
+            memory_budget: 실행 중인 작업의 예상 메모리 사용량 합계 한도 (바이트)
+            max_queued: 최대 대기 작업 수 (넘으면 SchedulerBusy)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self.memory_budget = memory_budget
+        self.max_queued = max_queued
+        self._cond = threading.Condition()
+        # 세션 ID → 대기 작업 (딕셔너리 순서가 다음에 시작할 세션 순서)
+        self._queues: 'OrderedDict[str, deque[_Ticket]]' = OrderedDict()
+        self._running: Dict[str, _Ticket] = {}
+        self._reserved = 0
+        self._stats = {'completed': 0, 'rejected': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+    # ---- 대기열 ----
+
+    def enqueue(self, session_id: str, name: str, cost: int = 0) -> str:
+        """
+        작업 대기열 등록 (바로 시작할 수 있으면 실행 상태로 등록)
+
+        Returns:
+            작업 티켓 ID (acquire/wait/release에 사용)
+        """
+        ticket = _Ticket(session_id, name, max(0, int(cost)))
+        with self._cond:
+            if self.queued_count() >= self.max_queued:
+                self._stats['rejected'] += 1
+                raise SchedulerBusy(
+                    f"처리 대기 중인 작업이 많습니다 ({self.max_queued}건). 잠시 후 다시 시도해주세요."
+                )
+            self._queues.setdefault(session_id, deque()).append(ticket)
+            self._dispatch()
+        return ticket.ticket_id
+
+    def wait(self, ticket_id: str, timeout: Optional[float] = None) -> bool:
+        """작업이 시작될 때까지 대기 (timeout 안에 시작하면 True)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while ticket_id not in self._running:
+                if self._find_queued(ticket_id) is None:
+                    raise KeyError(ticket_id)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def release(self, ticket_id: str):
+        """작업 종료 (실행 중이면 예산 반환, 대기 중이면 취소)"""
+        with self._cond:
+            ticket = self._running.pop(ticket_id, None)
+            if ticket is not None:
+                self._reserved -= ticket.cost
+                self._stats['completed'] += 1
+            else:
+                found = self._find_queued(ticket_id)
+                if found is not None:
+                    queue, ticket = found
+                    queue.remove(ticket)
+                    if not queue:
+                        del self._queues[ticket.session_id]
+            self._dispatch()
+
+    def position(self, ticket_id: str) -> int:
+        """
+        대기 순번 (1이면 다음 차례, 실행 중이면 0, 없으면 -1)
+
+        세션별로 돌아가며 시작하므로 앞선 세션들은 각자 이 작업보다 앞선 개수까지만 먼저 시작합니다.
+        """
+        with self._cond:
+            if ticket_id in self._running:
+                return 0
+            found = self._find_queued(ticket_id)
+            if found is None:
+                return -1
+            queue, ticket = found
+            index = queue.index(ticket)
+            ahead = index
+            before = True
+            for session_id, other in self._queues.items():
+                if session_id == ticket.session_id:
+                    before = False
+                    continue
+                ahead += min(len(other), index + (1 if before else 0))
+            return ahead + 1
+
+    @contextmanager
+    def slot(self, session_id: str, name: str, cost: int = 0,
+             on_wait: Optional[Callable[[int], None]] = None, poll_interval: float = 0.5):
+        """
+        작업 실행 구간 (시작할 차례가 될 때까지 대기, 끝나면 예산 반환)
+
+        Args:
+            session_id: 세션 ID (세션 간 공정 순서용)
+            name: 작업 이름 (상태 표시용)
+            cost: 예상 메모리 사용량 (바이트)
+            on_wait: 대기 중 poll_interval마다 호출 (대기 순번), 예외가 나면 대기 취소
+            poll_interval: on_wait 호출 간격(초)
+        """
+        ticket_id = self.enqueue(session_id, name, cost)
+        try:
+            while not self.wait(ticket_id, timeout=poll_interval):
+                if on_wait is not None:
+                    on_wait(self.position(ticket_id))
+            yield ticket_id
+        finally:
+            self.release(ticket_id)
+
+    # ---- 상태 ----
+
+    def queued_count(self) -> int:
+        with self._cond:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """실행/대기 현황과 누적 통계"""
+        with self._cond:
+            started = self._stats['completed'] + len(self._running)
+            return {
+                'running': len(self._running),
+                'queued': self.queued_count(),
+                'reserved_mb': round(self._reserved / 1024 / 1024, 1),
+                'budget_mb': round(self.memory_budget / 1024 / 1024, 1),
+                'max_concurrent': self.max_concurrent,
+                'completed': self._stats['completed'],
+                'rejected': self._stats['rejected'],
+                'avg_wait_s': round(self._stats['total_wait'] / started, 3) if started else 0.0,
+                'max_wait_s': round(self._stats['max_wait'], 3),
+                'running_tasks': [ticket.name for ticket in self._running.values()],
+            }
+
+    # ---- 내부 ----
+
+    def _find_queued(self, ticket_id: str):
+        for queue in self._queues.values():
+            for ticket in queue:
+                if ticket.ticket_id == ticket_id:
+                    return queue, ticket
+        return None
+
+    def _fits(self, ticket: _Ticket) -> bool:
+        if len(self._running) >= self.max_concurrent:
+            return False
+        # 혼자 예산을 넘는 작업도 실행 중인 작업이 없으면 시작 (영원히 대기하지 않도록)
+        return not self._running or self._reserved + ticket.cost <= self.memory_budget
+
+    def _dispatch(self):
+        """차례가 된 작업 시작 (잠금 안에서 호출)"""
+        started = False
+        while self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            ticket = queue[0]
+            if not self._fits(ticket):
+                break
+            queue.popleft()
+            # 이 세션은 맨 뒤로 (다른 세션의 작업이 다음 차례)
+            if queue:
+                self._queues.move_to_end(session_id)
+            else:
+                del self._queues[session_id]
+            ticket.started_at = time.time()
+            waited = ticket.started_at - ticket.queued_at
+            self._stats['total_wait'] += waited
+            self._stats['max_wait'] = max(self._stats['max_wait'], waited)
+            self._running[ticket.ticket_id] = ticket
+            self._reserved += ticket.cost
+            started = True
+        if started:
+            self._cond.notify_all()
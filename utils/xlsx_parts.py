@@ -0,0 +1,381 @@
+import re
+import time
+import zlib
+import struct
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+# 시트 XML 형식이 바뀌면 올려서 캐시된 시트 무효화
+SHEET_FORMAT_VERSION = 1
+
+# 기본 셀 서식 번호 (모든 통합문서에서 같은 번호라 캐시된 시트를 다른 통합문서에 그대로 사용 가능)
+STYLE_DEFAULT = 0
+STYLE_HEADER = 1    # pandas to_excel 머리글과 같은 서식 (굵게, 테두리, 가운데)
+STYLE_DATETIME = 2  # pandas to_excel 기본 날짜 표시 형식
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+# XML 1.0에서 쓸 수 없는 제어 문자 (openpyxl은 오류, 여기서는 제거)
+_ILLEGAL_CHARACTERS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+_EXCEL_EPOCH = np.datetime64('1899-12-30T00:00:00')
+
+
+def column_letter(index: int) -> str:
+    """0부터 시작하는 컬럼 위치 → 엑셀 컬럼 문자 (0 → A, 26 → AA)"""
+    letters = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class CellStyles:
+    """
+    통합문서 셀 서식 목록 (styles.xml)
+
+    글꼴/채우기/테두리/맞춤 조합마다 번호를 붙이며, 기본 서식(STYLE_*)은 항상 같은 번호입니다.
+    """
+
+    def __init__(self):
+        self._fonts: List[Tuple] = [('Calibri', 11, False, None), ('Calibri', 11, True, None)]
+        self._fills: List[Optional[str]] = [None, 'gray125']
+        self._xfs: List[Tuple] = []
+        self.add()
+        self.add(font=('Calibri', 11, True, None), border=True, align=('center', 'top'))
+        self.add(num_format='yyyy-mm-dd hh:mm:ss')
+
+    def add(self, font: Optional[Tuple] = None, fill: Optional[str] = None, border: bool = False,
+            align: Optional[Tuple[str, str]] = None, num_format: Optional[str] = None) -> int:
+        """
+        서식 번호 (같은 조합이면 기존 번호)
+
+        Args:
+            font: (글꼴 이름, 크기, 굵게, 색상 RRGGBB 또는 None)
+            fill: 단색 채우기 색상 RRGGBB
+            border: 네 변 가는 테두리
+            align: (가로 맞춤, 세로 맞춤)
+            num_format: 표시 형식
+        """
+        font_id = self._index(self._fonts, font) if font else 0
+        fill_id = self._index(self._fills, fill) if fill else 0
+        xf = (font_id, fill_id, 1 if border else 0, align, num_format)
+        return self._index(self._xfs, xf)
+
+    @staticmethod
+    def _index(items: List, item) -> int:
+        if item not in items:
+            items.append(item)
+        return items.index(item)
+
+    def to_xml(self) -> bytes:
+        num_formats = [xf[4] for xf in self._xfs if xf[4]]
+        num_format_ids = {fmt: 164 + i for i, fmt in enumerate(dict.fromkeys(num_formats))}
+        parts = [_XML_DECLARATION, f'<styleSheet xmlns="{_MAIN_NS}">']
+        if num_format_ids:
+            parts.append(f'<numFmts count="{len(num_format_ids)}">')
+            parts.extend(f'<numFmt numFmtId="{i}" formatCode="{escape(fmt)}"/>' for fmt, i in num_format_ids.items())
+            parts.append('</numFmts>')
+
+        parts.append(f'<fonts count="{len(self._fonts)}">')
+        for name, size, bold, color in self._fonts:
+            parts.append('<font>' + ('<b/>' if bold else '') + f'<sz val="{size}"/>'
+                         + (f'<color rgb="FF{color}"/>' if color else '')
+                         + f'<name val="{escape(name)}"/></font>')
+        parts.append('</fonts>')
+
+        parts.append(f'<fills count="{len(self._fills)}">')
+        for fill in self._fills:
+            if fill is None:
+                parts.append('<fill><patternFill patternType="none"/></fill>')
+            elif fill == 'gray125':
+                parts.append('<fill><patternFill patternType="gray125"/></fill>')
+            else:
+                parts.append(f'<fill><patternFill patternType="solid"><fgColor rgb="FF{fill}"/>'
+                             f'<bgColor rgb="FF{fill}"/></patternFill></fill>')
+        parts.append('</fills>')
+
+        thin = '<{0} style="thin"><color auto="1"/></{0}>'
+        parts.append('<borders count="2"><border><left/><right/><top/><bottom/><diagonal/></border>'
+                     '<border>' + ''.join(thin.format(side) for side in ('left', 'right', 'top', 'bottom'))
+                     + '<diagonal/></border></borders>')
+        parts.append('<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>')
+
+        parts.append(f'<cellXfs count="{len(self._xfs)}">')
+        for font_id, fill_id, border_id, align, num_format in self._xfs:
+            num_format_id = num_format_ids[num_format] if num_format else 0
+            attrs = (f'numFmtId="{num_format_id}" fontId="{font_id}" fillId="{fill_id}" '
+                     f'borderId="{border_id}" xfId="0"')
+            attrs += ''.join([
+                ' applyNumberFormat="1"' if num_format else '',
+                ' applyFont="1"' if font_id else '',
+                ' applyFill="1"' if fill_id else '',
+                ' applyBorder="1"' if border_id else '',
+            ])
+            if align:
+                parts.append(f'<xf {attrs} applyAlignment="1">'
+                             f'<alignment horizontal="{align[0]}" vertical="{align[1]}"/></xf>')
+            else:
+                parts.append(f'<xf {attrs}/>')
+        parts.append('</cellXfs>')
+        parts.append('<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>')
+        parts.append('</styleSheet>')
+        return ''.join(parts).encode('utf-8')
+
+
+def _text_cell(ref: str, value: str, style: int = STYLE_DEFAULT) -> str:
+    text = escape(_ILLEGAL_CHARACTERS.sub('', value))
+    style_attr = f' s="{style}"' if style else ''
+    return f'<c r="{ref}"{style_attr} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _excel_serial(value) -> float:
+    """날짜/시각 → 엑셀 날짜 일련번호"""
+    delta = np.datetime64(pd.Timestamp(value).tz_localize(None).to_datetime64(), 'us') - _EXCEL_EPOCH
+    return float(delta / np.timedelta64(1, 'D'))
+
+
+def _value_cell(ref: str, value: Any, style: int = STYLE_DEFAULT) -> str:
+    """파이썬 값 하나 → 셀 XML (빈 값이고 서식이 없으면 '')"""
+    style_attr = f' s="{style}"' if style else ''
+    if value is None or value is pd.NaT or (isinstance(value, str) and value == ''):
+        return f'<c r="{ref}"{style_attr}/>' if style else ''
+    if isinstance(value, (bool, np.bool_)):
+        return f'<c r="{ref}"{style_attr} t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, np.integer)):
+        return f'<c r="{ref}"{style_attr}><v>{int(value)}</v></c>'
+    if isinstance(value, (float, np.floating)):
+        if np.isnan(value):
+            return f'<c r="{ref}"{style_attr}/>' if style else ''
+        if np.isinf(value):
+            # pandas to_excel 기본 inf_rep와 같은 표기
+            return _text_cell(ref, 'inf' if value > 0 else '-inf', style)
+        return f'<c r="{ref}"{style_attr}><v>{float(value)!r}</v></c>'
+    if isinstance(value, (pd.Timestamp, datetime, date, np.datetime64)):
+        return f'<c r="{ref}" s="{style or STYLE_DATETIME}"><v>{_excel_serial(value)!r}</v></c>'
+    return _text_cell(ref, str(value), style)
+
+
+def _column_cells(series: pd.Series, letter: str, first_row: int) -> List[str]:
+    """데이터프레임 컬럼 하나 → 행별 셀 XML (숫자 컬럼은 형식 판별 없이 바로 변환)"""
+    rows = range(first_row, first_row + len(series))
+    dtype = series.dtype
+    if pd.api.types.is_bool_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype) \
+            and not series.hasnans:
+        return [f'<c r="{letter}{row}" t="b"><v>{int(value)}</v></c>'
+                for row, value in zip(rows, series.to_numpy(dtype=bool))]
+    if pd.api.types.is_integer_dtype(dtype) and not series.hasnans:
+        return [f'<c r="{letter}{row}"><v>{value}</v></c>' for row, value in zip(rows, series.to_numpy().tolist())]
+    if pd.api.types.is_float_dtype(dtype) and not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+        values = series.to_numpy()
+        if np.isfinite(values).all():
+            return [f'<c r="{letter}{row}"><v>{value!r}</v></c>' for row, value in zip(rows, values.tolist())]
+    return [_value_cell(f'{letter}{row}', value) for row, value in zip(rows, series.to_numpy(dtype=object))]
+
+
+def _worksheet_xml(sheet_data: List[str], columns: Optional[Sequence[Tuple[int, float]]] = None,
+                   merges: Optional[Sequence[str]] = None) -> bytes:
+    parts = [_XML_DECLARATION, f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">']
+    if columns:
+        parts.append('<cols>')
+        parts.extend(f'<col min="{i + 1}" max="{i + 1}" width="{width}" customWidth="1"/>' for i, width in columns)
+        parts.append('</cols>')
+    parts.append('<sheetData>')
+    parts.extend(sheet_data)
+    parts.append('</sheetData>')
+    if merges:
+        parts.append(f'<mergeCells count="{len(merges)}">')
+        parts.extend(f'<mergeCell ref="{ref}"/>' for ref in merges)
+        parts.append('</mergeCells>')
+    parts.append('</worksheet>')
+    return ''.join(parts).encode('utf-8')
+
+
+def frame_sheet_xml(df: pd.DataFrame) -> bytes:
+    """
+    데이터프레임 → 워크시트 XML (pandas to_excel(index=False)와 같은 배치, 머리글은 STYLE_HEADER)
+
+    문자열은 셀 안에 직접 기록(inlineStr)해 통합문서 공유 문자열 표에 의존하지 않으므로
+    만든 시트 XML을 다른 통합문서에 그대로 넣을 수 있습니다.
+    """
+    letters = [column_letter(i) for i in range(len(df.columns))]
+    header = ''.join(_text_cell(f'{letter}1', str(name), STYLE_HEADER) for letter, name in zip(letters, df.columns))
+    sheet_data = [f'<row r="1">{header}</row>']
+    if len(df.columns):
+        columns = [_column_cells(df.iloc[:, i], letter, 2) for i, letter in enumerate(letters)]
+        sheet_data.extend(
+            f'<row r="{row}">{"".join(cells)}</row>'
+            for row, cells in zip(range(2, len(df) + 2), zip(*columns))
+        )
+    return _worksheet_xml(sheet_data)
+
+
+def grid_sheet_xml(values: Sequence[Sequence[Any]], styles: Sequence[Sequence[int]],
+                   column_widths: Optional[Sequence[float]] = None, row_heights: Optional[Sequence[float]] = None,
+                   merges: Optional[Sequence[str]] = None) -> bytes:
+    """값/서식 번호 표 → 워크시트 XML (요약 시트처럼 셀마다 서식이 다른 작은 시트용)"""
+    sheet_data = []
+    for row_index, (row_values, row_styles) in enumerate(zip(values, styles)):
+        row = row_index + 1
+        cells = ''.join(
+            _value_cell(f'{column_letter(col)}{row}', value, style)
+            for col, (value, style) in enumerate(zip(row_values, row_styles))
+        )
+        height = f' ht="{row_heights[row_index]}" customHeight="1"' if row_heights else ''
+        sheet_data.append(f'<row r="{row}"{height}>{cells}</row>')
+    columns = list(enumerate(column_widths)) if column_widths else None
+    return _worksheet_xml(sheet_data, columns, merges)
+
+
+class XlsxPart:
+    """압축해 둔 패키지 파일 하나 (zip 항목에 그대로 기록)"""
+
+    __slots__ = ('data', 'crc', 'size')
+
+    def __init__(self, content: bytes, level: int = 6):
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        self.data = compressor.compress(content) + compressor.flush()
+        self.crc = zlib.crc32(content)
+        self.size = len(content)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.data)
+
+
+def _dos_time(timestamp: float) -> Tuple[int, int]:
+    t = time.localtime(timestamp)
+    return (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2), \
+        ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+
+
+def zip_parts(parts: Sequence[Tuple[str, XlsxPart]]) -> bytes:
+    """압축된 파일들을 다시 압축하지 않고 zip으로 묶기"""
+    mod_time, mod_date = _dos_time(time.time())
+    chunks = []
+    central = []
+    offset = 0
+    for name, part in parts:
+        encoded = name.encode('utf-8')
+        header = struct.pack('<4s5H3L2H', b'PK\x03\x04', 20, 0x0800, 8, mod_time, mod_date,
+                             part.crc, len(part.data), part.size, len(encoded), 0)
+        chunks.extend([header, encoded, part.data])
+        central.append(struct.pack('<4s6H3L5H2L', b'PK\x01\x02', 20, 20, 0x0800, 8, mod_time, mod_date,
+                                   part.crc, len(part.data), part.size, len(encoded), 0, 0, 0, 0, 0, offset)
+                       + encoded)
+        offset += len(header) + len(encoded) + len(part.data)
+    directory = b''.join(central)
+    end = struct.pack('<4s4H2LH', b'PK\x05\x06', 0, 0, len(parts), len(parts), len(directory), offset, 0)
+    return b''.join(chunks) + directory + end
+
+
+def write_workbook(sheets: Sequence[Tuple[str, XlsxPart]], styles: CellStyles) -> bytes:
+    """시트 XML 파일들로 xlsx 패키지 작성 (시트 파일은 이미 압축된 상태로 사용)"""
+    content_types = [
+        _XML_DECLARATION,
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">',
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+        '<Default Extension="xml" ContentType="application/xml"/>',
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>',
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>',
+    ]
+    content_types.extend(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    content_types.append('</Types>')
+
+    root_rels = (
+        f'{_XML_DECLARATION}<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+    )
+    workbook = [_XML_DECLARATION, f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>']
+    workbook.extend(
+        f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, (name, _) in enumerate(sheets, 1)
+    )
+    workbook.append('</sheets></workbook>')
+    workbook_rels = [
+        _XML_DECLARATION,
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">',
+    ]
+    workbook_rels.extend(
+        f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(sheets) + 1)
+    )
+    workbook_rels.append(
+        f'<Relationship Id="rId{len(sheets) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/></Relationships>'
+    )
+
+    parts = [
+        ('[Content_Types].xml', XlsxPart(''.join(content_types).encode('utf-8'))),
+        ('_rels/.rels', XlsxPart(root_rels.encode('utf-8'))),
+        ('xl/workbook.xml', XlsxPart(''.join(workbook).encode('utf-8'))),
+        ('xl/_rels/workbook.xml.rels', XlsxPart(''.join(workbook_rels).encode('utf-8'))),
+        ('xl/styles.xml', XlsxPart(styles.to_xml())),
+    ]
+    parts.extend((f'xl/worksheets/sheet{i}.xml', part) for i, (_, part) in enumerate(sheets, 1))
+    return zip_parts(parts)
+
+
+class SheetPartCache:
+    """
+    시트 입력 해시 → 압축된 시트 XML (전체 세션 공용, 크기 한도를 넘으면 오래 쓰지 않은 시트부터 삭제)
+
+    보고서를 다시 만들 때 입력이 바뀌지 않은 시트는 XML 작성/압축 없이 재사용합니다.
+    빈 시트(통합문서에서 생략)는 None으로 저장합니다.
+    """
+
+    MISSING = object()
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, Optional[XlsxPart]]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Any:
+        """캐시된 시트 (없으면 SheetPartCache.MISSING)"""
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return self.MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key: str, part: Optional[XlsxPart]):
+        nbytes = part.nbytes if part is not None else 0
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.nbytes
+            self._entries[key] = part
+            self._total_bytes += nbytes
+            while self._total_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                if evicted is not None:
+                    self._total_bytes -= evicted.nbytes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }